@@ -4,6 +4,10 @@ EXPIRE LIFECYCLE MANAGER - Sistema de dos pasos para jobs expirados
 PASO 1: Marca jobs como EXPIRED (primera vez que se detecta)
 PASO 2: Borra jobs que YA están marcados como EXPIRED (segunda vez)
 
+Todo el trabajo pesado lo hace core/sheets/lifecycle.py: una lectura de
+todas las pestañas, transiciones calculadas en bloque y una sola escritura
+(+ un batch de borrado por pestaña).
+
 Uso:
   py EXPIRE_LIFECYCLE.py --mark     # Marca nuevos expired
   py EXPIRE_LIFECYCLE.py --delete   # Borra los ya marcados
@@ -16,8 +20,8 @@ project_root = Path(__file__).parent
 sys.path.insert(0, str(project_root))
 
 from core.sheets.sheet_manager import SheetManager
+from core.sheets.lifecycle import LifecycleEngine
 from dotenv import load_dotenv
-from datetime import datetime, timedelta
 
 load_dotenv()
 
@@ -26,234 +30,98 @@ class ExpireLifecycleManager:
         self.manager = SheetManager()
         self.spreadsheet_id = os.getenv("GOOGLE_SHEETS_ID")
         self.tabs = ["Jobs", "Registry", "LinkedIn", "Indeed", "Glassdoor"]
-    
-    def mark_expired_by_date(self, days_threshold=30, dry_run=False):
+        self.engine = LifecycleEngine(self.manager.service, self.spreadsheet_id, self.tabs)
+
+    def mark_expired_by_date(self, days_threshold=30, dry_run=False, stale_days=14):
         """
         PASO 1: Marca jobs como EXPIRED si tienen más de X días
         """
-        print("\n" + "="*70)
-        print(f"📅 MARKING EXPIRED JOBS (>{days_threshold} days old)")
-        print("="*70)
-        print(f"Dry run: {dry_run}")
-        print("="*70 + "\n")
-        
-        total_marked = 0
-        cutoff_date = datetime.now() - timedelta(days=days_threshold)
-        
-        for tab in self.tabs:
-            print(f"Processing: {tab}")
-            try:
-                # Get all data
-                result = self.manager.service.spreadsheets().values().get(
-                    spreadsheetId=self.spreadsheet_id,
-                    range=f"{tab}!A1:Z10000"
-                ).execute()
-                
-                values = result.get('values', [])
-                if not values:
-                    print(f"  No data\n")
-                    continue
-                
-                headers = values[0]
-                rows = values[1:]
-                
-                # Find columns
-                if 'CreatedAt' not in headers or 'Status' not in headers:
-                    print(f"  [SKIP] Missing CreatedAt or Status column\n")
-                    continue
-                
-                created_idx = headers.index('CreatedAt')
-                status_idx = headers.index('Status')
-                company_idx = headers.index('Company') if 'Company' in headers else -1
-                role_idx = headers.index('Role') if 'Role' in headers else -1
-                
-                # Get sheet ID for batch update
-                sheet_metadata = self.manager.service.spreadsheets().get(
-                    spreadsheetId=self.spreadsheet_id
-                ).execute()
-                
-                sheet_id = None
-                for sheet in sheet_metadata.get('sheets', []):
-                    if sheet['properties']['title'] == tab:
-                        sheet_id = sheet['properties']['sheetId']
-                        break
-                
-                # Find jobs to mark
-                jobs_to_mark = []
-                for i, row in enumerate(rows, start=2):
-                    # Skip if already expired
-                    if len(row) > status_idx and row[status_idx] == 'EXPIRED':
-                        continue
-                    
-                    # Check date
-                    if len(row) > created_idx and row[created_idx]:
-                        try:
-                            # Parse date
-                            date_str = row[created_idx]
-                            # Try different formats
-                            for fmt in ['%Y-%m-%d %H:%M:%S', '%Y-%m-%d %I:%M:%S %p', '%Y-%m-%d']:
-                                try:
-                                    created_date = datetime.strptime(date_str.split('.')[0], fmt)
-                                    break
-                                except Exception:
-                                    continue
-                            else:
-                                continue
-                            
-                            # Check if old enough
-                            if created_date < cutoff_date:
-                                company = row[company_idx] if company_idx >= 0 and len(row) > company_idx else "Unknown"
-                                role = row[role_idx] if role_idx >= 0 and len(row) > role_idx else "Unknown"
-                                age_days = (datetime.now() - created_date).days
-                                
-                                jobs_to_mark.append({
-                                    'row': i,
-                                    'company': company,
-                                    'role': role,
-                                    'age_days': age_days
-                                })
-                        except Exception as e:
-                            continue
-                
-                if not jobs_to_mark:
-                    print(f"  No expired jobs found\n")
-                    continue
-                
-                print(f"  Found {len(jobs_to_mark)} jobs to mark:")
-                for job in jobs_to_mark[:3]:
-                    print(f"    - {job['company'][:30]:30s} | {job['role'][:30]:30s} | {job['age_days']} days")
-                if len(jobs_to_mark) > 3:
-                    print(f"    ... and {len(jobs_to_mark) - 3} more")
-                
-                if not dry_run:
-                    # Batch update
-                    status_col = chr(65 + status_idx)
-                    for job in jobs_to_mark:
-                        cell = f"{tab}!{status_col}{job['row']}"
-                        self.manager.service.spreadsheets().values().update(
-                            spreadsheetId=self.spreadsheet_id,
-                            range=cell,
-                            valueInputOption='RAW',
-                            body={'values': [['EXPIRED']]}
-                        ).execute()
-                    
-                    print(f"  ✅ Marked {len(jobs_to_mark)} jobs as EXPIRED")
-                else:
-                    print(f"  [DRY RUN] Would mark {len(jobs_to_mark)} jobs")
-                
-                total_marked += len(jobs_to_mark)
-                print()
-                
-            except Exception as e:
-                print(f"  [ERROR] {e}\n")
-        
-        print("="*70)
-        print(f"TOTAL MARKED: {total_marked}")
-        print("="*70 + "\n")
-        
-        return total_marked
-    
+        marked, _ = self.run(days_threshold, mark=True, delete=False,
+                             dry_run=dry_run, stale_days=stale_days)
+        return marked
+
     def delete_expired_jobs(self, dry_run=False):
         """
         PASO 2: Borra jobs que YA están marcados como EXPIRED
         """
+        _, deleted = self.run(mark=False, delete=True, dry_run=dry_run)
+        return deleted
+
+    def run(self, days_threshold=30, mark=True, delete=False, dry_run=False, stale_days=14):
+        """
+        Marca y/o borra con una sola lectura del Sheet. Con mark+delete (--full)
+        los jobs que se vencen en esta corrida también se borran, como antes.
+        """
+        title = " + ".join(filter(None, [
+            f"MARKING EXPIRED JOBS (>{days_threshold} days old)" if mark else "",
+            "DELETING EXPIRED JOBS" if delete else "",
+        ]))
         print("\n" + "="*70)
-        print("🗑️  DELETING EXPIRED JOBS")
+        print(f"📅 {title}")
         print("="*70)
         print(f"Dry run: {dry_run}")
         print("="*70 + "\n")
-        
-        total_deleted = 0
-        
-        for tab in self.tabs:
+
+        try:
+            plans = self.engine.plan(days_threshold=days_threshold, stale_days=stale_days,
+                                     mark=mark, delete=delete)
+        except Exception as e:
+            print(f"  [ERROR] {e}\n")
+            return 0, 0
+
+        for tab, reason in self.engine.skipped.items():
             print(f"Processing: {tab}")
-            try:
-                # Get all data
-                result = self.manager.service.spreadsheets().values().get(
-                    spreadsheetId=self.spreadsheet_id,
-                    range=f"{tab}!A1:Z10000"
-                ).execute()
-                
-                values = result.get('values', [])
-                if not values:
-                    print(f"  No data\n")
-                    continue
-                
-                headers = values[0]
-                rows = values[1:]
-                
-                # Find Status column
-                if 'Status' not in headers:
-                    print(f"  [SKIP] No Status column\n")
-                    continue
-                
-                status_idx = headers.index('Status')
-                
-                # Find EXPIRED jobs (from bottom to top)
-                rows_to_delete = []
-                for i, row in enumerate(rows, start=2):
-                    if len(row) > status_idx and row[status_idx] == 'EXPIRED':
-                        rows_to_delete.append(i)
-                
-                if not rows_to_delete:
-                    print(f"  No EXPIRED jobs found\n")
-                    continue
-                
-                print(f"  Found {len(rows_to_delete)} EXPIRED jobs to delete")
-                
-                if dry_run:
-                    print(f"  [DRY RUN] Would delete rows: {rows_to_delete[:5]}...")
+            print(f"  [SKIP] {reason}\n")
+
+        total_marked = total_deleted = total_stale = 0
+        for plan in plans:
+            print(f"Processing: {plan.tab}")
+            to_mark = plan.expire
+            if mark:
+                if to_mark.empty:
+                    print(f"  No expired jobs found")
                 else:
-                    # Get sheet ID
-                    sheet_metadata = self.manager.service.spreadsheets().get(
-                        spreadsheetId=self.spreadsheet_id
-                    ).execute()
-                    
-                    sheet_id = None
-                    for sheet in sheet_metadata.get('sheets', []):
-                        if sheet['properties']['title'] == tab:
-                            sheet_id = sheet['properties']['sheetId']
-                            break
-                    
-                    if not sheet_id:
-                        print(f"  [ERROR] Could not find sheet ID\n")
-                        continue
-                    
-                    # Delete rows (from bottom to top)
-                    rows_to_delete.sort(reverse=True)
-                    
-                    requests = []
-                    for row_num in rows_to_delete:
-                        requests.append({
-                            'deleteDimension': {
-                                'range': {
-                                    'sheetId': sheet_id,
-                                    'dimension': 'ROWS',
-                                    'startIndex': row_num - 1,
-                                    'endIndex': row_num
-                                }
-                            }
-                        })
-                    
-                    # Execute batch delete
-                    self.manager.service.spreadsheets().batchUpdate(
-                        spreadsheetId=self.spreadsheet_id,
-                        body={'requests': requests}
-                    ).execute()
-                    
-                    print(f"  ✅ Deleted {len(rows_to_delete)} jobs")
-                
-                total_deleted += len(rows_to_delete)
-                print()
-                
+                    print(f"  Found {len(to_mark)} jobs to mark:")
+                    for job in to_mark.head(3).itertuples():
+                        print(f"    - {str(job.company)[:30]:30s} | {str(job.role)[:30]:30s} | {job.age_days} days")
+                    if len(to_mark) > 3:
+                        print(f"    ... and {len(to_mark) - 3} more")
+                if not plan.stale.empty:
+                    print(f"  {len(plan.stale)} jobs New sin movimiento (>{stale_days} days), próximos a vencer")
+            if delete:
+                if plan.delete:
+                    print(f"  Found {len(plan.delete)} EXPIRED jobs to delete")
+                    if dry_run:
+                        print(f"  [DRY RUN] Would delete rows: {sorted(plan.delete)[:5]}...")
+                else:
+                    print(f"  No EXPIRED jobs found")
+            if dry_run and mark and not to_mark.empty:
+                print(f"  [DRY RUN] Would mark {len(to_mark)} jobs")
+            total_marked += len(to_mark)
+            total_deleted += len(plan.delete)
+            total_stale += len(plan.stale)
+            print()
+
+        if not dry_run and (total_marked or total_deleted):
+            try:
+                self.engine.commit(plans)
+                if total_marked:
+                    print(f"  ✅ Marked {total_marked} jobs as EXPIRED")
+                if total_deleted:
+                    print(f"  ✅ Deleted {total_deleted} jobs")
             except Exception as e:
                 print(f"  [ERROR] {e}\n")
-        
+                return 0, 0
+
         print("="*70)
-        print(f"TOTAL DELETED: {total_deleted}")
+        if mark:
+            print(f"TOTAL MARKED: {total_marked}")
+            print(f"TOTAL STALE (New, >{stale_days} days): {total_stale}")
+        if delete:
+            print(f"TOTAL DELETED: {total_deleted}")
         print("="*70 + "\n")
-        
-        return total_deleted
+
+        return total_marked, total_deleted
 
 def main():
     import argparse
@@ -262,11 +130,10 @@ def main():
     parser.add_argument('--delete', action='store_true', help='Delete EXPIRED jobs (PASO 2)')
     parser.add_argument('--full', action='store_true', help='Mark AND delete (both steps)')
     parser.add_argument('--days', type=int, default=30, help='Days threshold for expiration')
+    parser.add_argument('--stale-days', type=int, default=14, help='Days before a New job is reported as stale')
     parser.add_argument('--dry-run', action='store_true', help='Dry run (no changes)')
     args = parser.parse_args()
     
-    manager = ExpireLifecycleManager()
-    
     if not (args.mark or args.delete or args.full):
         print("\n❌ Error: Must specify --mark, --delete, or --full")
         print("\nUsage:")
@@ -277,18 +144,17 @@ def main():
         print("  py EXPIRE_LIFECYCLE.py --delete --dry-run # Ver qué se borraría")
         print()
         return
-    
-    if args.mark or args.full:
-        print("\n" + "="*70)
-        print("PASO 1: MARCAR EXPIRED")
-        print("="*70)
-        manager.mark_expired_by_date(days_threshold=args.days, dry_run=args.dry_run)
-    
-    if args.delete or args.full:
-        print("\n" + "="*70)
-        print("PASO 2: BORRAR EXPIRED")
-        print("="*70)
-        manager.delete_expired_jobs(dry_run=args.dry_run)
+
+    manager = ExpireLifecycleManager()
+
+    mark = args.mark or args.full
+    delete = args.delete or args.full
+    print("\n" + "="*70)
+    print("PASO 1 + 2: MARCAR Y BORRAR EXPIRED" if mark and delete
+          else "PASO 1: MARCAR EXPIRED" if mark else "PASO 2: BORRAR EXPIRED")
+    print("="*70)
+    manager.run(days_threshold=args.days, mark=mark, delete=delete,
+                dry_run=args.dry_run, stale_days=args.stale_days)
     
     print("\n" + "="*70)
     print("✅ LIFECYCLE COMPLETE")
@@ -3,6 +3,8 @@ UNIVERSAL JOB VERIFIER - Verifica jobs de TODAS las plataformas
 LinkedIn, Indeed, Glassdoor - Todo en un solo script
 
 Características:
+- Primero HTTP en paralelo (APIs de ATS, status, redirects, JSON-LD);
+  el browser solo abre los jobs ambiguos (core/enrichment/job_liveness.py)
 - Lee REALMENTE el contenido de cada página
 - Detecta textos específicos de "expired" por plataforma
 - Marca en Google Sheets
@@ -16,7 +18,8 @@ sys.path.insert(0, str(project_root))
 
 from core.sheets.sheet_manager import SheetManager
 from dotenv import load_dotenv
-from playwright.sync_api import sync_playwright
+from core.utils.browser_pool import get_sync_pool
+from core.enrichment.job_liveness import IndicatorScanner, LivenessChecker, classify_html
 import time
 from datetime import datetime
 
@@ -89,6 +92,16 @@ class UniversalJobVerifier:
                 "submit application"
             ]
         }
+        
+        # Indicadores por plataforma compilados en un solo regex; verificación
+        # HTTP por niveles antes de abrir el browser
+        self.scanners = {
+            platform: IndicatorScanner(self.expired_indicators[platform],
+                                       self.active_indicators.get(platform, []))
+            for platform in self.expired_indicators
+        }
+        self.scanners['unknown'] = IndicatorScanner([], [])
+        self.liveness = LivenessChecker(lambda url: self.scanners[self.detect_platform(url)])
     
     def detect_platform(self, url):
         """Detecta la plataforma del job"""
@@ -151,8 +164,8 @@ class UniversalJobVerifier:
         
         return jobs
     
-    def verify_single_job(self, job, browser):
-        """Verifica si un job está activo o expirado"""
+    def verify_single_job(self, job, pool):
+        """Verifica si un job está activo o expirado (página prestada por el pool)"""
         url = job['url']
         platform = job['platform']
         
@@ -160,78 +173,38 @@ class UniversalJobVerifier:
             return {'status': 'UNKNOWN', 'reason': 'Platform not detected'}
         
         try:
-            page = browser.new_page()
-            page.set_default_timeout(30000)
+            with pool.page(engine="firefox", headless=False) as page:
+                page.set_default_timeout(30000)
             
-            try:
-                response = page.goto(url, wait_until='domcontentloaded')
-                
-                if not response or response.status >= 400:
-                    return {
-                        'status': 'EXPIRED',
-                        'reason': f'HTTP {response.status if response else "no response"}',
-                        'method': 'http_status'
-                    }
+                try:
+                    response = page.goto(url, wait_until='domcontentloaded')
                 
-                # Wait for content to load
-                page.wait_for_timeout(2000)
-                
-                # Get page content
-                full_text = page.content().lower()
-                
-                # Check EXPIRED indicators for this platform
-                for indicator in self.expired_indicators.get(platform, []):
-                    if indicator.lower() in full_text:
+                    if not response or response.status >= 400:
                         return {
                             'status': 'EXPIRED',
-                            'reason': f'Found: "{indicator}"',
-                            'method': 'content_scan',
-                            'platform': platform
+                            'reason': f'HTTP {response.status if response else "no response"}',
+                            'method': 'http_status'
                         }
                 
-                # Check ACTIVE indicators
-                for indicator in self.active_indicators.get(platform, []):
-                    if indicator.lower() in full_text:
-                        return {
-                            'status': 'ACTIVE',
-                            'reason': f'Found: "{indicator}"',
-                            'method': 'content_scan',
-                            'platform': platform
-                        }
+                    # Wait for content to load
+                    page.wait_for_timeout(2000)
+                
+                    # Un solo scan precompilado (JSON-LD, indicadores, título)
+                    result = classify_html(page.content(), self.scanners[platform]).to_dict()
+                    result['platform'] = platform
+                    return result
                 
-                # Check title
-                title = page.title().lower()
-                if any(word in title for word in ['error', '404', 'not found', 'expirado']):
+                except Exception as nav_error:
                     return {
-                        'status': 'EXPIRED',
-                        'reason': f'Title indicates error',
-                        'method': 'title_check',
-                        'platform': platform
+                        'status': 'ERROR',
+                        'reason': f'Navigation failed: {str(nav_error)[:100]}'
                     }
                 
-                return {
-                    'status': 'UNKNOWN',
-                    'reason': 'No clear indicators',
-                    'method': 'default',
-                    'platform': platform
-                }
-                
-            except Exception as nav_error:
-                return {
-                    'status': 'ERROR',
-                    'reason': f'Navigation failed: {str(nav_error)[:100]}'
-                }
-                
         except Exception as e:
             return {
                 'status': 'ERROR',
                 'reason': f'Page error: {str(e)[:100]}'
             }
-        finally:
-            try:
-                page.close()
-            except Exception:
-                pass
     
     def mark_job_status(self, job, new_status, reason):
         """Marca el status de un job"""
@@ -294,49 +267,57 @@ class UniversalJobVerifier:
             'error': []
         }
         
-        with sync_playwright() as p:
-            browser = p.firefox.launch(headless=False)
+        # Páginas prestadas por el pool de browsers: un solo firefox para todos los jobs
+        pool = get_sync_pool()
+        for tab in tabs:
+            print(f"\n{'='*70}")
+            print(f"📂 PROCESSING TAB: {tab}")
+            print(f"{'='*70}\n")
             
-            for tab in tabs:
-                print(f"\n{'='*70}")
-                print(f"📂 PROCESSING TAB: {tab}")
-                print(f"{'='*70}\n")
-                
-                jobs = self.get_jobs_to_verify(tab, status_filter="New", limit=limit_per_tab)
+            jobs = self.get_jobs_to_verify(tab, status_filter="New", limit=limit_per_tab)
+            
+            if not jobs:
+                print(f"  No jobs found with Status='New'\n")
+                continue
+            
+            print(f"  Found {len(jobs)} jobs to verify\n")
+            
+            # Niveles 1-2: HTTP en paralelo (ATS APIs, status, redirects, JSON-LD, indicadores)
+            checks = self.liveness.check_many([job['url'] for job in jobs])
+            self.liveness.print_stats()
+            print()
+            
+            for i, (job, check) in enumerate(zip(jobs, checks), 1):
+                print(f"  [{i}/{len(jobs)}] {job['company'][:30]} - {job['role'][:40]}...")
+                print(f"    Platform: {job['platform'].upper()}")
                 
-                if not jobs:
-                    print(f"  No jobs found with Status='New'\n")
-                    continue
+                # Nivel 3: browser solo si HTTP no pudo decidir
+                used_browser = check.needs_browser
+                if used_browser:
+                    result = self.verify_single_job(job, pool)
+                else:
+                    result = dict(check.to_dict(), platform=job['platform'])
+                status = result['status']
+                reason = result['reason']
                 
-                print(f"  Found {len(jobs)} jobs to verify\n")
+                if status == 'EXPIRED':
+                    print(f"    ❌ EXPIRED: {reason}")
+                    all_results['expired'].append(job)
+                    if mark_expired:
+                        self.mark_job_status(job, 'EXPIRED', reason)
+                elif status == 'ACTIVE':
+                    print(f"    ✅ ACTIVE: {reason}")
+                    all_results['active'].append(job)
+                elif status == 'UNKNOWN':
+                    print(f"    ❓ UNKNOWN: {reason}")
+                    all_results['unknown'].append(job)
+                else:
+                    print(f"    ⚠️  ERROR: {reason}")
+                    all_results['error'].append(job)
                 
-                for i, job in enumerate(jobs, 1):
-                    print(f"  [{i}/{len(jobs)}] {job['company'][:30]} - {job['role'][:40]}...")
-                    print(f"    Platform: {job['platform'].upper()}")
-                    
-                    result = self.verify_single_job(job, browser)
-                    status = result['status']
-                    reason = result['reason']
-                    
-                    if status == 'EXPIRED':
-                        print(f"    ❌ EXPIRED: {reason}")
-                        all_results['expired'].append(job)
-                        if mark_expired:
-                            self.mark_job_status(job, 'EXPIRED', reason)
-                    elif status == 'ACTIVE':
-                        print(f"    ✅ ACTIVE: {reason}")
-                        all_results['active'].append(job)
-                    elif status == 'UNKNOWN':
-                        print(f"    ❓ UNKNOWN: {reason}")
-                        all_results['unknown'].append(job)
-                    else:
-                        print(f"    ⚠️  ERROR: {reason}")
-                        all_results['error'].append(job)
-                    
-                    print()
+                print()
+                if used_browser:
                     time.sleep(3)  # Rate limit
-            
-            browser.close()
         
         # Summary
         total = sum(len(v) for v in all_results.values())
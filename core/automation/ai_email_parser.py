@@ -6,20 +6,48 @@ This replaces brittle regex patterns with AI that can:
 - Extract job data even when format changes
 - Learn from examples
 
+Glassdoor bulletins are extracted in batches: many job snippets per prompt
+(sized to the model's context window), batches sent concurrently, and only
+the ids missing/malformed in the answer are re-requested.
+
+Env overrides:
+    LLM_URL, LLM_MODEL, EMAIL_PARSER_CONTEXT_TOKENS, EMAIL_PARSER_BATCH_JOBS,
+    EMAIL_PARSER_CONCURRENCY, EMAIL_PARSER_RETRY_ROUNDS, EMAIL_PARSER_BATCH_TIMEOUT
+
 Location: core/automation/ai_email_parser.py
 """
 
 import os
 import re
 import json
-from typing import List, Dict, Optional
+import time
+from concurrent.futures import ThreadPoolExecutor
+from typing import Any, Callable, List, Dict, Optional
 from datetime import datetime
 import requests
 from dotenv import load_dotenv
 
+from core.utils.llm_cache import get_cache
+from core.automation.bulletin_html import bulletin_doc
+
 # Load .env file
 load_dotenv()
 
+# Bump when the extraction prompts change (invalidates cached responses)
+PROMPT_VERSION = "v3"
+GLASSDOOR_PIXEL_ID = re.compile(r'utm_content=ja-jobpos\d+-[^-]+-(\d{13})')
+
+# Batched extraction: many job contexts per prompt, sized to the model's context window
+CONTEXT_TOKENS = int(os.getenv('EMAIL_PARSER_CONTEXT_TOKENS', '8192'))   # n_ctx of the local model
+BATCH_JOBS = int(os.getenv('EMAIL_PARSER_BATCH_JOBS', '10'))             # max jobs per prompt
+CONCURRENCY = int(os.getenv('EMAIL_PARSER_CONCURRENCY', '3'))            # batches in flight
+RETRY_ROUNDS = int(os.getenv('EMAIL_PARSER_RETRY_ROUNDS', '2'))          # re-requests for missing ids
+BATCH_TIMEOUT = int(os.getenv('EMAIL_PARSER_BATCH_TIMEOUT', '90'))       # seconds per batch request
+CHUNK_CHARS = 1500            # HTML per job (same cut as the old single-job prompt)
+CHARS_PER_TOKEN = 3           # conservative for HTML
+PROMPT_OVERHEAD_TOKENS = 400  # instructions + format example
+OUTPUT_TOKENS_PER_JOB = 80    # one JSON object per job in the answer
+
 class AIEmailParser:
     """
     Parse job bulletin emails using AI instead of rigid regex
@@ -40,6 +68,8 @@ class AIEmailParser:
         """
         self.llm_url = llm_url or os.getenv('LLM_URL', 'http://127.0.0.1:11434/v1/chat/completions')
         self.model = model or os.getenv('LLM_MODEL', 'qwen2.5-14b-instruct')
+        # Identical prompts (same HTML chunk) are answered from disk
+        self._cache = get_cache("email_parser", PROMPT_VERSION)
     
     def parse_glassdoor_bulletin(self, html_content: str) -> List[Dict]:
         """
@@ -74,9 +104,8 @@ class AIEmailParser:
         utm_content=ja-jobpos1-age5d-1009965617382
         """
         
-        # Pattern: job ID in tracking pixel (starts with 1009)
-        pattern = r'utm_content=ja-jobpos\d+-[^-]+-(\d{13})'
-        ids = re.findall(pattern, html_content)
+        # Pattern: job ID in tracking pixel (starts with 1009), sobre las URLs ya parseadas
+        ids = bulletin_doc(html_content).find_all(GLASSDOOR_PIXEL_ID)
         
         # Remove duplicates while preserving order
         unique_ids = list(dict.fromkeys(ids))
@@ -86,38 +115,170 @@ class AIEmailParser:
     def _ai_extract_job_details(self, html_content: str, job_ids: List[str]) -> List[Dict]:
         """
         Use AI to extract job titles, companies, and locations from HTML
-        
-        STRATEGY: Instead of processing entire HTML at once, we:
-        1. Find each job_id position in HTML
-        2. Extract a small chunk (500 chars context)
-        3. Let AI analyze just that chunk
-        4. This works for ANY email size!
+
+        STRATEGY (2026-10, batched):
+        1. Take each job's container from the DOM (small HTML chunk)
+        2. Pack as many chunks as fit in the model's context window into
+           ONE prompt (max BATCH_JOBS per prompt)
+        3. Send batches concurrently (CONCURRENCY requests in flight)
+        4. Validate the returned JSON list; re-request only the ids that are
+           missing or malformed, in smaller batches (RETRY_ROUNDS)
+        5. Whatever is still missing gets a minimal job (ID + URL)
+
+        Before: one request per job (20s timeout each) → 30 jobs = 30
+        sequential calls. Now: 3-4 concurrent calls per bulletin.
         """
-        
+
+        print(f"   🤖 Processing {len(job_ids)} jobs with batched AI extraction...")
+        started = time.time()
+
+        contexts = {}
+        for job_id in job_ids:
+            chunk = self._extract_job_context(html_content, job_id)
+            if chunk:
+                contexts[job_id] = re.sub(r'\s+', ' ', chunk)[:CHUNK_CHARS]
+            else:
+                print(f"   ⚠️  No context found for {job_id}")
+
+        extracted: Dict[str, Dict] = {}
+        pending = [job_id for job_id in job_ids if job_id in contexts]
+        max_jobs = BATCH_JOBS
+        calls = 0
+        for round_no in range(RETRY_ROUNDS + 1):
+            if not pending:
+                break
+            if round_no:
+                print(f"   🔁 Re-requesting {len(pending)} missing/malformed jobs (round {round_no})")
+            batches = self._pack_batches(pending, contexts, max_jobs)
+            calls += len(batches)
+            with ThreadPoolExecutor(max_workers=max(1, min(CONCURRENCY, len(batches)))) as pool:
+                for found in pool.map(lambda batch: self._ai_extract_batch(batch, contexts), batches):
+                    extracted.update(found)
+            pending = [job_id for job_id in pending if job_id not in extracted]
+            # Smaller batches on retry: a model that dropped ids in a long list
+            # usually answers a short one
+            max_jobs = max(1, max_jobs // 2)
+
         jobs = []
-        
-        print(f"   🤖 Processing {len(job_ids)} jobs with AI chunking...")
-        
-        for i, job_id in enumerate(job_ids, 1):
-            try:
-                # Find context around this job ID
-                chunk = self._extract_job_context(html_content, job_id)
-                
-                if not chunk:
-                    print(f"   ⚠️  [{i}/{len(job_ids)}] No context found for {job_id}")
-                    jobs.append(self._create_minimal_job(job_id))
-                    continue
-                
-                # Process this single job with AI
-                job = self._ai_extract_single_job(chunk, job_id, i, len(job_ids))
-                jobs.append(job)
-                
-            except Exception as e:
-                print(f"   ⚠️  [{i}/{len(job_ids)}] Failed: {e}")
-                jobs.append(self._create_minimal_job(job_id))
-        
+        for job_id in job_ids:
+            job = extracted.get(job_id)
+            jobs.append(job if job is not None else self._create_minimal_job(job_id))
+
+        missing = len(job_ids) - len(extracted)
+        note = f", {missing} placeholders" if missing else ""
+        print(f"   ✅ AI extracted {len(extracted)}/{len(job_ids)} jobs in "
+              f"{calls} requests ({time.time() - started:.1f}s{note})")
         return jobs
-    
+
+    def _pack_batches(self, job_ids: List[str], contexts: Dict[str, str],
+                      max_jobs: int = BATCH_JOBS) -> List[List[str]]:
+        """
+        Split job ids into batches whose prompt + expected answer fit in
+        CONTEXT_TOKENS (estimated from chars), max max_jobs per batch.
+        A single oversized job still gets its own batch.
+        """
+        batches: List[List[str]] = []
+        current: List[str] = []
+        used = PROMPT_OVERHEAD_TOKENS
+        for job_id in job_ids:
+            cost = len(contexts[job_id]) // CHARS_PER_TOKEN + OUTPUT_TOKENS_PER_JOB
+            if current and (len(current) >= max_jobs or used + cost > CONTEXT_TOKENS):
+                batches.append(current)
+                current, used = [], PROMPT_OVERHEAD_TOKENS
+            current.append(job_id)
+            used += cost
+        if current:
+            batches.append(current)
+        return batches
+
+    def _ai_extract_batch(self, batch: List[str], contexts: Dict[str, str]) -> Dict[str, Dict]:
+        """
+        One LLM request for a batch of jobs. Returns {job_id: job} with only
+        the valid entries; anything missing is re-requested by the caller.
+        """
+        prompt = self._build_batch_prompt(batch, contexts)
+        try:
+            found = self._call_llm(prompt, timeout=BATCH_TIMEOUT,
+                                   max_tokens=OUTPUT_TOKENS_PER_JOB * len(batch) + 200,
+                                   parse=lambda response: self._validate_batch_response(response, batch))
+        except Exception as e:
+            print(f"   ⚠️  Batch of {len(batch)} failed: {e}")
+            return {}
+
+        if len(found) < len(batch):
+            print(f"   ⚠️  Batch returned {len(found)}/{len(batch)} valid jobs")
+        return found
+
+    def _build_batch_prompt(self, batch: List[str], contexts: Dict[str, str]) -> str:
+        """Prompt with one delimited HTML snippet per job id."""
+        snippets = "\n\n".join(
+            f"### JOB {job_id}\n```\n{contexts[job_id]}\n```" for job_id in batch
+        )
+        return f"""Extract job information from these {len(batch)} HTML snippets of a Glassdoor email.
+Each snippet starts with "### JOB <job_id>" and belongs ONLY to that job.
+
+{snippets}
+
+For each job, find:
+1. Job title (look for <p>, <h2>, <strong> tags with job names)
+2. Company name (usually appears before or after title)
+3. Location (city, state/country)
+
+Respond with ONLY a valid JSON array (no markdown, no code fences), one object per job, same order:
+[
+  {{"job_id": "1009965617382", "title": "exact job title", "company": "company name", "location": "city, state/country"}}
+]
+
+Use exactly these job_id values: {', '.join(batch)}
+If you can't find company or location, use "Unknown"."""
+
+    def _validate_batch_response(self, ai_response: str, batch: List[str]) -> Dict[str, Dict]:
+        """
+        Parse the JSON list from a batch answer. An item is valid if its
+        job_id belongs to the batch and it has a real title; duplicates keep
+        the first one. Invalid JSON → {} (the whole batch is re-requested).
+        """
+        clean_response = ai_response.strip()
+        clean_response = re.sub(r'^```(?:json)?\s*', '', clean_response)
+        clean_response = re.sub(r'\s*```$', '', clean_response)
+        try:
+            data = json.loads(clean_response)
+        except json.JSONDecodeError:
+            # Some models add a sentence around the array
+            match = re.search(r'\[.*\]', clean_response, re.DOTALL)
+            try:
+                data = json.loads(match.group(0)) if match else None
+            except json.JSONDecodeError:
+                data = None
+        if isinstance(data, dict):
+            data = data.get('jobs')
+        if not isinstance(data, list):
+            print(f"   ⚠️  Batch response is not a JSON list: {ai_response[:120]!r}")
+            return {}
+
+        expected = set(batch)
+        found: Dict[str, Dict] = {}
+        for item in data:
+            if not isinstance(item, dict):
+                continue
+            job_id = str(item.get('job_id', '')).strip()
+            title = item.get('title')
+            if job_id not in expected or job_id in found:
+                continue
+            if not isinstance(title, str) or not title.strip() or title.strip().lower() == 'unknown':
+                continue
+            found[job_id] = {
+                'Source': 'Glassdoor',
+                'ApplyURL': f"https://www.glassdoor.com/job-listing/JL_{job_id}.htm",
+                'Role': title.strip(),
+                'Company': str(item.get('company') or 'Unknown').strip(),
+                'Location': str(item.get('location') or 'Unknown').strip(),
+                'Comp': '',
+                'CreatedAt': datetime.now().strftime('%Y-%m-%d %H:%M:%S'),
+                'Status': 'New'
+            }
+        return found
+
     def parse_generic_bulletin(self, html_content: str, source: str = 'Unknown') -> List[Dict]:
         """
         Parse generic job bulletin email using AI (for Adzuna, ComputraBajo, JobLeads, etc)
@@ -160,11 +321,9 @@ IMPORTANT:
 - If any field is missing, use "Unknown"
 - Return ONLY the JSON array, no other text"""
             
-            # Call LLM
-            response = self._call_llm(prompt, timeout=30)
-            
-            # Parse response
-            jobs = self._parse_generic_ai_response(response, source)
+            # Call LLM + parse response (only a non-empty result is cached)
+            jobs = self._call_llm(prompt, timeout=30,
+                                  parse=lambda response: self._parse_generic_ai_response(response, source))
             
             if jobs:
                 print(f"   ✅ AI extracted {len(jobs)} jobs from {source}")
@@ -246,40 +405,15 @@ IMPORTANT:
         including in links and tracking URLs.
         
         Returns ~2000 characters of context for better extraction
+        (2026-10: el chunk es el contenedor del job en el DOM, no un recorte
+        crudo que podía cortar tags a la mitad)
         """
         
-        # Strategy 1: Find the job_id in ANY URL parameter
-        # Pattern: job_id in various formats
-        patterns = [
-            rf'utm_content=ja-jobpos\d+-[^-]+-{job_id}',  # Tracking pixel
-            rf'jobListingId={job_id}',                     # Direct parameter
-            rf'job-listing/JL_{job_id}',                   # Direct link
-        ]
-        
-        best_idx = -1
-        for pattern in patterns:
-            import re
-            match = re.search(pattern, html_content)
-            if match:
-                best_idx = match.start()
-                break
-        
-        if best_idx == -1:
-            # Fallback: search for raw job_id
-            best_idx = html_content.find(job_id)
-        
-        if best_idx == -1:
-            return ""
-        
-        # Extract LARGER context (1000 chars before and after)
-        # This increases chance of capturing job details
-        context_size = 1000
-        start = max(0, best_idx - context_size)
-        end = min(len(html_content), best_idx + context_size)
-        
-        chunk = html_content[start:end]
-        
-        return chunk
+        # Contenedor del job en el DOM (tracking pixel / link que trae el job_id);
+        # si no aparece en ninguna URL, recorte de ±1000 chars alrededor del id
+        return bulletin_doc(html_content).context(
+            job_id, size=1000, prefer=('utm_content=ja-jobpos', 'jobListingId=', 'job-listing/JL_')
+        )
     
     def _ai_extract_single_job(self, html_chunk: str, job_id: str, current: int, total: int) -> Dict:
         """
@@ -378,12 +512,8 @@ If you can't find a field, use "Unknown"."""
         - Limit size to fit in context
         """
         
-        # Remove script and style tags
-        html = re.sub(r'<script[^>]*>.*?</script>', '', html, flags=re.DOTALL|re.IGNORECASE)
-        html = re.sub(r'<style[^>]*>.*?</style>', '', html, flags=re.DOTALL|re.IGNORECASE)
-        
-        # Remove tracking pixels and images
-        html = re.sub(r'<img[^>]*>', '', html)
+        # Remove script/style tags, tracking pixels and images (árbol compartido, un solo parseo)
+        html = bulletin_doc(html).clean_html()
         
         # Keep only semantic HTML
         # Extract text content from divs, spans, tds, etc
@@ -436,10 +566,22 @@ CRITICAL RULES:
         
         return prompt
     
-    def _call_llm(self, prompt: str, timeout: int = 30) -> str:
-        """Call LM Studio API with configurable timeout"""
+    def _call_llm(self, prompt: str, timeout: int = 30, max_tokens: int = 1000,
+                  parse: Optional[Callable[[str], Any]] = None) -> Any:
+        """
+        Call LM Studio API with configurable timeout (cached by prompt)
+
+        Only usable answers are cached, so a malformed or truncated answer is
+        never served again from disk:
+          - with `parse`: returns parse(answer); cached only if that is truthy
+          - without it:   returns the raw answer; cached only if it is valid JSON
+        """
+        cached = self._cache.get(self.model, prompt)
+        if cached is not None:
+            return parse(cached) if parse else cached
         
         try:
+            started = time.time()
             response = requests.post(
                 self.llm_url,
                 json={
@@ -448,7 +590,7 @@ CRITICAL RULES:
                         {"role": "user", "content": prompt}
                     ],
                     "temperature": 0.1,  # Low temperature for consistency
-                    "max_tokens": 1000   # Reduced for faster responses
+                    "max_tokens": max_tokens  # 1000 by default; batches ask for more
                 },
                 timeout=timeout
             )
@@ -459,10 +601,24 @@ CRITICAL RULES:
             # Extract content from response
             content = data['choices'][0]['message']['content']
             
-            return content
-            
         except requests.exceptions.RequestException as e:
             raise Exception(f"LLM API error: {e}")
+        
+        result = parse(content) if parse else content
+        usable = bool(result) if parse else self._is_json(content)
+        if usable:
+            self._cache.put(self.model, prompt, content, elapsed=time.time() - started)
+        return result
+    
+    @staticmethod
+    def _is_json(ai_response: str) -> bool:
+        """True if the answer (without markdown fences) parses as JSON."""
+        clean_response = re.sub(r'^```(?:json)?\s*|\s*```$', '', ai_response.strip())
+        try:
+            json.loads(clean_response)
+            return True
+        except (json.JSONDecodeError, TypeError):
+            return False
     
     def _parse_ai_response(self, ai_response: str, job_ids: List[str]) -> List[Dict]:
         """
@@ -514,7 +670,10 @@ CRITICAL RULES:
         return [self._create_minimal_job(job_id) for job_id in job_ids]
     
     def _create_minimal_job(self, job_id: str) -> Dict:
-        """Create single job entry with just ID"""
+        """
+        Create single job entry with just ID. Flagged with _ai_failed so
+        callers don't cache it as a real result (not a Sheet column).
+        """
         return {
             'Source': 'Glassdoor',
             'ApplyURL': f"https://www.glassdoor.com/job-listing/JL_{job_id}.htm",
@@ -523,7 +682,8 @@ CRITICAL RULES:
             'Location': 'Unknown',
             'Comp': '',
             'CreatedAt': datetime.now().strftime('%Y-%m-%d %H:%M:%S'),
-            'Status': 'New'
+            'Status': 'New',
+            '_ai_failed': True
         }
 
 
@@ -27,6 +27,8 @@ from typing import Optional, Tuple, Dict
 import requests
 from dotenv import load_dotenv
 
+from core.utils.answer_index import get_answer_index
+
 load_dotenv()
 
 # ── Multi-backend AI (Gemini → NVIDIA NIM → fallback) ────────────────────────
@@ -174,10 +176,19 @@ def ask_ai(question: str, job: dict, cv: dict, max_words: int = 80) -> str:
     """
     Answer an application question using multi-backend AI
     (Gemini Flash → NVIDIA NIM → LiteLLM/Ollama → generic fallback).
+    Questions already answered for another job come from the answer index
+    without calling the LLM; new LLM answers are written back to it.
     """
     title   = job.get("Role",    job.get("title",   "Project Manager"))
     company = job.get("Company", job.get("company", "the company"))
 
+    index = get_answer_index()
+    hit = index.lookup(question)
+    if hit:
+        known = hit.resolve(cv)
+        if known:
+            return known
+
     prompt = (
         f"You are filling a job application for {title} at {company}.\n"
         f"Candidate profile:\n{MARCOS_PROFILE}\n\n"
@@ -187,6 +198,7 @@ def ask_ai(question: str, job: dict, cv: dict, max_words: int = 80) -> str:
 
     answer = _call_llm(prompt, max_tokens=250)
     if answer:
+        index.learn(question, answer, source="llm", company=company)
         return answer
 
     # Hard fallback — no AI available
@@ -2,6 +2,25 @@
 LinkedIn Easy Apply - COMPLETE AUTOMATION
 Handles entire Easy Apply flow from start to finish
 
+Pipeline (run):
+  - Enrichment (ENERD), tailored CV and screening answers for the next
+    EASY_APPLY_PREFETCH jobs are prepared in the background while the
+    current forms are being filled
+  - Applications run on EASY_APPLY_TABS tabs of the same LinkedIn context
+    (one login, shared cookies)
+  - Per-account cap: at most EASY_APPLY_MAX_PER_HOUR application starts in
+    any one-hour window across all tabs, at least EASY_APPLY_MIN_GAP seconds
+    apart
+
+Screening questions: answer index first (core/utils/answer_index.py, built
+from previous forms), then SCREENING_RULES, then ENERD live. Whatever the
+rules or ENERD answer is written back to the index, so a question seen for
+one employer resolves without ENERD/LLM for the next.
+
+Env overrides:
+    EASY_APPLY_TABS, EASY_APPLY_PREFETCH, EASY_APPLY_MAX_PER_HOUR,
+    EASY_APPLY_MIN_GAP, EASY_APPLY_TAILOR_CV=0
+
 Author: Marcos Alberto Alvarado
 Date: 2026-01-28
 """
@@ -11,16 +30,21 @@ import os
 import sys
 import json
 import re
+import time
 import urllib.request as _urllib
+from collections import deque
+from contextvars import ContextVar
 from datetime import datetime
 from typing import Dict, List, Optional
 from pathlib import Path
-from playwright.async_api import async_playwright, Page, Browser
+from playwright.async_api import Page
 from dotenv import load_dotenv
 
 sys.path.append(str(Path(__file__).parent.parent.parent))
 from core.sheets.sheet_manager import SheetManager
 from core.enerd_bridge import ENERDBridge, CV_FALLBACK
+from core.utils.browser_pool import AsyncBrowserPool, linkedin_session_file
+from core.utils.answer_index import get_answer_index
 
 # CV DATA - COMPLETE
 CV_DATA = {
@@ -58,6 +82,78 @@ CV_DATA = {
     "aviation_experience": "No"
 }
 
+# Preguntas de screening conocidas: ENERD las contesta por job al preparar
+# (antes de abrir el formulario), no pregunta por pregunta en vivo
+SCREENING_FIELDS = [
+    "english_proficiency", "spanish_proficiency", "work_authorization_mexico",
+    "willing_to_relocate", "remote_work", "travel_availability",
+    "salary_expectation_mxn", "salary_expectation_usd", "years_experience",
+    "python_experience", "sql_experience", "agile_experience", "scrum_experience",
+    "power_bi_experience", "erp_experience", "banking_experience",
+    "healthcare_experience", "manufacturing_experience", "aviation_experience",
+]
+
+# Reglas por palabra clave (en orden: gana la primera) → campo de cv_data.
+# Solo para preguntas que el índice de respuestas todavía no conoce.
+SCREENING_RULES = [
+    ("english_proficiency",       ("english", "inglés", "proficiency in english")),
+    ("spanish_proficiency",       ("spanish", "español")),
+    ("work_authorization_mexico", ("work authorization", "autorización", "legally authorized")),
+    ("willing_to_relocate",       ("relocate", "relocation", "move to", "mudarte")),
+    ("remote_work",               ("remote", "remoto", "work from home")),
+    ("travel_availability",       ("travel", "viajar", "available to travel")),
+    ("salary_expectation_mxn",    ("salary", "salario", "compensation", "expectation")),
+    ("years_experience",          ("years", "años", "experience", "experiencia")),
+    ("python_experience",         ("python",)),
+    ("sql_experience",            ("sql",)),
+    ("agile_experience",          ("agile", "scrum", "ágil")),
+    ("power_bi_experience",       ("power bi", "powerbi")),
+    ("erp_experience",            ("erp",)),
+    ("banking_experience",        ("banking", "bank")),
+    ("healthcare_experience",     ("healthcare", "health")),
+    ("manufacturing_experience",  ("manufacturing",)),
+    ("aviation_experience",       ("aviation", "airline")),
+]
+
+APPLY_TABS = int(os.getenv("EASY_APPLY_TABS", "2"))              # pestañas aplicando a la vez
+PREFETCH = int(os.getenv("EASY_APPLY_PREFETCH", "3"))            # jobs preparados por adelantado
+MAX_PER_HOUR = int(os.getenv("EASY_APPLY_MAX_PER_HOUR", "30"))   # cap por cuenta (ventana de 1 h)
+MIN_GAP = float(os.getenv("EASY_APPLY_MIN_GAP", "3"))            # segundos entre aplicaciones
+TAILOR_CV = os.getenv("EASY_APPLY_TAILOR_CV", "1") != "0"
+
+
+class ApplyThrottle:
+    """
+    Cap por cuenta compartido por todas las pestañas: como máximo `per_hour`
+    inicios de aplicación en cualquier ventana de una hora, y al menos
+    `min_gap` segundos entre dos inicios (reemplaza el sleep(3) entre jobs).
+    """
+
+    def __init__(self, per_hour: int = MAX_PER_HOUR, min_gap: float = MIN_GAP):
+        self.per_hour = int(per_hour)
+        self.min_gap = min_gap
+        self._starts: deque = deque()
+        self._lock = asyncio.Lock()
+        self.waited = 0.0
+
+    async def wait(self) -> None:
+        # El lock se mantiene durante la espera: las pestañas salen en orden
+        async with self._lock:
+            while True:
+                now = time.monotonic()
+                while self._starts and now - self._starts[0] >= 3600:
+                    self._starts.popleft()
+                delay = 0.0
+                if self._starts:
+                    delay = self._starts[-1] + self.min_gap - now
+                if self.per_hour > 0 and len(self._starts) >= self.per_hour:
+                    delay = max(delay, self._starts[0] + 3600 - now)
+                if delay <= 0:
+                    break
+                self.waited += delay
+                await asyncio.sleep(delay)
+            self._starts.append(time.monotonic())
+
 
 class EasyApplyBot:
     """Complete Easy Apply automation"""
@@ -66,16 +162,50 @@ class EasyApplyBot:
         load_dotenv()
         self.dry_run = dry_run
         self.sheet_manager = SheetManager()
-        self.cv_data = CV_DATA.copy()
         self._bridge = ENERDBridge()          # ENERD bridge para respuestas inteligentes
+        self._answers = get_answer_index()    # pregunta → respuesta de formularios previos
         self._base_cv = CV_DATA.copy()        # Respaldo original, nunca se modifica
-        self._current_job: dict = {}          # Job activo — se actualiza por enrich_for_job
+        # cv_data / _current_job son por tarea asyncio: cada pestaña del
+        # pipeline ve solo el job que está llenando
+        self._cv_var: ContextVar[dict] = ContextVar(f"easy_apply_cv_{id(self)}")
+        self._job_var: ContextVar[dict] = ContextVar(f"easy_apply_job_{id(self)}")
+
+    @property
+    def cv_data(self) -> dict:
+        return self._cv_var.get(self._base_cv)
+
+    @cv_data.setter
+    def cv_data(self, value: dict) -> None:
+        self._cv_var.set(value)
+
+    @property
+    def _current_job(self) -> dict:
+        return self._job_var.get({})
+
+    @_current_job.setter
+    def _current_job(self, value: dict) -> None:
+        self._job_var.set(value)
 
     async def enrich_for_job(self, job: dict) -> None:
         """
         Consulta ENERD para enriquecer cv_data con respuestas específicas para ESTE trabajo.
         Si ENERD no está disponible, usa el CV_DATA original sin interrupciones.
         """
+        self.use_prepared(await self.prepare_job(job))
+
+    def use_prepared(self, prepared: dict) -> None:
+        """Activa el resultado de prepare_job en la tarea actual."""
+        self._current_job = prepared['job']
+        self.cv_data = prepared['cv_data']
+
+    async def prepare_job(self, job: dict) -> dict:
+        """
+        Todo lo que no necesita la página: enriquecimiento ENERD (con las
+        preguntas de screening conocidas) y CV personalizado. No toca el
+        estado del bot, así que corre en background para los próximos jobs.
+
+        Returns: {'job': job normalizado, 'cv_data': dict para el formulario}
+        """
         title   = job.get('Role', job.get('title', 'N/A'))
         company = job.get('Company', job.get('company', 'N/A'))
         print(f"   🧠 ENERD analizando oferta: {title} @ {company}...")
@@ -89,26 +219,46 @@ class EasyApplyBot:
             "fit_score":   job.get('FitScore', 0),
             "why":         job.get('Why', ''),
         }
-        self._current_job = job_normalized   # Guardar para uso en screening
 
-        enriched = await self._bridge.analyze_job(
-            job=job_normalized,
-            generate_cover_letter=True,
+        enriched, resume = await asyncio.gather(
+            self._bridge.analyze_job(
+                job=job_normalized,
+                form_fields=[{"name": name, "label": name.replace('_', ' ')}
+                             for name in SCREENING_FIELDS],
+                generate_cover_letter=True,
+            ),
+            self._tailored_resume(job),
         )
 
         if enriched.source == "enerd" and enriched.confidence >= 0.5:
             # Fusionar respuestas de ENERD sobre base original
-            self.cv_data = {**self._base_cv, **enriched.field_answers}
+            cv_data = {**self._base_cv, **enriched.field_answers}
             if enriched.cover_letter:
-                self.cv_data['cover_letter'] = enriched.cover_letter
+                cv_data['cover_letter'] = enriched.cover_letter
             print(f"   ✅ ENERD: {len(enriched.field_answers)} campos enriquecidos "
-                  f"(confianza={enriched.confidence:.0%})")
+                  f"para {title[:40]} (confianza={enriched.confidence:.0%})")
             if enriched.clarifications_needed:
                 print(f"   ❓ {len(enriched.clarifications_needed)} campos pendientes "
                       f"— ver http://localhost:4010 > Clarificaciones")
         else:
-            self.cv_data = self._base_cv.copy()
-            print(f"   ⚡ ENERD offline/baja confianza — usando CV_DATA base")
+            cv_data = self._base_cv.copy()
+            print(f"   ⚡ ENERD offline/baja confianza — usando CV_DATA base ({title[:40]})")
+
+        if resume:
+            cv_data['resume_path'] = resume
+        return {'job': job_normalized, 'cv_data': cv_data}
+
+    async def _tailored_resume(self, job: dict) -> Optional[str]:
+        """CV personalizado (cv_customizer, FIT alto) en un thread; None → CV base."""
+        if not TAILOR_CV:
+            return None
+        try:
+            from core.automation.cv_customizer import get_cv_for_job
+            path = await asyncio.to_thread(get_cv_for_job, job)
+        except Exception as e:
+            print(f"   ⚠️ CV personalizado no disponible: {e}")
+            return None
+        return str(path) if path and Path(path).exists() else None
         
     async def click_easy_apply(self, page: Page) -> bool:
         """Click Easy Apply button using JavaScript — handles obfuscated LinkedIn class names."""
@@ -282,8 +432,8 @@ class EasyApplyBot:
                     
                     print(f"      Q: {question_text[:80]}...")
                     
-                    # STRATEGY 1: Match question keywords to pre-loaded cv_data
-                    answer = self._match_screening_answer(question_lower)
+                    # STRATEGY 1: índice de respuestas + reglas sobre cv_data precargado
+                    answer = self._match_screening_answer(question_text)
 
                     # STRATEGY 2: ENERD — IA local lee la pregunta + opciones en vivo
                     if not answer:
@@ -337,76 +487,23 @@ class EasyApplyBot:
             return True  # Don't fail the whole application
     
     def _match_screening_answer(self, question: str) -> Optional[str]:
-        """Match question to answer from CV data"""
-        
-        # English proficiency
-        if any(word in question for word in ['english', 'inglés', 'proficiency in english']):
-            return self.cv_data['english_proficiency']
-        
-        # Spanish
-        if any(word in question for word in ['spanish', 'español']):
-            return self.cv_data['spanish_proficiency']
-        
-        # Work authorization
-        if any(word in question for word in ['work authorization', 'autorización', 'legally authorized']):
-            return self.cv_data['work_authorization_mexico']
-        
-        # Relocation
-        if any(word in question for word in ['relocate', 'relocation', 'move to', 'mudarte']):
-            return self.cv_data['willing_to_relocate']
-        
-        # Remote work
-        if any(word in question for word in ['remote', 'remoto', 'work from home']):
-            return self.cv_data['remote_work']
-        
-        # Travel
-        if any(word in question for word in ['travel', 'viajar', 'available to travel']):
-            return self.cv_data['travel_availability']
-        
-        # Salary
-        if any(word in question for word in ['salary', 'salario', 'compensation', 'expectation']):
-            if 'mxn' in question or 'pesos' in question:
-                return self.cv_data['salary_expectation_mxn']
-            else:
-                return self.cv_data['salary_expectation_mxn']
-        
-        # Years experience
-        if any(word in question for word in ['years', 'años', 'experience', 'experiencia']):
-            return self.cv_data['years_experience']
-        
-        # Python
-        if 'python' in question:
-            return self.cv_data['python_experience']
-        
-        # SQL
-        if 'sql' in question:
-            return self.cv_data['sql_experience']
-        
-        # Agile/Scrum
-        if any(word in question for word in ['agile', 'scrum', 'ágil']):
-            return self.cv_data['agile_experience']
-        
-        # Power BI
-        if 'power bi' in question or 'powerbi' in question:
-            return self.cv_data['power_bi_experience']
-        
-        # ERP
-        if 'erp' in question:
-            return self.cv_data['erp_experience']
-        
-        # Industry specific
-        if 'banking' in question or 'bank' in question:
-            return self.cv_data['banking_experience']
-        
-        if 'healthcare' in question or 'health' in question:
-            return self.cv_data['healthcare_experience']
-        
-        if 'manufacturing' in question:
-            return self.cv_data['manufacturing_experience']
-        
-        if 'aviation' in question or 'airline' in question:
-            return self.cv_data['aviation_experience']
-        
+        """
+        Respuesta desde el índice (exacta o pregunta parecida ya contestada)
+        o, si no está, desde SCREENING_RULES; la regla que matchea se guarda
+        en el índice para la próxima vez.
+        """
+        hit = self._answers.lookup(question)
+        if hit:
+            answer = hit.resolve(self.cv_data)
+            if answer:
+                return answer
+
+        question_lower = question.lower()
+        for field, keywords in SCREENING_RULES:
+            if any(word in question_lower for word in keywords):
+                self._answers.learn(question, field=field, source="rule")
+                return self.cv_data.get(field)
+
         return None
     
     async def _fill_question(self, group, answer: str, question: str) -> bool:
@@ -997,8 +1094,12 @@ class EasyApplyBot:
                 },
                 method="POST"
             )
-            with _urllib.urlopen(req, timeout=20) as resp:
-                result = json.loads(resp.read())
+            def _post():
+                with _urllib.urlopen(req, timeout=20) as resp:
+                    return json.loads(resp.read())
+
+            # En un thread: con varias pestañas, las demás siguen mientras tanto
+            result = await asyncio.to_thread(_post)
 
             raw = result["choices"][0]["message"]["content"].strip()
             # Extract JSON even if model wraps it in ```
@@ -1208,14 +1309,24 @@ class EasyApplyBot:
         except Exception as e:
             print(f"⚠️ Could not update status: {e}")
     
-    async def run(self, min_fit: int = 7, max_jobs: int = 10):
-        """Main execution"""
+    async def run(self, min_fit: int = 7, max_jobs: int = 10, pool: Optional[AsyncBrowserPool] = None,
+                  tabs: int = APPLY_TABS, prefetch: int = PREFETCH, pregen_cvs: bool = False):
+        """
+        Main execution. pool: AsyncBrowserPool compartido (si es None se abre uno propio)
+
+        Pipeline: `tabs` pestañas del mismo context aplican en paralelo y los
+        próximos `prefetch` jobs se preparan (ENERD + CV) en background, así
+        la latencia del LLM no frena las aplicaciones. ApplyThrottle limita
+        el ritmo por cuenta. pregen_cvs: genera en lote todos los CVs
+        personalizados antes de abrir LinkedIn.
+        """
         print("=" * 80)
         print(f"{'[DRY RUN MODE] ' if self.dry_run else ''}LINKEDIN EASY APPLY AUTOMATION")
         print("=" * 80)
         print(f"Min FIT Score: {min_fit}")
         print(f"Max Jobs: {max_jobs}")
         print(f"Resume: {Path(self.cv_data['resume_path']).name}")
+        print(f"Tabs: {tabs} | Prefetch: {prefetch} | Max/hour: {MAX_PER_HOUR}")
         print("=" * 80)
         
         # Get eligible jobs
@@ -1224,85 +1335,111 @@ class EasyApplyBot:
         if not jobs:
             print("❌ No eligible jobs found")
             return
+
+        if pregen_cvs and TAILOR_CV:
+            from core.automation.cv_customizer import pregenerate_cvs
+            print(f"📄 Pre-generando CVs personalizados para {len(jobs)} jobs...")
+            counts = await asyncio.to_thread(pregenerate_cvs, jobs)
+            print(f"   ✅ {counts['generated']} generados, {counts['cached']} en cache, "
+                  f"{counts['failed']} fallidos")
         
-        # Launch browser
-        async with async_playwright() as p:
-            browser = await p.chromium.launch(
-                headless=False,
-                args=['--disable-blink-features=AutomationControlled']
-            )
-            
-            # Load existing LinkedIn session cookies (Playwright storage_state format)
-            _session_candidates = [
-                r'C:\Users\MSI\Desktop\ai-job-foundry\data\credentials\linkedin_session.json',
-                r'C:\Users\MSI\Desktop\ai-job-foundry\data\credentials\linkedin_auth.json',
-            ]
-            _storage_state = None
-            for _sf in _session_candidates:
-                if Path(_sf).exists():
-                    _storage_state = _sf
-                    print(f'Loading LinkedIn session: {Path(_sf).name}')
-                    break
-            if not _storage_state:
-                print('No saved session found -- will attempt fresh login')
+        # Página del pool de browsers: context tibio "linkedin" con la sesión
+        # guardada (linkedin_auth.json / linkedin_session.json) si existe
+        session_file = linkedin_session_file()
+        if session_file is None:
+            print('No saved session found -- will attempt fresh login')
+        else:
+            print(f'Loading LinkedIn session: {session_file.name}')
 
-            context = await browser.new_context(
-                user_agent='Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36',
-                storage_state=_storage_state
-            )
-            
-            page = await context.new_page()
-            
-            # Login
-            if not await self.linkedin_login(page):
-                await browser.close()
-                return
-            
-            # Process each job
-            success_count = 0
-            external_count = 0
-            expired_count = 0
-            failed_count = 0
-
-            for i, job in enumerate(jobs, 1):
-                print(f"\n{'='*80}")
-                print(f"JOB {i}/{len(jobs)}: {job.get('Role', 'N/A')} @ {job.get('Company', 'N/A')}")
-                print(f"{'='*80}")
-
-                # ── ENERD: enriquecer CV con respuestas inteligentes por trabajo ──
-                await self.enrich_for_job(job)
-
-                success = await self.process_easy_apply(job, page)
-
-                apply_type = job.get('_apply_type', '')
-                if apply_type == 'expired':
-                    expired_count += 1
-                    print(f"⏱️  EXPIRED: {job.get('Role')}")
-                elif apply_type == 'external':
-                    external_count += 1
-                    print(f"⚠️  EXTERNAL APPLY: {job.get('Role')}")
-                elif success:
-                    success_count += 1
-                    self.update_job_status(job, 'Applied')
-                    print(f"✅ SUCCESS: {job.get('Role')}")
-                else:
-                    failed_count += 1
-                    print(f"❌ FAILED: {job.get('Role')}")
-
-                await asyncio.sleep(3)
-
-            await browser.close()
-
-            # Summary
-            print("\n" + "=" * 80)
-            print("SUMMARY")
-            print("=" * 80)
-            print(f"Total processed: {len(jobs)}")
-            print(f"✅ Easy Apply Success:        {success_count}")
-            print(f"⚠️  External Apply (skipped): {external_count}")
-            print(f"⏱️  Expired (skipped):         {expired_count}")
-            print(f"❌ Failed:                    {failed_count}")
-            print("=" * 80)
+        page_options = dict(
+            engine="chromium", headless=False,
+            user_agent='Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36',
+        )
+        counts = {'success': 0, 'external': 0, 'expired': 0, 'failed': 0}
+        throttle = ApplyThrottle()
+        started = time.time()
+
+        # Preparación en background: el job i y los `prefetch` siguientes
+        prepared: Dict[int, asyncio.Task] = {}
+        next_job = 0
+
+        def schedule(upto: int) -> None:
+            for j in range(len(prepared), min(upto, len(jobs))):
+                prepared[j] = asyncio.create_task(self.prepare_job(jobs[j]))
+
+        async def worker(tab: int, pool: AsyncBrowserPool) -> None:
+            nonlocal next_job
+            async with pool.page("linkedin", **page_options) as page:
+                while next_job < len(jobs):
+                    i = next_job
+                    next_job += 1
+                    schedule(i + 1 + prefetch)
+                    job = jobs[i]
+                    try:
+                        prep = await prepared[i]
+                    except Exception as e:
+                        print(f"   ⚠️ Preparación falló ({e}) — usando CV_DATA base")
+                        prep = {'job': {}, 'cv_data': self._base_cv.copy()}
+                    await throttle.wait()
+
+                    print(f"\n{'='*80}")
+                    print(f"[TAB {tab}] JOB {i + 1}/{len(jobs)}: {job.get('Role', 'N/A')} @ {job.get('Company', 'N/A')}")
+                    print(f"{'='*80}")
+
+                    # ENERD/CV ya calculados: solo se activan en esta pestaña
+                    self.use_prepared(prep)
+                    try:
+                        success = await self.process_easy_apply(job, page)
+                    except Exception as e:
+                        print(f"   ❌ [TAB {tab}] Error: {e}")
+                        success = False
+
+                    apply_type = job.get('_apply_type', '')
+                    if apply_type == 'expired':
+                        counts['expired'] += 1
+                        print(f"⏱️  EXPIRED: {job.get('Role')}")
+                    elif apply_type == 'external':
+                        counts['external'] += 1
+                        print(f"⚠️  EXTERNAL APPLY: {job.get('Role')}")
+                    elif success:
+                        counts['success'] += 1
+                        self.update_job_status(job, 'Applied')
+                        print(f"✅ SUCCESS: {job.get('Role')}")
+                    else:
+                        counts['failed'] += 1
+                        print(f"❌ FAILED: {job.get('Role')}")
+
+        own_pool = pool is None
+        if own_pool:
+            pool = AsyncBrowserPool()
+        try:
+            # Mientras se hace login ya se preparan los primeros jobs
+            schedule(min(len(jobs), max(1, tabs) + prefetch))
+            async with pool.page("linkedin", **page_options) as page:
+                if not await self.linkedin_login(page):
+                    return
+            # Mismo identity/opciones → mismo context: las pestañas comparten la sesión
+            n_tabs = max(1, min(tabs, len(jobs)))
+            await asyncio.gather(*(worker(t, pool) for t in range(1, n_tabs + 1)))
+        finally:
+            for task in prepared.values():
+                task.cancel()
+            if own_pool:
+                await pool.close()
+
+        # Summary
+        print("\n" + "=" * 80)
+        print("SUMMARY")
+        print("=" * 80)
+        print(f"Total processed: {len(jobs)}")
+        print(f"✅ Easy Apply Success:        {counts['success']}")
+        print(f"⚠️  External Apply (skipped): {counts['external']}")
+        print(f"⏱️  Expired (skipped):         {counts['expired']}")
+        print(f"❌ Failed:                    {counts['failed']}")
+        print(f"⏱️  Tiempo total: {time.time() - started:.0f}s "
+              f"(cap por cuenta: {throttle.waited:.0f}s de espera)")
+        self._answers.print_stats()
+        print("=" * 80)
 
 
 if __name__ == '__main__':
@@ -1312,8 +1449,12 @@ if __name__ == '__main__':
     parser.add_argument('--live', action='store_true', help='Live mode (actually apply)')
     parser.add_argument('--min-fit', type=int, default=7, help='Minimum FIT score')
     parser.add_argument('--max-jobs', type=int, default=5, help='Maximum jobs to process')
+    parser.add_argument('--tabs', type=int, default=APPLY_TABS, help='Parallel tabs (same LinkedIn session)')
+    parser.add_argument('--prefetch', type=int, default=PREFETCH, help='Jobs prepared ahead (ENERD + CV)')
+    parser.add_argument('--pregen-cvs', action='store_true', help='Generate all tailored CVs before applying')
     
     args = parser.parse_args()
     
     bot = EasyApplyBot(dry_run=not args.live)
-    asyncio.run(bot.run(min_fit=args.min_fit, max_jobs=args.max_jobs))
+    asyncio.run(bot.run(min_fit=args.min_fit, max_jobs=args.max_jobs,
+                        tabs=args.tabs, prefetch=args.prefetch, pregen_cvs=args.pregen_cvs))
@@ -165,24 +165,19 @@ class LinkedInEasyApply:
         if not self._playwright_available:
             return
 
-        from playwright.sync_api import sync_playwright, TimeoutError as PWT
-
-        with sync_playwright() as pw:
-            # Lanzar Chromium con ventana visible (para que puedas intervenir si hay CAPTCHA)
-            browser = pw.chromium.launch(
-                headless=False,
-                slow_mo=100,
-                args=["--start-maximized"]
-            )
-            ctx = browser.new_context(
-                viewport={"width": 1280, "height": 800},
-                user_agent="Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36"
-            )
+        from core.utils.browser_pool import get_sync_pool
+
+        # Chromium con ventana visible (para que puedas intervenir si hay CAPTCHA),
+        # página prestada por el pool de browsers del proceso
+        with get_sync_pool().page(
+            engine="chromium", headless=False,
+            viewport={"width": 1280, "height": 800},
+            user_agent="Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36",
+        ) as page:
+            ctx = page.context
 
             # Cargar cookies guardadas
             self._load_cookies(ctx)
-
-            page = ctx.new_page()
             self._ensure_login(page)
 
             for job in jobs:
@@ -223,8 +218,6 @@ class LinkedInEasyApply:
                 print(f"\n✅ {len(self._applied)} aplicaciones completadas")
                 print(f"   Log guardado en: {APPLIED_LOG}")
 
-            browser.close()
-
     def _load_cookies(self, ctx):
         try:
             if COOKIES_FILE.exists():
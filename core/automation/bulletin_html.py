@@ -0,0 +1,216 @@
+"""
+BULLETIN HTML - un solo parseo por email, compartido por todos los extractores
+
+Antes cada extractor de boletín (LinkedIn, Indeed, Glassdoor, URLs del
+usuario, AIEmailParser) corría sus propias regex sobre el HTML completo
+(decenas de pasadas por email) y improved_bulletin_processor lo volvía a
+parsear con BeautifulSoup/html.parser.
+
+BulletinDoc parsea el HTML una vez con lxml; cada índice es una consulta
+XPath que se arma la primera vez que un extractor la pide:
+  - urls        : href/src/background/content http(s) + URLs en el texto, en orden
+                  (entidades ya decodificadas: &amp; → &), y al final las URLs
+                  de los comentarios condicionales de Outlook (<!--[if mso]>),
+                  que lxml descarta con el resto de comentarios
+  - leaves      : elementos sin hijos con texto (tag, class, style, texto)
+  - text_nodes  : texto entre tags (el.text / el.tail), sin normalizar
+  - anchors     : <a href> (para buscar contenedores de un link)
+
+Las regex que quedan corren sobre strings cortos (una URL, un nodo de
+texto), no sobre el HTML entero.
+
+Uso:
+    doc = bulletin_doc(html)          # memoizado: el mismo HTML → el mismo árbol
+    ids = doc.find_all(r'/jobs/view/(\\d+)')
+    titles = doc.leaf_texts('span', class_contains='job-title', min_len=5, max_len=100)
+    chunk = doc.context(job_id)       # contenedor del job en el DOM
+    cleaned = doc.clean_html()        # sin script/style/img, para el LLM
+
+Benchmark: py scripts/diagnostics/bench_bulletin_parsers.py
+"""
+
+import copy
+import html as html_lib
+import re
+from functools import cached_property, lru_cache
+from typing import Iterable, List, Optional, Tuple
+
+import lxml.html
+from lxml import etree
+
+URL_IN_TEXT = re.compile(r'https?://[^\s<>"]+')
+# Bloques <!--[if mso]>...<![endif]-->: botones VML, logos, a veces el link al job
+MSO_COMMENT = re.compile(r'<!--\[if[^\]]*\]>(.*?)<!\[endif\]-->', re.S | re.I)
+# Contexto por defecto alrededor de un job (mismo orden que el recorte viejo de ±1000 chars)
+CONTEXT_SIZE = 1000
+
+_PARSER = lxml.html.HTMLParser(encoding='utf-8', remove_comments=True)
+_XPATHS = {
+    'urls': etree.XPath(
+        '//@href | //@src | //@background | //@content | //text()[contains(., "http")]'
+    ),
+    'text': etree.XPath('//text()[normalize-space()]'),
+    'leaves': etree.XPath('//*[not(*)][normalize-space(text())]'),
+    'anchors': etree.XPath('//a[@href]'),
+}
+
+
+class BulletinDoc:
+    """HTML de un email parseado una vez, con índices (perezosos) para los extractores."""
+
+    def __init__(self, html: str):
+        self.html = html or ""
+        self.root = None
+        if self.html.strip():
+            try:
+                # bytes + encoding explícito: lxml rechaza str con <?xml encoding=...?>
+                self.root = lxml.html.document_fromstring(self.html.encode('utf-8', 'replace'), parser=_PARSER)
+            except (etree.ParserError, ValueError):
+                self.root = None
+        self._clean: Optional[str] = None
+
+    # Cada índice es una sola consulta XPath (en C) y se arma la primera vez
+    # que algún extractor lo pide: Indeed solo paga las URLs, LinkedIn además
+    # los nodos de texto, etc.
+    def _xpath(self, query: str) -> list:
+        return _XPATHS[query](self.root) if self.root is not None else []
+
+    @cached_property
+    def _url_nodes(self) -> list:
+        """Atributos URL y nodos de texto con 'http', en orden del documento."""
+        return self._xpath('urls')
+
+    @cached_property
+    def urls(self) -> List[str]:
+        out: List[str] = []
+        for node in self._url_nodes:
+            if node.is_attribute:
+                if node.startswith(('http://', 'https://')):
+                    out.append(str(node))
+            else:
+                out.extend(URL_IN_TEXT.findall(node))
+        # Comentarios condicionales: una regex sobre el HTML crudo (solo si hay)
+        if '<!--[if' in self.html:
+            for block in MSO_COMMENT.findall(self.html):
+                out.extend(URL_IN_TEXT.findall(html_lib.unescape(block)))
+        return out
+
+    @cached_property
+    def _url_elements(self) -> List[Tuple[str, object]]:
+        return [(str(node), node.getparent()) for node in self._url_nodes
+                if node.is_attribute and node.startswith(('http://', 'https://'))]
+
+    @cached_property
+    def text_nodes(self) -> List[str]:
+        """Texto entre tags (el.text / el.tail) no vacío, sin normalizar."""
+        return [str(t) for t in self._xpath('text')]
+
+    @cached_property
+    def leaves(self) -> List[Tuple[str, str, str, str]]:
+        """Elementos sin hijos con texto: (tag, class, style, texto)."""
+        return [(el.tag, el.get('class') or '', el.get('style') or '', el.text)
+                for el in self._xpath('leaves') if el.text]
+
+    @cached_property
+    def anchors(self) -> list:
+        return self._xpath('anchors')
+
+    # ------------------------------------------------------------------
+    # Consultas
+    # ------------------------------------------------------------------
+    def find_all(self, pattern, flags: int = 0) -> List[str]:
+        """re.findall sobre cada URL del documento (en orden), concatenado."""
+        regex = re.compile(pattern, flags) if isinstance(pattern, str) else pattern
+        found: List[str] = []
+        for url in self.urls:
+            found.extend(regex.findall(url))
+        return found
+
+    def urls_text(self) -> str:
+        """Todas las URLs, una por línea (para regex pensadas sobre texto libre)."""
+        return "\n".join(self.urls)
+
+    def leaf_texts(self, tag: Optional[str] = None, class_contains: Optional[str] = None,
+                   style: Optional[str] = None, min_len: int = 1, max_len: int = 10_000) -> List[str]:
+        """
+        Texto de los elementos sin hijos que cumplen el filtro, en orden del
+        documento (equivale a <tag class="...x...">([^<]{min,max})</tag>).
+        """
+        out = []
+        for el_tag, el_class, el_style, text in self.leaves:
+            if tag and el_tag != tag:
+                continue
+            if class_contains and class_contains.lower() not in el_class.lower():
+                continue
+            if style is not None and el_style != style:
+                continue
+            if min_len <= len(text) <= max_len:
+                out.append(text)
+        return out
+
+    def anchor_texts(self, href_pattern, min_len: int = 1, max_len: int = 10_000) -> List[str]:
+        """Texto de los <a> sin hijos cuyo href matchea href_pattern."""
+        regex = re.compile(href_pattern, re.IGNORECASE) if isinstance(href_pattern, str) else href_pattern
+        return [
+            a.text for a in self.anchors
+            if len(a) == 0 and a.text and min_len <= len(a.text) <= max_len and regex.search(a.get('href'))
+        ]
+
+    def anchors_matching(self, href_pattern) -> List:
+        regex = re.compile(href_pattern) if isinstance(href_pattern, str) else href_pattern
+        return [a for a in self.anchors if regex.search(a.get('href'))]
+
+    def matching_text_nodes(self, pattern) -> List[str]:
+        """Nodos de texto completos que hacen fullmatch con pattern."""
+        regex = re.compile(pattern) if isinstance(pattern, str) else pattern
+        return [t for t in self.text_nodes if regex.fullmatch(t)]
+
+    def context(self, needle: str, size: int = CONTEXT_SIZE,
+                prefer: Iterable[str] = ()) -> str:
+        """
+        HTML del contenedor del job: el elemento cuya URL trae `needle`
+        (primero las que contienen alguno de `prefer`), subiendo por sus
+        ancestros mientras el HTML serializado quepa en 2*size. Si el
+        needle no está en ninguna URL, recorte crudo de ±size caracteres.
+        """
+        if self.root is not None:
+            candidates = [el for url, el in self._url_elements if needle in url]
+            for marker in prefer:
+                preferred = [el for url, el in self._url_elements if needle in url and marker in url]
+                if preferred:
+                    candidates = preferred
+                    break
+            if candidates:
+                best = ""
+                el = candidates[0]
+                while el is not None:
+                    chunk = etree.tostring(el, encoding='unicode', with_tail=False)
+                    if len(chunk) > 2 * size:
+                        break
+                    best = chunk
+                    el = el.getparent()
+                if best:
+                    return best
+
+        idx = self.html.find(needle)
+        if idx == -1:
+            return ""
+        return self.html[max(0, idx - size):idx + size]
+
+    def clean_html(self) -> str:
+        """HTML sin script/style/img (para el LLM). El árbol compartido no se toca."""
+        if self._clean is None:
+            if self.root is None:
+                self._clean = self.html
+            else:
+                body = self.root.find('body')
+                tree = copy.deepcopy(body if body is not None else self.root)
+                etree.strip_elements(tree, 'script', 'style', 'img', with_tail=False)
+                self._clean = etree.tostring(tree, encoding='unicode', method='html')
+        return self._clean
+
+
+@lru_cache(maxsize=8)
+def bulletin_doc(html: str) -> BulletinDoc:
+    """BulletinDoc memoizado: todos los extractores del mismo email comparten el árbol."""
+    return BulletinDoc(html)
@@ -8,23 +8,35 @@ Lógica:
   - FIT 7     → CV base (CV_Marcos_Alvarado_2026.pdf)
   - FIT < 7   → No debería llegar aquí (autoapply ya filtra por min_fit=7)
 
-Cache:
-  - data/cv/generated/{job_id}.pdf
-  - Si ya existe → retorna inmediatamente sin llamar a LLM ni Playwright
-  - Cache manual: borra el archivo para forzar regeneración
+Cache (core/utils/cv_cache.py):
+  - llave = (job_key canónico, hash de lo que ve el prompt de tailoring,
+    versión del perfil + template)
+  - el mismo posting desde otra pestaña / otra URL de tracking → hit, sin LLM
+  - editar data/cv_profile.json o el template invalida todo solo
+  - PDFs deduplicados por HTML, con límite de tamaño (CV_CACHE_MAX_MB)
+  - py core/automation/cv_customizer.py --stats  → hits/misses y MB en disco
 
 Uso:
   from core.automation.cv_customizer import get_cv_for_job
 
   # job dict con claves: job_id/ID, FitScore, Company, Role, Description
   cv_path = get_cv_for_job(job)
-  # → Path al PDF a usar para esta aplicación
+  # → Path al PDF a usar para esta aplicación (CV_Marcos_Alvarado_<Empresa>.pdf;
+  #   el blob con nombre de hash queda en data/cv/generated/ para dedup)
+
+Pre-generación en lote (antes de una corrida de apply, así ninguna
+aplicación espera al LLM ni a Chromium):
+  py core/automation/cv_customizer.py --pregenerate --tab linkedin --min-fit 8
+  # LLM en CV_PREGEN_LLM_WORKERS threads, PDFs en paralelo en el servicio
+  # de render (core/utils/pdf_renderer.py, un solo Chromium tibio)
 """
 
 import json
 import logging
+import os
 import re
 import sys
+from concurrent.futures import ThreadPoolExecutor
 from pathlib import Path
 
 # ── Paths ──────────────────────────────────────────────────────────────────────
@@ -34,8 +46,14 @@ _CACHE_DIR = _ROOT / "data" / "cv" / "generated"
 
 sys.path.insert(0, str(_ROOT))
 
+from core.sheets.job_index import job_key
+from core.utils.cv_cache import get_cv_cache
+
 log = logging.getLogger("cv_customizer")
 
+# Personalizaciones LLM simultáneas en la pre-generación en lote
+PREGEN_LLM_WORKERS = int(os.getenv("CV_PREGEN_LLM_WORKERS", "2"))
+
 # ── Lazy imports (evita cargar Playwright/requests si no se necesitan) ─────────
 _profile_cache: dict | None = None
 _salary_cache:  dict | None = None
@@ -110,10 +128,43 @@ Responde SOLO el JSON, sin texto adicional:
         return {}
 
 
-def _generate_custom_cv(job: dict, output_path: Path) -> bool:
+def _tailor_inputs(job: dict) -> tuple:
+    """Lo que ve el prompt de _tailor_with_multibackend (misma lectura de campos)."""
+    return (
+        str(job.get("Company", job.get("company", "la empresa"))),
+        str(job.get("Role",    job.get("role",    "el puesto"))),
+        (job.get("Description", job.get("description", "")) or "")[:800],
+        str(job.get("FitScore", job.get("fit", ""))),
+    )
+
+
+def _canonical_key(job: dict) -> str:
+    """job_key de la URL; sin URL, el ID del Sheet o empresa + puesto (nunca _row, que se corre)."""
+    url = job.get("ApplyURL") or job.get("url") or job.get("URL") or ""
+    key = job_key(url)
+    if key:
+        return key
+    job_id = str(job.get("job_id") or job.get("ID") or job.get("Job_ID") or "").strip()
+    if job_id:
+        return f"id:{job_id}"
+    company, role, _, _ = _tailor_inputs(job)
+    return f"name:{company.strip().lower()}|{role.strip().lower()}"
+
+
+def _cache_keys(job: dict) -> tuple:
+    """(job_key, inputs_hash, versión del perfil) para el cache de CVs."""
+    from scripts.apply.cv_generator import profile_version, template_version
+
+    profile, salary = _get_profile_and_salary()
+    cache = get_cv_cache()
+    version = cache.content_hash(profile_version(profile, salary), template_version())
+    return _canonical_key(job), cache.content_hash(*_tailor_inputs(job)), version
+
+
+def _generate_custom_cv(job: dict, keys: tuple) -> Path | None:
     """
-    Genera PDF personalizado para el job.
-    Retorna True si OK, False si falla (en ese caso usar CV base).
+    Genera (o reusa, si el HTML ya se renderizó) el PDF personalizado del job
+    y lo registra en el cache. None si falla (en ese caso usar CV base).
     """
     try:
         from scripts.apply.cv_generator import build_html, generate_pdf
@@ -122,13 +173,19 @@ def _generate_custom_cv(job: dict, output_path: Path) -> bool:
         tailored = _tailor_with_multibackend(profile, job)
         html     = build_html(profile, job, tailored, salary)
 
-        _CACHE_DIR.mkdir(parents=True, exist_ok=True)
-        ok = generate_pdf(html, output_path)
-        return ok
+        cache = get_cv_cache()
+        html_hash = cache.content_hash(html)
+        if cache.blob(html_hash) is None:
+            cache.blob_dir.mkdir(parents=True, exist_ok=True)
+            if not generate_pdf(html, cache.blob_path(html_hash)):
+                return None
+        else:
+            log.info("[CV] Mismo HTML ya renderizado → PDF reusado")
+        return cache.put(*keys, html_hash)
 
     except Exception as e:
         log.error(f"[CV] Error generando PDF: {e}")
-        return False
+        return None
 
 
 def get_cv_for_job(job: dict, fit_threshold: float = 8.0) -> Path:
@@ -137,85 +194,185 @@ def get_cv_for_job(job: dict, fit_threshold: float = 8.0) -> Path:
 
     Args:
         job: dict con claves Company/company, Role/role, FitScore/fit,
-             Description/description, y job_id / ID / _row como clave de cache
+             Description/description y ApplyURL (llave canónica del cache)
         fit_threshold: FIT mínimo para generar CV personalizado (default 8.0)
 
     Returns:
         Path al PDF existente (nunca None — fallback a CV base si algo falla)
     """
-    # ── Resolver FIT score ──────────────────────────────────────────────────
-    try:
-        fit = float(str(job.get("FitScore", job.get("fit", 0))).split("/")[0])
-    except (ValueError, TypeError):
-        fit = 0.0
+    fit = _job_fit(job)
 
     # ── FIT < threshold → CV base ───────────────────────────────────────────
     if fit < fit_threshold:
         log.info(f"[CV] FIT {fit:.1f} < {fit_threshold} → CV base")
         return _BASE_CV if _BASE_CV.exists() else Path(str(_BASE_CV))
 
-    # ── Resolver job_id para cache ──────────────────────────────────────────
-    job_id = str(
-        job.get("job_id") or
-        job.get("ID")     or
-        job.get("Job_ID") or
-        job.get("_row")   or
-        "unknown"
-    ).strip()
-
-    # Extraer ID numérico de URL de LinkedIn si está en ApplyURL
-    if job_id in ("unknown", "0", "") and job.get("ApplyURL"):
-        m = re.search(r'/jobs/view/(\d+)', job.get("ApplyURL", ""))
-        if m:
-            job_id = m.group(1)
-
-    company = re.sub(r"[^\w]", "", str(job.get("Company", job.get("company", "co"))).replace(" ", "_"))[:20]
-    role    = re.sub(r"[^\w]", "", str(job.get("Role",    job.get("role",    "pm"))).replace(" ", "_"))[:15]
-    cache_name = f"{job_id}_{company}_{role}.pdf"
-    cache_path = _CACHE_DIR / cache_name
+    try:
+        keys = _cache_keys(job)
+    except Exception as e:
+        log.warning(f"[CV] Perfil no disponible ({e}) — usando CV base")
+        return _BASE_CV
 
     # ── Cache hit → retornar inmediatamente ────────────────────────────────
-    if cache_path.exists():
-        log.info(f"[CV] Cache hit → {cache_path.name}")
-        return cache_path
+    cache = get_cv_cache()
+    cached = cache.get(*keys)
+    if cached is not None:
+        log.info(f"[CV] Cache hit → {cached.name} ({keys[0]})")
+        return cache.named(cached, _upload_name(job))
 
     # ── Cache miss → generar CV personalizado ──────────────────────────────
     log.info(f"[CV] FIT {fit:.1f} >= {fit_threshold} → generando CV personalizado para "
              f"{job.get('Company', '?')} — {job.get('Role', '?')}")
 
-    ok = _generate_custom_cv(job, cache_path)
-    if ok and cache_path.exists():
-        log.info(f"[CV] ✓ CV generado: {cache_path.name} ({cache_path.stat().st_size // 1024}KB)")
-        return cache_path
+    path = _generate_custom_cv(job, keys)
+    if path is not None and path.exists():
+        log.info(f"[CV] ✓ CV generado: {path.name} ({path.stat().st_size // 1024}KB)")
+        return cache.named(path, _upload_name(job))
 
     # ── Fallback a CV base si algo falló ───────────────────────────────────
     log.warning("[CV] Generación falló — usando CV base como fallback")
     return _BASE_CV
 
 
+def _upload_name(job: dict) -> str:
+    """Nombre con el que el reclutador recibe el PDF: CV_Marcos_Alvarado_<Empresa>.pdf."""
+    base = _BASE_CV.stem.rsplit("_", 1)[0]          # CV_Marcos_Alvarado
+    company = re.sub(r"[^\w]", "", str(job.get("Company", job.get("company", ""))).replace(" ", "_"))[:40]
+    return f"{base}_{company}.pdf" if company else f"{base}.pdf"
+
+
+def _job_fit(job: dict) -> float:
+    """FIT score del job ("8", "8/10", 8.5); 0 si no se puede leer."""
+    try:
+        return float(str(job.get("FitScore", job.get("fit", 0))).split("/")[0])
+    except (ValueError, TypeError):
+        return 0.0
+
+
+def pregenerate_cvs(jobs: list[dict], fit_threshold: float = 8.0,
+                    llm_workers: int = PREGEN_LLM_WORKERS) -> dict:
+    """
+    Genera en lote los CVs personalizados que get_cv_for_job pediría para
+    estos jobs (FIT >= fit_threshold y sin cache). La personalización LLM
+    corre en `llm_workers` threads; cada HTML listo se encola en el servicio
+    de render, que imprime varios PDFs en paralelo mientras el LLM sigue
+    con los siguientes. Jobs con la misma llave (mismo posting en dos
+    pestañas) se personalizan una vez; HTML idénticos se renderizan una vez.
+
+    Returns: {"generated": n, "cached": n, "failed": n, "skipped": n}
+    """
+    from scripts.apply.cv_generator import build_html
+    from core.utils.pdf_renderer import get_pdf_service
+
+    counts = {"generated": 0, "cached": 0, "failed": 0, "skipped": 0}
+    cache = get_cv_cache()
+    todo: dict[tuple, dict] = {}
+    for job in jobs:
+        if _job_fit(job) < fit_threshold:
+            counts["skipped"] += 1
+            continue
+        keys = _cache_keys(job)
+        if keys in todo or cache.get(*keys) is not None:
+            counts["cached"] += 1
+        else:
+            todo[keys] = job
+    if not todo:
+        return counts
+
+    profile, salary = _get_profile_and_salary()
+    service = get_pdf_service()
+    cache.blob_dir.mkdir(parents=True, exist_ok=True)
+    renders: dict[str, object] = {}       # html_hash → Future (un render por HTML)
+
+    def tailor_and_queue(item):
+        keys, job = item
+        tailored = _tailor_with_multibackend(profile, job)
+        html = build_html(profile, job, tailored, salary)
+        html_hash = cache.content_hash(html)
+        if html_hash not in renders and cache.blob(html_hash) is None:
+            renders[html_hash] = service.submit(html, cache.blob_path(html_hash))
+        return keys, html_hash
+
+    with ThreadPoolExecutor(max_workers=max(1, llm_workers)) as pool:
+        done = list(pool.map(tailor_and_queue, todo.items()))
+
+    for keys, html_hash in done:
+        future = renders.get(html_hash)
+        try:
+            ok = future.result() if future is not None else True
+        except Exception as e:
+            log.error(f"[CV] Render falló ({keys[0]}): {e}")
+            ok = False
+        if ok and cache.put(*keys, html_hash).exists():
+            counts["generated"] += 1
+        else:
+            counts["failed"] += 1
+    log.info(f"[CV] Pre-generación: {counts}")
+    return counts
+
+
+def eligible_sheet_jobs(tab: str = "linkedin", min_fit: float = 8.0) -> list[dict]:
+    """Filas del Sheet con FIT >= min_fit que todavía no se aplicaron/descartaron."""
+    from core.sheets.sheet_manager import SheetManager
+
+    jobs = []
+    for job in SheetManager().get_all_jobs(tab=tab.lower()):
+        status = str(job.get("Status", "")).lower()
+        if any(w in status for w in ("applied", "rejected", "revision", "skip", "expired")):
+            continue
+        if _job_fit(job) >= min_fit and job.get("ApplyURL"):
+            jobs.append(job)
+    return jobs
+
+
 def clear_cv_cache(job_id: str | None = None):
     """
     Limpia el cache de CVs generados.
-    Si job_id es None, borra todos. Útil al actualizar el CV base.
+    Si job_id es None, borra todos. Con job_id ("4404879580" o
+    "linkedin:4404879580") borra solo ese job. Editar el perfil ya no
+    requiere limpiar a mano: cambia la versión y el cache se invalida solo.
     """
-    _CACHE_DIR.mkdir(parents=True, exist_ok=True)
+    cache = get_cv_cache()
+    # PDFs del cache anterior ({job_id}_{company}_{role}.pdf; los blobs nuevos no llevan "_")
+    for f in _CACHE_DIR.glob(f"{job_id}_*.pdf" if job_id else "*_*.pdf"):
+        f.unlink(missing_ok=True)
     if job_id:
-        for f in _CACHE_DIR.glob(f"{job_id}_*.pdf"):
-            f.unlink()
-            log.info(f"[CV] Cache borrado: {f.name}")
+        count = cache.forget(str(job_id))
+        log.info(f"[CV] Cache borrado: {count} entradas de {job_id}")
     else:
-        count = 0
-        for f in _CACHE_DIR.glob("*.pdf"):
-            f.unlink()
-            count += 1
-        log.info(f"[CV] Cache limpiado: {count} archivos borrados")
+        count = cache.clear()
+        log.info(f"[CV] Cache limpiado: {count} PDFs borrados")
 
 
 if __name__ == "__main__":
-    # Test rápido
-    import logging
+    import argparse
+    import time
+
     logging.basicConfig(level=logging.INFO, format="%(asctime)s [%(levelname)s] %(message)s")
 
+    parser = argparse.ArgumentParser(description="CV personalizado por vacante")
+    parser.add_argument("--pregenerate", action="store_true",
+                        help="Genera en lote los CVs de todos los jobs elegibles del Sheet")
+    parser.add_argument("--tab", default="linkedin", help="Tab del Sheet (default: linkedin)")
+    parser.add_argument("--min-fit", type=float, default=8.0, help="FIT mínimo (default: 8)")
+    parser.add_argument("--stats", action="store_true", help="Estadísticas del cache de CVs")
+    args = parser.parse_args()
+
+    if args.stats:
+        get_cv_cache().print_stats()
+        sys.exit(0)
+
+    if args.pregenerate:
+        started = time.time()
+        jobs = eligible_sheet_jobs(args.tab, args.min_fit)
+        print(f"📄 {len(jobs)} jobs elegibles en '{args.tab}' (FIT >= {args.min_fit})")
+        counts = pregenerate_cvs(jobs, fit_threshold=args.min_fit)
+        print(f"✅ Generados: {counts['generated']} | En cache: {counts['cached']} | "
+              f"Fallidos: {counts['failed']} ({time.time() - started:.0f}s)")
+        get_cv_cache().print_stats()
+        sys.exit(0)
+
+    # Test rápido
     test_job = {
         "job_id":      "test_4404879580",
         "Company":     "Murmuration",
@@ -20,11 +20,11 @@ from pathlib import Path
 from typing import List, Dict
 from datetime import datetime, timedelta
 from dotenv import load_dotenv
-from googleapiclient.discovery import build
 from google.oauth2.credentials import Credentials
 
 sys.path.append(str(Path(__file__).parent.parent.parent))
 from core.sheets.sheet_manager import SheetManager
+from core.utils.google_clients import build_service
 
 load_dotenv()
 
@@ -44,7 +44,7 @@ class GmailStatusUpdater:
             raise FileNotFoundError(f"OAuth token not found: {token_path}")
         
         creds = Credentials.from_authorized_user_file(token_path, SCOPES)
-        self.gmail_service = build('gmail', 'v1', credentials=creds)
+        self.gmail_service = build_service('gmail', 'v1', creds)
         
         # Status detection patterns
         self.patterns = {
@@ -24,12 +24,12 @@ import os
 from typing import List, Dict, Optional
 from datetime import datetime
 from dotenv import load_dotenv
-from bs4 import BeautifulSoup
 
 from google.oauth2.credentials import Credentials
 from google_auth_oauthlib.flow import InstalledAppFlow
 from google.auth.transport.requests import Request
-from googleapiclient.discovery import build
+from core.utils.google_clients import build_service
+from core.automation.bulletin_html import bulletin_doc
 import base64
 
 # Load environment
@@ -46,13 +46,25 @@ SALARY_THRESHOLDS = {
     "excellent": 80000           # Bonus +1
 }
 
+def _find_container(el):
+    """Primer ancestro td/div/table del elemento (None si no hay)."""
+    for parent in el.iterancestors('td', 'div', 'table'):
+        return parent
+    return None
+
+
+def _stripped_text(el) -> str:
+    """Equivalente a BeautifulSoup get_text(strip=True)."""
+    return "".join(piece.strip() for piece in el.itertext())
+
+
 class ImprovedBulletinProcessor:
     """Processes job bulletin emails with multiple listings"""
     
     def __init__(self):
         self.credentials = self._get_credentials()
-        self.gmail_service = build('gmail', 'v1', credentials=self.credentials)
-        self.sheets_service = build('sheets', 'v4', credentials=self.credentials)
+        self.gmail_service = build_service('gmail', 'v1', self.credentials)
+        self.sheets_service = build_service('sheets', 'v4', self.credentials)
         self.sheet_id = os.getenv('GOOGLE_SHEETS_ID')
         
         # Processed cache
@@ -99,35 +111,37 @@ class ImprovedBulletinProcessor:
         - url
         """
         jobs = []
-        soup = BeautifulSoup(html_content, 'html.parser')
+        # Árbol lxml compartido con el resto de extractores del mismo email
+        doc = bulletin_doc(html_content)
         
         # Find all job containers (Glassdoor specific structure)
         # Pattern: Jobs are typically in <table> or <div> with specific classes
         
         # Method 1: Find by link patterns
-        job_links = soup.find_all('a', href=re.compile(r'glassdoor\.com/job-listing'))
+        job_links = doc.anchors_matching(r'glassdoor\.com/job-listing')
         
         for link in job_links:
             job_url = link.get('href', '')
             
             # Find parent container
-            container = link.find_parent(['td', 'div', 'table'])
-            if not container:
+            container = _find_container(link)
+            if container is None:
                 continue
             
             # Extract title (usually in the link text or nearby)
-            title = link.get_text(strip=True)
+            title = _stripped_text(link)
             if not title or len(title) < 5:
                 continue
             
             # Extract company (usually near the title)
-            company = self._find_nearby_text(container, title, max_distance=2)
+            container_text = container.text_content()
+            company = self._find_nearby_text(container_text, title, max_distance=2)
             
             # Extract location
-            location = self._extract_location(container.get_text())
+            location = self._extract_location(container_text)
             
             # Extract salary (if present)
-            salary_text = self._extract_salary(container.get_text())
+            salary_text = self._extract_salary(container_text)
             salary_amount = self._parse_salary(salary_text) if salary_text else None
             
             # Pre-filter by salary
@@ -157,10 +171,10 @@ class ImprovedBulletinProcessor:
     def extract_linkedin_jobs(self, html_content: str) -> List[Dict]:
         """Extract jobs from LinkedIn bulletin email"""
         jobs = []
-        soup = BeautifulSoup(html_content, 'html.parser')
+        doc = bulletin_doc(html_content)
         
         # LinkedIn job links
-        job_links = soup.find_all('a', href=re.compile(r'linkedin\.com/jobs/view/\d+'))
+        job_links = doc.anchors_matching(r'linkedin\.com/jobs/view/\d+')
         
         for link in job_links:
             job_url = link.get('href', '')
@@ -170,16 +184,16 @@ class ImprovedBulletinProcessor:
             job_id = job_id_match.group(1) if job_id_match else None
             
             # Find container
-            container = link.find_parent(['td', 'div', 'table'])
-            if not container:
+            container = _find_container(link)
+            if container is None:
                 continue
             
-            title = link.get_text(strip=True)
+            title = _stripped_text(link)
             if not title or len(title) < 5:
                 continue
             
             # LinkedIn structure usually has company and location nearby
-            text = container.get_text()
+            text = container.text_content()
             company = self._find_company_linkedin(text, title)
             location = self._extract_location(text)
             salary_text = self._extract_salary(text)
@@ -283,10 +297,9 @@ class ImprovedBulletinProcessor:
         
         return 3  # Other locations - LOW
     
-    def _find_nearby_text(self, container, anchor_text: str, max_distance: int = 2) -> Optional[str]:
-        """Find text near an anchor text within container"""
+    def _find_nearby_text(self, text: str, anchor_text: str, max_distance: int = 2) -> Optional[str]:
+        """Find text near an anchor text within the container text"""
         # Simplified - just get next text after anchor
-        text = container.get_text()
         idx = text.find(anchor_text)
         if idx == -1:
             return None
@@ -22,6 +22,9 @@ if sys.platform == "win32":
 
 import re
 import os
+import queue
+import threading
+from concurrent.futures import ThreadPoolExecutor
 from typing import List, Dict, Optional
 from datetime import datetime
 from dotenv import load_dotenv
@@ -29,13 +32,19 @@ from dotenv import load_dotenv
 from google.oauth2.credentials import Credentials
 from google_auth_oauthlib.flow import InstalledAppFlow
 from google.auth.transport.requests import Request
-from googleapiclient.discovery import build
+from core.utils.google_clients import acquire_quota, build_service, print_metrics
+from core.utils.gmail_sync import GmailSync
+from core.utils.llm_cache import print_cache_stats
+from core.utils.parse_cache import get_parse_cache
 import base64
+import time
 from email import policy
 from email.parser import BytesParser
 
 # Import AI Email Parser for intelligent HTML parsing
-from core.automation.ai_email_parser import AIEmailParser
+from core.automation.ai_email_parser import AIEmailParser, PROMPT_VERSION
+from core.automation.bulletin_html import bulletin_doc
+from core.sheets.job_index import JobIndex, job_key
 
 # Load environment
 load_dotenv()
@@ -47,27 +56,67 @@ SCOPES = [
     'https://www.googleapis.com/auth/spreadsheets'
 ]
 
+# Gmail recomienda <= 50 requests por batch HTTP
+GMAIL_BATCH_SIZE = 50
+# Mensajes descargados esperando parseo (acota memoria si el parseo va lento)
+FETCH_QUEUE_SIZE = 100
+_FETCH_DONE = object()
+
+# LinkedIn: job id en URLs directas, de email comms y de tracking
+LINKEDIN_ID_PATTERNS = [
+    re.compile(p, re.IGNORECASE) for p in (
+        r'https?://(?:www\.)?linkedin\.com/jobs/view/(\d+)',
+        r'https?://(?:www\.)?linkedin\.com/comm/jobs/view/(\d+)',
+        r'linkedin\.com[^"<\s]*jobId=(\d+)',
+        r'linkedin\.com[^"<\s]*job[_-]?id=(\d+)',
+        r'linkedin\.com[^"<\s]*currentJobId=(\d+)',
+    )
+]
+LINKEDIN_TRACKING_URL = re.compile(r'https?://(?:click\.email|emltrk|click)\.linkedin\.com/[^\s"<>]+')
+LINKEDIN_KEYWORD_TITLE = re.compile(
+    r'[^<]{5,80}(?:Manager|Director|Lead|Analyst|Consultant|Engineer|Owner|Scrum|Agile|ERP|ETL|BI)[^<]{0,30}',
+    re.IGNORECASE,
+)
+
+# Versión de cada parser de boletín: subirla invalida solo SUS resultados en
+# data/state/bulletin_parse.db (los que usan AIEmailParser siguen su PROMPT_VERSION)
+PARSER_VERSIONS = {
+    'user_urls': 'v3',
+    'linkedin': 'v3',
+    'indeed': 'v3',
+    'glassdoor': f'v3-ai{PROMPT_VERSION}',
+    'adzuna': f'ai{PROMPT_VERSION}',
+    'computrabajo': f'ai{PROMPT_VERSION}',
+    'jobleads': f'ai{PROMPT_VERSION}',
+}
+
 class JobBulletinProcessor:
     """Processes job bulletin emails with multiple listings"""
     
     def __init__(self):
         self.credentials = self._get_credentials()
-        self.gmail_service = build('gmail', 'v1', credentials=self.credentials)
-        self.sheets_service = build('sheets', 'v4', credentials=self.credentials)
+        self.gmail_service = build_service('gmail', 'v1', self.credentials)
+        self.sheets_service = build_service('sheets', 'v4', self.credentials)
         self.sheet_id = os.getenv('GOOGLE_SHEETS_ID')
         
         # Initialize AI Email Parser for intelligent parsing
         self.ai_parser = AIEmailParser()
         
-        # Track processed emails
-        self.processed_cache_file = Path(__file__).parent.parent.parent / 'data' / 'state' / 'processed_bulletins.txt'
-        self.processed_cache_file.parent.mkdir(parents=True, exist_ok=True)
+        # Jobs ya extraídos por mensaje (reruns, --reprocess, debug)
+        self.parse_cache = get_parse_cache()
+        
+        # Track processed emails (historyId + store acotado en data/state/gmail_sync.db)
+        self.gmail_sync = GmailSync(self.gmail_service, scope='bulletins')
+        # Migración única del archivo viejo
+        self.gmail_sync.import_legacy(
+            Path(__file__).parent.parent.parent / 'data' / 'state' / 'processed_bulletins.txt'
+        )
         
         # Track emails to delete
         self.emails_to_delete = []
         
-        # ✅ NUEVO: Cache de URLs existentes (para evitar rate limit)
-        self.existing_urls_cache = {}
+        # Índice cross-tab de jobs conocidos (llave canónica por URL/job id)
+        self.job_index = JobIndex(self.sheet_id)
         
     def _get_credentials(self):
         """Get OAuth credentials"""
@@ -92,62 +141,33 @@ class JobBulletinProcessor:
         
         return creds
     
-    def get_processed_ids(self) -> set:
-        """Load processed bulletin IDs"""
-        if self.processed_cache_file.exists():
-            with open(self.processed_cache_file, 'r') as f:
-                return set(line.strip() for line in f)
-        return set()
-    
     def save_processed_id(self, email_id: str):
         """Save processed bulletin ID"""
-        with open(self.processed_cache_file, 'a') as f:
-            f.write(f"{email_id}\n")
+        self.gmail_sync.mark_processed(email_id)
     
-    def load_existing_urls(self, tab_name: str):
+    def load_existing_urls(self):
         """
-        Carga TODAS las URLs existentes en el sheet UNA SOLA VEZ
-        
-        Args:
-            tab_name: Nombre de la pestaña
+        Reconcilia el índice de jobs conocidos contra TODAS las pestañas del sheet.
+        Solo pega al API si el índice local está vencido.
         """
-        if tab_name in self.existing_urls_cache:
-            return  # Ya está cargado
-        
         try:
-            result = self.sheets_service.spreadsheets().values().get(
-                spreadsheetId=self.sheet_id,
-                range=f"{tab_name}!F:F"  # Columna F = ApplyURL
-            ).execute()
-            
-            values = result.get('values', [])
-            
-            # Convertir a set para búsqueda rápida
-            self.existing_urls_cache[tab_name] = {row[0] for row in values if row}
-            
-            print(f"   📋 Loaded {len(self.existing_urls_cache[tab_name])} existing URLs from {tab_name}")
-            
+            self.job_index.load(self.sheets_service, self.sheet_id)
         except Exception as e:
             print(f"   ⚠️  Error loading URLs: {e}")
-            self.existing_urls_cache[tab_name] = set()
     
-    def check_job_exists_in_sheet(self, job_url: str, tab_name: str) -> bool:
+    def check_job_exists_in_sheet(self, job_url: str) -> bool:
         """
-        Verifica si un job ya existe en el sheet comparando ApplyURL
-        USA CACHE LOCAL para evitar rate limits
+        Verifica si un job ya existe en cualquier pestaña del sheet.
+        Compara la llave canónica (LinkedIn currentJobId, Glassdoor jl=,
+        Indeed jk=, o URL sin tracking params) — no hace llamadas al API.
         
         Args:
             job_url: URL del job a verificar
-            tab_name: Nombre de la pestaña
         
         Returns:
             True si el job ya existe, False si es nuevo
         """
-        # Verificar contra cache (no API)
-        if tab_name not in self.existing_urls_cache:
-            return False  # Si no hay cache, asumir que es nuevo
-        
-        return job_url in self.existing_urls_cache[tab_name]
+        return self.job_index.is_known(job_url)
     
     def get_email_age_days(self, message: dict) -> int:
         """
@@ -220,73 +240,48 @@ class JobBulletinProcessor:
           - emltrk.com/...               (tracking alternativo)
         """
         jobs = []
+        # Un solo parseo del email; las regex corren sobre URLs y nodos de texto
+        doc = bulletin_doc(html_content)
 
         # ── STEP 1: Extraer todas las URLs candidatas de LinkedIn ──────────
-        url_patterns = [
-            # Directo (el más común en navegador)
-            r'https?://(?:www\.)?linkedin\.com/jobs/view/(\d+)',
-            # Via email comms relay
-            r'https?://(?:www\.)?linkedin\.com/comm/jobs/view/(\d+)',
-            # Tracking URL con job_id en parámetro
-            r'linkedin\.com[^"<\s]*jobId=(\d+)',
-            r'linkedin\.com[^"<\s]*job[_-]?id=(\d+)',
-            r'linkedin\.com[^"<\s]*currentJobId=(\d+)',
-        ]
-
         job_ids = []
         seen_ids = set()
-        for pattern in url_patterns:
-            for match in re.finditer(pattern, html_content, re.IGNORECASE):
-                jid = match.group(1)
+        for pattern in LINKEDIN_ID_PATTERNS:
+            for jid in doc.find_all(pattern):
                 if jid not in seen_ids:
                     seen_ids.add(jid)
                     job_ids.append(jid)
 
         # También capturar URLs de tracking completas (para resolverlas luego)
-        tracking_url_pattern = r'https?://(?:click\.email|emltrk|click)\.linkedin\.com/[^\s"<>]+'
-        tracking_urls = re.findall(tracking_url_pattern, html_content)
+        tracking_urls = doc.find_all(LINKEDIN_TRACKING_URL)
 
         # ── STEP 2: Extraer título, empresa, ubicación ─────────────────────
-        # Múltiples formatos que LinkedIn ha usado históricamente
-        title_patterns = [
+        # Múltiples formatos que LinkedIn ha usado históricamente (orden = prioridad)
+        candidates = (
             # Formato 2024-2025
-            r'<span[^>]*class="[^"]*job-title[^"]*"[^>]*>([^<]{5,100})</span>',
-            r'<h3[^>]*>([^<]{5,100})</h3>',
+            doc.leaf_texts('span', class_contains='job-title', min_len=5, max_len=100)
+            + doc.leaf_texts('h3', min_len=5, max_len=100)
             # Links con título
-            r'<a[^>]*linkedin\.com/jobs/view/\d+[^>]*>([^<]{5,100})</a>',
-            r'<a[^>]*linkedin\.com/comm/jobs/view/\d+[^>]*>([^<]{5,100})</a>',
+            + doc.anchor_texts(r'linkedin\.com/(?:comm/)?jobs/view/\d+', min_len=5, max_len=100)
             # Texto plano con keywords de PM/BA/IT
-            r'>([^<]{5,80}(?:Manager|Director|Lead|Analyst|Consultant|Engineer|Owner|Scrum|Agile|ERP|ETL|BI)[^<]{0,30})<',
-        ]
+            + doc.matching_text_nodes(LINKEDIN_KEYWORD_TITLE)
+        )
 
         titles = []
         seen_titles = set()
-        for pattern in title_patterns:
-            for match in re.finditer(pattern, html_content, re.IGNORECASE):
-                t = match.group(1).strip()
-                # Limpiar HTML entities y espacios
-                t = re.sub(r'&[a-z]+;', ' ', t).strip()
-                t = re.sub(r'\s+', ' ', t)
-                if t and t not in seen_titles and len(t) > 4:
-                    seen_titles.add(t)
-                    titles.append(t)
+        for t in candidates:
+            # Limpiar espacios (lxml ya decodificó las entidades HTML)
+            t = ' '.join(t.split())
+            if t and t not in seen_titles and len(t) > 4:
+                seen_titles.add(t)
+                titles.append(t)
 
         # Empresas
-        company_patterns = [
-            r'<span[^>]*class="[^"]*company[^"]*"[^>]*>([^<]{2,80})</span>',
-            r'<p[^>]*class="[^"]*company[^"]*"[^>]*>([^<]{2,80})</p>',
-        ]
-        companies = []
-        for pattern in company_patterns:
-            companies.extend(re.findall(pattern, html_content, re.IGNORECASE))
+        companies = (doc.leaf_texts('span', class_contains='company', min_len=2, max_len=80)
+                     + doc.leaf_texts('p', class_contains='company', min_len=2, max_len=80))
 
         # Ubicaciones
-        location_patterns = [
-            r'<span[^>]*class="[^"]*location[^"]*"[^>]*>([^<]{2,80})</span>',
-        ]
-        locations = []
-        for pattern in location_patterns:
-            locations.extend(re.findall(pattern, html_content, re.IGNORECASE))
+        locations = doc.leaf_texts('span', class_contains='location', min_len=2, max_len=80)
 
         # ── STEP 3: Construir jobs combinando IDs + títulos ────────────────
         # Estrategia: primero por job_id (más fiable), luego llenar título
@@ -334,9 +329,8 @@ class JobBulletinProcessor:
         """Extract job listings from Indeed bulletin email"""
         jobs = []
         
-        # Indeed URLs
-        url_pattern = r'https://www\.indeed\.com[^\s"<>]+'
-        urls = re.findall(url_pattern, html_content)
+        # Indeed URLs (href ya decodificado: &amp; → &)
+        urls = bulletin_doc(html_content).find_all(r'https://www\.indeed\.com[^\s"<>]+')
         
         # Job titles from text (Indeed often has clean text format)
         # Pattern: Title followed by company
@@ -404,18 +398,19 @@ class JobBulletinProcessor:
         # FALLBACK: Original regex-based extraction (FRAGILE - breaks on format changes)
         try:
             job_ids = []
+            doc = bulletin_doc(html_content)
             
-            # Multiple URL extraction patterns
+            # Multiple URL extraction patterns (sobre las URLs del documento)
             patterns = [
                 r'https://www\.glassdoor\.com/job-listing/JL_(\d+)\.htm',  # Direct URL
-                r'jobAlertAlert&amp;utm_content=ja-jobpos\d+-(\d+)',        # Tracking pixel
+                r'jobAlertAlert&(?:amp;)?utm_content=ja-jobpos\d+-(\d+)',   # Tracking pixel
                 r'job_listing_id=(\d+)',                                     # Parameter
                 r'jobListingId%3D(\d+)',                                     # Encoded
-                r'glassdoor\.com/[^"]*?(\d{10,})'                           # Generic
+                r'glassdoor\.com/[^"\s]*?(\d{10,})'                         # Generic
             ]
             
             for pattern in patterns:
-                job_ids.extend(re.findall(pattern, html_content))
+                job_ids.extend(doc.find_all(pattern))
             
             # Remove duplicates while preserving order
             seen = set()
@@ -428,16 +423,14 @@ class JobBulletinProcessor:
             job_ids = unique_job_ids
             
             # Extract titles (OLD format - may not work with new emails)
-            title_pattern = r'<p style="font-size:14px;line-height:1\.4;margin:0;font-weight:600">([^<]+)</p>'
-            titles = re.findall(title_pattern, html_content)
+            titles = doc.leaf_texts('p', style="font-size:14px;line-height:1.4;margin:0;font-weight:600")
             
             # Extract companies
-            company_pattern = r'<p style="font-size:12px;line-height:1\.33;margin:0;font-weight:400;white-space:normal">([^<]+)</p>'
-            companies = re.findall(company_pattern, html_content)
+            companies = doc.leaf_texts('p', style="font-size:12px;line-height:1.33;margin:0;font-weight:400;white-space:normal")
             
             # Extract locations
-            location_pattern = r'<p style="font-size:12px;line-height:1\.33;margin:0;margin-top:4px">([^<$]+)</p>'
-            locations = re.findall(location_pattern, html_content)
+            locations = [t for t in doc.leaf_texts('p', style="font-size:12px;line-height:1.33;margin:0;margin-top:4px")
+                         if '$' not in t]
             
             # Build jobs from extracted data
             for i, title in enumerate(titles):
@@ -482,6 +475,9 @@ class JobBulletinProcessor:
             import traceback
             traceback.print_exc()
         
+        # Llegar aquí = el AI falló: el resultado del fallback no se cachea
+        for job in jobs:
+            job['_ai_failed'] = True
         return jobs
     
     def extract_user_jobs(self, text_content: str, html_content: str = "") -> List[Dict]:
@@ -496,8 +492,8 @@ class JobBulletinProcessor:
         jobs = []
         
         try:
-            # Combine text and HTML for better extraction
-            combined_content = text_content + "\n" + html_content
+            # Texto plano + URLs del HTML (ya parseado una vez, &amp; decodificado)
+            combined_content = text_content + "\n" + bulletin_doc(html_content).urls_text()
             
             # Comprehensive URL patterns
             patterns = {
@@ -649,7 +645,7 @@ class JobBulletinProcessor:
         
         if not headers:
             # Create headers if not exist
-            headers = list(jobs[0].keys())
+            headers = [k for k in jobs[0] if not k.startswith('_')]   # _ai_failed etc. no son columnas
             self.sheets_service.spreadsheets().values().update(
                 spreadsheetId=self.sheet_id,
                 range=f"{tab_name}!A1",
@@ -673,19 +669,180 @@ class JobBulletinProcessor:
                 body={'values': rows}
             ).execute()
             
-            # ✅ NUEVO: Actualizar cache con URLs guardadas
-            if tab_name not in self.existing_urls_cache:
-                self.existing_urls_cache[tab_name] = set()
-            
-            for job in jobs:
-                url = job.get('ApplyURL', '')
-                if url:
-                    self.existing_urls_cache[tab_name].add(url)
+            # Registrar en el índice para que el mismo job no entre por otra pestaña
+            self.job_index.add_many((job.get('ApplyURL', '') for job in jobs), tab_name)
         
         return len(rows)
     
-    def process_bulletins(self, max_emails: int = 50):
-        """Main processing function"""
+    def fetch_messages(self, msg_ids: List[str], out_queue: "queue.Queue"):
+        """
+        Productor: descarga los mensajes (format='raw') en batches HTTP de Gmail
+        y los va poniendo en out_queue como (msg_id, message) conforme llegan.
+        Un mensaje que no se pudo descargar se entrega como (msg_id, None).
+        Al terminar pone _FETCH_DONE.
+        """
+        try:
+            for start in range(0, len(msg_ids), GMAIL_BATCH_SIZE):
+                chunk = msg_ids[start:start + GMAIL_BATCH_SIZE]
+                delivered = set()
+
+                def on_message(request_id, response, exception):
+                    if exception is None:
+                        delivered.add(request_id)
+                        out_queue.put((request_id, response))
+
+                # Un batch = 1 HTTP call, pero Gmail cobra las unidades de cada get
+                acquire_quota('gmail', 5 * len(chunk))
+                batch = self.gmail_service.new_batch_http_request(callback=on_message)
+                for msg_id in chunk:
+                    batch.add(
+                        self.gmail_service.users().messages().get(userId='me', id=msg_id, format='raw'),
+                        request_id=msg_id,
+                    )
+                try:
+                    batch.execute()
+                except Exception as e:
+                    print(f"   ⚠️  Gmail batch error ({len(chunk)} msgs): {e}")
+
+                # Los que fallaron dentro del batch (429 típico) → uno por uno con backoff
+                for msg_id in chunk:
+                    if msg_id in delivered:
+                        continue
+                    try:
+                        message = self.gmail_service.users().messages().get(
+                            userId='me', id=msg_id, format='raw'
+                        ).execute()
+                        out_queue.put((msg_id, message))
+                    except Exception as e:
+                        print(f"   ⚠️  Error fetching {msg_id[:16]}: {e}")
+                        out_queue.put((msg_id, None))
+        finally:
+            out_queue.put(_FETCH_DONE)
+
+    def _extract_jobs(self, message: dict) -> tuple:
+        """Parsea un mensaje y extrae sus jobs. Devuelve (bulletin_type, jobs)."""
+        # Parse email
+        subject, sender, html_content, text_content = self.parse_email(message)
+        
+        # Detect bulletin type
+        bulletin_type = self.detect_bulletin_type(sender, subject)
+        
+        # ✅ NUEVO: Si está en JOBS/Inbound, SIEMPRE procesarlo como user_urls
+        # No importa el sender o subject, si está en esta carpeta es un job
+        if not bulletin_type:
+            # Asumir que es un email del usuario con URLs
+            bulletin_type = 'user_urls'
+            print(f"📨 Processing email as USER_URLS (default for JOBS/Inbound):")
+        else:
+            print(f"📨 Processing {bulletin_type.upper()} bulletin:")
+        
+        print(f"   Subject: {subject[:60]}...")
+        
+        # Resultado cacheado: mismo mensaje, mismo cuerpo, misma versión del parser
+        msg_id = message.get('id', '')
+        version = PARSER_VERSIONS.get(bulletin_type, 'v1')
+        body_hash = self.parse_cache.body_hash(html_content, text_content)
+        jobs = self.parse_cache.get(msg_id, bulletin_type, version, body_hash) if msg_id else None
+        if jobs is not None:
+            print(f"   💾 {len(jobs)} jobs from parse cache ({bulletin_type} {version})")
+            return bulletin_type, self._restamp(jobs)
+        
+        started = time.time()
+        jobs = self._run_parser(bulletin_type, html_content, text_content)
+        # Vacío puede ser un fallo (LLM caído, HTML raro) y los placeholders de
+        # un AI que no respondió (_ai_failed) también: no se cachean
+        if jobs and msg_id and not any(job.get('_ai_failed') for job in jobs):
+            self.parse_cache.put(msg_id, bulletin_type, version, body_hash, jobs,
+                                 elapsed=time.time() - started)
+        return bulletin_type, jobs
+
+    def _run_parser(self, bulletin_type: str, html_content: str, text_content: str) -> List[Dict]:
+        """Extrae los jobs con el parser del tipo de boletín."""
+        jobs = []
+        if bulletin_type == 'user_urls':
+            jobs = self.extract_user_jobs(text_content, html_content)
+        elif bulletin_type == 'linkedin':
+            jobs = self.extract_linkedin_jobs(html_content)
+        elif bulletin_type == 'indeed':
+            jobs = self.extract_indeed_jobs(html_content, text_content)
+        elif bulletin_type == 'glassdoor':
+            jobs = self.extract_glassdoor_jobs(html_content)
+        
+        elif bulletin_type == 'adzuna':
+            print("   🤖 Using AI parser for Adzuna bulletin...")
+            jobs = self.ai_parser.parse_generic_bulletin(html_content, source='Adzuna')
+        
+        elif bulletin_type == 'computrabajo':
+            print("   🤖 Using AI parser for Computrabajo bulletin...")
+            jobs = self.ai_parser.parse_generic_bulletin(html_content, source='Computrabajo')
+        
+        elif bulletin_type == 'jobleads':
+            print("   🤖 Using AI parser for JobLeads bulletin...")
+            jobs = self.ai_parser.parse_generic_bulletin(html_content, source='JobLeads')
+        
+        return jobs
+
+    @staticmethod
+    def _restamp(jobs: List[Dict]) -> List[Dict]:
+        """CreatedAt de un resultado cacheado = ahora (mismo formato que puso el parser)."""
+        now = datetime.now()
+        for job in jobs:
+            if 'CreatedAt' in job:
+                job['CreatedAt'] = (now.isoformat() if 'T' in str(job['CreatedAt'])
+                                    else now.strftime('%Y-%m-%d %H:%M:%S'))
+        return jobs
+
+    def _group_new_jobs(self, bulletin_type: str, jobs: List[Dict], seen_keys: set) -> Dict[str, List[Dict]]:
+        """
+        Agrupa jobs por pestaña destino y quita duplicados
+        (contra el índice del sheet y contra lo ya encolado en esta corrida).
+        """
+        TAB_NAMES = {
+            'linkedin': 'LinkedIn', 'indeed': 'Indeed',
+            'glassdoor': 'Glassdoor', 'adzuna': 'Adzuna',
+            'computrabajo': 'Computrabajo', 'jobleads': 'JobLeads'
+        }
+        by_tab: Dict[str, List[Dict]] = {}
+        for job in jobs:
+            if bulletin_type == 'user_urls':
+                # ✅ NUEVO: Para user_urls, separar por fuente y guardar en tabs correctos
+                # FIX: Map "Generic" and "Unknown" to "LinkedIn" (those tabs dont exist)
+                source = job.get('Source', 'Unknown')
+                tab_name = "LinkedIn" if source in ["Generic", "Unknown"] else source
+            else:
+                tab_name = TAB_NAMES.get(bulletin_type, bulletin_type.capitalize())
+            by_tab.setdefault(tab_name, [])
+
+            job_url = job.get('ApplyURL', '')
+            key = job_key(job_url)
+            if job_url and (key in seen_keys or self.check_job_exists_in_sheet(job_url)):
+                continue
+            if key:
+                seen_keys.add(key)
+            by_tab[tab_name].append(job)
+
+        for tab_name, tab_jobs in by_tab.items():
+            if not tab_jobs:
+                print(f"   ℹ️  No new jobs in {tab_name} (all were duplicates)")
+            else:
+                print(f"   💾 Queued {len(tab_jobs)} NEW jobs → {tab_name}")
+        return {tab: tab_jobs for tab, tab_jobs in by_tab.items() if tab_jobs}
+
+    def process_bulletins(self, max_emails: int = 50, full_resync: bool = False,
+                          reprocess: bool = False):
+        """
+        Main processing function.
+
+        Pipeline de 3 etapas que se solapan:
+          fetch  (thread)       — batches HTTP de Gmail → cola
+          parse  (main thread)  — extracción + dedup por mensaje
+          save   (thread)       — append a Sheets por pestaña
+
+        Solo se descargan los mensajes nuevos desde el último historyId
+        (o pendientes de una corrida fallida). full_resync=True vuelve a
+        listar JOBS/Inbound completo; reprocess=True además vuelve a encolar
+        los ya procesados (sus jobs salen del parse cache, sin re-parsear).
+        """
         print("\n" + "="*70)
         print("📧 JOB BULLETIN PROCESSOR")
         print("="*70)
@@ -710,171 +867,79 @@ class JobBulletinProcessor:
             print("   Please create the label or check Gmail filters")
             return
         
-        # Get messages from JOBS/Inbound label
-        results = self.gmail_service.users().messages().list(
-            userId='me',
-            labelIds=[label_id],
-            maxResults=max_emails
-        ).execute()
+        # Mensajes nuevos en JOBS/Inbound desde la última corrida
+        pending_ids = self.gmail_sync.new_message_ids(
+            label_id=label_id, max_results=max_emails, force_full=full_resync,
+            include_processed=reprocess,
+        )
         
-        messages = results.get('messages', [])
+        print(f"Sync mode: {self.gmail_sync.mode} ({self.gmail_sync.discovered} new since last run)")
+        print(f"Found {len(pending_ids)} emails to process\n")
         
-        if not messages:
-            print("No messages found in JOBS/Inbound")
+        if not pending_ids:
+            self.gmail_sync.compact()
             return
         
-        # Load processed IDs
-        processed_ids = self.get_processed_ids()
-        
-        print(f"Found {len(messages)} emails to check")
-        print(f"Already processed: {len(processed_ids)} IDs\n")
-        
         # ✅ NUEVO: Cargar URLs existentes UNA SOLA VEZ (evita rate limit)
         print("📋 Loading existing job URLs...")
-        self.load_existing_urls('Glassdoor')
-        self.load_existing_urls('LinkedIn')
-        self.load_existing_urls('Indeed')
+        self.load_existing_urls()
         print()
         
-        total_jobs_found = 0
         bulletins_processed = 0
-        
-        for msg_ref in messages:
-            msg_id = msg_ref['id']
-            
-            # Skip if already processed
-            if msg_id in processed_ids:
-                print(f"⏭️  Already processed: {msg_id[:16]}...")
-                continue
-            
-            # Get full message
-            message = self.gmail_service.users().messages().get(
-                userId='me',
-                id=msg_id,
-                format='raw'
-            ).execute()
-            
-            # ✅ NUEVO: Verificar edad del email
-            email_age = self.get_email_age_days(message)
-            if email_age > 7:
-                print(f"⏭️  Skipping old email ({email_age} days old)")
-                self.save_processed_id(msg_id)  # Marcar para no reprocessar
-                continue
-            
-            # Parse email
-            subject, sender, html_content, text_content = self.parse_email(message)
-            
-            # Detect bulletin type
-            bulletin_type = self.detect_bulletin_type(sender, subject)
-            
-            # ✅ NUEVO: Si está en JOBS/Inbound, SIEMPRE procesarlo como user_urls
-            # No importa el sender o subject, si está en esta carpeta es un job
-            if not bulletin_type:
-                # Asumir que es un email del usuario con URLs
-                bulletin_type = 'user_urls'
-                print(f"📨 Processing email as USER_URLS (default for JOBS/Inbound):")
-            else:
-                print(f"📨 Processing {bulletin_type.upper()} bulletin:")
-            
-            print(f"   Subject: {subject[:60]}...")
-            
-            # Extract jobs based on type
-            jobs = []
-            if bulletin_type == 'user_urls':
-                jobs = self.extract_user_jobs(text_content, html_content)
-            elif bulletin_type == 'linkedin':
-                jobs = self.extract_linkedin_jobs(html_content)
-            elif bulletin_type == 'indeed':
-                jobs = self.extract_indeed_jobs(html_content, text_content)
-            elif bulletin_type == 'glassdoor':
-                jobs = self.extract_glassdoor_jobs(html_content)
-            
-            elif bulletin_type == 'adzuna':
-                print("   🤖 Using AI parser for Adzuna bulletin...")
-                jobs = self.ai_parser.parse_generic_bulletin(html_content, source='Adzuna')
-            
-            elif bulletin_type == 'computrabajo':
-                print("   🤖 Using AI parser for Computrabajo bulletin...")
-                jobs = self.ai_parser.parse_generic_bulletin(html_content, source='Computrabajo')
-            
-            elif bulletin_type == 'jobleads':
-                print("   🤖 Using AI parser for JobLeads bulletin...")
-                jobs = self.ai_parser.parse_generic_bulletin(html_content, source='JobLeads')
-            
-            if jobs:
-                print(f"   ✅ Found {len(jobs)} job listings")
+        seen_keys: set = set()
+        # msg_id → [(tab_name, Future)] — el email se marca procesado solo si sus saves salieron bien
+        saves_by_msg: Dict[str, list] = {}
+        
+        fetch_queue: "queue.Queue" = queue.Queue(maxsize=FETCH_QUEUE_SIZE)
+        fetcher = threading.Thread(
+            target=self.fetch_messages, args=(pending_ids, fetch_queue), daemon=True
+        )
+        fetcher.start()
+        
+        with ThreadPoolExecutor(max_workers=1) as saver:
+            while True:
+                item = fetch_queue.get()
+                if item is _FETCH_DONE:
+                    break
+                msg_id, message = item
+                if message is None:
+                    continue  # no se marca: se reintenta en la siguiente corrida
                 
-                # ✅ NUEVO: Para user_urls, separar por fuente y guardar en tabs correctos
-                if bulletin_type == 'user_urls':
-                    # Separar jobs por Source
-                    jobs_by_source = {}
-                    for job in jobs:
-                        source = job.get('Source', 'Unknown')
-                        if source not in jobs_by_source:
-                            jobs_by_source[source] = []
-                        jobs_by_source[source].append(job)
-                    
-                    # Guardar cada grupo en su tab correspondiente
-                    for source, source_jobs in jobs_by_source.items():
-                        # FIX: Map "Generic" and "Unknown" to "LinkedIn" (those tabs dont exist)
-                        if source in ["Generic", "Unknown"]:
-                            source = "LinkedIn"
-                        
-                        print(f"   💾 Saving {len(source_jobs)} jobs to {source} tab...")
-                        
-                        # Filtrar duplicados
-                        unique_jobs = []
-                        duplicates_found = 0
-                        
-                        for job in source_jobs:
-                            job_url = job.get('ApplyURL', '')
-                            if job_url and self.check_job_exists_in_sheet(job_url, source):
-                                duplicates_found += 1
-                            else:
-                                unique_jobs.append(job)
-                        
-                        if duplicates_found > 0:
-                            print(f"   ⚠️  Skipped {duplicates_found} duplicates in {source}")
-                        
-                        if unique_jobs:
-                            saved = self.save_to_sheets(unique_jobs, tab_name=source)
-                            print(f"   ✅ Saved {saved} NEW jobs to {source}")
-                            total_jobs_found += saved
-                        else:
-                            print(f"   ℹ️  No new jobs in {source} (all were duplicates)")
+                # ✅ NUEVO: Verificar edad del email
+                email_age = self.get_email_age_days(message)
+                if email_age > 7:
+                    print(f"⏭️  Skipping old email ({email_age} days old)")
+                    self.save_processed_id(msg_id)  # Marcar para no reprocessar
+                    continue
                 
-                else:
-                    # Procesamiento normal para otros tipos de bulletins
-                    TAB_NAMES = {
-                        'linkedin': 'LinkedIn', 'indeed': 'Indeed',
-                        'glassdoor': 'Glassdoor', 'adzuna': 'Adzuna',
-                        'computrabajo': 'Computrabajo', 'jobleads': 'JobLeads'
-                    }
-                    tab_name = TAB_NAMES.get(bulletin_type, bulletin_type.capitalize())
-                    unique_jobs = []
-                    duplicates_found = 0
-                    
-                    for job in jobs:
-                        job_url = job.get('ApplyURL', '')
-                        if job_url and self.check_job_exists_in_sheet(job_url, tab_name):
-                            duplicates_found += 1
-                        else:
-                            unique_jobs.append(job)
-                    
-                    if duplicates_found > 0:
-                        print(f"   ⚠️  Skipped {duplicates_found} duplicates")
-                    
-                    # Solo guardar jobs únicos
-                    if unique_jobs:
-                        saved = self.save_to_sheets(unique_jobs, tab_name=tab_name)
-                        print(f"   💾 Saved {saved} NEW jobs to Sheets")
-                        total_jobs_found += saved
-                    else:
-                        print(f"   ℹ️  No new jobs (all were duplicates)")
+                bulletin_type, jobs = self._extract_jobs(message)
                 
-                bulletins_processed += 1
-            else:
-                print(f"   ⚠️  No jobs extracted (may need better parsing)")
+                if jobs:
+                    print(f"   ✅ Found {len(jobs)} job listings")
+                    by_tab = self._group_new_jobs(bulletin_type, jobs, seen_keys)
+                    saves_by_msg[msg_id] = [
+                        (tab_name, saver.submit(self.save_to_sheets, tab_jobs, tab_name))
+                        for tab_name, tab_jobs in by_tab.items()
+                    ]
+                    bulletins_processed += 1
+                else:
+                    print(f"   ⚠️  No jobs extracted (may need better parsing)")
+                    saves_by_msg[msg_id] = []
+        
+        fetcher.join()
+        
+        # Resultado de los saves (el executor ya terminó todo al salir del with)
+        total_jobs_found = 0
+        for msg_id, saves in saves_by_msg.items():
+            ok = True
+            for tab_name, future in saves:
+                try:
+                    total_jobs_found += future.result()
+                except Exception as e:
+                    print(f"   ❌ Error saving to {tab_name}: {e}")
+                    ok = False
+            if not ok:
+                continue  # se reprocesa la próxima vez; el índice evita duplicados
             
             # ✅ CRÍTICO: Marcar email para eliminación SIEMPRE (encontró jobs o no)
             # Esto evita que se procese el mismo email indefinidamente
@@ -887,14 +952,20 @@ class JobBulletinProcessor:
         print(f"📊 SUMMARY:")
         print(f"   Bulletins processed: {bulletins_processed}")
         print(f"   Total jobs found: {total_jobs_found}")
+        print_metrics()
+        print_cache_stats()
+        self.parse_cache.print_stats()
         print("="*70 + "\n")
         
         # ✅ NUEVO: Eliminar emails procesados
         self.delete_marked_emails()
+        self.gmail_sync.compact()
+        self.parse_cache.compact()
 
 def main():
     processor = JobBulletinProcessor()
-    processor.process_bulletins(max_emails=50)
+    processor.process_bulletins(max_emails=50, full_resync='--full' in sys.argv,
+                                reprocess='--reprocess' in sys.argv)
 
 if __name__ == '__main__':
     main()
@@ -25,6 +25,8 @@ from typing import Any
 import httpx
 from dotenv import load_dotenv
 
+from core.utils.answer_index import get_answer_index
+
 load_dotenv()
 
 log = logging.getLogger("job_foundry.enerd_bridge")
@@ -169,7 +171,16 @@ class ENERDBridge:
         """
         Obtiene la respuesta para UN campo específico.
         Útil cuando el formulario se procesa campo por campo en tiempo real.
+        Primero consulta el índice de respuestas (preguntas ya contestadas
+        para otros jobs); las respuestas nuevas de ENERD se guardan ahí.
         """
+        question = field_label or field_name
+        hit = get_answer_index().lookup(question, options)
+        if hit:
+            answer = hit.resolve(CV_FALLBACK)
+            if answer:
+                return answer
+
         online = await self.is_online()
         if not online:
             return self._get_fallback_answer(field_name, field_label)
@@ -187,7 +198,10 @@ class ENERDBridge:
                     },
                 )
                 if resp.status_code == 200:
-                    return resp.json().get("answer", "")
+                    answer = resp.json().get("answer", "")
+                    get_answer_index().learn(question, answer, source="enerd",
+                                             company=job.get("company", ""))
+                    return answer
         except Exception as e:
             log.warning(f"ENERD get_field_answer failed: {e}")
 
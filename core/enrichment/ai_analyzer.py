@@ -5,9 +5,12 @@ Calcula FIT scores usando LiteLLM (con fallback a Claude si el local falla)
 """
 import os
 import json
+import time
 import requests
 from dotenv import load_dotenv
 
+from core.utils.llm_cache import get_cache
+
 load_dotenv()
 
 # Usar LiteLLM como proxy (tiene fallback a Claude automatico)
@@ -16,6 +19,9 @@ LLM_MODEL = os.getenv("LLM_MODEL", "local-llama")
 LLM_KEY   = os.getenv("LITELLM_KEY", "sk-1234567890abcdef")
 CHALAN_URL = os.getenv("CHALAN_URL", "http://localhost:4001")
 
+# Subir la version si cambia el prompt de analyze_job (invalida el cache)
+PROMPT_VERSION = "gap-v2"
+
 
 def _get_chalan_profile() -> str:
     """Intenta obtener el perfil actualizado de Marcos desde CHALAN."""
@@ -45,6 +51,7 @@ class AIAnalyzer:
         self.llm_model = LLM_MODEL
         self.llm_key   = LLM_KEY
         self._profile  = None   # se carga lazy
+        self._cache    = get_cache("ai_analyzer", PROMPT_VERSION)
 
     def _load_profile(self) -> str:
         if self._profile is None:
@@ -70,6 +77,12 @@ class AIAnalyzer:
         description = job_data.get('full_description', job_data.get('Description', ''))
         profile     = self._load_profile()
 
+        cache_inputs = {"profile": profile, "role": role, "company": company,
+                        "description": description[:1500]}
+        cached = self._cache.get(self.llm_model, cache_inputs)
+        if cached is not None:
+            return cached
+
         prompt = f"""{profile}
 
 OFERTA A ANALIZAR:
@@ -100,6 +113,7 @@ recomendacion debe ser exactamente: "Aplica", "Borderline" o "No apliques"
 tienes y faltan: lista de bullets especificos del job, NO genericos
 """
         try:
+            started = time.time()
             response = requests.post(
                 self.llm_url,
                 json={
@@ -136,7 +150,7 @@ tienes y faltan: lista de bullets especificos del job, NO genericos
             rec    = result.get('recomendacion', 'Borderline')
             why_short = result.get('why', f"{rec} | {tienes[:60]}")
 
-            return {
+            analysis = {
                 'fit_score':     fit,
                 'tienes':        tienes,
                 'faltan':        faltan,
@@ -144,6 +158,8 @@ tienes y faltan: lista de bullets especificos del job, NO genericos
                 'seniority':     result.get('seniority', 'Unknown'),
                 'why':           f"[{rec}] {why_short}"
             }
+            self._cache.put(self.llm_model, cache_inputs, analysis, elapsed=time.time() - started)
+            return analysis
 
         except Exception as e:
             print(f"  Warning analisis IA: {e}")
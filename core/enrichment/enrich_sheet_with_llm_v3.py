@@ -17,21 +17,28 @@ Ejemplo:
 """
 
 import os
+import sys
 import json
 import time
 import argparse
 import requests
+from pathlib import Path
 from typing import List, Dict, Any
 
 from google.oauth2.credentials import Credentials
 from google_auth_oauthlib.flow import InstalledAppFlow
-from googleapiclient.discovery import build
 from googleapiclient.errors import HttpError
 
+sys.path.insert(0, str(Path(__file__).parent.parent.parent))
+from core.utils.google_clients import build_service
+from core.utils.llm_cache import get_cache, print_cache_stats
+
 
 SCOPES = ["https://www.googleapis.com/auth/spreadsheets"]
 LLM_URL   = os.getenv("LLM_URL",   "http://127.0.0.1:11434/v1/chat/completions")
 LLM_MODEL = os.getenv("LLM_MODEL", "qwen2.5-14b-instruct")
+# Subir si cambia el prompt de call_llm_fit (invalida el cache)
+FIT_PROMPT_VERSION = "fit100-v1"
 
 # -------------------- util A1 --------------------
 def a1_col(n: int) -> str:
@@ -70,7 +77,7 @@ def get_service() -> Any:
         with open(str(token_path),"w",encoding="utf-8") as f:
             f.write(creds.to_json())
         print("token.json generado.")
-    return build("sheets", "v4", credentials=creds)
+    return build_service("sheets", "v4", creds)
 
 def fetch_headers(service, sheet_id: str, tab: str) -> List[str]:
     resp = service.spreadsheets().values().get(
@@ -133,6 +140,12 @@ def call_llm_fit(cv_text: str, role: str, description: str) -> Dict[str, Any]:
     Llama al LLM local y devuelve dict {'fit': int, 'why': str}.
     Debe manejar 400 del runtime devolviendo LLM_ERROR.
     """
+    cache = get_cache("enrich_v3_fit", FIT_PROMPT_VERSION)
+    cache_inputs = {"cv": cv_text, "role": role, "description": description}
+    cached = cache.get(LLM_MODEL, cache_inputs)
+    if cached is not None:
+        return cached
+
     prompt = (
         "Eres un evaluador de compatibilidad de vacantes y CV.\n"
         "Devuelve SOLO JSON con esta forma:\n"
@@ -154,6 +167,7 @@ def call_llm_fit(cv_text: str, role: str, description: str) -> Dict[str, Any]:
         "stream": False
     }
 
+    started = time.time()
     try:
         # Increased timeout for Llama-3-Groq-70B (takes ~100 sec/job)
         r = requests.post(LLM_URL, json=payload, timeout=180)
@@ -171,6 +185,7 @@ def call_llm_fit(cv_text: str, role: str, description: str) -> Dict[str, Any]:
         fit = int(out.get("fit", 0))
         why = str(out.get("why", ""))
         fit = max(0, min(100, fit))
+        cache.put(LLM_MODEL, cache_inputs, {"fit": fit, "why": why}, elapsed=time.time() - started)
         return {"fit": fit, "why": why}
     except Exception as e:
         return {"fit": 0, "why": f"LLM_ERROR (parse): {e}"}
@@ -312,6 +327,7 @@ def main():
             print(f"[{tab}] ERROR: {e}")
 
     print(f"TOTAL enriquecidas/actualizadas: {total_updates}")
+    print_cache_stats()
 
 if __name__ == "__main__":
     main()
@@ -25,7 +25,8 @@ import re
 import time
 import requests
 from bs4 import BeautifulSoup
-from typing import Optional
+from concurrent.futures import ThreadPoolExecutor
+from typing import Dict, List, Optional, Sequence, Tuple
 
 # ── Patterns ──────────────────────────────────────────────────────────────────
 
@@ -79,21 +80,129 @@ MX_PATTERNS = [
 ]
 
 
+# Literal que TODO match del patron contiene (texto ya en minusculas).
+# Si ninguno aparece en el texto, el patron no puede matchear y no se evalua.
+# Patron sin entrada aqui = se evalua siempre (correcto, solo mas lento).
+PATTERN_TRIGGERS: Dict[str, Tuple[str, ...]] = {
+    # US only
+    r"\bU\.?S\.?\s*only\b":                                   ("only",),
+    r"\bunited states only\b":                                 ("united states only",),
+    r"\bmust be (located|based|residing|resident) in (the )?u\.?s\.?": ("must be ",),
+    r"\bmust (live|reside|work) in (the )?u\.?s\.?a?\.?\b":       ("must ",),
+    r"\bauthorized to work in (the )?u\.?s\.?":                ("authorized to work in ",),
+    r"\bwork authorization (in|for) (the )?u\.?s":              ("work authorization ",),
+    r"\bu\.?s\.?\s+work (visa|permit|authorization)":           ("work ",),
+    r"\blegally authorized to work in (the )?united states":    ("legally authorized",),
+    r"\bonly (hire|considering|accepting).*(us|u\.s\.|united states)": ("only ",),
+    r"\blocated in (the )?(united states|usa|u\.s\.a?)\b":       ("located in ",),
+    r"\bmust have (us|u\.s\.) citizenship":                     ("citizenship",),
+    r"\bsociedad?\s*(de)?\s*riesgo.*(usa|estados unidos)":       ("riesgo",),
+    r"\bcannot (sponsor|provide) (visa|work authorization)":    ("cannot ",),
+    r"\bno visa sponsorship":                                  ("no visa sponsorship",),
+    r"\bnot eligible.*(outside|international)":                ("not eligible",),
+    r"\bdomestic (only|candidates)":                           ("domestic ",),
+    # Global / LATAM
+    r"\bremote.*(worldwide|world.?wide|global|anywhere|any.?where|all countries)": ("remote",),
+    r"\b(worldwide|global|anywhere|international)\s+remote":    (" remote",),
+    r"\bopen to (candidates|applicants) (from )?anywhere":      ("anywhere",),
+    r"\bwork from anywhere":                                   ("work from anywhere",),
+    r"\blocated anywhere":                                     ("located anywhere",),
+    r"\blatam\b":                                              ("latam",),
+    r"\blatin america\b":                                      ("latin america",),
+    r"\bmexico\b":                                             ("mexico",),
+    r"\bm[eé]xico\b":                                          ("xico",),
+    r"\bgdl\b":                                                ("gdl",),
+    r"\bguadalajara\b":                                        ("guadalajara",),
+    r"\bremote.*(latam|latin)":                                ("remote",),
+    r"\blatam.*(remote|position|role|job)":                    ("latam",),
+    r"\bhiring (in|from) (multiple|all) (countries|locations|regions)": ("hiring ",),
+    r"\b(open|available) (to |for )?(all|international|global) (candidates|applicants)": ("candidates", "applicants"),
+    # Mexico
+    r"\bmexican candidates\b":                                 ("mexican candidates",),
+    r"\bcdmx\b":                                               ("cdmx",),
+    r"\bciudad de m[eé]xico\b":                                ("ciudad de m",),
+    r"\bremoto en m[eé]xico\b":                                ("remoto en m",),
+}
+
+
 def _clean_text(text: str) -> str:
     """Normaliza texto para busqueda de patrones."""
     return " ".join(text.lower().split())
 
 
+class GeoClassifier:
+    """
+    Clasificador precompilado: todos los patrones se compilan una vez y cada
+    texto se limpia una sola vez.
+
+    Por texto:
+      1. Prefiltro — una pasada buscando los literales disparadores; los
+         patrones cuyo disparador no aparece se descartan sin correr regex
+      2. Solo los patrones candidatos corren su regex (y un patron repetido
+         en dos familias, p.ej. guadalajara, se evalua una vez)
+
+    Los conteos son identicos a evaluar cada patron con re.search.
+    """
+
+    def __init__(self, families: Dict[str, Sequence[str]],
+                 triggers: Dict[str, Tuple[str, ...]] = PATTERN_TRIGGERS):
+        self.families = {name: list(patterns) for name, patterns in families.items()}
+        unique = list(dict.fromkeys(p for ps in self.families.values() for p in ps))
+        self._compiled = {p: re.compile(p, re.IGNORECASE) for p in unique}
+        self._triggers = {p: triggers.get(p) for p in unique}
+        self._by_trigger: Dict[str, List[str]] = {}
+        for p, ts in self._triggers.items():
+            for trig in ts or ():
+                self._by_trigger.setdefault(trig, []).append(p)
+        self._all_triggers = sorted(self._by_trigger)
+        # Patrones que no se pueden prefiltrar → siempre se evaluan
+        self._unfiltered = [p for p, ts in self._triggers.items() if not ts]
+        # Si no aparece NINGUN disparador (y no hay patrones sin disparador), el texto es 0/0/0
+        self._any_trigger = re.compile("|".join(re.escape(t) for t in self._all_triggers))
+
+    def _candidates(self, t: str) -> set:
+        candidates = set(self._unfiltered)
+        for trig in self._all_triggers:
+            if trig in t:
+                candidates.update(self._by_trigger[trig])
+        return candidates
+
+    def score_clean(self, t: str) -> Dict[str, int]:
+        """Conteo por familia para texto ya normalizado con _clean_text."""
+        counts = {name: 0 for name in self.families}
+        if not self._unfiltered and not self._any_trigger.search(t):
+            return counts
+        hits = {p for p in self._candidates(t) if self._compiled[p].search(t)}
+        for name, patterns in self.families.items():
+            counts[name] = sum(1 for p in patterns if p in hits)
+        return counts
+
+    def score(self, text: str) -> Dict[str, int]:
+        return self.score_clean(_clean_text(text))
+
+    def score_many(self, texts: Sequence[str]) -> List[Dict[str, int]]:
+        """Clasifica miles de textos en una llamada (mismos conteos que score())."""
+        return [self.score_clean(_clean_text(t or "")) for t in texts]
+
+
+_CLASSIFIER = GeoClassifier({
+    "us_only": US_ONLY_PATTERNS,
+    "global":  GLOBAL_PATTERNS,
+    "mx":      MX_PATTERNS,
+})
+
+
 def _score_text(text: str) -> dict:
     """
     Analiza el texto y devuelve scores para cada categoria.
     Returns: {"us_only": int, "global": int, "mx": int}
     """
-    t = _clean_text(text)
-    us_hits   = sum(1 for p in US_ONLY_PATTERNS if re.search(p, t, re.IGNORECASE))
-    global_hits = sum(1 for p in GLOBAL_PATTERNS if re.search(p, t, re.IGNORECASE))
-    mx_hits   = sum(1 for p in MX_PATTERNS if re.search(p, t, re.IGNORECASE))
-    return {"us_only": us_hits, "global": global_hits, "mx": mx_hits}
+    return _CLASSIFIER.score(text)
+
+
+def score_texts(texts: Sequence[str]) -> List[dict]:
+    """Version batch de _score_text (p.ej. todas las descripciones guardadas de un tab)."""
+    return _CLASSIFIER.score_many(texts)
 
 
 def _decide(scores: dict, source: str = "") -> dict:
@@ -175,6 +284,39 @@ def _fetch_job_text(url: str, timeout: int = 10) -> Optional[str]:
 
 # ── Main public function ───────────────────────────────────────────────────────
 
+def _job_text(job: dict) -> str:
+    """Texto base de campos ya disponibles en el sheet."""
+    return " ".join([
+        str(job.get("Title", "")),
+        str(job.get("Role", "")),
+        str(job.get("Company", "")),
+        str(job.get("Location", "")),
+        str(job.get("Description", "")),
+        str(job.get("Why", "")),         # campo del ai_analyzer
+        str(job.get("Tienes", "")),
+        str(job.get("Faltan", "")),
+    ])
+
+
+def _job_url(job: dict) -> str:
+    return str(job.get("ApplyURL", "") or job.get("URL", "") or "")
+
+
+def _strong_signal(scores: dict) -> bool:
+    """Señal suficiente solo con el texto del sheet → no hace falta fetch."""
+    return scores["us_only"] >= 2 or scores["global"] >= 2
+
+
+def _finish(base_text: str, base_scores: dict, page_text: Optional[str]) -> dict:
+    if page_text:
+        result = _decide(_score_text(base_text + " " + page_text), "combined")
+        result["source"] = "combined"
+    else:
+        result = _decide(base_scores, "text")
+        result["source"] = "text"
+    return result
+
+
 def check_geo_eligibility(
     job: dict,
     fetch_url: bool = True,
@@ -198,54 +340,61 @@ def check_geo_eligibility(
         }
     """
     # 1. Construir texto base de campos ya disponibles en el sheet
-    base_text = " ".join([
-        str(job.get("Title", "")),
-        str(job.get("Role", "")),
-        str(job.get("Company", "")),
-        str(job.get("Location", "")),
-        str(job.get("Description", "")),
-        str(job.get("Why", "")),         # campo del ai_analyzer
-        str(job.get("Tienes", "")),
-        str(job.get("Faltan", "")),
-    ])
+    base_text = _job_text(job)
     base_scores = _score_text(base_text)
 
     # Si ya hay señal fuerte solo con el texto del sheet, no hace falta fetch
-    if base_scores["us_only"] >= 2 or base_scores["global"] >= 2:
+    if _strong_signal(base_scores):
         result = _decide(base_scores, "text")
         result["source"] = "text"
         return result
 
     # 2. Fetch URL para analisis mas completo
-    url = str(job.get("ApplyURL", "") or job.get("URL", "") or "")
+    url = _job_url(job)
     page_text = None
     if fetch_url and url:
         time.sleep(delay)
         page_text = _fetch_job_text(url)
 
-    if page_text:
-        combined_text = base_text + " " + page_text
-        combined_scores = _score_text(combined_text)
-        result = _decide(combined_scores, "combined")
-        result["source"] = "combined"
-    else:
-        result = _decide(base_scores, "text")
-        result["source"] = "text"
-
-    return result
+    return _finish(base_text, base_scores, page_text)
 
 
 # ── Batch processor ───────────────────────────────────────────────────────────
 
-def batch_check_geo(jobs: list, fetch_url: bool = True, delay: float = 1.5) -> list:
+def batch_check_geo(jobs: list, fetch_url: bool = True, delay: float = 1.5,
+                    max_workers: int = 4) -> list:
     """
     Verifica elegibilidad geografica para una lista de jobs.
     Retorna la misma lista con campo '_geo' agregado.
+
+    Todo el texto del sheet se clasifica en una sola llamada; solo los jobs
+    sin señal fuerte se descargan, con max_workers fetches en paralelo
+    (cada worker espera `delay` antes de cada request).
     """
+    base_texts  = [_job_text(job) for job in jobs]
+    base_scores = score_texts(base_texts)
+
+    page_texts: Dict[int, Optional[str]] = {}
+    if fetch_url:
+        to_fetch = [i for i, (job, sc) in enumerate(zip(jobs, base_scores))
+                    if not _strong_signal(sc) and _job_url(job)]
+
+        def _fetch(i: int) -> Optional[str]:
+            time.sleep(delay)
+            return _fetch_job_text(_job_url(jobs[i]))
+
+        if to_fetch:
+            with ThreadPoolExecutor(max_workers=max_workers) as pool:
+                page_texts = dict(zip(to_fetch, pool.map(_fetch, to_fetch)))
+
     results = []
-    for job in jobs:
+    for i, job in enumerate(jobs):
         try:
-            geo = check_geo_eligibility(job, fetch_url=fetch_url, delay=delay)
+            if _strong_signal(base_scores[i]):
+                geo = _decide(base_scores[i], "text")
+                geo["source"] = "text"
+            else:
+                geo = _finish(base_texts[i], base_scores[i], page_texts.get(i))
         except Exception as e:
             geo = {
                 "geo": "UNKNOWN", "eligible": True,
@@ -0,0 +1,359 @@
+# -*- coding: utf-8 -*-
+"""
+job_liveness.py — ¿La vacante sigue abierta? Verificación por niveles
+=====================================================================
+Antes: un Firefox por job, sleep de 3s, page.content() y un `in` por cada
+indicador. Ahora cada URL pasa por niveles baratos, en paralelo con httpx,
+y solo lo ambiguo llega al browser:
+
+  1. API del ATS (sin HTML):
+       Greenhouse  boards-api.greenhouse.io/v1/boards/{board}/jobs/{id}   200/404
+       Lever       api.lever.co/v0/postings/{company}/{id}                200/404
+       Ashby       api.ashbyhq.com/posting-api/job-board/{org}  (¿id en el board?)
+  2. HTTP de la página (LinkedIn vía jobs-guest, sin login):
+       404 / 410                          → EXPIRED
+       redirect que pierde el id del job  → EXPIRED (p.ej. a /jobs/search),
+                                            solo donde el id se extrae explícito:
+                                            LinkedIn, Greenhouse, Lever, Ashby,
+                                            Indeed jk; otros redirects → nivel 3
+       JSON-LD JobPosting.validThrough    → EXPIRED si ya pasó, ACTIVE si no
+       <title> de error                   → EXPIRED
+       indicadores expired/active         → un solo regex precompilado
+  3. Todo lo demás (403 anti-bot, login wall, sin indicadores, errores de
+     red) queda UNKNOWN con needs_browser=True → el verifier lo abre con el
+     pool de browsers.
+
+Uso:
+    checker = LivenessChecker(IndicatorScanner(expired, active))
+    verdicts = checker.check_many(urls)       # misma longitud y orden que urls
+    for url, v in zip(urls, verdicts):
+        if v.needs_browser: ...               # nivel 3
+    checker.print_stats()
+
+Env overrides:
+    LIVENESS_CONCURRENCY, LIVENESS_PER_HOST, LIVENESS_TIMEOUT
+"""
+
+import asyncio
+import json
+import os
+import re
+import time
+from collections import Counter
+from dataclasses import dataclass
+from datetime import datetime, timezone
+from typing import Callable, Dict, List, Optional, Sequence, Tuple, Union
+from urllib.parse import urlsplit
+
+import httpx
+
+from core.utils.rate_limit import backoff_delay
+
+CONCURRENCY = int(os.getenv("LIVENESS_CONCURRENCY", "24"))
+PER_HOST = int(os.getenv("LIVENESS_PER_HOST", "4"))
+TIMEOUT = float(os.getenv("LIVENESS_TIMEOUT", "15"))
+MAX_RETRIES = 2
+
+ACTIVE, EXPIRED, UNKNOWN, ERROR = "ACTIVE", "EXPIRED", "UNKNOWN", "ERROR"
+
+HEADERS = {
+    "User-Agent": ("Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 "
+                   "(KHTML, like Gecko) Chrome/124.0.0.0 Safari/537.36"),
+    "Accept": "text/html,application/xhtml+xml,application/json;q=0.9,*/*;q=0.8",
+    "Accept-Language": "en-US,en;q=0.9,es-MX;q=0.8",
+}
+
+# Redirects a estas páginas no dicen nada de la vacante (login / anti-bot)
+WALL_MARKERS = ("login", "signin", "sign-in", "authwall", "checkpoint", "captcha",
+                "challenge", "/uas/", "cf_chl")
+
+ERROR_TITLE_WORDS = ("error", "404", "not found", "no encontrado", "no encontrada", "expirado")
+
+# ── URLs ─────────────────────────────────────────────────────────────────────
+
+_GREENHOUSE = re.compile(r"greenhouse\.io/(?:embed/job_app\?for=)?([\w-]+)/jobs/(\d+)", re.I)
+_LEVER = re.compile(r"jobs\.lever\.co/([\w.-]+)/([0-9a-f]{8}-[0-9a-f-]{27})", re.I)
+_ASHBY = re.compile(r"jobs\.ashbyhq\.com/([\w.%-]+)/([0-9a-f]{8}-[0-9a-f-]{27})", re.I)
+_LINKEDIN = re.compile(r"linkedin\.com/(?:comm/)?jobs/view/(?:[\w-]*?-)?(\d{6,})", re.I)
+_LINKEDIN_PARAM = re.compile(r"linkedin\.com/.*[?&]currentJobId=(\d{6,})", re.I)
+_INDEED = re.compile(r"indeed\.[\w.]+/.*[?&]jk=([0-9a-f]{16})(?![0-9a-f])", re.I)
+
+_JSONLD = re.compile(r'<script[^>]*application/ld\+json[^>]*>(.*?)</script>', re.I | re.S)
+_TITLE = re.compile(r"<title[^>]*>(.*?)</title>", re.I | re.S)
+
+
+def job_id_of(url: str) -> str:
+    """
+    Id de la vacante en plataformas de formato conocido (LinkedIn, Greenhouse,
+    Lever, Ashby, Indeed jk), '' para el resto. En URLs de tracking el número
+    más largo no es el id (Glassdoor partner/jobListing.htm trae cb=<timestamp>).
+    """
+    url = url or ""
+    linkedin_id = _linkedin_id(url)
+    if linkedin_id:
+        return linkedin_id
+    for pattern in (_GREENHOUSE, _LEVER, _ASHBY):
+        m = pattern.search(url)
+        if m:
+            return m.group(2).lower()
+    m = _INDEED.search(url)
+    return m.group(1).lower() if m else ""
+
+
+def _linkedin_id(url: str) -> Optional[str]:
+    m = _LINKEDIN.search(url) or _LINKEDIN_PARAM.search(url)
+    return m.group(1) if m else None
+
+
+def _page_url(url: str) -> str:
+    """URL que se pide en el nivel 2: LinkedIn → endpoint público jobs-guest (no pide login)."""
+    linkedin_id = _linkedin_id(url)
+    if linkedin_id:
+        return f"https://www.linkedin.com/jobs-guest/jobs/api/jobPosting/{linkedin_id}"
+    return url
+
+
+# ── Indicadores ──────────────────────────────────────────────────────────────
+
+class IndicatorScanner:
+    """
+    Indicadores expired/active compilados en un solo regex (alternación,
+    más largos primero, case-insensitive). Un EXPIRED en cualquier parte del
+    texto gana sobre un ACTIVE, igual que el chequeo indicador por indicador.
+    """
+
+    def __init__(self, expired: Sequence[str], active: Sequence[str]):
+        self._kind: Dict[str, str] = {}
+        for indicator in active:
+            self._kind[indicator.lower()] = ACTIVE
+        for indicator in expired:
+            self._kind[indicator.lower()] = EXPIRED
+        alternatives = sorted(self._kind, key=len, reverse=True)
+        self._pattern = re.compile("|".join(re.escape(a) for a in alternatives), re.I) if alternatives else None
+
+    def scan(self, text: str) -> Tuple[Optional[str], str]:
+        """(EXPIRED | ACTIVE | None, indicador encontrado)."""
+        if not self._pattern or not text:
+            return None, ""
+        first_active = ""
+        for m in self._pattern.finditer(text):
+            found = m.group(0).lower()
+            if self._kind[found] == EXPIRED:
+                return EXPIRED, found
+            if not first_active:
+                first_active = found
+        return (ACTIVE, first_active) if first_active else (None, "")
+
+
+# ── Veredicto ────────────────────────────────────────────────────────────────
+
+@dataclass(slots=True)
+class Verdict:
+    status: str                 # ACTIVE | EXPIRED | UNKNOWN | ERROR
+    reason: str
+    method: str                 # ats_api | http_status | redirect | jsonld | title | indicators | http
+
+    @property
+    def needs_browser(self) -> bool:
+        return self.status in (UNKNOWN, ERROR)
+
+    def to_dict(self) -> dict:
+        return {"status": self.status, "reason": self.reason, "method": self.method}
+
+
+def _valid_through(html: str) -> Optional[Tuple[bool, str]]:
+    """(vencida?, validThrough) del primer JobPosting con validThrough en el JSON-LD."""
+    for block in _JSONLD.findall(html):
+        try:
+            data = json.loads(block.strip())
+        except ValueError:
+            continue
+        stack = [data]
+        while stack:
+            node = stack.pop()
+            if isinstance(node, list):
+                stack.extend(node)
+            elif isinstance(node, dict):
+                if "@graph" in node:
+                    stack.append(node["@graph"])
+                if node.get("@type") == "JobPosting" and node.get("validThrough"):
+                    raw = str(node["validThrough"])
+                    try:
+                        until = datetime.fromisoformat(raw.replace("Z", "+00:00"))
+                    except ValueError:
+                        continue
+                    if until.tzinfo is None:
+                        until = until.replace(tzinfo=timezone.utc)
+                    return until < datetime.now(timezone.utc), raw
+    return None
+
+
+def classify_html(html: str, scanner: IndicatorScanner) -> Verdict:
+    """
+    Nivel 2 sobre un HTML ya descargado (también lo usa el fallback de browser).
+    Las señales de cierre ganan: una vacante cerrada antes de tiempo sigue
+    teniendo validThrough futuro pero ya dice "no longer accepting".
+    """
+    expiry = _valid_through(html)
+    if expiry is not None and expiry[0]:
+        return Verdict(EXPIRED, f"validThrough {expiry[1]}", "jsonld")
+
+    kind, indicator = scanner.scan(html)
+    if kind == EXPIRED:
+        return Verdict(EXPIRED, f'Found: "{indicator}"', "indicators")
+
+    m = _TITLE.search(html)
+    title = m.group(1).strip().lower() if m else ""
+    if any(word in title for word in ERROR_TITLE_WORDS):
+        return Verdict(EXPIRED, f"Title error: {title[:50]}", "title")
+
+    if expiry is not None:
+        return Verdict(ACTIVE, f"validThrough {expiry[1]}", "jsonld")
+    if kind == ACTIVE:
+        return Verdict(ACTIVE, f'Found: "{indicator}"', "indicators")
+    return Verdict(UNKNOWN, "No clear indicators", "http")
+
+
+# ── Checker ──────────────────────────────────────────────────────────────────
+
+ScannerArg = Union[IndicatorScanner, Callable[[str], IndicatorScanner]]
+
+
+class LivenessChecker:
+    """Niveles 1-2 en paralelo (httpx async, límite global y por host)."""
+
+    def __init__(self, scanner: ScannerArg, concurrency: int = CONCURRENCY,
+                 per_host: int = PER_HOST, timeout: float = TIMEOUT):
+        self._scanner_for = scanner if callable(scanner) and not isinstance(scanner, IndicatorScanner) \
+            else (lambda url: scanner)
+        self.concurrency = concurrency
+        self.per_host = per_host
+        self.timeout = timeout
+        self.stats: Counter = Counter()
+        self.elapsed = 0.0
+
+    # -- HTTP --------------------------------------------------------------
+
+    async def _get(self, client: httpx.AsyncClient, url: str) -> httpx.Response:
+        """GET con límite por host y reintentos en 429 / 5xx / errores de red."""
+        host = urlsplit(url).hostname or ""
+        sem = self._hosts.setdefault(host, asyncio.Semaphore(self.per_host))
+        for attempt in range(MAX_RETRIES + 1):
+            try:
+                async with self._global, sem:
+                    resp = await client.get(url)
+                if resp.status_code != 429 and resp.status_code < 500:
+                    return resp
+                if attempt >= MAX_RETRIES:
+                    return resp
+            except httpx.TransportError:
+                if attempt >= MAX_RETRIES:
+                    raise
+            await asyncio.sleep(backoff_delay(attempt))
+
+    async def _ashby_board(self, client, org: str) -> Optional[set]:
+        """Ids publicados del board de Ashby (una descarga por org y corrida)."""
+        task = self._ashby.get(org)
+        if task is None:
+            async def fetch():
+                resp = await self._get(client, f"https://api.ashbyhq.com/posting-api/job-board/{org}")
+                if resp.status_code != 200:
+                    return None
+                return {str(j.get("id", "")).lower() for j in resp.json().get("jobs", [])}
+            task = self._ashby[org] = asyncio.ensure_future(fetch())
+        try:
+            return await task
+        except Exception:
+            return None
+
+    async def _ats_api(self, client, url: str) -> Optional[Verdict]:
+        m = _GREENHOUSE.search(url)
+        if m:
+            api = f"https://boards-api.greenhouse.io/v1/boards/{m.group(1)}/jobs/{m.group(2)}"
+        else:
+            m = _LEVER.search(url)
+            api = f"https://api.lever.co/v0/postings/{m.group(1)}/{m.group(2)}" if m else None
+        if api:
+            try:
+                resp = await self._get(client, api)
+            except Exception:
+                return None
+            if resp.status_code == 200:
+                return Verdict(ACTIVE, "Listed in ATS API", "ats_api")
+            if resp.status_code in (404, 410):
+                return Verdict(EXPIRED, f"ATS API HTTP {resp.status_code}", "ats_api")
+            return None
+
+        m = _ASHBY.search(url)
+        if m:
+            ids = await self._ashby_board(client, m.group(1))
+            if ids is not None:
+                if m.group(2).lower() in ids:
+                    return Verdict(ACTIVE, "Listed in Ashby board", "ats_api")
+                return Verdict(EXPIRED, "Not in Ashby board", "ats_api")
+        return None
+
+    async def _check(self, client, url: str) -> Verdict:
+        if not url:
+            return Verdict(ERROR, "No URL", "http")
+
+        verdict = await self._ats_api(client, url)
+        if verdict:
+            return verdict
+
+        target = _page_url(url)
+        try:
+            resp = await self._get(client, target)
+        except Exception as e:
+            return Verdict(ERROR, f"HTTP error: {str(e)[:60]}", "http")
+
+        status = resp.status_code
+        if status in (404, 410):
+            return Verdict(EXPIRED, f"HTTP {status}", "http_status")
+        if status >= 400:
+            # 403 anti-bot, 429 persistente, 5xx: lo decide el browser
+            return Verdict(UNKNOWN, f"HTTP {status}", "http")
+
+        final = str(resp.url)
+        if resp.history:
+            final_lower = final.lower()
+            if any(marker in final_lower for marker in WALL_MARKERS):
+                return Verdict(UNKNOWN, "Redirected to login / anti-bot wall", "http")
+            wanted = job_id_of(url)
+            if not wanted:
+                # Sin id explícito no se sabe si el redirect perdió la vacante
+                return Verdict(UNKNOWN, f"Redirect → {urlsplit(final).path[:60]}", "http")
+            if wanted not in final_lower:
+                return Verdict(EXPIRED, f"Redirect → {urlsplit(final).path[:60]}", "redirect")
+
+        if "html" not in resp.headers.get("content-type", "html"):
+            return Verdict(UNKNOWN, f"Content-Type {resp.headers.get('content-type')}", "http")
+        return classify_html(resp.text, self._scanner_for(url))
+
+    async def check_many_async(self, urls: Sequence[str]) -> List[Verdict]:
+        self._global = asyncio.Semaphore(self.concurrency)
+        self._hosts: Dict[str, asyncio.Semaphore] = {}
+        self._ashby: Dict[str, asyncio.Future] = {}
+        started = time.monotonic()
+        limits = httpx.Limits(max_connections=self.concurrency,
+                              max_keepalive_connections=self.concurrency)
+        async with httpx.AsyncClient(timeout=self.timeout, limits=limits, follow_redirects=True,
+                                     headers=HEADERS) as client:
+            verdicts = await asyncio.gather(*(self._check(client, url) for url in urls))
+        self.elapsed += time.monotonic() - started
+        for v in verdicts:
+            self.stats["browser" if v.needs_browser else v.method] += 1
+        return list(verdicts)
+
+    def check_many(self, urls: Sequence[str]) -> List[Verdict]:
+        """Veredictos en el mismo orden que urls. needs_browser → nivel 3."""
+        return asyncio.run(self.check_many_async(urls))
+
+    def print_stats(self) -> None:
+        total = sum(self.stats.values())
+        if not total:
+            return
+        order = ("ats_api", "http_status", "redirect", "jsonld", "title", "indicators")
+        parts = [f"{m} {self.stats[m]}" for m in order if self.stats[m]]
+        print(f"   ⚡ liveness HTTP: {total} jobs en {self.elapsed:.1f}s — "
+              f"{', '.join(parts) or 'ninguno resuelto'}; {self.stats['browser']} ambiguos → browser")
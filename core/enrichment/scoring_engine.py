@@ -0,0 +1,239 @@
+#!/usr/bin/env python3
+"""
+Scoring Engine — pool de LLMs en paralelo con rate limit por backend
+
+Reparte una lista de jobs entre TODOS los backends disponibles al mismo
+tiempo (Gemini, NVIDIA, Ollama...) en vez de usar uno y rotar en 429.
+
+Cada backend tiene:
+  - N workers en paralelo (concurrency)
+  - token bucket de requests/min (rpm) y de tokens/min (tpm)
+  - cooldown con backoff exponencial cuando devuelve 429
+
+Los workers toman trabajo de una cola común, así que cada backend procesa
+en proporción a su capacidad: el throughput total es la suma de todos.
+Un job que recibe 429 vuelve a la cola y lo toma quien esté libre.
+
+Uso:
+    engine = ScoringEngine(BACKENDS)
+    for job, result, backend_name in engine.run(jobs, score_fn, deadline=...):
+        ... escribir resultado (en el thread principal) ...
+    engine.print_stats()
+
+score_fn(backend, job) devuelve el resultado, o lanza:
+  - RateLimited        → reintento en otro backend / después del cooldown
+  - BackendUnavailable → el backend se desactiva para el resto de la corrida
+"""
+import os
+import queue
+import threading
+import time
+from typing import Callable, Dict, Iterable, Iterator, List, Optional, Tuple
+
+from core.utils.rate_limit import TokenBucket, backoff_delay
+
+# Límites por familia de backend (override con env, p.ej. LLM_RPM_GEMINI=30)
+#   rpm / tpm = 0 → sin límite
+DEFAULT_LIMITS = {
+    "gemini": {"rpm": 15, "tpm": 1_000_000, "concurrency": 4},   # free tier Flash
+    "nvidia": {"rpm": 5,  "tpm": 0,         "concurrency": 2},   # NIM gratis
+    "ollama": {"rpm": 0,  "tpm": 0,         "concurrency": 2},   # OLLAMA_NUM_PARALLEL
+    "custom": {"rpm": 30, "tpm": 0,         "concurrency": 2},
+}
+
+# Intentos por job antes de dejarlo para la siguiente corrida
+MAX_ATTEMPTS = 4
+
+
+class RateLimited(Exception):
+    """El backend devolvió 429."""
+
+
+class BackendUnavailable(Exception):
+    """Key inválida/expirada o backend caído: no volver a usarlo en esta corrida."""
+
+
+def backend_family(backend: Dict) -> str:
+    url = backend.get("url", "")
+    if "google" in url:
+        return "gemini"
+    if "nvidia" in url:
+        return "nvidia"
+    if "127.0.0.1" in url or "localhost" in url:
+        return "ollama"
+    return "custom"
+
+
+def estimate_tokens(prompt: str, max_tokens: int = 300) -> int:
+    """~4 caracteres por token + la respuesta máxima."""
+    return len(prompt) // 4 + max_tokens
+
+
+class BackendSlot:
+    """Un backend con sus límites, cooldown y estadísticas."""
+
+    def __init__(self, backend: Dict):
+        self.backend = backend
+        self.name = backend["name"]
+        family = backend_family(backend)
+        limits = dict(DEFAULT_LIMITS[family])
+        for key in limits:
+            env = os.getenv(f"LLM_{key.upper()}_{family.upper()}")
+            if env:
+                limits[key] = int(env)
+        self.concurrency = max(1, limits["concurrency"])
+        self.rpm = limits["rpm"]
+        self.tpm = limits["tpm"]
+        self.requests = (TokenBucket(f"{self.name}.rpm", self.rpm / 60.0, max(1, self.concurrency))
+                         if self.rpm else None)
+        self.tokens = (TokenBucket(f"{self.name}.tpm", self.tpm / 60.0, self.tpm / 4)
+                       if self.tpm else None)
+
+        self.disabled = False
+        self._cooldown_until = 0.0
+        self._strikes = 0
+        self._lock = threading.Lock()
+
+        # Estadísticas
+        self.ok = 0
+        self.rate_limited = 0
+        self.errors = 0
+        self.busy_seconds = 0.0
+
+    @property
+    def capacity_per_min(self) -> float:
+        """Requests/min teóricos (sin rpm → ~20/min por worker)."""
+        return self.rpm if self.rpm else 20.0 * self.concurrency
+
+    def acquire(self) -> None:
+        """Espera cooldown (429) y un turno de rpm."""
+        wait = self._cooldown_until - time.monotonic()
+        if wait > 0:
+            time.sleep(wait)
+        if self.requests:
+            self.requests.acquire(1)
+
+    def acquire_tokens(self, token_cost: int) -> None:
+        if self.tokens:
+            self.tokens.acquire(token_cost)
+
+    def on_rate_limited(self) -> None:
+        with self._lock:
+            self.rate_limited += 1
+            self._strikes += 1
+            self._cooldown_until = time.monotonic() + backoff_delay(self._strikes)
+        if self.requests:
+            self.requests.drain()
+
+    def on_success(self) -> None:
+        with self._lock:
+            self.ok += 1
+            self._strikes = 0
+
+
+class ScoringEngine:
+    """Pool de backends LLM con workers en paralelo."""
+
+    def __init__(self, backends: List[Dict]):
+        self.slots = [BackendSlot(b) for b in backends]
+        self.skipped: List[Tuple[object, str]] = []
+
+    @property
+    def capacity_per_min(self) -> float:
+        return sum(s.capacity_per_min for s in self.slots if not s.disabled)
+
+    def run(self, items: Iterable, score_fn: Callable[[Dict, object], object],
+            deadline: Optional[float] = None,
+            token_cost: Callable[[object], int] = lambda item: 600) -> Iterator[tuple]:
+        """
+        Procesa items en paralelo. Genera (item, result, backend_name) conforme
+        terminan. Lo que no se alcanzó a procesar (deadline, todos los backends
+        caídos, MAX_ATTEMPTS) queda en self.skipped.
+
+        deadline: time.time() a partir del cual no se empieza trabajo nuevo.
+        """
+        work: "queue.Queue" = queue.Queue()
+        items = list(items)
+        for item in items:
+            work.put((item, 0))
+        results: "queue.Queue" = queue.Queue()
+        done = threading.Event()
+        self.skipped = []
+
+        def worker(slot: BackendSlot):
+            while not done.is_set() and not slot.disabled:
+                # Esperar turno ANTES de tomar un job: un backend lento no
+                # acapara trabajo que otro backend libre podría hacer ya
+                slot.acquire()
+                if done.is_set() or (deadline and time.time() >= deadline):
+                    return
+                try:
+                    item, attempts = work.get(timeout=0.5)
+                except queue.Empty:
+                    continue
+                slot.acquire_tokens(token_cost(item))
+                started = time.monotonic()
+                try:
+                    result = score_fn(slot.backend, item)
+                    slot.on_success()
+                    results.put(("ok", item, result, slot.name))
+                except RateLimited:
+                    slot.on_rate_limited()
+                    work.put((item, attempts))   # 429 no cuenta como intento
+                except BackendUnavailable as e:
+                    if not slot.disabled:
+                        print(f"   ⛔ Backend '{slot.name}' desactivado: {str(e)[:80]}")
+                    slot.disabled = True
+                    work.put((item, attempts))
+                except Exception as e:
+                    slot.errors += 1
+                    if attempts + 1 >= MAX_ATTEMPTS:
+                        results.put(("skip", item, f"error: {str(e)[:80]}", slot.name))
+                    else:
+                        work.put((item, attempts + 1))
+                finally:
+                    slot.busy_seconds += time.monotonic() - started
+
+        threads = [
+            threading.Thread(target=worker, args=(slot,), daemon=True)
+            for slot in self.slots for _ in range(slot.concurrency)
+        ]
+        for t in threads:
+            t.start()
+
+        remaining = len(items)
+        try:
+            while remaining:
+                try:
+                    kind, item, payload, name = results.get(timeout=0.5)
+                except queue.Empty:
+                    if not any(t.is_alive() for t in threads):
+                        break   # deadline o todos los backends desactivados
+                    continue
+                remaining -= 1
+                if kind == "ok":
+                    yield item, payload, name
+                else:
+                    self.skipped.append((item, payload))
+        finally:
+            # Los workers son daemon: los que esperan rpm salen solos al despertar
+            done.set()
+            # Lo que quedó en cola (o llegó mientras se cerraba)
+            while True:
+                try:
+                    kind, item, payload, name = results.get_nowait()
+                except queue.Empty:
+                    break
+                self.skipped.append((item, payload if kind == "skip" else "not written"))
+            while True:
+                try:
+                    item, _ = work.get_nowait()
+                except queue.Empty:
+                    break
+                self.skipped.append((item, "not started"))
+
+    def print_stats(self) -> None:
+        for s in self.slots:
+            state = " (desactivado)" if s.disabled else ""
+            print(f"   🤖 {s.name}{state}: {s.ok} ok, {s.rate_limited}×429, "
+                  f"{s.errors} errores, {s.busy_seconds:.0f}s en llamadas")
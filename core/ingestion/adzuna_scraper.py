@@ -17,13 +17,12 @@ import urllib.parse
 import json
 import time
 from pathlib import Path
-from datetime import datetime
 
 PROJECT_ROOT = Path(__file__).parent.parent.parent
 sys.path.insert(0, str(PROJECT_ROOT))
 
 from core.ingestion.queries import get_mexico_queries, get_latam_queries
-from core.sheets.sheet_manager import SheetManager
+from core.ingestion.base_scraper import BaseScraper, Job
 from dotenv import load_dotenv
 
 load_dotenv(dotenv_path=PROJECT_ROOT / ".env")
@@ -81,48 +80,43 @@ def _fetch_json(url: str, retries: int = 3, backoff: float = 5.0) -> dict | None
     return None
 
 
-class AdzunaScraper:
-    def __init__(self, headless: bool = None):
-        # headless param kept for interface parity — not used (no browser)
-        self.headless       = headless
-        self.jobs_found: list[dict] = []
-        self.dry_run        = True
-        self.sheet_manager  = None
-        self._calls_today   = 0
+class AdzunaScraper(BaseScraper):
+    name = "ADZUNA"
+    title = "ADZUNA MX SCRAPER  (REST API, no browser)"
+    tab = "adzuna"
+    headers = ADZUNA_HEADERS
+    # headless param kept for interface parity — not used (no browser)
+    uses_browser = False
 
-    async def run(self, dry_run: bool = True):
-        self.dry_run = dry_run
-        if not dry_run:
-            self.sheet_manager = SheetManager()
+    def __init__(self, headless: bool = None, sink=None):
+        super().__init__(headless=headless, sink=sink)
+        self._calls_today = 0
 
+    def print_banner(self):
         print(f"\n{CYAN}{'='*70}")
-        print(f"ADZUNA MX SCRAPER  (REST API, no browser)")
+        print(self.title)
         print(f"{'='*70}{END}")
 
+    async def scrape(self, pool=None):
         if not _APP_ID or not _APP_KEY:
             print(f"{RED}❌ ADZUNA_APP_ID / ADZUNA_APP_KEY no configurados{END}")
             print(f"   Regístrate en developer.adzuna.com y agrega los secrets")
             return
 
-        print(f"Mode:   {YELLOW}{'DRY RUN' if dry_run else 'LIVE'}{END}")
+        print(f"Mode:   {YELLOW}{'DRY RUN' if self.dry_run else 'LIVE'}{END}")
         print(f"App ID: {_APP_ID[:8]}***")
         print(f"Limits: 250 calls/day, 2500/month\n")
 
         for query, source in get_mexico_queries("en"):
-            self._search(query, source)
+            await self._search(query, source)
             await asyncio.sleep(1)   # gentle rate control
 
         for query, source in get_latam_queries("en"):
-            self._search(query, source)
+            await self._search(query, source)
             await asyncio.sleep(1)
 
-        self._print_summary()
-
-        if not dry_run and self.jobs_found:
-            self._save_to_sheets()
-
-    def _search(self, query: str, query_source: str):
-        """Call Adzuna search API for one query and collect results."""
+    async def _search(self, query: str, query_source: str):
+        """Call Adzuna search API for one query and emit the results."""
         print(f"\n{CYAN}[Adzuna] Searching: {query}{END}")
 
         params = {
@@ -136,7 +130,8 @@ class AdzunaScraper:
         }
         url = f"{_API_BASE}/1?{urllib.parse.urlencode(params)}"
 
-        data = _fetch_json(url)
+        # urllib es bloqueante: fuera del event loop para no frenar a las otras fuentes
+        data = await asyncio.to_thread(_fetch_json, url)
         if not data:
             return
 
@@ -162,69 +157,25 @@ class AdzunaScraper:
                 if not title or not apply_url:
                     continue
 
-                remote = _detect_remote(title + " " + description + " " + location)
-
-                self.jobs_found.append({
-                    'Role':        title[:100],
-                    'Company':     company[:100],
-                    'Location':    location[:100],
-                    'ApplyURL':    apply_url,
-                    'Source':      'Adzuna MX',
-                    'SearchQuery': query,
-                    'QuerySource': query_source,
-                    'CreatedAt':   datetime.now().strftime('%Y-%m-%d %H:%M:%S'),
-                    'DateFound':   datetime.now().strftime('%Y-%m-%d'),
-                    'Status':      'New',
-                    'RemoteScope': remote,
-                    'SalaryMin':   str(salary_min),
-                    'SalaryMax':   str(salary_max),
-                })
-                count += 1
+                emitted = await self.emit(Job(
+                    role=title,
+                    company=company,
+                    location=location,
+                    apply_url=apply_url,
+                    source='Adzuna MX',
+                    search_query=query,
+                    query_source=query_source,
+                    remote_scope=_detect_remote(title + " " + description + " " + location),
+                    salary_min=str(salary_min),
+                    salary_max=str(salary_max),
+                ))
+                if emitted:
+                    count += 1
             except Exception:
                 continue
 
         print(f"  {GREEN}Parsed {count} jobs  (API calls today: {self._calls_today}){END}")
 
-    def _print_summary(self):
-        print(f"\n{CYAN}{'='*70}")
-        print(f"ADZUNA SCRAPING SUMMARY")
-        print(f"{'='*70}{END}")
-        print(f"  Total: {GREEN}{len(self.jobs_found)}{END}")
+    def print_summary(self):
+        super().print_summary()
         print(f"  API calls used: {self._calls_today}/250 daily budget")
-        by_source: dict[str, int] = {}
-        for j in self.jobs_found:
-            k = j['QuerySource']
-            by_source[k] = by_source.get(k, 0) + 1
-        for k, v in by_source.items():
-            print(f"    {k}: {v} jobs")
-
-    def _save_to_sheets(self):
-        print(f"\n{CYAN}Saving to Google Sheets → Adzuna tab...{END}")
-        try:
-            self.sheet_manager.ensure_headers('adzuna', ADZUNA_HEADERS)
-            existing_urls: set[str] = set()
-            try:
-                rows = self.sheet_manager.get_all_jobs(tab='adzuna')
-                existing_urls = {r.get('ApplyURL', '') for r in rows}
-            except Exception:
-                pass
-
-            new_jobs = [j for j in self.jobs_found if j['ApplyURL'] not in existing_urls]
-            if not new_jobs:
-                print(f"  {YELLOW}No new jobs (all duplicates){END}")
-                return
-
-            tab_name = self.sheet_manager.tabs['adzuna']
-            headers  = self.sheet_manager._get_headers(tab_name)
-            rows_out = [[str(j.get(h, '') or '') for h in headers] for j in new_jobs]
-            self.sheet_manager.service.spreadsheets().values().append(
-                spreadsheetId=self.sheet_manager.spreadsheet_id,
-                range=f"{tab_name}!A2",
-                valueInputOption="USER_ENTERED",
-                insertDataOption="INSERT_ROWS",
-                body={"values": rows_out},
-            ).execute()
-            print(f"  {GREEN}Saved {len(new_jobs)} new jobs to Adzuna tab{END}")
-        except Exception as e:
-            print(f"  {RED}Error saving to Sheets: {e}{END}")
-            raise
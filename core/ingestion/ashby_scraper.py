@@ -7,16 +7,21 @@ API pública: https://api.ashbyhq.com/posting-api/job-board/{company}
 NO modifica código existente — agrega una nueva fuente al pipeline.
 Integración: usar desde scripts/scrape_greenhouse_ashby.py
 
+Las descargas van en paralelo vía core.ingestion.ats_harvester (httpx async,
+requests condicionales y snapshot por empresa).
+
 Uso:
     from core.ingestion.ashby_scraper import scrape_ashby
     jobs = scrape_ashby(["retool", "replit", "cursor"])
+    jobs = scrape_ashby(companies, only_new=True)   # solo nuevas/modificadas
 """
 
-import requests
 import logging
 from datetime import datetime
 from typing import Optional
 
+from core.ingestion.ats_harvester import BoardProvider, PendingSnapshots, harvest
+
 log = logging.getLogger(__name__)
 
 ASHBY_API = "https://api.ashbyhq.com/posting-api/job-board/{company}"
@@ -35,73 +40,58 @@ PM_KEYWORDS = [
 ]
 
 
-def scrape_ashby(companies: list[str] = None, keywords: list[str] = None) -> list[dict]:
+def parse_board(company: str, data: dict) -> list[dict]:
+    """Convierte el JSON del board en records del pipeline (todos los postings)."""
+    records = []
+    for job in data.get("jobs", []):
+        # Extraer localización
+        location = job.get("location", "") or ""
+        if isinstance(location, dict):
+            location = location.get("name", "")
+
+        # Compensación si está disponible
+        comp = ""
+        if job.get("compensation"):
+            c = job["compensation"]
+            comp = f"{c.get('min', '')} - {c.get('max', '')} {c.get('currency', 'USD')}"
+
+        records.append({
+            "title":        job.get("title", ""),
+            "company":      company.capitalize(),
+            "location":     location,
+            "url":          job.get("jobUrl", "") or f"https://jobs.ashbyhq.com/{company}/{job.get('id', '')}",
+            "source":       "ashby",
+            "job_id":       str(job.get("id", "")),
+            "posted_at":    job.get("publishedAt", datetime.now().isoformat()),
+            "description":  (job.get("descriptionPlain", "") or "")[:500],
+            "compensation": comp,
+        })
+    return records
+
+
+ASHBY = BoardProvider(
+    name="ashby",
+    label="Ashby",
+    url=ASHBY_API,
+    parse=parse_board,
+    params={"includeCompensation": "true"},
+)
+
+
+def scrape_ashby(companies: list[str] = None, keywords: list[str] = None,
+                 only_new: bool = False,
+                 pending: Optional[PendingSnapshots] = None) -> list[dict]:
     """
     Descarga vacantes de empresas en Ashby ATS.
 
     Args:
         companies: lista de slugs de empresa
         keywords: palabras clave para filtrar por título
+        only_new: solo vacantes nuevas o modificadas desde la corrida anterior
+        pending: PendingSnapshots para guardar el snapshot después de escribir
 
     Returns:
         lista de dicts con formato compatible con ai-job-foundry pipeline
     """
-    companies = companies or DEFAULT_COMPANIES
-    keywords  = keywords  or PM_KEYWORDS
-    results   = []
-
-    for company in companies:
-        try:
-            url  = ASHBY_API.format(company=company)
-            resp = requests.get(
-                url, timeout=15,
-                headers={"User-Agent": "Mozilla/5.0"},
-                params={"includeCompensation": "true"},
-            )
-            if resp.status_code == 404:
-                log.debug(f"Ashby: {company} no encontrado")
-                continue
-            if resp.status_code != 200:
-                log.warning(f"Ashby {company}: HTTP {resp.status_code}")
-                continue
-
-            data = resp.json()
-            jobs = data.get("jobs", [])
-            log.info(f"Ashby {company}: {len(jobs)} vacantes totales")
-
-            for job in jobs:
-                title = job.get("title", "").lower()
-                if not any(kw in title for kw in keywords):
-                    continue
-
-                # Extraer localización
-                location = job.get("location", "") or ""
-                if isinstance(location, dict):
-                    location = location.get("name", "")
-
-                # Compensación si está disponible
-                comp = ""
-                if job.get("compensation"):
-                    c = job["compensation"]
-                    comp = f"{c.get('min', '')} - {c.get('max', '')} {c.get('currency', 'USD')}"
-
-                results.append({
-                    "title":        job.get("title", ""),
-                    "company":      company.capitalize(),
-                    "location":     location,
-                    "url":          job.get("jobUrl", "") or f"https://jobs.ashbyhq.com/{company}/{job.get('id', '')}",
-                    "source":       "ashby",
-                    "job_id":       str(job.get("id", "")),
-                    "posted_at":    job.get("publishedAt", datetime.now().isoformat()),
-                    "description":  job.get("descriptionPlain", "")[:500],
-                    "compensation": comp,
-                })
-
-            count = sum(1 for r in results if r["company"] == company.capitalize())
-            log.info(f"Ashby {company}: {count} relevantes")
-
-        except Exception as e:
-            log.warning(f"Ashby {company} error: {e}")
-
-    log.info(f"Ashby total: {len(results)} vacantes relevantes de {len(companies)} empresas")
-    return results
+    return harvest(ASHBY, companies or DEFAULT_COMPANIES, keywords or PM_KEYWORDS,
+                   only_new=only_new, pending=pending)
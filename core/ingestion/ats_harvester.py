@@ -0,0 +1,308 @@
+"""
+ats_harvester.py
+================
+Cosecha asíncrona de job boards ATS (Greenhouse, Ashby) con httpx.
+
+- Un solo httpx.AsyncClient (pool de conexiones compartido) y concurrencia
+  acotada: cientos de empresas por corrida en el tiempo de las más lentas.
+- Requests condicionales (If-None-Match / If-Modified-Since): un 304 =
+  board sin cambios, no se descarga ni se parsea.
+- Snapshot por empresa en data/state/ats_boards.db:
+    etag, last-modified, hash del body y fingerprint de cada posting
+  → solo se emiten postings nuevos o modificados.
+- Slugs que dan 404 no se vuelven a pedir hasta MISSING_RECHECK_DAYS.
+- 429 / 5xx / errores de red se reintentan con backoff.
+
+Uso:
+    from core.ingestion.ats_harvester import harvest, PendingSnapshots
+    from core.ingestion.greenhouse_scraper import GREENHOUSE
+    jobs = harvest(GREENHOUSE, companies, keywords)                  # solo nuevos/cambiados
+    jobs = harvest(GREENHOUSE, companies, keywords, only_new=False)  # todo lo relevante
+
+    # Snapshot diferido: los boards con cambios se guardan solo al confirmar,
+    # después de escribir los jobs (un --dry-run o un insert que falla no
+    # "consume" las vacantes nuevas)
+    pending = PendingSnapshots()
+    jobs = harvest(GREENHOUSE, companies, keywords, pending=pending)
+    ...escribir jobs...
+    pending.commit(failed=jobs_que_fallaron)
+
+Env overrides:
+    ATS_CONCURRENCY, ATS_TIMEOUT, ATS_MISSING_RECHECK_DAYS
+"""
+
+import asyncio
+import hashlib
+import json
+import logging
+import os
+import sqlite3
+import time
+from collections import Counter
+from dataclasses import dataclass, field
+from pathlib import Path
+from typing import Callable, Dict, List, Optional
+
+import httpx
+
+from core.utils.rate_limit import backoff_delay
+
+log = logging.getLogger(__name__)
+
+PROJECT_ROOT = Path(__file__).parent.parent.parent
+DEFAULT_DB_PATH = PROJECT_ROOT / "data" / "state" / "ats_boards.db"
+
+CONCURRENCY = int(os.getenv("ATS_CONCURRENCY", "32"))
+TIMEOUT = float(os.getenv("ATS_TIMEOUT", "15"))
+MISSING_RECHECK_DAYS = float(os.getenv("ATS_MISSING_RECHECK_DAYS", "7"))
+MAX_RETRIES = 3
+
+USER_AGENT = "Mozilla/5.0"
+
+
+@dataclass(frozen=True)
+class BoardProvider:
+    """Un ATS: endpoint público del board y cómo convertir su JSON en records."""
+    name: str                                   # "greenhouse" | "ashby"
+    label: str                                  # para logs: "Greenhouse"
+    url: str                                    # template con {company}
+    parse: Callable[[str, dict], List[dict]]    # (company, json) → records de TODOS los postings
+    params: Dict[str, str] = field(default_factory=dict)
+
+
+def _fingerprint(record: dict) -> str:
+    """Cambia si cambia el título, la ubicación o la fecha de actualización del posting."""
+    blob = "\x1f".join(str(record.get(k, "")) for k in ("title", "location", "posted_at", "url"))
+    return hashlib.sha1(blob.encode("utf-8")).hexdigest()[:16]
+
+
+def _matches(record: dict, keywords: List[str]) -> bool:
+    title = record.get("title", "").lower()
+    return any(kw in title for kw in keywords)
+
+
+class BoardSnapshots:
+    """Último estado conocido de cada board (un row por provider + empresa)."""
+
+    def __init__(self, db_path: Optional[Path] = None):
+        self.db_path = Path(db_path or DEFAULT_DB_PATH)
+        self.db_path.parent.mkdir(parents=True, exist_ok=True)
+        self._conn = sqlite3.connect(str(self.db_path))
+        self._conn.execute("PRAGMA journal_mode=WAL")
+        self._conn.execute(
+            "CREATE TABLE IF NOT EXISTS boards ("
+            "  provider TEXT, slug TEXT, status INTEGER, etag TEXT, last_modified TEXT,"
+            "  body_hash TEXT, postings TEXT, checked_at REAL,"
+            "  PRIMARY KEY (provider, slug))"
+        )
+
+    def get(self, provider: str, slug: str) -> Optional[dict]:
+        row = self._conn.execute(
+            "SELECT status, etag, last_modified, body_hash, postings, checked_at"
+            " FROM boards WHERE provider = ? AND slug = ?", (provider, slug)
+        ).fetchone()
+        if not row:
+            return None
+        keys = ("status", "etag", "last_modified", "body_hash", "postings", "checked_at")
+        return dict(zip(keys, row))
+
+    def save(self, provider: str, slug: str, status: int, etag: str = None,
+             last_modified: str = None, body_hash: str = None, postings: dict = None) -> None:
+        self._conn.execute(
+            "INSERT OR REPLACE INTO boards"
+            " (provider, slug, status, etag, last_modified, body_hash, postings, checked_at)"
+            " VALUES (?, ?, ?, ?, ?, ?, ?, ?)",
+            (provider, slug, status, etag, last_modified, body_hash,
+             json.dumps(postings or {}), time.time()),
+        )
+
+    def touch(self, provider: str, slug: str) -> None:
+        self._conn.execute(
+            "UPDATE boards SET checked_at = ? WHERE provider = ? AND slug = ?",
+            (time.time(), provider, slug),
+        )
+
+    def close(self) -> None:
+        self._conn.commit()
+        self._conn.close()
+
+
+class PendingSnapshots:
+    """
+    Snapshots de boards con cambios que todavía no se guardan: harvest() los
+    junta aquí y commit() los escribe cuando los jobs ya se procesaron.
+    Sin commit (dry-run, crash) la próxima corrida vuelve a emitir lo mismo.
+    """
+
+    def __init__(self, db_path: Optional[Path] = None):
+        self.db_path = db_path
+        self._boards: List[tuple] = []
+
+    def __len__(self) -> int:
+        return len(self._boards)
+
+    def add(self, provider: str, slug: str, etag: Optional[str], last_modified: Optional[str],
+            body_hash: str, postings: dict, previous: dict, emitted: List[str]) -> None:
+        self._boards.append((provider, slug, etag, last_modified, body_hash, postings, previous, emitted))
+
+    def commit(self, failed: List[dict] = ()) -> None:
+        """
+        Guarda los snapshots. Los postings de `failed` (records que no se
+        pudieron escribir) conservan su fingerprint anterior y su board pierde
+        etag/hash, así la próxima corrida lo descarga y los vuelve a emitir.
+        """
+        failed_ids = {(r.get("source"), r.get("job_id")) for r in failed}
+        store = BoardSnapshots(self.db_path)
+        try:
+            for provider, slug, etag, last_modified, body_hash, postings, previous, emitted in self._boards:
+                lost = [job_id for job_id in emitted if (provider, job_id) in failed_ids]
+                if lost:
+                    postings = dict(postings)
+                    for job_id in lost:
+                        if job_id in previous:
+                            postings[job_id] = previous[job_id]
+                        else:
+                            postings.pop(job_id, None)
+                    etag = last_modified = body_hash = None
+                store.save(provider, slug, 200, etag, last_modified, body_hash, postings)
+        finally:
+            store.close()
+        self._boards.clear()
+
+
+async def _get(client: httpx.AsyncClient, sem: asyncio.Semaphore, url: str,
+               params: dict, headers: dict) -> httpx.Response:
+    """GET con reintentos en 429 / 5xx / errores de red. El semáforo solo cubre el request."""
+    for attempt in range(MAX_RETRIES + 1):
+        try:
+            async with sem:
+                resp = await client.get(url, params=params, headers=headers)
+            if resp.status_code != 429 and resp.status_code < 500:
+                return resp
+            if attempt >= MAX_RETRIES:
+                return resp
+        except httpx.TransportError:
+            if attempt >= MAX_RETRIES:
+                raise
+        await asyncio.sleep(backoff_delay(attempt))
+
+
+async def _harvest_company(client, sem, store: BoardSnapshots, provider: BoardProvider,
+                           company: str, keywords: List[str], only_new: bool,
+                           stats: Counter, pending: Optional[PendingSnapshots] = None) -> List[dict]:
+    snap = store.get(provider.name, company)
+
+    if (snap and snap["status"] == 404
+            and time.time() - snap["checked_at"] < MISSING_RECHECK_DAYS * 86400):
+        stats["missing"] += 1
+        return []
+
+    headers = {}
+    if only_new and snap and snap["status"] == 200:
+        if snap["etag"]:
+            headers["If-None-Match"] = snap["etag"]
+        if snap["last_modified"]:
+            headers["If-Modified-Since"] = snap["last_modified"]
+
+    try:
+        resp = await _get(client, sem, provider.url.format(company=company), provider.params, headers)
+    except Exception as e:
+        stats["errors"] += 1
+        log.warning(f"{provider.label} {company} error: {e}")
+        return []
+
+    if resp.status_code == 304:
+        stats["unchanged"] += 1
+        store.touch(provider.name, company)
+        return []
+    if resp.status_code == 404:
+        stats["missing"] += 1
+        store.save(provider.name, company, 404)
+        log.debug(f"{provider.label}: {company} no encontrado")
+        return []
+    if resp.status_code != 200:
+        stats["errors"] += 1
+        log.warning(f"{provider.label} {company}: HTTP {resp.status_code}")
+        return []
+
+    etag = resp.headers.get("etag")
+    last_modified = resp.headers.get("last-modified")
+    body_hash = hashlib.sha256(resp.content).hexdigest()
+
+    # Sin ETag (o ignorado por el servidor): mismo body = board sin cambios
+    if only_new and snap and snap["body_hash"] == body_hash:
+        stats["unchanged"] += 1
+        store.save(provider.name, company, 200, etag, last_modified, body_hash,
+                   json.loads(snap["postings"] or "{}"))
+        return []
+
+    try:
+        records = provider.parse(company, resp.json())
+    except Exception as e:
+        stats["errors"] += 1
+        log.warning(f"{provider.label} {company} error: {e}")
+        return []
+
+    previous = json.loads(snap["postings"] or "{}") if snap else {}
+    postings = {r["job_id"]: _fingerprint(r) for r in records}
+    relevant = [r for r in records if _matches(r, keywords)]
+    if only_new:
+        relevant = [r for r in relevant if previous.get(r["job_id"]) != postings[r["job_id"]]]
+
+    if pending is not None:
+        pending.add(provider.name, company, etag, last_modified, body_hash, postings, previous,
+                    [r["job_id"] for r in relevant])
+    else:
+        store.save(provider.name, company, 200, etag, last_modified, body_hash, postings)
+    stats["changed"] += 1
+    log.info(f"{provider.label} {company}: {len(records)} vacantes totales, {len(relevant)} relevantes"
+             f"{' nuevas/modificadas' if only_new else ''}")
+    return relevant
+
+
+async def harvest_async(provider: BoardProvider, companies: List[str], keywords: List[str],
+                        only_new: bool = True, concurrency: int = CONCURRENCY,
+                        db_path: Optional[Path] = None,
+                        pending: Optional[PendingSnapshots] = None) -> List[dict]:
+    """Versión async de harvest() para quien ya corre dentro de un event loop."""
+    keywords = [kw.lower() for kw in keywords]
+    companies = list(dict.fromkeys(companies))
+    store = BoardSnapshots(db_path)
+    stats: Counter = Counter()
+    started = time.monotonic()
+    limits = httpx.Limits(max_connections=concurrency, max_keepalive_connections=concurrency)
+    try:
+        async with httpx.AsyncClient(timeout=TIMEOUT, limits=limits, follow_redirects=True,
+                                     headers={"User-Agent": USER_AGENT}) as client:
+            sem = asyncio.Semaphore(concurrency)
+            per_company = await asyncio.gather(*(
+                _harvest_company(client, sem, store, provider, company, keywords, only_new, stats, pending)
+                for company in companies
+            ))
+    finally:
+        store.close()
+
+    results = [r for records in per_company for r in records]
+    log.info(f"{provider.label} total: {len(results)} vacantes relevantes de {len(companies)} empresas "
+             f"en {time.monotonic() - started:.1f}s ({stats['changed']} con cambios, "
+             f"{stats['unchanged']} sin cambios, {stats['missing']} inexistentes, {stats['errors']} errores)")
+    return results
+
+
+def harvest(provider: BoardProvider, companies: List[str], keywords: List[str],
+            only_new: bool = True, concurrency: int = CONCURRENCY,
+            db_path: Optional[Path] = None,
+            pending: Optional[PendingSnapshots] = None) -> List[dict]:
+    """
+    Descarga los boards de `companies` en paralelo y devuelve los postings
+    cuyo título contiene alguna keyword.
+
+    only_new=True  → requests condicionales; solo postings nuevos o modificados
+                     desde la corrida anterior.
+    only_new=False → descarga todo y devuelve todos los relevantes (el snapshot
+                     se actualiza igual).
+    pending        → los boards con cambios no se guardan aquí sino en
+                     pending.commit(), después de escribir los jobs.
+    """
+    return asyncio.run(harvest_async(provider, companies, keywords, only_new, concurrency,
+                                     db_path, pending))
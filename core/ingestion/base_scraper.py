@@ -0,0 +1,334 @@
+#!/usr/bin/env python3
+"""
+AI JOB FOUNDRY - SCRAPER BASE
+=============================
+Piezas comunes de los scrapers de búsqueda (Indeed, Adzuna, OCC,
+Computrabajo, LinkedIn Search):
+
+  Job           : record tipado (dataclass con __slots__), una vacante
+  JobSink       : destino en streaming — cada job se manda en cuanto aparece,
+                  no al final de la corrida (enriquecimiento, filtros, storage)
+  SheetWriter   : UN escritor por proceso; dedup contra la pestaña destino y
+                  append en lotes mientras los scrapers siguen trabajando
+  BaseScraper   : run() / banner / resumen / guardado. La subclase solo
+                  implementa scrape(pool) y llama self.emit(job); las páginas
+                  se piden al AsyncBrowserPool (core/utils/browser_pool.py)
+  run_scrapers(): varias fuentes a la vez en un solo event loop, con un solo
+                  pool de browsers y un solo SheetWriter
+
+Uso:
+    await IndeedScraper().run(dry_run=True)          # standalone, igual que antes
+
+    results = await run_scrapers(
+        [LinkedInSearchScraper(), IndeedScraper(), OccScraper()],
+        dry_run=False,
+    )
+"""
+import os
+import asyncio
+from dataclasses import dataclass, field
+from datetime import datetime
+from typing import ClassVar, Dict, List, Optional
+
+from core.sheets.job_index import job_key
+
+GREEN = '\033[92m'; RED = '\033[91m'; YELLOW = '\033[93m'
+CYAN  = '\033[96m'; END = '\033[0m'
+
+# Filas por values.append; el resto se manda al cerrar
+SHEET_BATCH_SIZE = int(os.environ.get("SCRAPER_SHEET_BATCH_SIZE", "50"))
+
+
+def _now() -> str:
+    return datetime.now().strftime('%Y-%m-%d %H:%M:%S')
+
+
+def _today() -> str:
+    return datetime.now().strftime('%Y-%m-%d')
+
+
+@dataclass(slots=True)
+class Job:
+    """Una vacante encontrada por un scraper de búsqueda."""
+    role: str
+    company: str
+    location: str
+    apply_url: str
+    source: str
+    search_query: str = ""
+    query_source: str = ""
+    remote_scope: str = ""
+    salary_min: str = ""
+    salary_max: str = ""
+    status: str = "New"
+    created_at: str = field(default_factory=_now)
+    date_found: str = field(default_factory=_today)
+
+    # Columna del Sheet → atributo
+    COLUMNS: ClassVar[Dict[str, str]] = {
+        'Role': 'role', 'Company': 'company', 'Location': 'location',
+        'ApplyURL': 'apply_url', 'Source': 'source',
+        'SearchQuery': 'search_query', 'QuerySource': 'query_source',
+        'RemoteScope': 'remote_scope', 'SalaryMin': 'salary_min',
+        'SalaryMax': 'salary_max', 'Status': 'status',
+        'CreatedAt': 'created_at', 'DateFound': 'date_found',
+    }
+
+    def __post_init__(self):
+        self.role = (self.role or "").strip()[:100]
+        self.company = (self.company or "").strip()[:100]
+        self.location = (self.location or "").strip()[:100]
+        self.apply_url = (self.apply_url or "").strip()
+
+    @property
+    def key(self) -> str:
+        return job_key(self.apply_url)
+
+    # Acceso estilo dict por nombre de columna: job['Role'], job.get('ApplyURL')
+    def __getitem__(self, column: str):
+        return getattr(self, self.COLUMNS[column])
+
+    def get(self, column: str, default=None):
+        attr = self.COLUMNS.get(column)
+        return getattr(self, attr) if attr else default
+
+    def to_row(self, headers: List[str]) -> List[str]:
+        return [str(self.get(h, '') or '') for h in headers]
+
+
+class JobSink:
+    """Destino de jobs en streaming. put() se llama por cada job en cuanto se encuentra."""
+
+    async def put(self, job: Job) -> None:
+        raise NotImplementedError
+
+    async def close(self) -> None:
+        pass
+
+
+class _TabState:
+    __slots__ = ("tab_name", "headers", "known", "pending", "saved", "duplicates", "failed")
+
+    def __init__(self, tab_name: str, headers: List[str], known: set):
+        self.tab_name = tab_name
+        self.headers = headers
+        self.known = known
+        self.pending: List[Job] = []
+        self.saved = 0
+        self.duplicates = 0
+        self.failed = 0
+
+
+class SheetWriter:
+    """
+    Escritor único de Sheets para todas las fuentes de la corrida.
+    Dedup contra el JobIndex cross-tab del SheetManager (un job que ya está
+    en cualquier pestaña no se vuelve a agregar); cada job nuevo se encola y
+    se manda en lotes de SHEET_BATCH_SIZE con SheetManager.append_rows, que
+    lo registra en el índice. Las llamadas a la API corren en un thread para
+    no frenar el event loop.
+    """
+
+    def __init__(self, sheet_manager, batch_size: int = SHEET_BATCH_SIZE):
+        self.sheet_manager = sheet_manager
+        self.batch_size = batch_size
+        self._tabs: Dict[str, _TabState] = {}
+        self._index = None
+        self._lock = asyncio.Lock()
+
+    def for_tab(self, tab: str, headers: List[str]) -> "TabSink":
+        return TabSink(self, tab, headers)
+
+    def _open_tab(self, tab: str, headers: List[str]) -> _TabState:
+        sm = self.sheet_manager
+        sm.ensure_headers(tab, headers)
+        if self._index is None:
+            self._index = sm.get_job_index()
+        tab_name = sm.tabs.get(tab, tab)
+        # known = llaves encoladas en esta corrida; lo ya guardado lo responde el índice
+        return _TabState(tab_name, sm._get_headers(tab_name), set())
+
+    def _append(self, state: _TabState, jobs: List[Job]) -> None:
+        rows = [job.to_row(state.headers) for job in jobs]
+        if not self.sheet_manager.append_rows(state.tab_name, rows):
+            raise RuntimeError(f"append_rows falló ({len(rows)} filas)")
+
+    async def _flush(self, state: _TabState) -> None:
+        jobs, state.pending = state.pending, []
+        if not jobs:
+            return
+        try:
+            await asyncio.to_thread(self._append, state, jobs)
+            state.saved += len(jobs)
+        except Exception as e:
+            state.failed += len(jobs)
+            print(f"  {RED}Batch write error ({state.tab_name}): {e}{END}")
+
+    async def put(self, tab: str, headers: List[str], job: Job) -> None:
+        async with self._lock:
+            state = self._tabs.get(tab)
+            if state is None:
+                state = self._tabs[tab] = await asyncio.to_thread(self._open_tab, tab, headers)
+            key = job.key
+            if key in state.known or self._index.is_known(job.apply_url):
+                state.duplicates += 1
+                return
+            state.known.add(key)
+            state.pending.append(job)
+            if len(state.pending) >= self.batch_size:
+                await self._flush(state)
+
+    async def close(self) -> None:
+        async with self._lock:
+            for state in self._tabs.values():
+                await self._flush(state)
+        for state in self._tabs.values():
+            failed = f", {RED}{state.failed} con error{END}" if state.failed else ""
+            print(f"  {GREEN}{state.tab_name}: {state.saved} jobs nuevos guardados{END}, "
+                  f"{state.duplicates} ya estaban en el Sheet{failed}")
+
+
+class TabSink(JobSink):
+    """Vista de un SheetWriter para una pestaña concreta."""
+
+    def __init__(self, writer: SheetWriter, tab: str, headers: List[str]):
+        self.writer = writer
+        self.tab = tab
+        self.headers = headers
+
+    async def put(self, job: Job) -> None:
+        await self.writer.put(self.tab, self.headers, job)
+
+
+class BaseScraper:
+    """
+    Base de los scrapers de búsqueda.
+
+    Subclases definen:
+        name, title  : nombre corto (resumen) y línea del banner
+        tab, headers : pestaña destino y headers iniciales
+        uses_browser : True si scrape() pide páginas al pool de browsers
+        scrape(pool) : recorre las queries y llama `await self.emit(job)`
+    """
+
+    name: str = ""
+    title: str = "SCRAPER"
+    tab: str = ""
+    headers: List[str] = []
+    uses_browser: bool = False
+
+    def __init__(self, headless: bool = None, sink: Optional[JobSink] = None):
+        # headless=None → lee PLAYWRIGHT_HEADLESS del entorno (CI la pone a "true")
+        if headless is None:
+            headless = os.environ.get("PLAYWRIGHT_HEADLESS", "false").lower() == "true"
+        self.headless = headless
+        self.jobs_found: List[Job] = []
+        self.dry_run = True
+        self.sheet_manager = None
+        self.sink = sink
+        self._seen: set = set()
+
+    async def run(self, dry_run: bool = True, pool=None, writer: Optional[SheetWriter] = None):
+        """
+        Corre la búsqueda completa. En LIVE los jobs van al Sheet conforme
+        aparecen (writer compartido si se pasa, si no uno propio).
+        pool: AsyncBrowserPool compartido (run_scrapers); si es None y la
+        fuente lo necesita, se abre uno propio para esta corrida.
+        """
+        self.dry_run = dry_run
+        own_writer = None
+        if not dry_run and self.sink is None:
+            if writer is None:
+                from core.sheets.sheet_manager import SheetManager
+                self.sheet_manager = SheetManager()
+                writer = own_writer = SheetWriter(self.sheet_manager)
+            else:
+                self.sheet_manager = writer.sheet_manager
+            self.sink = writer.for_tab(self.tab, self.headers)
+
+        self.print_banner()
+        try:
+            if self.uses_browser and pool is None:
+                from core.utils.browser_pool import AsyncBrowserPool
+                from core.utils.resource_blocking import print_block_stats
+                async with AsyncBrowserPool() as pool:
+                    await self.scrape(pool)
+                print_block_stats()
+            else:
+                await self.scrape(pool)
+            self.print_summary()
+        finally:
+            if own_writer is not None:
+                print(f"\n{CYAN}Saving to Google Sheets → {self.tab} tab...{END}")
+                await own_writer.close()
+
+    async def scrape(self, pool) -> None:
+        raise NotImplementedError
+
+    async def emit(self, job: Job) -> bool:
+        """Registra un job y lo manda al sink. False si la URL ya salió en esta corrida."""
+        key = job.key
+        if not key or key in self._seen:
+            return False
+        self._seen.add(key)
+        self.jobs_found.append(job)
+        if self.sink is not None:
+            await self.sink.put(job)
+        return True
+
+    def print_banner(self) -> None:
+        print(f"\n{CYAN}{'='*70}")
+        print(self.title)
+        print(f"{'='*70}{END}")
+        print(f"Mode: {YELLOW}{'DRY RUN' if self.dry_run else 'LIVE'}{END}\n")
+
+    def print_summary(self) -> None:
+        print(f"\n{CYAN}{'='*70}")
+        print(f"{self.name} SCRAPING SUMMARY")
+        print(f"{'='*70}{END}")
+        print(f"  Total: {GREEN}{len(self.jobs_found)}{END}")
+        by_source: Dict[str, int] = {}
+        for j in self.jobs_found:
+            by_source[j.query_source] = by_source.get(j.query_source, 0) + 1
+        for k, v in by_source.items():
+            print(f"    {k}: {v} jobs")
+
+
+async def run_scrapers(scrapers: List[BaseScraper], dry_run: bool = True,
+                       headless: bool = None) -> Dict[str, object]:
+    """
+    Corre todas las fuentes a la vez en este event loop.
+    Un pool de browsers compartido (cada scraper pide páginas de su context
+    tibio) y un solo SheetWriter. Devuelve {clase: nº de jobs | Exception} — una fuente que
+    falla no detiene a las demás.
+    """
+    writer = None
+    if not dry_run:
+        from core.sheets.sheet_manager import SheetManager
+        writer = SheetWriter(SheetManager())
+
+    from core.utils.browser_pool import AsyncBrowserPool
+    from core.utils.resource_blocking import print_block_stats
+
+    if headless is not None:
+        for s in scrapers:
+            s.headless = headless
+
+    # El pool lanza cada browser la primera vez que una fuente pide página
+    async with AsyncBrowserPool() as pool:
+        outcomes = await asyncio.gather(
+            *(s.run(dry_run=dry_run, pool=pool, writer=writer) for s in scrapers),
+            return_exceptions=True,
+        )
+        if pool.stats.leases:
+            print(pool.stats.line())
+            print_block_stats()
+
+    if writer is not None:
+        print(f"\n{CYAN}Saving to Google Sheets...{END}")
+        await writer.close()
+
+    return {
+        type(s).__name__: (outcome if isinstance(outcome, BaseException) else len(s.jobs_found))
+        for s, outcome in zip(scrapers, outcomes)
+    }
@@ -6,17 +6,16 @@ Scraper de Computrabajo México usando Playwright.
 Escribe resultados directamente a la pestaña "Computrabajo" de Google Sheets.
 No requiere autenticación — Computrabajo es público.
 """
-import sys, os, asyncio
+import sys, asyncio
 import urllib.parse
 from pathlib import Path
 from datetime import datetime
-from playwright.async_api import async_playwright
 
 PROJECT_ROOT = Path(__file__).parent.parent.parent
 sys.path.insert(0, str(PROJECT_ROOT))
 
 from core.ingestion.queries import get_mexico_queries, get_latam_queries
-from core.sheets.sheet_manager import SheetManager
+from core.ingestion.base_scraper import BaseScraper, Job
 
 GREEN = '\033[92m'; RED = '\033[91m'; YELLOW = '\033[93m'
 CYAN  = '\033[96m'; END = '\033[0m'
@@ -39,50 +38,40 @@ _CARD_SELECTORS = [
 ]
 
 
-class ComputrabajoScraper:
-    def __init__(self, headless: bool = None):
-        if headless is None:
-            headless = os.environ.get("PLAYWRIGHT_HEADLESS", "false").lower() == "true"
-        self.headless   = headless
-        self.jobs_found: list[dict] = []
-        self.dry_run    = True
-        self.sheet_manager = None
-
-    async def run(self, dry_run: bool = True):
-        self.dry_run = dry_run
-        if not dry_run:
-            self.sheet_manager = SheetManager()
-
-        print(f"\n{CYAN}{'='*70}")
-        print(f"COMPUTRABAJO MX SCRAPER")
-        print(f"{'='*70}{END}")
-        print(f"Mode: {YELLOW}{'DRY RUN' if dry_run else 'LIVE'}{END}\n")
-
-        async with async_playwright() as p:
-            browser = await p.firefox.launch(headless=self.headless)
-            context = await browser.new_context(
-                user_agent="Mozilla/5.0 (Windows NT 10.0; Win64; x64) "
-                           "AppleWebKit/537.36 (KHTML, like Gecko) "
-                           "Chrome/120.0.0.0 Safari/537.36",
-                viewport={"width": 1280, "height": 900},
-            )
-            page = await context.new_page()
-
-            try:
-                for query, source in get_mexico_queries("es"):
-                    await self._search(page, query, source)
-                    await asyncio.sleep(4)
-
-                for query, source in get_latam_queries("es"):
-                    await self._search(page, query, source)
-                    await asyncio.sleep(4)
-
-                self._print_summary()
-
-                if not dry_run and self.jobs_found:
-                    self._save_to_sheets()
-            finally:
-                await browser.close()
+class ComputrabajoScraper(BaseScraper):
+    name = "COMPUTRABAJO"
+    title = "COMPUTRABAJO MX SCRAPER"
+    tab = "computrabajo"
+    headers = COMPUTRABAJO_HEADERS
+    uses_browser = True
+
+    async def scrape(self, pool):
+        async with pool.page(
+            engine="firefox", headless=self.headless, block="scraping",
+            user_agent="Mozilla/5.0 (Windows NT 10.0; Win64; x64) "
+                       "AppleWebKit/537.36 (KHTML, like Gecko) "
+                       "Chrome/120.0.0.0 Safari/537.36",
+            viewport={"width": 1280, "height": 900},
+        ) as page:
+            for query, source in get_mexico_queries("es"):
+                await self._search(page, query, source)
+                await asyncio.sleep(4)
+
+            for query, source in get_latam_queries("es"):
+                await self._search(page, query, source)
+                await asyncio.sleep(4)
+
+    async def _emit_jsonld(self, jsonld_jobs: list[dict], query: str, query_source: str) -> int:
+        count = 0
+        for jl in jsonld_jobs[:20]:
+            if await self.emit(Job(
+                role=jl["title"], company=jl["company"], location=jl["location"],
+                apply_url=jl["apply_url"], source='Computrabajo MX',
+                search_query=query, query_source=query_source,
+                remote_scope=jl["remote"],
+            )):
+                count += 1
+        return count
 
     async def _find_cards(self, page):
         """Try all card selectors and return the first non-empty match."""
@@ -171,22 +160,7 @@ class ComputrabajoScraper:
             jsonld_jobs = await self._extract_jsonld(page)
             if jsonld_jobs:
                 print(f"  JSON-LD: {len(jsonld_jobs)} jobs extracted")
-                count = 0
-                for jl in jsonld_jobs[:20]:
-                    self.jobs_found.append({
-                        'Role':        jl["title"][:100],
-                        'Company':     jl["company"][:100],
-                        'Location':    jl["location"][:100],
-                        'ApplyURL':    jl["apply_url"],
-                        'Source':      'Computrabajo MX',
-                        'SearchQuery': query,
-                        'QuerySource': query_source,
-                        'CreatedAt':   datetime.now().strftime('%Y-%m-%d %H:%M:%S'),
-                        'DateFound':   datetime.now().strftime('%Y-%m-%d'),
-                        'Status':      'New',
-                        'RemoteScope': jl["remote"],
-                    })
-                    count += 1
+                count = await self._emit_jsonld(jsonld_jobs, query, query_source)
                 print(f"  {GREEN}Found {count} jobs (JSON-LD){END}")
                 return
 
@@ -212,22 +186,7 @@ class ComputrabajoScraper:
                 jsonld_jobs = await self._extract_jsonld(page)
                 if jsonld_jobs:
                     print(f"  JSON-LD (fallback): {len(jsonld_jobs)} jobs extracted")
-                    count = 0
-                    for jl in jsonld_jobs[:20]:
-                        self.jobs_found.append({
-                            'Role':        jl["title"][:100],
-                            'Company':     jl["company"][:100],
-                            'Location':    jl["location"][:100],
-                            'ApplyURL':    jl["apply_url"],
-                            'Source':      'Computrabajo MX',
-                            'SearchQuery': query,
-                            'QuerySource': query_source,
-                            'CreatedAt':   datetime.now().strftime('%Y-%m-%d %H:%M:%S'),
-                        'DateFound':   datetime.now().strftime('%Y-%m-%d'),
-                            'Status':      'New',
-                            'RemoteScope': jl["remote"],
-                        })
-                        count += 1
+                    count = await self._emit_jsonld(jsonld_jobs, query, query_source)
                     print(f"  {GREEN}Found {count} jobs (JSON-LD fallback){END}")
                     return
 
@@ -270,20 +229,13 @@ class ComputrabajoScraper:
                               else "Hybrid" if ("híbrid" in loc_lower or "hybrid" in loc_lower)
                               else "OnSite")
 
-                    self.jobs_found.append({
-                        'Role':        title[:100],
-                        'Company':     company[:100],
-                        'Location':    location[:100],
-                        'ApplyURL':    apply_url,
-                        'Source':      'Computrabajo MX',
-                        'SearchQuery': query,
-                        'QuerySource': query_source,
-                        'CreatedAt':   datetime.now().strftime('%Y-%m-%d %H:%M:%S'),
-                        'DateFound':   datetime.now().strftime('%Y-%m-%d'),
-                        'Status':      'New',
-                        'RemoteScope': remote,
-                    })
-                    count += 1
+                    if await self.emit(Job(
+                        role=title, company=company, location=location,
+                        apply_url=apply_url, source='Computrabajo MX',
+                        search_query=query, query_source=query_source,
+                        remote_scope=remote,
+                    )):
+                        count += 1
                 except Exception:
                     continue
 
@@ -291,46 +243,3 @@ class ComputrabajoScraper:
 
         except Exception as e:
             print(f"  {RED}Error searching '{query}': {e}{END}")
-
-    def _print_summary(self):
-        print(f"\n{CYAN}{'='*70}")
-        print(f"COMPUTRABAJO SCRAPING SUMMARY")
-        print(f"{'='*70}{END}")
-        print(f"  Total: {GREEN}{len(self.jobs_found)}{END}")
-        by_source: dict[str, int] = {}
-        for j in self.jobs_found:
-            k = j['QuerySource']
-            by_source[k] = by_source.get(k, 0) + 1
-        for k, v in by_source.items():
-            print(f"    {k}: {v} jobs")
-
-    def _save_to_sheets(self):
-        print(f"\n{CYAN}Saving to Google Sheets → Computrabajo tab...{END}")
-        try:
-            self.sheet_manager.ensure_headers('computrabajo', COMPUTRABAJO_HEADERS)
-            existing_urls: set[str] = set()
-            try:
-                rows = self.sheet_manager.get_all_jobs(tab='computrabajo')
-                existing_urls = {r.get('ApplyURL', '') for r in rows}
-            except Exception:
-                pass
-
-            new_jobs = [j for j in self.jobs_found if j['ApplyURL'] not in existing_urls]
-            if not new_jobs:
-                print(f"  {YELLOW}No new jobs (all duplicates){END}")
-                return
-
-            tab_name = self.sheet_manager.tabs['computrabajo']
-            headers  = self.sheet_manager._get_headers(tab_name)
-            rows_out = [[str(j.get(h, '') or '') for h in headers] for j in new_jobs]
-            self.sheet_manager.service.spreadsheets().values().append(
-                spreadsheetId=self.sheet_manager.spreadsheet_id,
-                range=f"{tab_name}!A2",
-                valueInputOption="USER_ENTERED",
-                insertDataOption="INSERT_ROWS",
-                body={"values": rows_out},
-            ).execute()
-            print(f"  {GREEN}Saved {len(new_jobs)} new jobs to Computrabajo tab{END}")
-        except Exception as e:
-            print(f"  {RED}Error saving to Sheets: {e}{END}")
-            raise
@@ -7,16 +7,22 @@ API pública: https://boards-api.greenhouse.io/v1/boards/{company}/jobs
 NO modifica código existente — agrega una nueva fuente al pipeline.
 Integración: usar desde scripts/scrape_greenhouse_ashby.py
 
+Las descargas van en paralelo vía core.ingestion.ats_harvester (httpx async,
+requests condicionales y snapshot por empresa).
+
 Uso:
     from core.ingestion.greenhouse_scraper import scrape_greenhouse
     jobs = scrape_greenhouse(["stripe", "airbnb", "figma"])
+    jobs = scrape_greenhouse(companies, only_new=True)   # solo nuevas/modificadas
 """
 
-import requests
+import re
 import logging
 from datetime import datetime
 from typing import Optional
 
+from core.ingestion.ats_harvester import BoardProvider, PendingSnapshots, harvest
+
 log = logging.getLogger(__name__)
 
 GREENHOUSE_API = "https://boards-api.greenhouse.io/v1/boards/{company}/jobs?content=true"
@@ -36,73 +42,65 @@ PM_KEYWORDS = [
 ]
 
 
-def scrape_greenhouse(companies: list[str] = None, keywords: list[str] = None) -> list[dict]:
+def parse_board(company: str, data: dict) -> list[dict]:
+    """Convierte el JSON del board en records del pipeline (todos los postings)."""
+    records = []
+    for job in data.get("jobs", []):
+        location = ""
+        for loc in job.get("offices", []):
+            location = loc.get("name", "")
+            break
+
+        records.append({
+            "title":       job.get("title", ""),
+            "company":     company.capitalize(),
+            "location":    location,
+            "url":         job.get("absolute_url", ""),
+            "source":      "greenhouse",
+            "job_id":      str(job.get("id", "")),
+            "posted_at":   job.get("updated_at", datetime.now().isoformat()),
+            "description": _extract_description(job),
+        })
+    return records
+
+
+GREENHOUSE = BoardProvider(
+    name="greenhouse",
+    label="Greenhouse",
+    url=GREENHOUSE_API,
+    parse=parse_board,
+)
+
+
+def scrape_greenhouse(companies: list[str] = None, keywords: list[str] = None,
+                      only_new: bool = False,
+                      pending: Optional[PendingSnapshots] = None) -> list[dict]:
     """
     Descarga vacantes de empresas en Greenhouse ATS.
 
     Args:
         companies: lista de slugs de empresa (ej: ["stripe", "airbnb"])
         keywords: palabras clave para filtrar por título
+        only_new: solo vacantes nuevas o modificadas desde la corrida anterior
+        pending: PendingSnapshots para guardar el snapshot después de escribir
 
     Returns:
         lista de dicts con formato compatible con ai-job-foundry pipeline
     """
-    companies = companies or DEFAULT_COMPANIES
-    keywords  = keywords  or PM_KEYWORDS
-    results   = []
-
-    for company in companies:
-        try:
-            url  = GREENHOUSE_API.format(company=company)
-            resp = requests.get(url, timeout=15, headers={"User-Agent": "Mozilla/5.0"})
-            if resp.status_code == 404:
-                log.debug(f"Greenhouse: {company} no encontrado")
-                continue
-            if resp.status_code != 200:
-                log.warning(f"Greenhouse {company}: HTTP {resp.status_code}")
-                continue
-
-            data = resp.json()
-            jobs = data.get("jobs", [])
-            log.info(f"Greenhouse {company}: {len(jobs)} vacantes totales")
-
-            for job in jobs:
-                title = job.get("title", "").lower()
-                if not any(kw in title for kw in keywords):
-                    continue
-
-                location = ""
-                for loc in job.get("offices", []):
-                    location = loc.get("name", "")
-                    break
-
-                results.append({
-                    "title":       job.get("title", ""),
-                    "company":     company.capitalize(),
-                    "location":    location,
-                    "url":         job.get("absolute_url", ""),
-                    "source":      "greenhouse",
-                    "job_id":      str(job.get("id", "")),
-                    "posted_at":   job.get("updated_at", datetime.now().isoformat()),
-                    "description": _extract_description(job),
-                })
-
-            log.info(f"Greenhouse {company}: {sum(1 for r in results if r['company'] == company.capitalize())} relevantes")
-
-        except Exception as e:
-            log.warning(f"Greenhouse {company} error: {e}")
-
-    log.info(f"Greenhouse total: {len(results)} vacantes relevantes de {len(companies)} empresas")
-    return results
+    return harvest(GREENHOUSE, companies or DEFAULT_COMPANIES, keywords or PM_KEYWORDS,
+                   only_new=only_new, pending=pending)
+
+
+_TAGS = re.compile(r"<[^>]+>")
+_SPACES = re.compile(r"\s+")
 
 
 def _extract_description(job: dict) -> str:
     """Extrae descripción limpia del job."""
     content = job.get("content", "") or ""
     # Remover HTML básico
-    import re
-    clean = re.sub(r"<[^>]+>", " ", content)
-    clean = re.sub(r"\s+", " ", clean).strip()
+    clean = _TAGS.sub(" ", content)
+    clean = _SPACES.sub(" ", clean).strip()
     return clean[:500]
 
 
@@ -17,20 +17,23 @@ LABEL_PATH      = "JOBS/Inbound"
 QUERY_DAYS      = 60
 MAX_RESULTS     = 50
 LOG_TO_FILE     = True
-SEEN_IDS_FILE   = "state/seen_ids.json"
+SEEN_IDS_FILE   = "state/seen_ids.json"   # legado: se importa 1 vez a gmail_sync.db
 
 # OAuth
 CLIENT_SECRETS_FILE = "data/credentials/credentials.json"
 TOKEN_PATH          = "data/credentials/token.json"
 # ====================================================
 
-import re, json, base64, pathlib, datetime as dt
+import re, sys, base64, pathlib, datetime as dt
 from email import policy
 from email.parser import BytesParser
 from urllib.parse import urlparse, parse_qsl, urlunparse, urlencode
 
 pathlib.Path("state").mkdir(exist_ok=True)
 
+sys.path.insert(0, str(pathlib.Path(__file__).resolve().parent.parent.parent))
+from core.sheets.job_index import JobIndex, job_key
+
 # ---- columnas únicas y en orden (24 -> X)
 HEADERS = [
     "CreatedAt","Company","Role","Location","RemoteScope",
@@ -51,7 +54,8 @@ def log(msg: str):
 from google.oauth2.credentials import Credentials
 from google_auth_oauthlib.flow import InstalledAppFlow
 from google.auth.transport.requests import Request
-from googleapiclient.discovery import build
+from core.utils.google_clients import build_service
+from core.utils.gmail_sync import GmailSync
 
 SCOPES = [
     'https://www.googleapis.com/auth/spreadsheets',
@@ -77,8 +81,8 @@ def get_creds():
             f.write(creds.to_json())
     return creds
 
-def gmail_service(creds):  return build("gmail", "v1", credentials=creds)
-def sheets_service(creds): return build("sheets", "v4", credentials=creds)
+def gmail_service(creds):  return build_service("gmail", "v1", creds)
+def sheets_service(creds): return build_service("sheets", "v4", creds)
 
 # ========= URL helpers =========
 STRIP_PARAMS = {
@@ -161,27 +165,11 @@ def ensure_tab_exists_and_headers(ssvc, tab: str):
         except Exception as e2:
             log(f"[SHEETS] Error headers {tab}: {e2}")
 
-def existing_urls_set(ssvc, tabs: list[str]) -> set[str]:
-    s = set()
-    for tab in tabs:
-        try:
-            res = ssvc.spreadsheets().values().get(
-                spreadsheetId=SHEET_ID, range=f"{tab}!A:Z"
-            ).execute()
-            vals = res.get("values", [])
-            if not vals: 
-                continue
-            headers, rows = vals[0], vals[1:]
-            try:
-                idx = headers.index("ApplyURL")
-            except ValueError:
-                continue
-            for r in rows:
-                if idx < len(r) and r[idx]:
-                    s.add(normalize_url(r[idx]))
-        except Exception:
-            pass
-    return s
+def existing_urls_set(ssvc) -> JobIndex:
+    """Índice compartido de jobs conocidos en TODAS las pestañas (llave canónica)."""
+    index = JobIndex(SHEET_ID)
+    index.load(ssvc, SHEET_ID)
+    return index
 
 def row_from_dict(d: dict) -> list[str]:
     """Convierte dict -> fila en el orden exacto de HEADERS."""
@@ -225,11 +213,18 @@ def detect_tab_from_url(url: str) -> str:
     return TAB_REGISTRY
 
 # ========= Gmail parsing =========
-def list_message_ids(gsvc, query, max_results=50):
-    log(f"[GMAIL] Query: {query}")
-    res = gsvc.users().messages().list(userId="me", q=query, maxResults=max_results).execute()
-    ids = [m["id"] for m in res.get("messages", [])]
-    log(f"[GMAIL] {len(ids)} mensajes candidatos")
+def label_id_for(gsvc, name: str):
+    for lab in gsvc.users().labels().list(userId="me").execute().get("labels", []):
+        if lab["name"] == name:
+            return lab["id"]
+    return None
+
+def list_message_ids(sync: GmailSync, label_id, query, max_results=50):
+    """Nuevos desde el último historyId; query solo aplica en resync completo."""
+    # Sin label no se puede filtrar el history → se lista por query como antes
+    ids = sync.new_message_ids(label_id=label_id, query=query, max_results=max_results,
+                               force_full=label_id is None)
+    log(f"[GMAIL] sync={sync.mode} nuevos={sync.discovered} · {len(ids)} mensajes candidatos")
     return ids
 
 def get_message(gsvc, msg_id):
@@ -401,18 +396,6 @@ def parse_job_fields(source, subject, body, url):
     }
     return row
 
-# ========= Seen IDs =========
-def load_seen_ids():
-    try:
-        with open(SEEN_IDS_FILE, "r", encoding="utf-8") as f:
-            return set(json.load(f))
-    except Exception:
-        return set()
-
-def save_seen_ids(ids):
-    with open(SEEN_IDS_FILE, "w", encoding="utf-8") as f:
-        json.dump(sorted(list(ids)), f)
-
 # ========= Main =========
 def main():
     print("="*70)
@@ -429,35 +412,36 @@ def main():
     for tab in (TAB_REGISTRY, TAB_LINKEDIN, TAB_INDEED, TAB_GLASSDOOR):
         ensure_tab_exists_and_headers(ssvc, tab)
 
-    # Dedupe global por ApplyURL (todas las pestañas)
-    all_urls = existing_urls_set(ssvc, [TAB_REGISTRY, TAB_LINKEDIN, TAB_INDEED, TAB_GLASSDOOR])
+    # Dedupe global por llave canónica (todas las pestañas). Las llaves se
+    # registran en el índice solo después de que el append a Sheets funcionó;
+    # mientras tanto, `queued` evita duplicados dentro de esta corrida.
+    job_index = existing_urls_set(ssvc)
+    queued = set()
 
     def maybe_add(tab_name, row_dict, buckets):
         url = row_dict.get("ApplyURL","")
         if url:
             u = normalize_url(url)
-            if u in all_urls:
+            key = job_key(u)
+            if key in queued or job_index.is_known(u):
                 log(f"[SKIP] Duplicada por URL -> {u}")
                 return False
-            all_urls.add(u)
+            queued.add(key)
             row_dict["ApplyURL"] = u
         buckets[tab_name].append(row_dict)
         return True
 
-    # Buscar mensajes
+    # Buscar mensajes (incremental por historyId)
+    sync = GmailSync(gsvc, scope="ingest_v2")
+    sync.import_legacy(pathlib.Path(SEEN_IDS_FILE))
     query = f'label:"{LABEL_PATH}" newer_than:{QUERY_DAYS}d'
-    ids = list_message_ids(gsvc, query, MAX_RESULTS)
-
-    seen = load_seen_ids()
-    new_seen = set(seen)
+    ids = list_message_ids(sync, label_id_for(gsvc, LABEL_PATH), query, MAX_RESULTS)
+    new_seen = []
 
     rows_by_tab = {TAB_REGISTRY: [], TAB_LINKEDIN: [], TAB_INDEED: [], TAB_GLASSDOOR: []}
     inspected = 0
 
     for mid in ids:
-        if mid in seen:
-            log(f"  - {mid} ya procesado (skip).")
-            continue
         inspected += 1
 
         msg = get_message(gsvc, mid)
@@ -472,21 +456,24 @@ def main():
 
         if not url and len(subject.strip()) < 6:
             log("    -> descartado: sin URL y subject corto")
-            new_seen.add(mid)
+            new_seen.append(mid)
             continue
 
         row = parse_job_fields(source, subject, body, url)
         maybe_add(tab, row, rows_by_tab)
-        new_seen.add(mid)
+        new_seen.append(mid)
 
     # Escribir por pestaña
     total = 0
     for tab, rows in rows_by_tab.items():
         n = append_rows(ssvc, tab, rows)
+        job_index.add_many([r["ApplyURL"] for r in rows if r.get("ApplyURL")], tab)
         total += n
         log(f"[SHEETS] {tab}: insertadas {n} filas")
 
-    save_seen_ids(new_seen)
+    # Se marcan después de escribir: si el append falla, quedan pendientes
+    sync.mark_many(new_seen)
+    sync.close()
     log(f"Listo. Nuevas filas insertadas: {total}. Correos inspeccionados: {inspected}")
 
 if __name__ == "__main__":
@@ -17,29 +17,38 @@ Strategy: Two-track search to return only Mexico/LATAM-eligible roles.
   Post-filter: is_us_only() drops any card whose location indicates a
                US state/city without a LATAM/Mexico/global hint.
 
+Concurrency: queries run on N tabs of the same logged-in context
+(LINKEDIN_SEARCH_CONCURRENCY, default 3). Every navigation across all tabs
+goes through one politeness budget (LINKEDIN_NAV_INTERVAL seconds apart).
+Each query pages through results with &start= (LINKEDIN_SEARCH_MAX_PAGES
+pages of 25), and each results page is read with a single DOM pass.
+
 Keywords updated 2026-04-28
 Target companies: Accenture, Deloitte, KPMG, Capgemini, IBM, SAP, Oracle
 
 Usage:
     py core/ingestion/linkedin_search_scraper_v3.py --dry-run  # Test mode
     py core/ingestion/linkedin_search_scraper_v3.py --live     # Save to Sheets
+    py core/ingestion/linkedin_search_scraper_v3.py --dry-run --concurrency 2 --max-pages 2
 """
 
 import sys
 import os
+import random
 import asyncio
+from contextlib import AsyncExitStack
 from pathlib import Path
-from datetime import datetime
 import argparse
-from playwright.async_api import async_playwright, Page
+from playwright.async_api import Page
 
 # Add project root to path
 PROJECT_ROOT = Path(__file__).parent.parent.parent
 sys.path.insert(0, str(PROJECT_ROOT))
 
-from core.sheets.sheet_manager import SheetManager
+from core.ingestion.base_scraper import BaseScraper, Job
 from core.utils.linkedin_credentials import get_linkedin_credentials
 from core.ingestion.queries import get_mexico_queries, get_latam_queries
+from core.utils.browser_pool import LINKEDIN_AUTH_FILE
 
 # Colors
 GREEN = '\033[92m'
@@ -56,6 +65,102 @@ LINKEDIN_HEADERS = [
 # GeoId de México en LinkedIn
 MEXICO_GEO_ID = "103323778"
 
+# Concurrencia / paginación (override por env)
+SEARCH_CONCURRENCY  = int(os.environ.get("LINKEDIN_SEARCH_CONCURRENCY", "3"))
+MAX_PAGES_PER_QUERY = int(os.environ.get("LINKEDIN_SEARCH_MAX_PAGES", "3"))
+RESULTS_PER_PAGE    = 25   # LinkedIn pagina con &start=0,25,50...
+# Presupuesto global de cortesía: segundos mínimos entre navegaciones (todas las pestañas)
+NAV_INTERVAL        = float(os.environ.get("LINKEDIN_NAV_INTERVAL", "2.0"))
+
+# Extract job cards - multiple selectors for LinkedIn 2025/2026 UI
+CARD_SELECTORS = [
+    'div.job-search-card',                          # old UI
+    'li.jobs-search-results__list-item',            # logged-in feed
+    'div[data-job-id]',                             # data attribute
+    'li[data-occludable-job-id]',                   # occludable list
+    '.scaffold-layout__list-item',                  # scaffold layout
+    'li.ember-view.jobs-search-results__list-item', # ember variant
+]
+
+# Dismiss any login/signup popups — try multiple known selectors
+POPUP_SELECTORS = [
+    'button[aria-label="Dismiss"]',
+    'button[aria-label="Dismiss Sign In Modal"]',
+    'button.modal__dismiss',
+    '[data-tracking-control-name="public_jobs_contextual-sign-in-modal_modal_dismiss"]',
+    'button.contextual-sign-in-modal__modal-dismiss-btn',
+    '[aria-label="Cerrar"]',
+    'button[data-modal-dismiss]',
+    '.sign-in-modal button.dismiss',
+]
+
+# Un solo round-trip por página de resultados: todos los campos de todas las cards
+EXTRACT_CARDS_JS = """
+(selectors) => {
+    let cards = [];
+    for (const sel of selectors) {
+        cards = document.querySelectorAll(sel);
+        if (cards.length) break;
+    }
+    const text = (card, sel) => {
+        const el = card.querySelector(sel);
+        return el ? el.innerText.trim() : "";
+    };
+    return Array.from(cards).map(card => {
+        const link = card.querySelector('a.base-card__full-link, a.job-card-list__title, a[class*="job-card"]');
+        return {
+            title:    text(card, 'h3.base-search-card__title, a.job-card-list__title, .job-card-container__link strong, h3[class*="title"]'),
+            company:  text(card, 'h4.base-search-card__subtitle, .job-card-container__company-name, a[class*="company"], span[class*="company"]'),
+            location: text(card, 'span.job-search-card__location, .job-card-container__metadata-item, li[class*="location"]'),
+            url:      link ? link.href : "",
+        };
+    });
+}
+"""
+
+COUNT_CARDS_JS = """
+(selectors) => {
+    for (const sel of selectors) {
+        const n = document.querySelectorAll(sel).length;
+        if (n) return n;
+    }
+    return 0;
+}
+"""
+
+DISMISS_POPUP_JS = """
+(selectors) => {
+    for (const sel of selectors) {
+        const btn = document.querySelector(sel);
+        if (btn) { btn.click(); return sel; }
+    }
+    return null;
+}
+"""
+
+
+class NavBudget:
+    """
+    Presupuesto global de cortesía: como máximo una navegación cada
+    `interval` segundos (con jitter) entre TODAS las pestañas.
+    """
+
+    def __init__(self, interval: float = NAV_INTERVAL):
+        self.interval = interval
+        self._lock = asyncio.Lock()
+        self._next = 0.0
+        self.navigations = 0
+
+    async def wait(self):
+        async with self._lock:
+            loop = asyncio.get_running_loop()
+            now = loop.time()
+            if self._next > now:
+                await asyncio.sleep(self._next - now)
+                now = loop.time()
+            self._next = now + self.interval * random.uniform(0.8, 1.3)
+            self.navigations += 1
+
 # Frases que indican que el rol es SOLO para residentes de USA (descartar)
 US_ONLY_PHRASES = [
     "must be located in",
@@ -72,98 +177,93 @@ US_ONLY_PHRASES = [
 ]
 
 
-class LinkedInSearchScraper:
+class LinkedInSearchScraper(BaseScraper):
     """
     LinkedIn job search scraper
     Searches for specific keywords and extracts job listings.
     Filters results to Mexico/LATAM-eligible roles only.
     """
 
-    def __init__(self, dry_run=True, headless=None):
-        self.dry_run = dry_run
-        self.jobs_found = []
-        self.sheet_manager = SheetManager() if not dry_run else None
+    name = "LINKEDIN SEARCH"
+    title = "LINKEDIN SEARCH SCRAPER V3"
+    tab = "linkedin"
+    headers = LINKEDIN_HEADERS
+    uses_browser = True
+
+    def __init__(self, dry_run=True, headless=None, concurrency: int = SEARCH_CONCURRENCY,
+                 max_pages: int = MAX_PAGES_PER_QUERY, sink=None):
         # headless=None → lee PLAYWRIGHT_HEADLESS del entorno (CI la pone a "true")
         # headless=True/False → override explícito
-        if headless is None:
-            self.headless = os.environ.get("PLAYWRIGHT_HEADLESS", "false").lower() == "true"
-        else:
-            self.headless = headless
+        super().__init__(headless=headless, sink=sink)
+        self.dry_run = dry_run
+        self.concurrency = max(1, concurrency)
+        self.max_pages = max(1, max_pages)
+        self.nav_budget = NavBudget()
 
-    async def run(self, dry_run=None):
+    async def run(self, dry_run=None, pool=None, writer=None):
         """Main scraping workflow. dry_run param sobreescribe el del constructor si se pasa."""
-        if dry_run is not None:
-            self.dry_run = dry_run
-            if dry_run and self.sheet_manager is None:
-                pass  # ya estaba en dry_run
-            elif not dry_run and self.sheet_manager is None:
-                self.sheet_manager = SheetManager()
-
-        print(f"\n{CYAN}{'='*70}")
-        print(f"LINKEDIN SEARCH SCRAPER V3")
-        print(f"{'='*70}{END}")
-        print(f"Mode: {YELLOW}{'DRY RUN' if self.dry_run else 'LIVE'}{END}\n")
-
-        async with async_playwright() as p:
-            # Launch browser — headless en CI, visible en local
-            print(f"{CYAN}Launching browser...{END}")
-            browser = await p.firefox.launch(headless=self.headless)
-
-            # Reusar sesion guardada si existe
-            AUTH_FILE = PROJECT_ROOT / "data" / "credentials" / "linkedin_auth.json"
-            if AUTH_FILE.exists():
-                print(f"{CYAN}Reusing saved LinkedIn session from {AUTH_FILE}{END}")
-                context = await browser.new_context(storage_state=str(AUTH_FILE))
-            else:
-                context = await browser.new_context()
-            page = await context.new_page()
+        if dry_run is None:
+            dry_run = self.dry_run
+        await super().run(dry_run=dry_run, pool=pool, writer=writer)
+
+    async def scrape(self, pool):
+        # Context tibio "linkedin" del pool: ya trae la sesion guardada si existe
+        if LINKEDIN_AUTH_FILE.exists():
+            print(f"{CYAN}Reusing saved LinkedIn session from {LINKEDIN_AUTH_FILE}{END}")
+
+        async with AsyncExitStack() as stack:
+            async def lease() -> Page:
+                return await stack.enter_async_context(
+                    pool.page("linkedin", engine="firefox", headless=self.headless,
+                              block="scraping"))
+
+            page = await lease()
+
+            # Login
+            if not await self.login(page):
+                print(f"{RED}Login failed{END}")
+                return
 
+            # Cola de queries: Mexico (geoId) + LATAM global (keyword ya filtra)
+            work: asyncio.Queue = asyncio.Queue()
+            for query, query_source in get_mexico_queries("en"):
+                work.put_nowait(("MX", query, query_source, MEXICO_GEO_ID))
+            for query, query_source in get_latam_queries("en"):
+                work.put_nowait(("LATAM", query, query_source, None))
+
+            # N pestañas del mismo contexto → comparten la sesión de linkedin_auth.json
+            n_tabs = min(self.concurrency, work.qsize())
+            pages = [page] + [await lease() for _ in range(n_tabs - 1)]
+            print(f"{CYAN}Searching {work.qsize()} queries on {len(pages)} tabs "
+                  f"(≤{self.max_pages} pages each, 1 nav / {self.nav_budget.interval:.1f}s){END}")
+
+            # Cada worker emite sus jobs en cuanto termina una query;
+            # emit() descarta el mismo job encontrado por varias queries
+            started = asyncio.get_running_loop().time()
+            await asyncio.gather(*(self._search_worker(pg, work) for pg in pages))
+            elapsed = asyncio.get_running_loop().time() - started
+            print(f"\n{CYAN}Sweep done in {elapsed:.0f}s — "
+                  f"{self.nav_budget.navigations} navigations{END}")
+
+    async def _search_worker(self, page: Page, work: asyncio.Queue) -> None:
+        """Toma queries de la cola hasta vaciarla y emite los jobs elegibles."""
+        while True:
             try:
-                # Login
-                if not await self.login(page):
-                    print(f"{RED}Login failed{END}")
-                    return
-
-                # Search Mexico-targeted queries
-                for query, query_source in get_mexico_queries("en"):
-                    print(f"\n{CYAN}{'='*70}")
-                    print(f"[MX] Searching: {query}")
-                    print(f"{'='*70}{END}")
-                    jobs = await self.search_jobs(page, query, geo_id=MEXICO_GEO_ID, query_source=query_source)
-                    # Filter US-only
-                    before = len(jobs)
-                    jobs = [j for j in jobs if not self.is_us_only(j)]
-                    filtered = before - len(jobs)
-                    if filtered:
-                        print(f"  {YELLOW}Filtered {filtered} US-only jobs{END}")
-                    self.jobs_found.extend(jobs)
-                    print(f"  {GREEN}Found {len(jobs)} Mexico-eligible jobs{END}")
-                    await asyncio.sleep(3)
-
-                # Search LATAM global queries (no geo filter, keyword already filters)
-                for query, query_source in get_latam_queries("en"):
-                    print(f"\n{CYAN}{'='*70}")
-                    print(f"[LATAM] Searching: {query}")
-                    print(f"{'='*70}{END}")
-                    jobs = await self.search_jobs(page, query, geo_id=None, query_source=query_source)
-                    before = len(jobs)
-                    jobs = [j for j in jobs if not self.is_us_only(j)]
-                    filtered = before - len(jobs)
-                    if filtered:
-                        print(f"  {YELLOW}Filtered {filtered} US-only jobs{END}")
-                    self.jobs_found.extend(jobs)
-                    print(f"  {GREEN}Found {len(jobs)} LATAM-eligible jobs{END}")
-                    await asyncio.sleep(3)
-
-                # Summary
-                self.print_summary()
-
-                # Save to Sheets
-                if not self.dry_run and self.jobs_found:
-                    self.save_to_sheets()
-
-            finally:
-                await browser.close()
+                track, query, query_source, geo_id = work.get_nowait()
+            except asyncio.QueueEmpty:
+                return
+            print(f"\n{CYAN}[{track}] Searching: {query}{END}")
+            jobs = await self.search_jobs(page, query, geo_id=geo_id, query_source=query_source)
+            # Filter US-only
+            before = len(jobs)
+            jobs = [j for j in jobs if not self.is_us_only(j)]
+            filtered = before - len(jobs)
+            if filtered:
+                print(f"  {YELLOW}[{query}] Filtered {filtered} US-only jobs{END}")
+            label = "Mexico" if track == "MX" else "LATAM"
+            print(f"  {GREEN}[{query}] Found {len(jobs)} {label}-eligible jobs{END}")
+            for job in jobs:
+                await self.emit(job)
 
     async def login(self, page: Page) -> bool:
         """Login to LinkedIn - first tries saved session, then fresh login"""
@@ -194,9 +294,8 @@ class LinkedInSearchScraper:
             current_url = page.url
             if 'feed' in current_url or 'jobs' in current_url:
                 # Save session for next time
-                AUTH_FILE = PROJECT_ROOT / "data" / "credentials" / "linkedin_auth.json"
-                AUTH_FILE.parent.mkdir(parents=True, exist_ok=True)
-                await page.context.storage_state(path=str(AUTH_FILE))
+                LINKEDIN_AUTH_FILE.parent.mkdir(parents=True, exist_ok=True)
+                await page.context.storage_state(path=str(LINKEDIN_AUTH_FILE))
                 print(f"{GREEN}Logged in and session saved{END}")
                 return True
             elif 'checkpoint' in current_url or 'challenge' in current_url:
@@ -211,142 +310,117 @@ class LinkedInSearchScraper:
             print(f"{RED}Login error: {e}{END}")
             return False
 
-    async def search_jobs(self, page: Page, query: str, max_results=20, geo_id: str = None, query_source: str = "") -> list:
+    async def search_jobs(self, page: Page, query: str, max_results: int = None,
+                          geo_id: str = None, query_source: str = "") -> list:
         """
-        Search for jobs with given query
+        Search for jobs with given query, paging with &start= until
+        max_results, self.max_pages or a page without new cards.
 
         Args:
             page: Playwright page
             query: Search query
-            max_results: Max jobs to extract
+            max_results: Max jobs to extract (default: max_pages * 25)
             geo_id: LinkedIn geoId for location filter (e.g. MEXICO_GEO_ID)
 
         Returns:
-            List of job dicts
+            List of Job records
         """
+        if max_results is None:
+            max_results = self.max_pages * RESULTS_PER_PAGE
         jobs = []
+        seen = set()
 
-        try:
-            # Build URL — with Mexico geoId if requested
-            encoded_query = query.replace(' ', '%20')
-            if geo_id:
-                search_url = f"https://www.linkedin.com/jobs/search/?keywords={encoded_query}&location=M%C3%A9xico&geoId={geo_id}&f_WT=2&f_LF=f_AL"
-            else:
-                search_url = f"https://www.linkedin.com/jobs/search/?keywords={encoded_query}&f_WT=2&f_LF=f_AL"
-
-            print(f"  {CYAN}Opening: {search_url}{END}")
-            await page.goto(search_url, wait_until='domcontentloaded', timeout=30000)
-            await asyncio.sleep(5)
-
-            # Dismiss any login/signup popups — try multiple known selectors
-            popup_selectors = [
-                'button[aria-label="Dismiss"]',
-                'button[aria-label="Dismiss Sign In Modal"]',
-                'button.modal__dismiss',
-                '[data-tracking-control-name="public_jobs_contextual-sign-in-modal_modal_dismiss"]',
-                'button.contextual-sign-in-modal__modal-dismiss-btn',
-                '[aria-label="Cerrar"]',
-                'button[data-modal-dismiss]',
-                '.sign-in-modal button.dismiss',
-            ]
-            for sel in popup_selectors:
-                try:
-                    btn = page.locator(sel)
-                    if await btn.count() > 0:
-                        await btn.first.click(timeout=2000)
-                        await asyncio.sleep(0.5)
-                        break
-                except Exception:
-                    continue
-            # Also press Escape as fallback — closes most LinkedIn modals
+        # Build URL — with Mexico geoId if requested
+        encoded_query = query.replace(' ', '%20')
+        if geo_id:
+            base_url = f"https://www.linkedin.com/jobs/search/?keywords={encoded_query}&location=M%C3%A9xico&geoId={geo_id}&f_WT=2&f_LF=f_AL"
+        else:
+            base_url = f"https://www.linkedin.com/jobs/search/?keywords={encoded_query}&f_WT=2&f_LF=f_AL"
+
+        for page_num in range(self.max_pages):
+            if len(jobs) >= max_results:
+                break
+            search_url = f"{base_url}&start={page_num * RESULTS_PER_PAGE}"
             try:
-                await page.keyboard.press('Escape')
-                await asyncio.sleep(0.5)
-            except Exception:
-                pass
-
-            # Scroll to load more jobs
-            for i in range(3):
-                await page.evaluate("window.scrollTo(0, document.body.scrollHeight)")
-                await asyncio.sleep(2)
-
-            # Extract job cards - multiple selectors for LinkedIn 2025/2026 UI
-            CARD_SELECTORS = [
-                'div.job-search-card',                          # old UI
-                'li.jobs-search-results__list-item',            # logged-in feed
-                'div[data-job-id]',                             # data attribute
-                'li[data-occludable-job-id]',                   # occludable list
-                '.scaffold-layout__list-item',                  # scaffold layout
-                'li.ember-view.jobs-search-results__list-item', # ember variant
-            ]
-
-            job_cards = None
-            count = 0
-            for sel in CARD_SELECTORS:
-                candidate = page.locator(sel)
-                c = await candidate.count()
-                if c > 0:
-                    job_cards = candidate
-                    count = c
-                    print(f"  {CYAN}Selector '{sel}' -> {c} cards{END}")
+                cards = await self._load_results_page(page, search_url)
+            except Exception as e:
+                print(f"  {RED}[{query}] Search error (page {page_num + 1}): {e}{END}")
+                break
+
+            new_on_page = 0
+            for card in cards:
+                url = card.get('url') or ""
+                # Clean URL (remove tracking params)
+                if '?' in url:
+                    url = url.split('?')[0]
+                if not url or url in seen:
+                    continue
+                seen.add(url)
+                new_on_page += 1
+
+                jobs.append(Job(
+                    role=card.get('title') or "Unknown",
+                    company=card.get('company') or "Unknown",
+                    location=card.get('location') or "Unknown",
+                    apply_url=url,
+                    source='LinkedIn Search',
+                    search_query=query,
+                    query_source=query_source,
+                    remote_scope='Remote',  # We filtered for remote
+                ))
+                if len(jobs) >= max_results:
                     break
 
-            if not job_cards or count == 0:
-                # Debug: dump a sample of the page HTML to diagnose
-                html_sample = await page.evaluate("document.body.innerHTML.substring(0, 2000)")
-                print(f"  {YELLOW}No job cards found. HTML sample: {html_sample[:500]}{END}")
-            else:
-                print(f"  {CYAN}Found {count} job cards{END}")
-
-            # Extract each job
-            for i in range(min(count, max_results)):
-                try:
-                    card = job_cards.nth(i)
-
-                    # Extract data - try multiple selectors per field
-                    title_elem = card.locator('h3.base-search-card__title, a.job-card-list__title, .job-card-container__link strong, h3[class*="title"]').first
-                    company_elem = card.locator('h4.base-search-card__subtitle, .job-card-container__company-name, a[class*="company"], span[class*="company"]').first
-                    location_elem = card.locator('span.job-search-card__location, .job-card-container__metadata-item, li[class*="location"]').first
-                    link_elem = card.locator('a.base-card__full-link, a.job-card-list__title, a[class*="job-card"]').first
-
-                    title = await title_elem.inner_text(timeout=2000) if await title_elem.count() > 0 else "Unknown"
-                    company = await company_elem.inner_text(timeout=2000) if await company_elem.count() > 0 else "Unknown"
-                    location = await location_elem.inner_text(timeout=2000) if await location_elem.count() > 0 else "Unknown"
-                    url = await link_elem.get_attribute('href', timeout=2000) if await link_elem.count() > 0 else ""
-
-                    # Clean URL (remove tracking params)
-                    if url and '?' in url:
-                        url = url.split('?')[0]
-
-                    job = {
-                        'CreatedAt':   datetime.now().strftime('%Y-%m-%d %H:%M:%S'),
-                        'Role':        title.strip(),
-                        'Company':     company.strip(),
-                        'Location':    location.strip(),
-                        'ApplyURL':    url,
-                        'Source':      'LinkedIn Search',
-                        'SearchQuery': query,
-                        'QuerySource': query_source,
-                        'DateFound':   datetime.now().strftime('%Y-%m-%d'),
-                        'Status':      'New',
-                        'RemoteScope': 'Remote'  # We filtered for remote
-                    }
-
-                    jobs.append(job)
-
-                    if i < 5:  # Show first 5
-                        print(f"    {i+1}. {title[:50]} at {company}")
-
-                except Exception as e:
-                    print(f"    {YELLOW}Could not extract job {i+1}: {e}{END}")
-                    continue
+            print(f"  {CYAN}[{query}] page {page_num + 1}: {len(cards)} cards, {new_on_page} new{END}")
+            if new_on_page == 0:
+                break   # última página (o LinkedIn repite resultados)
 
-        except Exception as e:
-            print(f"  {RED}Search error: {e}{END}")
+        for i, job in enumerate(jobs[:5]):  # Show first 5
+            print(f"    {i+1}. {job.role[:50]} at {job.company}")
 
         return jobs
 
-    def is_us_only(self, job: dict) -> bool:
+    async def _load_results_page(self, page: Page, search_url: str) -> list:
+        """Navega a una página de resultados y devuelve las cards (1 evaluate)."""
+        await self.nav_budget.wait()
+        await page.goto(search_url, wait_until='domcontentloaded', timeout=30000)
+
+        # Esperar a que aparezcan cards en vez de un sleep fijo
+        try:
+            await page.wait_for_selector(", ".join(CARD_SELECTORS), timeout=10000)
+        except Exception:
+            pass
+
+        try:
+            if await page.evaluate(DISMISS_POPUP_JS, POPUP_SELECTORS):
+                await asyncio.sleep(0.5)
+            # Also press Escape as fallback — closes most LinkedIn modals
+            await page.keyboard.press('Escape')
+        except Exception:
+            pass
+
+        # Scroll to load more jobs — hasta que el número de cards deje de crecer
+        count = await page.evaluate(COUNT_CARDS_JS, CARD_SELECTORS)
+        for _ in range(3):
+            await page.evaluate("""() => {
+                window.scrollTo(0, document.body.scrollHeight);
+                const list = document.querySelector('.scaffold-layout__list > div, .jobs-search-results-list');
+                if (list) list.scrollTop = list.scrollHeight;
+            }""")
+            await asyncio.sleep(1)
+            new_count = await page.evaluate(COUNT_CARDS_JS, CARD_SELECTORS)
+            if new_count <= count:
+                break
+            count = new_count
+
+        cards = await page.evaluate(EXTRACT_CARDS_JS, CARD_SELECTORS)
+        if not cards:
+            # Debug: dump a sample of the page HTML to diagnose
+            html_sample = await page.evaluate("document.body.innerHTML.substring(0, 2000)")
+            print(f"  {YELLOW}No job cards found. HTML sample: {html_sample[:500]}{END}")
+        return cards
+
+    def is_us_only(self, job) -> bool:
         """Returns True only if job is clearly US-only, no LATAM/Mexico eligibility."""
         location = (job.get("location") or job.get("Location") or "").lower()
         title = (job.get("title") or job.get("Role") or "").lower()
@@ -415,60 +489,6 @@ class LinkedInSearchScraper:
 
         print(f"{CYAN}{'='*70}{END}\n")
 
-    def save_to_sheets(self):
-        """Save jobs to Google Sheets → LinkedIn tab."""
-        print(f"\n{CYAN}Saving to Google Sheets (LinkedIn tab)...{END}")
-
-        try:
-            # Initialize LinkedIn headers if the tab is blank (first-ever run)
-            self.sheet_manager.ensure_headers('linkedin', LINKEDIN_HEADERS)
-
-            # Collect already-known URLs from LinkedIn tab
-            existing_urls: set = set()
-            try:
-                rows = self.sheet_manager.get_all_jobs(tab='linkedin')
-                existing_urls.update(j.get('ApplyURL', '') for j in rows)
-            except Exception:
-                pass  # Tab may not exist yet — first run
-
-            # Only keep genuinely new jobs
-            new_jobs = [
-                job for job in self.jobs_found
-                if job.get('ApplyURL', '') not in existing_urls
-            ]
-
-            print(f"  Total scraped:  {len(self.jobs_found)}")
-            print(f"  Duplicates:     {len(self.jobs_found) - len(new_jobs)}")
-            print(f"  New jobs:       {GREEN}{len(new_jobs)}{END}")
-            print(f"  Destination:    {CYAN}LinkedIn tab{END}")
-
-            if not new_jobs:
-                print(f"  {YELLOW}No hay jobs nuevos que guardar{END}")
-                return
-
-            # ONE batch write — avoids the 60 writes/min quota (HTTP 429)
-            tab_name = self.sheet_manager.tabs['linkedin']
-            headers  = self.sheet_manager._get_headers(tab_name)
-            rows     = [[str(job.get(h, '') or '') for h in headers] for job in new_jobs]
-
-            try:
-                self.sheet_manager.service.spreadsheets().values().append(
-                    spreadsheetId=self.sheet_manager.spreadsheet_id,
-                    range=f"{tab_name}!A2",
-                    valueInputOption="USER_ENTERED",
-                    insertDataOption="INSERT_ROWS",
-                    body={"values": rows},
-                ).execute()
-                saved = len(rows)
-            except Exception as e:
-                print(f"    {RED}Batch write error: {e}{END}")
-                saved = 0
-
-            print(f"  {GREEN}Guardados {saved}/{len(new_jobs)} jobs en LinkedIn tab{END}")
-
-        except Exception as e:
-            print(f"  {RED}Save error: {e}{END}")
-
 
 def main():
     parser = argparse.ArgumentParser(description='Search LinkedIn for jobs')
@@ -482,6 +502,18 @@ def main():
         action='store_true',
         help='Test mode - do not save (default)'
     )
+    parser.add_argument(
+        '--concurrency',
+        type=int,
+        default=SEARCH_CONCURRENCY,
+        help=f'Tabs searching in parallel (default: {SEARCH_CONCURRENCY})'
+    )
+    parser.add_argument(
+        '--max-pages',
+        type=int,
+        default=MAX_PAGES_PER_QUERY,
+        help=f'Result pages (25 jobs each) per query (default: {MAX_PAGES_PER_QUERY})'
+    )
 
     args = parser.parse_args()
 
@@ -492,7 +524,8 @@ def main():
         dry_run = True
 
     try:
-        scraper = LinkedInSearchScraper(dry_run=dry_run)
+        scraper = LinkedInSearchScraper(dry_run=dry_run, concurrency=args.concurrency,
+                                        max_pages=args.max_pages)
         asyncio.run(scraper.run())
         sys.exit(0)
     except KeyboardInterrupt:
@@ -11,16 +11,15 @@ Strategy 2: CSS card selectors (fallback)
 
 No requiere autenticación — búsqueda pública.
 """
-import sys, os, asyncio, json, re
+import sys, asyncio, json, re
 from pathlib import Path
 from datetime import datetime
-from playwright.async_api import async_playwright
 
 PROJECT_ROOT = Path(__file__).parent.parent.parent
 sys.path.insert(0, str(PROJECT_ROOT))
 
 from core.ingestion.queries import get_mexico_queries, get_latam_queries
-from core.sheets.sheet_manager import SheetManager
+from core.ingestion.base_scraper import BaseScraper, Job
 
 GREEN = '\033[92m'; RED = '\033[91m'; YELLOW = '\033[93m'
 CYAN  = '\033[96m'; END = '\033[0m'
@@ -62,53 +61,31 @@ def _detect_remote(text: str) -> str:
     return "OnSite"
 
 
-class OccScraper:
-    def __init__(self, headless: bool = None):
-        if headless is None:
-            headless = os.environ.get("PLAYWRIGHT_HEADLESS", "false").lower() == "true"
-        self.headless      = headless
-        self.jobs_found: list[dict] = []
-        self.dry_run       = True
-        self.sheet_manager = None
-
-    async def run(self, dry_run: bool = True):
-        self.dry_run = dry_run
-        if not dry_run:
-            self.sheet_manager = SheetManager()
-
-        print(f"\n{CYAN}{'='*70}")
-        print(f"OCC MUNDIAL MX SCRAPER  (Playwright)")
-        print(f"{'='*70}{END}")
-        print(f"Mode: {YELLOW}{'DRY RUN' if dry_run else 'LIVE'}{END}\n")
-
-        async with async_playwright() as p:
-            browser = await p.firefox.launch(headless=self.headless)
-            context = await browser.new_context(
-                user_agent=(
-                    "Mozilla/5.0 (Windows NT 10.0; Win64; x64) "
-                    "AppleWebKit/537.36 (KHTML, like Gecko) "
-                    "Chrome/124.0.0.0 Safari/537.36"
-                ),
-                viewport={"width": 1280, "height": 900},
-                locale="es-MX",
-            )
-            page = await context.new_page()
-
-            try:
-                for query, source in get_mexico_queries("en"):
-                    await self._search(page, query, source)
-                    await asyncio.sleep(3)
-
-                for query, source in get_latam_queries("en"):
-                    await self._search(page, query, source)
-                    await asyncio.sleep(3)
-
-                self._print_summary()
-
-                if not dry_run and self.jobs_found:
-                    self._save_to_sheets()
-            finally:
-                await browser.close()
+class OccScraper(BaseScraper):
+    name = "OCC"
+    title = "OCC MUNDIAL MX SCRAPER  (Playwright)"
+    tab = "occ"
+    headers = OCC_HEADERS
+    uses_browser = True
+
+    async def scrape(self, pool):
+        async with pool.page(
+            engine="firefox", headless=self.headless, block="scraping",
+            user_agent=(
+                "Mozilla/5.0 (Windows NT 10.0; Win64; x64) "
+                "AppleWebKit/537.36 (KHTML, like Gecko) "
+                "Chrome/124.0.0.0 Safari/537.36"
+            ),
+            viewport={"width": 1280, "height": 900},
+            locale="es-MX",
+        ) as page:
+            for query, source in get_mexico_queries("en"):
+                await self._search(page, query, source)
+                await asyncio.sleep(3)
+
+            for query, source in get_latam_queries("en"):
+                await self._search(page, query, source)
+                await asyncio.sleep(3)
 
     async def _load_page(self, page, url: str):
         """Navigate and wait for content to settle."""
@@ -187,20 +164,13 @@ class OccScraper:
                 print(f"  JSON-LD: {len(jsonld_jobs)} jobs")
                 count = 0
                 for jl in jsonld_jobs[:20]:
-                    self.jobs_found.append({
-                        'Role':        jl["title"][:100],
-                        'Company':     jl["company"][:100],
-                        'Location':    jl["location"][:100],
-                        'ApplyURL':    jl["apply_url"],
-                        'Source':      'OCC Mundial MX',
-                        'SearchQuery': query,
-                        'QuerySource': query_source,
-                        'CreatedAt':   datetime.now().strftime('%Y-%m-%d %H:%M:%S'),
-                        'DateFound':   datetime.now().strftime('%Y-%m-%d'),
-                        'Status':      'New',
-                        'RemoteScope': jl["remote"],
-                    })
-                    count += 1
+                    if await self.emit(Job(
+                        role=jl["title"], company=jl["company"], location=jl["location"],
+                        apply_url=jl["apply_url"], source='OCC Mundial MX',
+                        search_query=query, query_source=query_source,
+                        remote_scope=jl["remote"],
+                    )):
+                        count += 1
                 print(f"  {GREEN}Found {count} jobs (JSON-LD){END}")
                 return
 
@@ -260,20 +230,13 @@ class OccScraper:
                     if not title or not apply_url:
                         continue
 
-                    self.jobs_found.append({
-                        'Role':        title[:100],
-                        'Company':     company[:100],
-                        'Location':    location[:100],
-                        'ApplyURL':    apply_url,
-                        'Source':      'OCC Mundial MX',
-                        'SearchQuery': query,
-                        'QuerySource': query_source,
-                        'CreatedAt':   datetime.now().strftime('%Y-%m-%d %H:%M:%S'),
-                        'DateFound':   datetime.now().strftime('%Y-%m-%d'),
-                        'Status':      'New',
-                        'RemoteScope': _detect_remote(location + " " + title),
-                    })
-                    count += 1
+                    if await self.emit(Job(
+                        role=title, company=company, location=location,
+                        apply_url=apply_url, source='OCC Mundial MX',
+                        search_query=query, query_source=query_source,
+                        remote_scope=_detect_remote(location + " " + title),
+                    )):
+                        count += 1
                 except Exception:
                     continue
 
@@ -281,46 +244,3 @@ class OccScraper:
 
         except Exception as e:
             print(f"  {RED}Error searching '{query}': {e}{END}")
-
-    def _print_summary(self):
-        print(f"\n{CYAN}{'='*70}")
-        print(f"OCC SCRAPING SUMMARY")
-        print(f"{'='*70}{END}")
-        print(f"  Total: {GREEN}{len(self.jobs_found)}{END}")
-        by_source: dict[str, int] = {}
-        for j in self.jobs_found:
-            k = j['QuerySource']
-            by_source[k] = by_source.get(k, 0) + 1
-        for k, v in by_source.items():
-            print(f"    {k}: {v} jobs")
-
-    def _save_to_sheets(self):
-        print(f"\n{CYAN}Saving to Google Sheets → OCC tab...{END}")
-        try:
-            self.sheet_manager.ensure_headers('occ', OCC_HEADERS)
-            existing_urls: set[str] = set()
-            try:
-                rows = self.sheet_manager.get_all_jobs(tab='occ')
-                existing_urls = {r.get('ApplyURL', '') for r in rows}
-            except Exception:
-                pass
-
-            new_jobs = [j for j in self.jobs_found if j['ApplyURL'] not in existing_urls]
-            if not new_jobs:
-                print(f"  {YELLOW}No new jobs (all duplicates){END}")
-                return
-
-            tab_name = self.sheet_manager.tabs['occ']
-            headers  = self.sheet_manager._get_headers(tab_name)
-            rows_out = [[str(j.get(h, '') or '') for h in headers] for j in new_jobs]
-            self.sheet_manager.service.spreadsheets().values().append(
-                spreadsheetId=self.sheet_manager.spreadsheet_id,
-                range=f"{tab_name}!A2",
-                valueInputOption="USER_ENTERED",
-                insertDataOption="INSERT_ROWS",
-                body={"values": rows_out},
-            ).execute()
-            print(f"  {GREEN}Saved {len(new_jobs)} new jobs to OCC tab{END}")
-        except Exception as e:
-            print(f"  {RED}Error saving to Sheets: {e}{END}")
-            raise
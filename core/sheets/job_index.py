@@ -0,0 +1,232 @@
+"""
+AI JOB FOUNDRY - Job Key Index
+Índice persistente de jobs conocidos en TODAS las pestañas del Sheet.
+
+Cada job se reduce a una llave canónica:
+  - LinkedIn : currentJobId= o /jobs/view/{id}     → "linkedin:{id}"
+  - Glassdoor: jl= / jobListingId=                 → "glassdoor:{id}"
+  - Indeed   : jk= / vjk=                          → "indeed:{id}"
+  - Greenhouse / Lever / Ashby: id del posting     → "greenhouse:{id}" ...
+  - Resto    : URL normalizada sin tracking params → "url:{url}"
+
+Así el mismo job que llega por boletín con trackingId a LinkedIn y por
+/comm/jobs/view/ a Registry se detecta como duplicado, sin leer columnas
+del Sheet en cada ingesta.
+
+La reconciliación contra el Sheet solo AGREGA llaves: un job borrado del
+Sheet (p.ej. expirado) sigue siendo conocido y no se vuelve a ingerir.
+
+Uso:
+    index = JobIndex(spreadsheet_id)
+    index.load(sheets_service, spreadsheet_id)   # 1 vez por proceso
+    if not index.is_known(job):
+        ... append ...
+        index.add(job, tab="LinkedIn")
+
+Autor: Marcos Alvarado
+Fecha: 2026-10-17
+"""
+
+import re
+import sqlite3
+import threading
+import time
+from pathlib import Path
+from typing import Dict, Iterable, List, Optional, Union
+from urllib.parse import urlparse, parse_qsl, urlencode, urlunparse
+
+from core.sheets.sheet_mirror import col_letter
+
+PROJECT_ROOT = Path(__file__).parent.parent.parent
+STATE_DIR = PROJECT_ROOT / "data" / "state"
+
+# Segundos antes de volver a reconciliar el índice contra el Sheet
+DEFAULT_MAX_AGE = 6 * 3600
+
+# Pestañas que nunca contienen jobs
+SKIP_TABS = {"Resumen"}
+
+# Parámetros de tracking que no identifican al job
+STRIP_PARAMS = {
+    "utm_source", "utm_medium", "utm_campaign", "utm_term", "utm_content",
+    "gclid", "fbclid", "ao", "s", "guid", "src", "t", "vt", "uido", "ea", "cs", "cb",
+    "pos", "trackingId", "refId", "trk", "lipi", "lici", "midToken", "midSig", "eid",
+    "from", "tk", "alid", "advn", "sjdu", "acatk", "pub",
+}
+
+_PLATFORM_PATTERNS = [
+    ("linkedin",   re.compile(r"linkedin\.com/.*?[?&]currentJobId=(\d+)", re.I)),
+    ("linkedin",   re.compile(r"linkedin\.com/(?:comm/)?jobs/view/(?:[^/?#]*?-)?(\d+)", re.I)),
+    ("glassdoor",  re.compile(r"glassdoor\.[a-z.]+/.*?[?&](?:jl|jobListingId)=(\d+)", re.I)),
+    ("indeed",     re.compile(r"indeed\.[a-z.]+/.*?[?&]v?jk=([0-9a-f]+)", re.I)),
+    ("greenhouse", re.compile(r"greenhouse\.io/(?:embed/job_app\?.*?token=|[^/]+/jobs/)(\d+)", re.I)),
+    ("lever",      re.compile(r"jobs\.lever\.co/[^/]+/([0-9a-f-]{36})", re.I)),
+    ("ashby",      re.compile(r"jobs\.ashbyhq\.com/[^/]+/([0-9a-f-]{36})", re.I)),
+]
+
+
+def canonical_url(url: str) -> str:
+    """URL sin fragmento, sin tracking params, host en minúsculas y sin '/' final."""
+    if not url:
+        return ""
+    try:
+        p = urlparse(url.strip())
+        q = [(k, v) for (k, v) in parse_qsl(p.query, keep_blank_values=True)
+             if k not in STRIP_PARAMS]
+        p = p._replace(
+            scheme=(p.scheme or "https").lower(),
+            netloc=p.netloc.lower().removeprefix("www."),
+            path=p.path.rstrip("/"),
+            query=urlencode(sorted(q)),
+            fragment="",
+        )
+        return urlunparse(p)
+    except Exception:
+        return url.strip()
+
+
+def job_key(url: str) -> str:
+    """Llave canónica de un job a partir de su URL ("" si no hay URL)."""
+    if not url:
+        return ""
+    for platform, pattern in _PLATFORM_PATTERNS:
+        m = pattern.search(url)
+        if m:
+            return f"{platform}:{m.group(1).lower()}"
+    return f"url:{canonical_url(url)}"
+
+
+def _url_of(job: Union[str, Dict]) -> str:
+    if isinstance(job, str):
+        return job
+    return job.get("ApplyURL") or job.get("url") or job.get("URL") or ""
+
+
+class JobIndex:
+    """Set persistente de llaves canónicas de todos los jobs en el Sheet."""
+
+    def __init__(self, spreadsheet_id: str = "", db_path: Optional[Path] = None,
+                 max_age: float = DEFAULT_MAX_AGE):
+        # Un .db por spreadsheet para no mezclar llaves entre Sheets distintos
+        if db_path is None:
+            db_path = STATE_DIR / f"job_index_{(spreadsheet_id or 'default')[:16]}.db"
+        self.db_path = Path(db_path)
+        self.db_path.parent.mkdir(parents=True, exist_ok=True)
+        self.max_age = max_age
+        self._lock = threading.Lock()
+        self._conn = sqlite3.connect(str(self.db_path), check_same_thread=False)
+        self._conn.executescript(
+            "CREATE TABLE IF NOT EXISTS job_keys ("
+            "  key TEXT PRIMARY KEY, tab TEXT, url TEXT, added_at REAL);"
+            "CREATE TABLE IF NOT EXISTS meta (name TEXT PRIMARY KEY, value REAL);"
+        )
+        self._keys = {row[0] for row in self._conn.execute("SELECT key FROM job_keys")}
+
+    def __len__(self) -> int:
+        return len(self._keys)
+
+    # ------------------------------------------------------------------
+    # Carga / reconciliación contra el Sheet
+    # ------------------------------------------------------------------
+    def _synced_at(self) -> float:
+        row = self._conn.execute("SELECT value FROM meta WHERE name = 'synced_at'").fetchone()
+        return row[0] if row else 0.0
+
+    def load(self, sheets_service, spreadsheet_id: str, force: bool = False) -> int:
+        """
+        Reconciliación con el Sheet si el índice está vencido (o force=True).
+        Lee ApplyURL de todas las pestañas con 3 requests en total
+        (metadata + batchGet de headers + batchGet de columnas).
+
+        Returns:
+            Número de llaves en el índice
+        """
+        if not force and (time.time() - self._synced_at()) < self.max_age:
+            return len(self._keys)
+
+        try:
+            meta = sheets_service.spreadsheets().get(
+                spreadsheetId=spreadsheet_id, fields="sheets.properties.title"
+            ).execute()
+            tabs = [s["properties"]["title"] for s in meta.get("sheets", [])
+                    if s["properties"]["title"] not in SKIP_TABS]
+            if not tabs:
+                return len(self._keys)
+
+            header_resp = sheets_service.spreadsheets().values().batchGet(
+                spreadsheetId=spreadsheet_id, ranges=[f"{t}!1:1" for t in tabs]
+            ).execute()
+
+            url_ranges, url_tabs = [], []
+            for tab, vr in zip(tabs, header_resp.get("valueRanges", [])):
+                headers = (vr.get("values") or [[]])[0]
+                if "ApplyURL" in headers:
+                    letter = col_letter(headers.index("ApplyURL"))
+                    url_ranges.append(f"{tab}!{letter}2:{letter}")
+                    url_tabs.append(tab)
+
+            if url_ranges:
+                col_resp = sheets_service.spreadsheets().values().batchGet(
+                    spreadsheetId=spreadsheet_id, ranges=url_ranges
+                ).execute()
+                for tab, vr in zip(url_tabs, col_resp.get("valueRanges", [])):
+                    self.add_many((row[0] for row in vr.get("values", []) if row), tab, commit=False)
+
+            self._conn.execute(
+                "INSERT OR REPLACE INTO meta (name, value) VALUES ('synced_at', ?)", (time.time(),)
+            )
+            self._conn.commit()
+            print(f"   📋 JobIndex: {len(self._keys)} jobs conocidos en {len(url_tabs)} pestañas")
+        except Exception as e:
+            print(f"   ⚠️  JobIndex.load error (se usa índice local): {e}")
+        return len(self._keys)
+
+    # ------------------------------------------------------------------
+    # API
+    # ------------------------------------------------------------------
+    def is_known(self, job: Union[str, Dict]) -> bool:
+        """True si el job (dict con ApplyURL o URL directa) ya existe en cualquier pestaña."""
+        key = job_key(_url_of(job))
+        if not key:
+            return False
+        if key in self._keys:
+            return True
+        # Miss en memoria: otro proceso pudo haberlo agregado al mismo .db
+        with self._lock:
+            if self._conn.execute("SELECT 1 FROM job_keys WHERE key = ?", (key,)).fetchone():
+                self._keys.add(key)
+                return True
+        return False
+
+    def add(self, job: Union[str, Dict], tab: str = "") -> bool:
+        """Registra un job recién agregado. Devuelve False si ya era conocido."""
+        return self.add_many([_url_of(job)], tab) == 1
+
+    def add_many(self, urls: Iterable[str], tab: str = "", commit: bool = True) -> int:
+        """Registra varias URLs. Devuelve cuántas llaves eran nuevas."""
+        now = time.time()
+        new_rows: List[tuple] = []
+        with self._lock:
+            for url in urls:
+                key = job_key(url)
+                if key and key not in self._keys:
+                    self._keys.add(key)
+                    new_rows.append((key, tab, url, now))
+            if new_rows:
+                self._conn.executemany(
+                    "INSERT OR IGNORE INTO job_keys (key, tab, url, added_at) VALUES (?, ?, ?, ?)",
+                    new_rows,
+                )
+                if commit:
+                    self._conn.commit()
+        return len(new_rows)
+
+    def tab_of(self, job: Union[str, Dict]) -> Optional[str]:
+        """Pestaña donde se registró el job por primera vez (None si no se conoce)."""
+        row = self._conn.execute(
+            "SELECT tab FROM job_keys WHERE key = ?", (job_key(_url_of(job)),)
+        ).fetchone()
+        return row[0] if row else None
+
+    def close(self) -> None:
+        self._conn.close()
@@ -0,0 +1,218 @@
+"""
+AI JOB FOUNDRY - Lifecycle Engine (expiración de jobs en bloque)
+
+Antes cada pestaña era: values.get, spreadsheets.get (otra vez), tres
+strptime por fila en Python y un values.update por cada fila vencida.
+
+Ahora, por corrida:
+  1 spreadsheets.get     → sheetIds de todas las pestañas
+  1 values.batchGet      → todas las pestañas de una vez
+  → un DataFrame por pestaña (solo las columnas que se usan), CreatedAt
+    parseado vectorizado (mismos 3 formatos que antes)
+  → transiciones calculadas en bloque:
+       expire : CreatedAt < hoy - days y Status != EXPIRED
+       stale  : Status New/vacío con CreatedAt < hoy - stale_days (solo reporte:
+                los próximos en vencer)
+       delete : Status == EXPIRED (+ los que se marcan en esta corrida si
+                se pide marcar y borrar a la vez, igual que --full)
+  1 values.batchUpdate   → todas las celdas Status nuevas (filas contiguas
+                           en un solo rango)
+  1 batchUpdate por pestaña con los deleteDimension (rangos contiguos
+    fusionados, de abajo hacia arriba)
+
+Uso:
+    engine = LifecycleEngine(sheet_manager.service, spreadsheet_id, tabs)
+    plans = engine.plan(days_threshold=30, mark=True, delete=False)
+    marked, deleted = engine.commit(plans)
+
+Autor: Marcos Alvarado
+Fecha: 2026-10-17
+"""
+
+from dataclasses import dataclass, field
+from datetime import datetime, timedelta
+from typing import Dict, List, Optional, Tuple
+
+import pandas as pd
+
+EXPIRED = "EXPIRED"
+CREATED_FORMATS = ("%Y-%m-%d %H:%M:%S", "%Y-%m-%d %I:%M:%S %p", "%Y-%m-%d")
+NEW_STATUSES = ("", "new")
+COLUMNS = ("CreatedAt", "Status", "Company", "Role")
+
+
+def col_letter(idx: int) -> str:
+    """0 → A, 25 → Z, 26 → AA."""
+    letters = ""
+    idx += 1
+    while idx:
+        idx, rem = divmod(idx - 1, 26)
+        letters = chr(65 + rem) + letters
+    return letters
+
+
+def contiguous_runs(rows: List[int]) -> List[Tuple[int, int]]:
+    """[2, 3, 4, 9] → [(2, 4), (9, 9)]."""
+    runs: List[Tuple[int, int]] = []
+    for row in sorted(set(rows)):
+        if runs and row == runs[-1][1] + 1:
+            runs[-1] = (runs[-1][0], row)
+        else:
+            runs.append((row, row))
+    return runs
+
+
+def parse_created(raw: pd.Series) -> pd.Series:
+    """CreatedAt → datetime64 (NaT si no encaja en ningún formato). Ignora fracciones de segundo."""
+    text = raw.fillna("").astype(str).str.split(".", n=1).str[0].str.strip()
+    created = pd.to_datetime(text, format=CREATED_FORMATS[0], errors="coerce")
+    for fmt in CREATED_FORMATS[1:]:
+        missing = created.isna() & (text != "")
+        if not missing.any():
+            break
+        created = created.where(~missing, pd.to_datetime(text[missing], format=fmt, errors="coerce"))
+    return created
+
+
+@dataclass
+class TabPlan:
+    """Transiciones de una pestaña. Los DataFrames traen row (fila del Sheet), company, role, age_days."""
+    tab: str
+    sheet_id: Optional[int]
+    status_col: str
+    expire: pd.DataFrame
+    stale: pd.DataFrame
+    delete: List[int] = field(default_factory=list)
+
+
+class LifecycleEngine:
+    def __init__(self, service, spreadsheet_id: str, tabs: List[str]):
+        self.service = service
+        self.spreadsheet_id = spreadsheet_id
+        self.tabs = list(tabs)
+        self.sheet_ids: Dict[str, int] = {}
+        self.frames: Dict[str, pd.DataFrame] = {}
+        self.skipped: Dict[str, str] = {}
+
+    def load(self) -> Dict[str, pd.DataFrame]:
+        """Metadata + todas las pestañas en 2 API calls. Devuelve {tab: DataFrame}."""
+        meta = self.service.spreadsheets().get(
+            spreadsheetId=self.spreadsheet_id,
+            fields="sheets.properties(title,sheetId)",
+        ).execute()
+        self.sheet_ids = {s["properties"]["title"]: s["properties"]["sheetId"]
+                          for s in meta.get("sheets", [])}
+
+        present = [t for t in self.tabs if t in self.sheet_ids]
+        for tab in self.tabs:
+            if tab not in self.sheet_ids:
+                self.skipped[tab] = "tab not found"
+        if not present:
+            return {}
+
+        result = self.service.spreadsheets().values().batchGet(
+            spreadsheetId=self.spreadsheet_id,
+            ranges=[f"{tab}!A1:Z" for tab in present],
+        ).execute()
+
+        for tab, value_range in zip(present, result.get("valueRanges", [])):
+            values = value_range.get("values", [])
+            if not values:
+                self.skipped[tab] = "no data"
+                continue
+            headers, rows = values[0], values[1:]
+            if "CreatedAt" not in headers and "Status" not in headers:
+                self.skipped[tab] = "missing CreatedAt and Status columns"
+                continue
+            # Solo las columnas que se usan, una lista por columna
+            frame = {"row": range(2, len(rows) + 2)}
+            for name in COLUMNS:
+                if name in headers:
+                    i = headers.index(name)
+                    frame[name] = [r[i] if len(r) > i else "" for r in rows]
+            df = pd.DataFrame(frame)
+            df.attrs["status_col"] = col_letter(headers.index("Status")) if "Status" in headers else ""
+            self.frames[tab] = df
+        return self.frames
+
+    def plan(self, days_threshold: int = 30, stale_days: int = 14, mark: bool = True,
+             delete: bool = False, now: Optional[datetime] = None) -> List[TabPlan]:
+        """Calcula todas las transiciones de todas las pestañas (sin escribir nada)."""
+        if not self.frames:
+            self.skipped = {}
+            self.load()
+        now = now or datetime.now()
+        cutoff = pd.Timestamp(now - timedelta(days=days_threshold))
+        stale_cutoff = pd.Timestamp(now - timedelta(days=stale_days))
+
+        plans = []
+        for tab, df in self.frames.items():
+            if "Status" not in df:
+                self.skipped[tab] = "no Status column"
+                continue
+            status = df["Status"].fillna("").astype(str)
+            is_expired = status == EXPIRED
+            empty = df.iloc[0:0][["row"]]
+
+            if "CreatedAt" in df:
+                created = parse_created(df["CreatedAt"])
+                age_days = (pd.Timestamp(now) - created).dt.days.astype("Int64")
+                info = pd.DataFrame({
+                    "row": df["row"],
+                    "company": df["Company"] if "Company" in df else "Unknown",
+                    "role": df["Role"] if "Role" in df else "Unknown",
+                    "age_days": age_days,
+                })
+                to_expire = info[~is_expired & (created < cutoff)] if mark else empty
+                is_new = status.str.strip().str.lower().isin(NEW_STATUSES)
+                stale = info[is_new & (created < stale_cutoff) & (created >= cutoff)]
+            else:
+                to_expire, stale = empty, empty
+
+            delete_rows: List[int] = []
+            if delete:
+                delete_rows = df.loc[is_expired, "row"].tolist() + to_expire["row"].tolist()
+
+            plans.append(TabPlan(tab, self.sheet_ids.get(tab), df.attrs["status_col"],
+                                 to_expire, stale, delete_rows))
+        return plans
+
+    def commit(self, plans: List[TabPlan]) -> Tuple[int, int]:
+        """Escribe el plan: 1 values.batchUpdate global + 1 batchUpdate de borrado por pestaña."""
+        data = []
+        marked = 0
+        for plan in plans:
+            # Lo que se va a borrar no hace falta marcarlo
+            rows = sorted(set(plan.expire["row"]) - set(plan.delete))
+            marked += len(rows)
+            for start, end in contiguous_runs(rows):
+                data.append({
+                    "range": f"{plan.tab}!{plan.status_col}{start}:{plan.status_col}{end}",
+                    "values": [[EXPIRED]] * (end - start + 1),
+                })
+        if data:
+            self.service.spreadsheets().values().batchUpdate(
+                spreadsheetId=self.spreadsheet_id,
+                body={"valueInputOption": "RAW", "data": data},
+            ).execute()
+
+        deleted = 0
+        for plan in plans:
+            if not plan.delete or plan.sheet_id is None:
+                continue
+            requests = [
+                {"deleteDimension": {"range": {
+                    "sheetId": plan.sheet_id, "dimension": "ROWS",
+                    "startIndex": start - 1, "endIndex": end,
+                }}}
+                for start, end in reversed(contiguous_runs(plan.delete))
+            ]
+            self.service.spreadsheets().batchUpdate(
+                spreadsheetId=self.spreadsheet_id,
+                body={"requests": requests},
+            ).execute()
+            deleted += len(set(plan.delete))
+        # Las filas cambiaron: el próximo plan() vuelve a leer el Sheet
+        self.frames = {}
+        self.skipped = {}
+        return marked, deleted
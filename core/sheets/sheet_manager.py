@@ -8,14 +8,19 @@ Fecha: 2025-11-13
 
 import os
 import json
-from typing import List, Dict, Optional
+from contextlib import contextmanager
+from typing import List, Dict, Optional, Iterator, Tuple, Mapping
 from datetime import datetime
 from pathlib import Path
 from dotenv import load_dotenv
 from google.oauth2.credentials import Credentials
 from google_auth_oauthlib.flow import InstalledAppFlow
 from google.auth.transport.requests import Request
-from googleapiclient.discovery import build
+from core.utils.google_clients import build_service
+
+from core.sheets.sheet_mirror import SheetMirror, col_letter
+from core.sheets.job_index import JobIndex
+from core.sheets.write_buffer import SheetWriteBuffer
 
 # Load environment variables
 env_path = Path(__file__).parent.parent.parent / ".env"
@@ -25,13 +30,58 @@ SCOPES = [
     'https://www.googleapis.com/auth/spreadsheets',
 ]
 
+# Filas por página en iter_jobs (un values.get por página)
+DEFAULT_CHUNK_ROWS = 500
+
+
+class JobRow(Mapping):
+    """
+    Fila compacta de una pestaña: guarda la lista cruda de valores y comparte
+    el índice de headers entre todas las filas de la misma página/pestaña.
+    Se comporta como dict de solo lectura (row['Role'], row.get('Status')).
+    """
+    __slots__ = ("_index", "_values", "row")
+
+    def __init__(self, index: Dict[str, int], values: List, row: int):
+        self._index = index
+        self._values = values
+        self.row = row   # número de fila 1-based (para updates)
+
+    @staticmethod
+    def make_index(headers: List[str]) -> Dict[str, int]:
+        return {h: i for i, h in enumerate(headers)}
+
+    @classmethod
+    def from_dict(cls, job: Dict, row: int) -> "JobRow":
+        keys = list(job.keys())
+        return cls(cls.make_index(keys), [job[k] for k in keys], row)
+
+    def __getitem__(self, key):
+        if key == '_row':
+            return self.row
+        i = self._index[key]
+        return self._values[i] if i < len(self._values) else ''
+
+    def __iter__(self):
+        return iter(self._index)
+
+    def __len__(self):
+        return len(self._index)
+
+    def to_dict(self) -> Dict:
+        """Dict mutable con el mismo formato que get_all_jobs (incluye '_row')."""
+        job = {h: (self._values[i] if i < len(self._values) else '')
+               for h, i in self._index.items()}
+        job['_row'] = self.row
+        return job
+
 class SheetManager:
     """Gestor de Google Sheets"""
     
-    def __init__(self):
+    def __init__(self, use_mirror: Optional[bool] = None):
         self.spreadsheet_id = os.getenv("GOOGLE_SHEETS_ID")
         self.credentials = self._get_credentials()
-        self.service = build('sheets', 'v4', credentials=self.credentials)
+        self.service = build_service('sheets', 'v4', self.credentials)
         
         # Nombres de pestañas
         self.tabs = {
@@ -51,23 +101,102 @@ class SheetManager:
         self._headers_cache: Dict[str, List[str]] = {}
         # Cache de sheet IDs numéricos para batchUpdate (colores)
         self._sheet_id_cache: Dict[str, int] = {}
+        # Cache de rowCount por pestaña — límite de paginación en iter_jobs
+        self._row_count_cache: Dict[str, int] = {}
+
+        # Buffer de escrituras (activo solo dentro de buffered())
+        self._write_buffer: Optional[SheetWriteBuffer] = None
+
+        # Índice cross-tab de llaves canónicas (se carga en el primer uso)
+        self._job_index: Optional[JobIndex] = None
+
+        # Espejo SQLite local (opt-in): use_mirror=True o SHEETS_MIRROR=true en .env
+        # Con el espejo activo las lecturas son locales; las escrituras van
+        # directo al Sheet y luego se reflejan en la copia local.
+        if use_mirror is None:
+            use_mirror = os.getenv("SHEETS_MIRROR", "false").lower() == "true"
+        self.mirror = None
+        if use_mirror:
+            self.mirror = SheetMirror(self.service, self.spreadsheet_id)
+
+    def _load_sheet_metadata(self) -> bool:
+        """Lee la metadata del Spreadsheet (sheetId y número de filas por pestaña)
+        en un solo API call y la guarda en cache."""
+        try:
+            spreadsheet = self.service.spreadsheets().get(
+                spreadsheetId=self.spreadsheet_id,
+                fields="sheets.properties(title,sheetId,gridProperties.rowCount)",
+            ).execute()
+        except Exception as e:
+            print(f"⚠️  _load_sheet_metadata error: {e}")
+            return False
+        for sheet in spreadsheet.get('sheets', []):
+            props = sheet['properties']
+            self._sheet_id_cache[props['title']] = props['sheetId']
+            self._row_count_cache[props['title']] = props.get('gridProperties', {}).get('rowCount', 0)
+        return True
 
     def _get_sheet_id(self, tab_name: str) -> Optional[int]:
         """Obtiene el sheetId numérico de una pestaña (necesario para batchUpdate de formato).
         Cachea todos los IDs en el primer llamado para minimizar API requests."""
         if tab_name not in self._sheet_id_cache:
-            try:
-                spreadsheet = self.service.spreadsheets().get(
-                    spreadsheetId=self.spreadsheet_id
-                ).execute()
-                for sheet in spreadsheet.get('sheets', []):
-                    title = sheet['properties']['title']
-                    self._sheet_id_cache[title] = sheet['properties']['sheetId']
-            except Exception as e:
-                print(f"⚠️  _get_sheet_id error: {e}")
+            if not self._load_sheet_metadata():
                 return None
         return self._sheet_id_cache.get(tab_name)
 
+    def _get_row_count(self, tab_name: str) -> Optional[int]:
+        """Número de filas del grid de la pestaña (None si no se pudo leer)."""
+        if tab_name not in self._row_count_cache:
+            self._load_sheet_metadata()
+        return self._row_count_cache.get(tab_name)
+
+    def get_job_index(self) -> JobIndex:
+        """Índice de jobs conocidos en todas las pestañas (cargado una vez por proceso)."""
+        if self._job_index is None:
+            self._job_index = JobIndex(self.spreadsheet_id)
+            self._job_index.load(self.service, self.spreadsheet_id)
+        return self._job_index
+
+    def is_known(self, job) -> bool:
+        """
+        True si el job ya existe en CUALQUIER pestaña (dedup O(1)).
+
+        Args:
+            job: dict con 'ApplyURL' o la URL directamente
+        """
+        return self.get_job_index().is_known(job)
+
+    @contextmanager
+    def buffered(self, max_age: float = 30.0):
+        """
+        Modo buffer: update_job / update_cell / color_row_by_fit / set_row_color
+        se acumulan y se mandan en lotes (values.batchUpdate + batchUpdate).
+        Flush automático por tamaño y por tiempo; flush final al salir.
+
+        Uso:
+            with sheet_manager.buffered():
+                for job in jobs:
+                    sheet_manager.update_job(job['_row'], {...}, 'linkedin')
+                    sheet_manager.color_row_by_fit(job['_row'], fit, 'linkedin')
+        """
+        if self._write_buffer is not None:
+            yield self._write_buffer   # ya estamos en modo buffer (anidado)
+            return
+        self._write_buffer = SheetWriteBuffer(self.service, self.spreadsheet_id, max_age=max_age)
+        try:
+            yield self._write_buffer
+        finally:
+            buffer, self._write_buffer = self._write_buffer, None
+            buffer.flush()
+            print(f"   💾 Buffer: {buffer.cells_queued} celdas → "
+                  f"{buffer.values_calls} values.batchUpdate + {buffer.format_calls} batchUpdate")
+
+    def flush(self) -> bool:
+        """Manda lo pendiente del buffer (si está activo). True si todo se guardó."""
+        if self._write_buffer is None:
+            return True
+        return self._write_buffer.flush()
+
     def color_row_by_fit(self, row_num: int, fit_score: int, tab: str = "linkedin") -> bool:
         """
         Colorea una fila completa en el sheet con semaforo segun FIT score.
@@ -86,6 +215,10 @@ class SheetManager:
             else:
                 color = {"red": 0.918, "green": 0.600, "blue": 0.600}   # rojo
 
+            if self._write_buffer is not None and sheet_id is not None:
+                self._write_buffer.add_row_color(sheet_id, row_num, color, end_col=26)
+                return True
+
             requests_body = [{
                 "repeatCell": {
                     "range": {
@@ -196,46 +329,88 @@ class SheetManager:
     
     def get_all_jobs(self, tab: str = "registry") -> List[Dict]:
         """
-        Obtiene todas las ofertas de una pestaña
-        
+        Obtiene todas las ofertas de una pestaña (sin límite de filas)
+
         Args:
             tab: Nombre de pestaña (registry, linkedin, indeed, glassdoor)
-        
+
         Returns:
             Lista de diccionarios con ofertas
         """
         tab_name = self.tabs.get(tab, "Registry")
 
-        # Leer toda la pestaña — atrapar 400 si el tab no existe aún
-        try:
-            result = self.service.spreadsheets().values().get(
-                spreadsheetId=self.spreadsheet_id,
-                range=f"{tab_name}!A1:Z1000"
-            ).execute()
-        except Exception as e:
-            if "400" in str(e) or "Unable to parse range" in str(e):
-                return []   # tab no existe todavía
-            raise
-        
-        values = result.get('values', [])
-        
-        if not values:
-            return []
-        
-        # Primera fila = headers
-        headers = values[0]
-        
-        # Convertir a lista de dicts
-        jobs = []
-        for idx, row in enumerate(values[1:], start=2):  # start=2 porque row 1 = headers
-            # Rellenar con vacíos si faltan columnas
-            row_data = row + [''] * (len(headers) - len(row))
-            job = dict(zip(headers, row_data))
-            job['_row'] = idx  # Guardar número de fila para updates
-            jobs.append(job)
-        
-        return jobs
-    
+        if self.mirror is not None:
+            self.mirror.ensure_fresh(tab_name)
+            return self.mirror.get_all(tab_name)
+
+        return [row.to_dict() for row in self.iter_jobs(tab)]
+
+    def iter_jobs(self, tab: str = "registry",
+                  chunk_rows: int = DEFAULT_CHUNK_ROWS) -> Iterator["JobRow"]:
+        """
+        Recorre una pestaña en páginas de `chunk_rows` filas y produce JobRow
+        de forma perezosa. Solo una página vive en memoria a la vez.
+
+        Args:
+            tab: Nombre de pestaña (clave de self.tabs o nombre literal)
+            chunk_rows: filas por request (una página = un values.get)
+
+        Yields:
+            JobRow (acceso tipo dict: row['ApplyURL'], row.get('Status'), row.row)
+        """
+        tab_name = self.tabs.get(tab, tab)
+
+        if self.mirror is not None:
+            self.mirror.ensure_fresh(tab_name)
+            for job in self.mirror.get_all(tab_name):
+                row_num = job.pop('_row')
+                yield JobRow.from_dict(job, row_num)
+            return
+
+        headers = self._get_headers(tab_name)
+        if not headers:
+            return   # tab no existe todavía o está vacío
+
+        index = JobRow.make_index(headers)
+        last_col = col_letter(len(headers) - 1)
+        row_count = self._get_row_count(tab_name)
+
+        start = 2
+        while row_count is None or start <= row_count:
+            end = start + chunk_rows - 1
+            try:
+                result = self.service.spreadsheets().values().get(
+                    spreadsheetId=self.spreadsheet_id,
+                    range=f"{tab_name}!A{start}:{last_col}{end}"
+                ).execute()
+            except Exception as e:
+                if "400" in str(e) or "Unable to parse range" in str(e):
+                    return   # fuera del grid
+                raise
+            values = result.get('values', [])
+            for offset, row in enumerate(values):
+                yield JobRow(index, row, start + offset)
+            if row_count is None and len(values) < chunk_rows:
+                return   # sin metadata: página corta = fin de datos
+            start = end + 1
+
+    def iter_all_jobs(self, tabs: Optional[List[str]] = None,
+                      chunk_rows: int = DEFAULT_CHUNK_ROWS) -> Iterator[Tuple[str, "JobRow"]]:
+        """
+        Escaneo de todo el Spreadsheet con memoria acotada (una página a la vez).
+
+        Args:
+            tabs: claves de self.tabs a recorrer (default: todas menos resumen)
+            chunk_rows: filas por request
+
+        Yields:
+            (tab, JobRow)
+        """
+        keys = tabs or [k for k in self.tabs if k != "resumen"]
+        for key in keys:
+            for row in self.iter_jobs(key, chunk_rows=chunk_rows):
+                yield key, row
+
     def append_rows(self, tab: str, rows: List[List]) -> bool:
         """
         Agrega múltiples filas al Sheet
@@ -257,7 +432,16 @@ class SheetManager:
                 valueInputOption="USER_ENTERED",
                 body={"values": rows}
             ).execute()
-            
+
+            # El append pudo crecer el grid: rowCount cacheado ya no es el límite
+            self._row_count_cache.pop(tab_name, None)
+            if self.mirror is not None:
+                self.mirror.invalidate(tab_name)
+            if self._job_index is not None:
+                headers = self._get_headers(tab_name)
+                if "ApplyURL" in headers:
+                    i = headers.index("ApplyURL")
+                    self._job_index.add_many((r[i] for r in rows if len(r) > i and r[i]), tab_name)
             return True
         except Exception as e:
             print(f"❌ Error appending rows: {e}")
@@ -315,7 +499,12 @@ class SheetManager:
             valueInputOption="USER_ENTERED",
             body={"values": [row]}
         ).execute()
-        
+
+        self._row_count_cache.pop(tab_name, None)
+        if self.mirror is not None:
+            self.mirror.invalidate(tab_name)
+        if self._job_index is not None:
+            self._job_index.add(job_data, tab_name)
         return True
     
     def update_job(self, row_id: int, updates: Dict, tab: str = "registry") -> bool:
@@ -357,15 +546,26 @@ class SheetManager:
         if not data:
             return False
 
-        try:
-            self.service.spreadsheets().values().batchUpdate(
-                spreadsheetId=self.spreadsheet_id,
-                body={"valueInputOption": "USER_ENTERED", "data": data}
-            ).execute()
-            return True
-        except Exception as e:
-            print(f"[ERROR] update_job failed (row {row_id}, tab {tab_name}): {e}")
-            return False
+        # Modo buffer: se manda en el próximo flush (junto con otras filas/tabs)
+        if self._write_buffer is not None:
+            for item in data:
+                self._write_buffer.add_value(item["range"], item["values"][0][0])
+        else:
+            try:
+                self.service.spreadsheets().values().batchUpdate(
+                    spreadsheetId=self.spreadsheet_id,
+                    body={"valueInputOption": "USER_ENTERED", "data": data}
+                ).execute()
+            except Exception as e:
+                print(f"[ERROR] update_job failed (row {row_id}, tab {tab_name}): {e}")
+                return False
+
+        if self.mirror is not None:
+            # Write-through: el Sheet ya tiene el valor (o lo tendrá al salir de buffered())
+            self.mirror.apply_local(
+                tab_name, row_id, {k: v for k, v in updates.items() if k in headers}
+            )
+        return True
     
     def update_cell(self, tab: str, row_id: int, column: str, value: str) -> bool:
         """
@@ -425,7 +625,10 @@ class SheetManager:
                     'data': data
                 }
             ).execute()
-        
+            if self.mirror is not None:
+                for update_item in updates:
+                    self.mirror.invalidate(self.tabs.get(update_item.get('tab', 'registry'), "Registry"))
+
         return True
     
     def find_job_by_url(self, url: str, tab: str = "registry") -> Optional[Dict]:
@@ -439,6 +642,14 @@ class SheetManager:
         Returns:
             Dict con oferta o None
         """
+        # Sin atajo por JobIndex: es una pista para deduplicar, no la fuente de
+        # verdad (filas agregadas por otros procesos no aparecen hasta el
+        # siguiente reconcile), así que un miss ahí no prueba que no exista.
+        if self.mirror is not None:
+            tab_name = self.tabs.get(tab, "Registry")
+            self.mirror.ensure_fresh(tab_name)
+            return self.mirror.find_by_url(url, tab_name)
+
         jobs = self.get_all_jobs(tab)
         
         for job in jobs:
@@ -458,6 +669,11 @@ class SheetManager:
         Returns:
             Lista de ofertas con ese status
         """
+        if self.mirror is not None:
+            tab_name = self.tabs.get(tab, "Registry")
+            self.mirror.ensure_fresh(tab_name)
+            return self.mirror.by_status(status, tab_name)
+
         jobs = self.get_all_jobs(tab)
         return [job for job in jobs if job.get('Status') == status]
     
@@ -492,7 +708,9 @@ class SheetManager:
             valueInputOption='USER_ENTERED',
             body={'values': [[new_status]]}
         ).execute()
-        
+
+        if self.mirror is not None:
+            self.mirror.apply_local(tab_name, row_index, {'Status': new_status})
         return True
     
     def set_row_color(self, row_index: int, tab: str = "registry",
@@ -512,6 +730,11 @@ class SheetManager:
             if sheet_id is None:
                 return False
 
+            color = {"red": red, "green": green, "blue": blue}
+            if self._write_buffer is not None:
+                self._write_buffer.add_row_color(sheet_id, row_index, color)
+                return True
+
             # row_index es 1-based; Sheets API usa 0-based
             zero_row = row_index - 1
 
@@ -525,11 +748,7 @@ class SheetManager:
                         },
                         "cell": {
                             "userEnteredFormat": {
-                                "backgroundColor": {
-                                    "red":   red,
-                                    "green": green,
-                                    "blue":  blue
-                                }
+                                "backgroundColor": color
                             }
                         },
                         "fields": "userEnteredFormat.backgroundColor"
@@ -546,6 +765,21 @@ class SheetManager:
             print(f"⚠️  set_row_color error: {e}")
             return False
 
+    def sync(self, tabs: Optional[List[str]] = None) -> Dict[str, int]:
+        """
+        Pull del espejo SQLite (las escrituras ya van directo al Sheet).
+
+        Args:
+            tabs: claves de self.tabs a sincronizar (default: todas)
+
+        Returns:
+            Dict {tab_name: filas cambiadas localmente}
+        """
+        if self.mirror is None:
+            return {}
+        keys = tabs or list(self.tabs.keys())
+        return self.mirror.pull_all(self.tabs.get(k, k) for k in keys)
+
     def test_connection(self):
         """Test rápido de conexión"""
         print("\n" + "="*70)
@@ -0,0 +1,264 @@
+"""
+AI JOB FOUNDRY - Sheet Mirror (SQLite)
+Copia local de todas las pestañas del Google Sheet con sync incremental.
+
+El Sheet deja de ser la base de datos primaria para lecturas:
+  - Lecturas (get_all_jobs, find_job_by_url, get_jobs_by_status) salen de SQLite.
+  - pull() lee la pestaña en un solo values.get y compara un hash por fila:
+    solo las filas con hash distinto se reescriben en SQLite. Así se ven
+    también filas borradas (deleteDimension corre las de abajo) y ediciones
+    hechas a mano en el Sheet, que ningún marcador UpdatedAt registraría.
+  - Escrituras: write-through. SheetManager escribe al Sheet y después
+    actualiza la copia local con apply_local(); nada queda pendiente en
+    SQLite.
+
+Autor: Marcos Alvarado
+Fecha: 2026-10-17
+"""
+
+import json
+import sqlite3
+import hashlib
+import threading
+import time
+from pathlib import Path
+from typing import Dict, List, Optional, Iterable
+
+PROJECT_ROOT = Path(__file__).parent.parent.parent
+DEFAULT_DB_PATH = PROJECT_ROOT / "data" / "state" / "sheet_mirror.db"
+
+# Segundos que una pestaña se considera fresca antes de volver a hacer pull
+DEFAULT_MAX_AGE = 300
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS rows (
+    tab        TEXT    NOT NULL,
+    row_num    INTEGER NOT NULL,
+    apply_url  TEXT,
+    status     TEXT,
+    fit_score  REAL,
+    row_hash   TEXT    NOT NULL,
+    data       TEXT    NOT NULL,
+    PRIMARY KEY (tab, row_num)
+);
+CREATE INDEX IF NOT EXISTS idx_rows_url    ON rows (apply_url);
+CREATE INDEX IF NOT EXISTS idx_rows_status ON rows (tab, status);
+CREATE INDEX IF NOT EXISTS idx_rows_fit    ON rows (tab, fit_score);
+
+CREATE TABLE IF NOT EXISTS tabs (
+    tab        TEXT PRIMARY KEY,
+    headers    TEXT NOT NULL,
+    row_count  INTEGER NOT NULL DEFAULT 0,
+    pulled_at  REAL NOT NULL DEFAULT 0
+);
+"""
+
+
+def col_letter(col_index: int) -> str:
+    """Convierte índice 0-based de columna a letra A1 (0 → A, 26 → AA)."""
+    letters = ""
+    n = col_index + 1
+    while n:
+        n, rem = divmod(n - 1, 26)
+        letters = chr(65 + rem) + letters
+    return letters
+
+
+def _row_hash(row: List[str]) -> str:
+    return hashlib.sha1("\x1f".join(row).encode("utf-8")).hexdigest()
+
+
+def _parse_fit(value) -> Optional[float]:
+    try:
+        return float(str(value).split("/")[0].strip())
+    except (ValueError, TypeError):
+        return None
+
+
+class SheetMirror:
+    """Espejo SQLite de las pestañas de un Spreadsheet."""
+
+    def __init__(self, service, spreadsheet_id: str,
+                 db_path: Path = DEFAULT_DB_PATH,
+                 max_age: float = DEFAULT_MAX_AGE):
+        self.service = service
+        self.spreadsheet_id = spreadsheet_id
+        self.max_age = max_age
+        self.db_path = Path(db_path)
+        self.db_path.parent.mkdir(parents=True, exist_ok=True)
+        self._lock = threading.RLock()
+        self._conn = sqlite3.connect(str(self.db_path), check_same_thread=False)
+        self._conn.row_factory = sqlite3.Row
+        self._conn.execute("PRAGMA journal_mode=WAL")
+        self._conn.executescript(_SCHEMA)
+
+    # ------------------------------------------------------------------
+    # Estado de pestañas
+    # ------------------------------------------------------------------
+    def headers(self, tab_name: str) -> List[str]:
+        row = self._conn.execute(
+            "SELECT headers FROM tabs WHERE tab = ?", (tab_name,)
+        ).fetchone()
+        return json.loads(row["headers"]) if row else []
+
+    def is_fresh(self, tab_name: str) -> bool:
+        row = self._conn.execute(
+            "SELECT pulled_at FROM tabs WHERE tab = ?", (tab_name,)
+        ).fetchone()
+        return bool(row) and (time.time() - row["pulled_at"]) < self.max_age
+
+    def ensure_fresh(self, tab_name: str) -> None:
+        """Hace pull solo si la copia local está vencida (o no existe)."""
+        if not self.is_fresh(tab_name):
+            self.pull(tab_name)
+
+    # ------------------------------------------------------------------
+    # Pull (Sheet → SQLite)
+    # ------------------------------------------------------------------
+    def pull(self, tab_name: str) -> int:
+        """Sincroniza una pestaña. Devuelve cuántas filas cambiaron localmente."""
+        with self._lock:
+            headers = self._fetch_headers(tab_name)
+            if headers is None:
+                return 0  # tab no existe todavía
+
+            changed = self._pull_full(tab_name, headers)
+
+            self._conn.execute(
+                "INSERT INTO tabs (tab, headers, row_count, pulled_at) VALUES (?, ?, "
+                "(SELECT COUNT(*) FROM rows WHERE tab = ?), ?) "
+                "ON CONFLICT(tab) DO UPDATE SET headers = excluded.headers, "
+                "row_count = excluded.row_count, pulled_at = excluded.pulled_at",
+                (tab_name, json.dumps(headers), tab_name, time.time()),
+            )
+            self._conn.commit()
+            return changed
+
+    def invalidate(self, tab_name: str) -> None:
+        """Marca la pestaña como vencida (p.ej. después de un append directo al Sheet)."""
+        self._conn.execute("UPDATE tabs SET pulled_at = 0 WHERE tab = ?", (tab_name,))
+        self._conn.commit()
+
+    def pull_all(self, tab_names: Iterable[str]) -> Dict[str, int]:
+        return {tab: self.pull(tab) for tab in tab_names}
+
+    def _fetch_headers(self, tab_name: str) -> Optional[List[str]]:
+        try:
+            result = self.service.spreadsheets().values().get(
+                spreadsheetId=self.spreadsheet_id,
+                range=f"{tab_name}!1:1",
+            ).execute()
+        except Exception as e:
+            if "400" in str(e) or "Unable to parse range" in str(e):
+                return None
+            raise
+        values = result.get("values", [])
+        return values[0] if values else []
+
+    def _pull_full(self, tab_name: str, headers: List[str]) -> int:
+        """Lee la pestaña completa y actualiza solo las filas con hash distinto."""
+        last_col = col_letter(max(len(headers), 1) - 1)
+        result = self.service.spreadsheets().values().get(
+            spreadsheetId=self.spreadsheet_id,
+            range=f"{tab_name}!A2:{last_col}",
+        ).execute()
+        values = result.get("values", [])
+
+        existing = {
+            r["row_num"]: r["row_hash"]
+            for r in self._conn.execute(
+                "SELECT row_num, row_hash FROM rows WHERE tab = ?", (tab_name,)
+            )
+        }
+        changed = 0
+        for idx, row in enumerate(values, start=2):
+            row = [str(v) for v in row] + [""] * (len(headers) - len(row))
+            h = _row_hash(row)
+            if existing.get(idx) == h:
+                continue
+            self._upsert(tab_name, idx, headers, row, h)
+            changed += 1
+
+        last_row = len(values) + 1
+        deleted = self._conn.execute(
+            "DELETE FROM rows WHERE tab = ? AND row_num > ?", (tab_name, last_row)
+        ).rowcount
+        return changed + deleted
+
+    def _upsert(self, tab_name: str, row_num: int, headers: List[str],
+                row: List[str], row_hash: str) -> None:
+        job = dict(zip(headers, row))
+        self._conn.execute(
+            "INSERT OR REPLACE INTO rows "
+            "(tab, row_num, apply_url, status, fit_score, row_hash, data) "
+            "VALUES (?, ?, ?, ?, ?, ?, ?)",
+            (
+                tab_name, row_num,
+                job.get("ApplyURL") or None,
+                job.get("Status") or None,
+                _parse_fit(job.get("FitScore")),
+                row_hash,
+                json.dumps(job, ensure_ascii=False),
+            ),
+        )
+
+    # ------------------------------------------------------------------
+    # Lecturas locales
+    # ------------------------------------------------------------------
+    @staticmethod
+    def _to_job(r: sqlite3.Row) -> Dict:
+        job = json.loads(r["data"])
+        job["_row"] = r["row_num"]
+        return job
+
+    def get_all(self, tab_name: str) -> List[Dict]:
+        return [self._to_job(r) for r in self._conn.execute(
+            "SELECT row_num, data FROM rows WHERE tab = ? ORDER BY row_num", (tab_name,)
+        )]
+
+    def find_by_url(self, url: str, tab_name: Optional[str] = None) -> Optional[Dict]:
+        if tab_name:
+            r = self._conn.execute(
+                "SELECT row_num, data FROM rows WHERE apply_url = ? AND tab = ? LIMIT 1",
+                (url, tab_name),
+            ).fetchone()
+        else:
+            r = self._conn.execute(
+                "SELECT row_num, data FROM rows WHERE apply_url = ? LIMIT 1", (url,)
+            ).fetchone()
+        return self._to_job(r) if r else None
+
+    def by_status(self, status: str, tab_name: str) -> List[Dict]:
+        return [self._to_job(r) for r in self._conn.execute(
+            "SELECT row_num, data FROM rows WHERE tab = ? AND status = ? ORDER BY row_num",
+            (tab_name, status),
+        )]
+
+    def by_min_fit(self, min_fit: float, tab_name: str) -> List[Dict]:
+        return [self._to_job(r) for r in self._conn.execute(
+            "SELECT row_num, data FROM rows WHERE tab = ? AND fit_score >= ? "
+            "ORDER BY fit_score DESC",
+            (tab_name, min_fit),
+        )]
+
+    # ------------------------------------------------------------------
+    # Write-through (el Sheet ya se escribió; se refleja en la copia local)
+    # ------------------------------------------------------------------
+    def apply_local(self, tab_name: str, row_num: int, updates: Dict) -> None:
+        """Aplica a la copia local updates que ya se mandaron al Sheet."""
+        with self._lock:
+            headers = self.headers(tab_name)
+            if not headers:
+                return  # pestaña nunca traída: el próximo pull la lee entera
+            r = self._conn.execute(
+                "SELECT data FROM rows WHERE tab = ? AND row_num = ?", (tab_name, row_num)
+            ).fetchone()
+            job = json.loads(r["data"]) if r else {h: "" for h in headers}
+            for col, value in updates.items():
+                job[col] = str(value)
+            row = [job.get(h, "") for h in headers]
+            self._upsert(tab_name, row_num, headers, row, _row_hash(row))
+            self._conn.commit()
+
+    def close(self) -> None:
+        self._conn.close()
@@ -0,0 +1,161 @@
+"""
+AI JOB FOUNDRY - Sheet Write Buffer
+Acumula escrituras de SheetManager y las manda en el menor número de
+requests que permite el API.
+
+  - Valores  (update_job / update_cell)          → values.batchUpdate
+  - Formato  (color_row_by_fit / set_row_color)  → spreadsheets.batchUpdate
+
+Coalescing:
+  - Misma celda escrita varias veces → solo se manda el último valor.
+  - Mismo rango de formato repetido   → solo se manda el último color.
+  - Filas contiguas con el mismo color → un solo repeatCell.
+
+Flush automático por tamaño (max_values / max_requests) y por edad del
+primer cambio pendiente (max_age). Los lotes fallidos con 429/5xx se
+reintentan con backoff exponencial (core.utils.google_clients).
+
+Autor: Marcos Alvarado
+Fecha: 2026-10-17
+"""
+
+import time
+from typing import Dict, List, Optional, Tuple
+
+from core.utils.google_clients import execute_with_retry
+
+# Límites por request (el API acepta más, pero payloads chicos fallan menos)
+MAX_VALUE_RANGES = 1000
+MAX_FORMAT_REQUESTS = 500
+
+# Flush automático
+DEFAULT_MAX_AGE = 30.0   # segundos desde el primer cambio pendiente
+
+
+class SheetWriteBuffer:
+    """Buffer de escrituras para un Spreadsheet."""
+
+    def __init__(self, service, spreadsheet_id: str,
+                 max_values: int = MAX_VALUE_RANGES,
+                 max_requests: int = MAX_FORMAT_REQUESTS,
+                 max_age: float = DEFAULT_MAX_AGE):
+        self.service = service
+        self.spreadsheet_id = spreadsheet_id
+        self.max_values = max_values
+        self.max_requests = max_requests
+        self.max_age = max_age
+
+        # A1 range ("LinkedIn!G12") → valor
+        self._values: Dict[str, str] = {}
+        # (sheetId, fila 0-based, endColumnIndex) → color
+        self._formats: Dict[Tuple[int, int, Optional[int]], Dict[str, float]] = {}
+        self._first_pending_at: Optional[float] = None
+
+        # Estadísticas del buffer
+        self.cells_queued = 0
+        self.values_calls = 0
+        self.format_calls = 0
+
+    # ------------------------------------------------------------------
+    # Encolar
+    # ------------------------------------------------------------------
+    def add_value(self, a1_range: str, value) -> None:
+        self._values[a1_range] = str(value)
+        self.cells_queued += 1
+        self._touch()
+
+    def add_row_color(self, sheet_id: int, row_num: int, color: Dict[str, float],
+                      end_col: Optional[int] = None) -> None:
+        """row_num 1-based (igual que update_job). end_col=None → fila completa."""
+        self._formats[(sheet_id, row_num - 1, end_col)] = color
+        self._touch()
+
+    @property
+    def pending(self) -> int:
+        return len(self._values) + len(self._formats)
+
+    def _touch(self) -> None:
+        if self._first_pending_at is None:
+            self._first_pending_at = time.time()
+        if (len(self._values) >= self.max_values
+                or len(self._formats) >= self.max_requests
+                or time.time() - self._first_pending_at >= self.max_age):
+            self.flush()
+
+    # ------------------------------------------------------------------
+    # Flush
+    # ------------------------------------------------------------------
+    def _format_requests(self) -> List[Dict]:
+        """Une filas contiguas con el mismo color y ancho en un solo repeatCell."""
+        requests_body = []
+        keyed = sorted(
+            self._formats.items(),
+            key=lambda kv: (kv[0][0], kv[0][2] if kv[0][2] is not None else -1, kv[0][1]),
+        )
+        run = None  # [sheet_id, start, end, end_col, color]
+        for (sheet_id, row0, end_col), color in keyed:
+            if (run and run[0] == sheet_id and run[3] == end_col
+                    and run[2] == row0 and run[4] == color):
+                run[2] = row0 + 1
+                continue
+            if run:
+                requests_body.append(self._repeat_cell(*run))
+            run = [sheet_id, row0, row0 + 1, end_col, color]
+        if run:
+            requests_body.append(self._repeat_cell(*run))
+        return requests_body
+
+    @staticmethod
+    def _repeat_cell(sheet_id, start, end, end_col, color) -> Dict:
+        grid_range = {"sheetId": sheet_id, "startRowIndex": start, "endRowIndex": end}
+        if end_col is not None:
+            grid_range["startColumnIndex"] = 0
+            grid_range["endColumnIndex"] = end_col
+        return {
+            "repeatCell": {
+                "range": grid_range,
+                "cell": {"userEnteredFormat": {"backgroundColor": color}},
+                "fields": "userEnteredFormat.backgroundColor",
+            }
+        }
+
+    def flush(self) -> bool:
+        """Manda todo lo pendiente. Devuelve False si algún lote falló definitivamente."""
+        ok = True
+        data = [{"range": rng, "values": [[val]]} for rng, val in self._values.items()]
+        formats = self._format_requests()
+        self._values.clear()
+        self._formats.clear()
+        self._first_pending_at = None
+
+        for start in range(0, len(data), self.max_values):
+            chunk = data[start:start + self.max_values]
+            try:
+                execute_with_retry(
+                    self.service.spreadsheets().values().batchUpdate(
+                        spreadsheetId=self.spreadsheet_id,
+                        body={"valueInputOption": "USER_ENTERED", "data": chunk},
+                    ),
+                    label="values.batchUpdate",
+                )
+                self.values_calls += 1
+            except Exception as e:
+                print(f"[ERROR] SheetWriteBuffer: {len(chunk)} celdas no se guardaron: {e}")
+                ok = False
+
+        for start in range(0, len(formats), self.max_requests):
+            chunk = formats[start:start + self.max_requests]
+            try:
+                execute_with_retry(
+                    self.service.spreadsheets().batchUpdate(
+                        spreadsheetId=self.spreadsheet_id,
+                        body={"requests": chunk},
+                    ),
+                    label="batchUpdate",
+                )
+                self.format_calls += 1
+            except Exception as e:
+                print(f"  Warning: {len(chunk)} formatos no se aplicaron: {e}")
+                ok = False
+
+        return ok
@@ -3,7 +3,23 @@ Core utilities for AI Job Foundry
 
 This package contains utility modules used across the application:
 - oauth_validator: OAuth token validation and auto-refresh
+- google_clients: Sheets/Gmail client factory with quota limiter and retry
+- gmail_sync: incremental Gmail sync (historyId) with bounded processed-id store
+- llm_cache: content-addressed on-disk cache for LLM responses
+- parse_cache: per-email cache of parsed bulletin jobs (body hash + parser version)
+- browser_pool: shared Playwright browsers, warm contexts per identity, page leases
+- resource_blocking: request-interception profiles (images, fonts, trackers) + per-site stats
 """
 from .oauth_validator import ensure_valid_oauth_token
+from .gmail_sync import GmailSync
 
-__all__ = ['ensure_valid_oauth_token']
+__all__ = ['ensure_valid_oauth_token', 'build_service', 'print_metrics', 'GmailSync']
+
+
+def __getattr__(name):
+    # google_clients importa googleapiclient: se carga solo cuando se pide,
+    # para que core.utils.<submódulo> funcione sin las libs de Google.
+    if name in ('build_service', 'print_metrics'):
+        from . import google_clients
+        return getattr(google_clients, name)
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
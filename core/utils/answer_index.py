@@ -0,0 +1,343 @@
+#!/usr/bin/env python3
+"""
+Answer Index - screening question → answer knowledge base, on disk
+
+Every Easy Apply question went through a long `if any(word in question ...)`
+chain, and whatever it missed became an ENERD /api/jobs/field call
+(ENERDBridge.get_field_answer) or an LLM prompt (auto_apply_external.ask_ai),
+even when the very same question had been answered for another employer
+the day before.
+
+Questions are normalised (lowercase, no accents/punctuation, LinkedIn's
+duplicated label lines collapsed) and looked up in two steps:
+  - exact      : sha1 of the normalised text → dict lookup
+  - similar    : token set (stopwords EN/ES dropped, naive plural strip)
+                 through an inverted index; best Jaccard >= MIN_SIMILARITY,
+                 and the two questions may differ only in generic phrasing
+                 words (years, experience, level...): every other token —
+                 skill, tool, country, negation — must be the same ("years
+                 with Python" is not "years with Java", "authorized to work
+                 in the US" is not "... in Mexico", "do not require" is not
+                 "require")
+Both run in memory (microseconds); SQLite is only touched on learn().
+
+An entry stores either a literal answer or a `field` of the applicant's
+cv_data ("salary_expectation_mxn"): field entries resolve against the
+cv_data of the current job, so per-job values (ENERD-enriched salary, etc.)
+are still honoured.
+
+Storage: data/state/answer_index.db (SQLite, WAL)
+
+Usage:
+    index = get_answer_index()
+    hit = index.lookup("How many years of Python experience do you have?")
+    if hit:
+        answer = hit.resolve(cv_data)
+    else:
+        answer = ask_llm(...)
+        index.learn(question, answer, source="llm", company=job["company"])
+    index.print_stats()
+
+    py core/utils/answer_index.py --stats
+    py core/utils/answer_index.py --import data/applications   # {question: answer} maps
+
+learn() skips answers that name the employer (they don't transfer to other
+companies) and empty / placeholder answers.
+
+Env overrides:
+    ANSWER_INDEX_MIN_SIMILARITY, ANSWER_INDEX_DISABLED=1
+"""
+import hashlib
+import json
+import os
+import re
+import sqlite3
+import threading
+import time
+import unicodedata
+from collections import Counter
+from dataclasses import dataclass
+from pathlib import Path
+from typing import Dict, FrozenSet, Iterable, Optional
+
+PROJECT_ROOT = Path(__file__).parent.parent.parent
+DEFAULT_DB_PATH = PROJECT_ROOT / "data" / "state" / "answer_index.db"
+
+MIN_SIMILARITY = float(os.getenv("ANSWER_INDEX_MIN_SIMILARITY", "0.75"))
+DISABLED = os.getenv("ANSWER_INDEX_DISABLED", "") == "1"
+
+_NON_WORD = re.compile(r"[^a-z0-9+#]+")
+_STOPWORDS = frozenset(
+    # English
+    "a an the and or of to in on for with at by from as is are be been do does did "
+    "you your yours we our i me my it its this that these those have has had "
+    "will would can could should shall may might what which who whom how please "
+    "if any there here about into than then so such required question "
+    # Español
+    "el la los las un una unos unas y o de del al en con por para como es son ser "
+    "tu tus su sus que cual cuales quien como cuanto cuantos usted este esta estos "
+    "estas tiene tienes tener has ha mi me se lo le favor pregunta requerido".split()
+)
+# Phrasing words a similar (non-exact) match may add or drop; any other token
+# (skill, tool, certification, country, negation) names the subject and must match
+_GENERIC = frozenset(
+    # English
+    "many much long year yrs experience experienced work working worked professional "
+    "total overall hand level proficiency proficient skill knowledge familiar familiarity "
+    "comfortable expertise rate rating using use used relevant related programming language "
+    # Español
+    "anos experiencia trabajo trabajando profesional total nivel conocimiento dominio "
+    "manejo usando uso tiempo lenguaje programacion".split()
+)
+_CONTRACTION = re.compile(r"\b(can|won|don|doesn|didn|isn|aren|wasn|weren|haven|hasn|hadn|"
+                          r"shouldn|wouldn|couldn)['\u2019]t\b")
+_PLACEHOLDERS = frozenset({"", "n/a", "na", "none", "null", "unknown", "select", "--"})
+
+
+def normalize_question(text: str) -> str:
+    """Lowercase, accents and punctuation stripped, repeated label lines collapsed."""
+    lines = []
+    for line in (text or "").splitlines():
+        line = line.strip()
+        if line and line not in lines:
+            lines.append(line)
+    folded = _CONTRACTION.sub(r"\1 not", " ".join(lines).lower())
+    folded = unicodedata.normalize("NFKD", folded)
+    folded = "".join(ch for ch in folded if not unicodedata.combining(ch))
+    return _NON_WORD.sub(" ", folded).strip()
+
+
+def question_tokens(normalized: str) -> FrozenSet[str]:
+    tokens = set()
+    for word in normalized.split():
+        if word in _STOPWORDS:
+            continue
+        if len(word) > 4 and word.endswith("s") and not word.endswith("ss"):
+            word = word[:-1]
+        tokens.add(word)
+    return frozenset(tokens)
+
+
+def question_hash(normalized: str) -> str:
+    return hashlib.sha1(normalized.encode("utf-8")).hexdigest()
+
+
+@dataclass(frozen=True)
+class AnswerHit:
+    """Result of a lookup: a literal answer or a cv_data field to resolve."""
+    question: str
+    answer: str
+    field: str
+    source: str
+    score: float            # 1.0 exact, Jaccard otherwise
+
+    def resolve(self, cv_data: Optional[dict] = None) -> Optional[str]:
+        if self.field and cv_data and cv_data.get(self.field):
+            return str(cv_data[self.field])
+        return self.answer or None
+
+
+class AnswerIndex:
+    """Normalised screening questions → answers, exact hash then token-set similarity."""
+
+    def __init__(self, db_path: Optional[Path] = None, min_similarity: float = MIN_SIMILARITY):
+        self.db_path = Path(db_path or DEFAULT_DB_PATH)
+        self.db_path.parent.mkdir(parents=True, exist_ok=True)
+        self.min_similarity = min_similarity
+        self._lock = threading.Lock()
+        self._conn = sqlite3.connect(str(self.db_path), check_same_thread=False)
+        self._conn.execute("PRAGMA journal_mode=WAL")
+        self._conn.execute(
+            "CREATE TABLE IF NOT EXISTS answers ("
+            "  qhash TEXT PRIMARY KEY, question TEXT, answer TEXT, field TEXT,"
+            "  source TEXT, created_at REAL, updated_at REAL)"
+        )
+        self._conn.commit()
+
+        # qhash → (tokens, question, answer, field, source); token → {qhash}
+        self._entries: Dict[str, tuple] = {}
+        self._by_token: Dict[str, set] = {}
+        for qhash, question, answer, field, source in self._conn.execute(
+            "SELECT qhash, question, answer, field, source FROM answers"
+        ):
+            self._add(qhash, question, answer or "", field or "", source or "")
+
+        self.exact = 0
+        self.similar = 0
+        self.misses = 0
+        self.learned = 0
+
+    def _add(self, qhash: str, question: str, answer: str, field: str, source: str) -> None:
+        tokens = question_tokens(question)
+        self._entries[qhash] = (tokens, question, answer, field, source)
+        for token in tokens:
+            self._by_token.setdefault(token, set()).add(qhash)
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    def lookup(self, question: str, options: Optional[Iterable[str]] = None) -> Optional[AnswerHit]:
+        """
+        Best known answer for this question, or None. With `options`
+        (radio/select labels) a literal answer only counts if it matches one.
+        """
+        if DISABLED:
+            return None
+        normalized = normalize_question(question)
+        if not normalized:
+            return None
+        options = [o.lower() for o in options or () if o]
+
+        def usable(entry) -> bool:
+            answer = entry[2]
+            return bool(entry[3]) or not options or any(
+                answer.lower() in opt or opt in answer.lower() for opt in options
+            )
+
+        with self._lock:
+            entry = self._entries.get(question_hash(normalized))
+            if entry is not None and usable(entry):
+                self.exact += 1
+                return AnswerHit(entry[1], entry[2], entry[3], entry[4], 1.0)
+
+            tokens = question_tokens(normalized)
+            subject = tokens - _GENERIC
+            overlap: Counter = Counter()
+            for token in tokens:
+                overlap.update(self._by_token.get(token, ()))
+            best, best_score = None, 0.0
+            for qhash, shared in overlap.items():
+                entry = self._entries[qhash]
+                if entry[0] - _GENERIC != subject:
+                    continue
+                score = shared / (len(tokens) + len(entry[0]) - shared)
+                if score > best_score and usable(entry):
+                    best, best_score = entry, score
+            if best is not None and best_score >= self.min_similarity:
+                self.similar += 1
+                return AnswerHit(best[1], best[2], best[3], best[4], best_score)
+
+        self.misses += 1
+        return None
+
+    def learn(self, question: str, answer: str = "", field: str = "",
+              source: str = "llm", company: str = "") -> bool:
+        """
+        Store (or overwrite) the answer for this question. Answers that
+        mention `company`, and empty/placeholder answers, are not stored.
+        Returns True if the index changed.
+        """
+        if DISABLED:
+            return False
+        normalized = normalize_question(question)
+        answer = (answer or "").strip()
+        if not normalized or (not field and answer.lower() in _PLACEHOLDERS):
+            return False
+        company = (company or "").strip().lower()
+        if company and len(company) > 2 and (company in answer.lower() or company in question.lower()):
+            return False
+
+        qhash = question_hash(normalized)
+        now = time.time()
+        with self._lock:
+            current = self._entries.get(qhash)
+            if current is not None and current[2:] == (answer, field, source):
+                return False
+            self._conn.execute(
+                "INSERT INTO answers (qhash, question, answer, field, source, created_at, updated_at)"
+                " VALUES (?, ?, ?, ?, ?, ?, ?)"
+                " ON CONFLICT(qhash) DO UPDATE SET answer = excluded.answer,"
+                "  field = excluded.field, source = excluded.source, updated_at = excluded.updated_at",
+                (qhash, normalized, answer, field, source, now, now),
+            )
+            self._conn.commit()
+            if current is not None:
+                for token in current[0]:
+                    self._by_token.get(token, set()).discard(qhash)
+            self._add(qhash, normalized, answer, field, source)
+            self.learned += 1
+        return True
+
+    def import_answers(self, path: Path, source: str = "import") -> int:
+        """
+        Learn {question: answer} maps from a JSON file or every *.json under
+        a directory. Accepts a top-level map or records carrying
+        "answers"/"screening_answers" maps (and "company", used for the
+        employer filter). Returns answers learned.
+        """
+        path = Path(path)
+        files = sorted(path.rglob("*.json")) if path.is_dir() else [path]
+        learned = 0
+        for file in files:
+            try:
+                data = json.loads(file.read_text(encoding="utf-8"))
+            except (OSError, ValueError):
+                continue
+            records = list(data.values()) if isinstance(data, dict) else data
+            maps = []
+            if isinstance(data, dict) and all(isinstance(v, str) for v in records):
+                maps.append(("", data))
+            for record in records if isinstance(records, list) else ():
+                if not isinstance(record, dict):
+                    continue
+                for key in ("answers", "screening_answers"):
+                    if isinstance(record.get(key), dict):
+                        maps.append((record.get("company") or "", record[key]))
+            for company, answers in maps:
+                for question, answer in answers.items():
+                    if isinstance(answer, (str, int, float)):
+                        learned += self.learn(question, str(answer), source=source, company=company)
+        return learned
+
+    # ------------------------------------------------------------------
+    # Stats
+    # ------------------------------------------------------------------
+    def stats(self) -> Dict[str, int]:
+        with self._lock:
+            by_source = Counter(entry[4] for entry in self._entries.values())
+        return {
+            "exact": self.exact, "similar": self.similar, "misses": self.misses,
+            "learned": self.learned, "entries": len(self._entries), **by_source,
+        }
+
+    def print_stats(self) -> None:
+        s = self.stats()
+        print(f"   🗂️ answer_index: {s['exact']} exactas + {s['similar']} similares / "
+              f"{s['misses']} sin respuesta | {s['learned']} aprendidas, {s['entries']} en el índice")
+
+
+_INDEX: Optional[AnswerIndex] = None
+_LOCK = threading.Lock()
+
+
+def get_answer_index(db_path: Optional[Path] = None) -> AnswerIndex:
+    """Process-wide answer index."""
+    global _INDEX
+    with _LOCK:
+        if _INDEX is None:
+            _INDEX = AnswerIndex(db_path)
+        return _INDEX
+
+
+if __name__ == "__main__":
+    import argparse
+
+    parser = argparse.ArgumentParser(description="Índice de respuestas de screening")
+    parser.add_argument("--stats", action="store_true", help="Resumen del índice")
+    parser.add_argument("--import", dest="import_path", help="JSON o carpeta con {pregunta: respuesta}")
+    parser.add_argument("--lookup", help="Probar una pregunta")
+    args = parser.parse_args()
+
+    index = get_answer_index()
+    if args.import_path:
+        print(f"✅ {index.import_answers(Path(args.import_path))} respuestas importadas")
+    if args.lookup:
+        hit = index.lookup(args.lookup)
+        print(f"   {hit.answer or '{' + hit.field + '}'} (score {hit.score:.2f}, {hit.source}: {hit.question})"
+              if hit else "   ❓ Sin respuesta en el índice")
+    if args.stats or not (args.import_path or args.lookup):
+        s = index.stats()
+        print(f"📚 {s['entries']} preguntas en {index.db_path}")
+        for source, count in sorted((k, v) for k, v in s.items()
+                                    if k not in ("exact", "similar", "misses", "learned", "entries")):
+            print(f"   {source}: {count}")
@@ -0,0 +1,478 @@
+#!/usr/bin/env python3
+"""
+Browser Pool - Playwright compartido por scrapers, verifiers, apply bots y PDFs
+
+Lanzar un browser cuesta segundos; pedir una página a un context ya abierto,
+milisegundos. El pool mantiene, por proceso:
+
+  - un Browser por (engine, headless), lanzado la primera vez que se pide
+    — o conectado por CDP al servicio local si está corriendo (chromium)
+  - contexts tibios por identidad + opciones del context:
+        "anonymous" → context limpio
+        "linkedin"  → storage_state de data/credentials/linkedin_auth.json
+                      (o linkedin_session.json)
+  - lease / return: la página vuelve al pool (about:blank) y se reusa;
+    se cierra tras PAGE_MAX_USES préstamos
+  - reciclado del context tras CONTEXT_MAX_LEASES préstamos (memoria, cookies
+    viejas); se cierra cuando ya no tiene páginas prestadas
+  - health check al prestar: browser conectado y página viva; si no, se
+    descarta y se crea otra (relanzando el browser si hizo falta)
+  - block="scraping" | "verify": perfil de core/utils/resource_blocking.py
+    aplicado al context (imágenes, fuentes, trackers...)
+
+Uso (async):
+    async with AsyncBrowserPool() as pool:
+        async with pool.page("linkedin", engine="firefox", headless=False) as page:
+            await page.goto(url)
+
+Uso (sync; un pool por thread, se cierra solo al salir del proceso):
+    with get_sync_pool().page(engine="chromium") as page:
+        page.set_content(html)
+        page.pdf(path=str(output_path))
+
+Servicio local (chromium headless compartido entre procesos vía CDP):
+    py -m core.utils.browser_pool serve
+  Mientras corre, los pools de otros procesos se conectan a él en vez de
+  lanzar su propio chromium headless.
+
+Env overrides:
+    BROWSER_POOL_PAGE_MAX_USES, BROWSER_POOL_CONTEXT_MAX_LEASES,
+    BROWSER_POOL_CDP_PORT, BROWSER_POOL_DISABLED=1 (sin reuso: context nuevo por préstamo)
+"""
+import asyncio
+import atexit
+import json
+import os
+import sys
+import threading
+import time
+import urllib.request
+from contextlib import asynccontextmanager, contextmanager
+from pathlib import Path
+from typing import Dict, Optional, Tuple
+
+from core.utils.resource_blocking import attach_async, attach_sync
+
+PROJECT_ROOT = Path(__file__).parent.parent.parent
+LINKEDIN_AUTH_FILE = PROJECT_ROOT / "data" / "credentials" / "linkedin_auth.json"
+LINKEDIN_SESSION_FILES = [
+    LINKEDIN_AUTH_FILE,
+    PROJECT_ROOT / "data" / "credentials" / "linkedin_session.json",
+]
+SERVICE_FILE = PROJECT_ROOT / "data" / "state" / "browser_pool.json"
+
+PAGE_MAX_USES = int(os.getenv("BROWSER_POOL_PAGE_MAX_USES", "25"))
+CONTEXT_MAX_LEASES = int(os.getenv("BROWSER_POOL_CONTEXT_MAX_LEASES", "200"))
+CDP_PORT = int(os.getenv("BROWSER_POOL_CDP_PORT", "9333"))
+DISABLED = os.getenv("BROWSER_POOL_DISABLED", "") == "1"
+
+# Segundos máximos para el health check de una página ociosa
+HEALTH_TIMEOUT = 5.0
+
+# Flags de lanzamiento por engine
+LAUNCH_ARGS = {
+    "chromium": ["--disable-blink-features=AutomationControlled"],
+}
+
+
+def linkedin_session_file() -> Optional[Path]:
+    """Primer storage_state de LinkedIn guardado, o None."""
+    return next((f for f in LINKEDIN_SESSION_FILES if f.exists()), None)
+
+
+def _linkedin_options() -> dict:
+    session = linkedin_session_file()
+    return {"storage_state": str(session)} if session else {}
+
+
+# Identidad → opciones base del context (se evalúan al crear el context)
+IDENTITIES = {
+    "anonymous": lambda: {},
+    "linkedin": _linkedin_options,
+}
+
+
+def _context_options(identity: str, options: dict, block: Optional[str]) -> dict:
+    if identity not in IDENTITIES:
+        raise ValueError(f"Identidad desconocida: {identity!r} (usa {', '.join(IDENTITIES)})")
+    base = IDENTITIES[identity]()
+    if block:
+        # Con service workers activos sus requests no pasan por context.route()
+        base["service_workers"] = "block"
+    return {**base, **options}
+
+
+def _slot_key(engine: str, identity: str, headless: bool, block: Optional[str], options: dict) -> Tuple:
+    return (engine, identity, headless, block, json.dumps(options, sort_keys=True, default=str))
+
+
+def service_endpoint() -> Optional[str]:
+    """Endpoint CDP del servicio local si está vivo, si no None."""
+    try:
+        endpoint = json.loads(SERVICE_FILE.read_text(encoding="utf-8"))["endpoint"]
+        with urllib.request.urlopen(f"{endpoint}/json/version", timeout=0.5):
+            return endpoint
+    except Exception:
+        return None
+
+
+class _Slot:
+    """Un context tibio con sus páginas ociosas."""
+    __slots__ = ("context", "idle", "uses", "leases", "active", "retired")
+
+    def __init__(self, context):
+        self.context = context
+        self.idle = []
+        self.uses: Dict[object, int] = {}
+        self.leases = 0
+        self.active = 0
+        self.retired = False
+
+
+class _PoolStats:
+    def __init__(self):
+        self.launches = 0
+        self.connects = 0
+        self.contexts = 0
+        self.pages = 0
+        self.leases = 0
+        self.discarded = 0
+
+    def line(self) -> str:
+        reused = self.leases - self.pages
+        return (f"   🌐 browser_pool: {self.leases} préstamos, {reused} páginas reusadas, "
+                f"{self.contexts} contexts, {self.launches} launches, {self.connects} conexiones CDP"
+                f"{f', {self.discarded} descartadas' if self.discarded else ''}")
+
+
+# ─────────────────────────────────────────────────────────────────────────────
+# ASYNC
+# ─────────────────────────────────────────────────────────────────────────────
+
+class AsyncBrowserPool:
+    """Pool para código playwright.async_api (scrapers, EasyApplyBot)."""
+
+    def __init__(self):
+        self._pw = None
+        self._browsers: Dict[Tuple[str, bool], object] = {}
+        self._slots: Dict[Tuple, _Slot] = {}
+        self._slot_locks: Dict[Tuple, asyncio.Lock] = {}
+        self._lock = asyncio.Lock()
+        self.stats = _PoolStats()
+
+    async def __aenter__(self) -> "AsyncBrowserPool":
+        return self
+
+    async def __aexit__(self, *exc) -> None:
+        await self.close()
+
+    async def browser(self, engine: str = "firefox", headless: bool = True):
+        """Browser compartido del pool (relanzado si se desconectó)."""
+        async with self._lock:
+            browser = self._browsers.get((engine, headless))
+            if browser is not None and browser.is_connected():
+                return browser
+            if self._pw is None:
+                from playwright.async_api import async_playwright
+                self._pw = await async_playwright().start()
+            browser_type = getattr(self._pw, engine)
+            browser = None
+            endpoint = service_endpoint() if engine == "chromium" and headless else None
+            if endpoint:
+                try:
+                    browser = await browser_type.connect_over_cdp(endpoint)
+                    self.stats.connects += 1
+                except Exception:
+                    browser = None
+            if browser is None:
+                browser = await browser_type.launch(headless=headless,
+                                                    args=LAUNCH_ARGS.get(engine, []))
+                self.stats.launches += 1
+            self._browsers[(engine, headless)] = browser
+            return browser
+
+    async def _slot(self, engine: str, identity: str, headless: bool, block: Optional[str],
+                    options: dict) -> _Slot:
+        key = _slot_key(engine, identity, headless, block, options)
+        # Un lock por llave: dos leases concurrentes de la misma identidad
+        # esperarían ambos en new_context() y crearían dos contexts (uno huérfano).
+        async with self._slot_locks.setdefault(key, asyncio.Lock()):
+            slot = self._slots.get(key)
+            if slot is not None and (slot.leases >= CONTEXT_MAX_LEASES
+                                     or not slot.context.browser.is_connected()):
+                slot.retired = True
+                del self._slots[key]
+                if slot.active == 0:
+                    await self._close_quietly(slot.context)
+                slot = None
+            if slot is None:
+                browser = await self.browser(engine, headless)
+                context = await browser.new_context(**_context_options(identity, options, block))
+                if block:
+                    await attach_async(context, block)
+                slot = _Slot(context)
+                self.stats.contexts += 1
+                if not DISABLED:
+                    self._slots[key] = slot
+            return slot
+
+    @staticmethod
+    async def _close_quietly(target) -> None:
+        try:
+            await target.close()
+        except Exception:
+            pass
+
+    async def _healthy(self, page) -> bool:
+        if page.is_closed():
+            return False
+        try:
+            await asyncio.wait_for(page.evaluate("1"), HEALTH_TIMEOUT)
+            return True
+        except Exception:
+            return False
+
+    @asynccontextmanager
+    async def page(self, identity: str = "anonymous", engine: str = "firefox",
+                   headless: bool = True, block: Optional[str] = None, **context_options):
+        """
+        Presta una página de un context tibio de `identity`.
+        block y context_options (viewport, user_agent, locale...) forman parte
+        de la llave del context: mismas opciones → mismo context.
+        """
+        slot = await self._slot(engine, identity, headless, block, context_options)
+        page = None
+        while slot.idle and page is None:
+            candidate = slot.idle.pop()
+            if await self._healthy(candidate):
+                page = candidate
+            else:
+                slot.uses.pop(candidate, None)
+                self.stats.discarded += 1
+        if page is None:
+            page = await slot.context.new_page()
+            self.stats.pages += 1
+        slot.leases += 1
+        slot.active += 1
+        self.stats.leases += 1
+        try:
+            yield page
+        finally:
+            slot.active -= 1
+            uses = slot.uses.pop(page, 0) + 1
+            keep = not (DISABLED or slot.retired or page.is_closed() or uses >= PAGE_MAX_USES)
+            if keep:
+                try:
+                    await page.goto("about:blank")
+                except Exception:
+                    keep = False
+            if keep:
+                slot.uses[page] = uses
+                slot.idle.append(page)
+            else:
+                await self._close_quietly(page)
+            if (DISABLED or slot.retired) and slot.active == 0:
+                await self._close_quietly(slot.context)
+
+    async def close(self) -> None:
+        for slot in self._slots.values():
+            await self._close_quietly(slot.context)
+        self._slots.clear()
+        self._slot_locks.clear()
+        for browser in self._browsers.values():
+            await self._close_quietly(browser)
+        self._browsers.clear()
+        if self._pw is not None:
+            await self._pw.stop()
+            self._pw = None
+
+
+# ─────────────────────────────────────────────────────────────────────────────
+# SYNC
+# ─────────────────────────────────────────────────────────────────────────────
+
+class SyncBrowserPool:
+    """
+    Pool para código playwright.sync_api (verifiers, LinkedInEasyApply, PDFs).
+    Los objetos sync de Playwright pertenecen al thread que los creó: usar
+    get_sync_pool(), que da un pool por thread.
+    """
+
+    def __init__(self):
+        self._pw = None
+        self._browsers: Dict[Tuple[str, bool], object] = {}
+        self._slots: Dict[Tuple, _Slot] = {}
+        self.stats = _PoolStats()
+
+    def browser(self, engine: str = "firefox", headless: bool = True):
+        """Browser compartido del pool (relanzado si se desconectó)."""
+        browser = self._browsers.get((engine, headless))
+        if browser is not None and browser.is_connected():
+            return browser
+        if self._pw is None:
+            from playwright.sync_api import sync_playwright
+            self._pw = sync_playwright().start()
+        browser_type = getattr(self._pw, engine)
+        browser = None
+        endpoint = service_endpoint() if engine == "chromium" and headless else None
+        if endpoint:
+            try:
+                browser = browser_type.connect_over_cdp(endpoint)
+                self.stats.connects += 1
+            except Exception:
+                browser = None
+        if browser is None:
+            browser = browser_type.launch(headless=headless, args=LAUNCH_ARGS.get(engine, []))
+            self.stats.launches += 1
+        self._browsers[(engine, headless)] = browser
+        return browser
+
+    def _slot(self, engine: str, identity: str, headless: bool, block: Optional[str],
+              options: dict) -> _Slot:
+        key = _slot_key(engine, identity, headless, block, options)
+        slot = self._slots.get(key)
+        if slot is not None and (slot.leases >= CONTEXT_MAX_LEASES
+                                 or not slot.context.browser.is_connected()):
+            slot.retired = True
+            del self._slots[key]
+            if slot.active == 0:
+                self._close_quietly(slot.context)
+            slot = None
+        if slot is None:
+            context = self.browser(engine, headless).new_context(
+                **_context_options(identity, options, block))
+            if block:
+                attach_sync(context, block)
+            slot = _Slot(context)
+            self.stats.contexts += 1
+            if not DISABLED:
+                self._slots[key] = slot
+        return slot
+
+    @staticmethod
+    def _close_quietly(target) -> None:
+        try:
+            target.close()
+        except Exception:
+            pass
+
+    def _healthy(self, page) -> bool:
+        if page.is_closed():
+            return False
+        try:
+            page.evaluate("1")
+            return True
+        except Exception:
+            return False
+
+    @contextmanager
+    def page(self, identity: str = "anonymous", engine: str = "firefox",
+             headless: bool = True, block: Optional[str] = None, **context_options):
+        """Igual que AsyncBrowserPool.page(), para la API sync."""
+        slot = self._slot(engine, identity, headless, block, context_options)
+        page = None
+        while slot.idle and page is None:
+            candidate = slot.idle.pop()
+            if self._healthy(candidate):
+                page = candidate
+            else:
+                slot.uses.pop(candidate, None)
+                self.stats.discarded += 1
+        if page is None:
+            page = slot.context.new_page()
+            self.stats.pages += 1
+        slot.leases += 1
+        slot.active += 1
+        self.stats.leases += 1
+        try:
+            yield page
+        finally:
+            slot.active -= 1
+            uses = slot.uses.pop(page, 0) + 1
+            keep = not (DISABLED or slot.retired or page.is_closed() or uses >= PAGE_MAX_USES)
+            if keep:
+                try:
+                    page.goto("about:blank")
+                except Exception:
+                    keep = False
+            if keep:
+                slot.uses[page] = uses
+                slot.idle.append(page)
+            else:
+                self._close_quietly(page)
+            if (DISABLED or slot.retired) and slot.active == 0:
+                self._close_quietly(slot.context)
+
+    def close(self) -> None:
+        for slot in self._slots.values():
+            self._close_quietly(slot.context)
+        self._slots.clear()
+        for browser in self._browsers.values():
+            self._close_quietly(browser)
+        self._browsers.clear()
+        if self._pw is not None:
+            try:
+                self._pw.stop()
+            except Exception:
+                pass
+            self._pw = None
+
+
+_local = threading.local()
+_SYNC_POOLS = []
+_SYNC_LOCK = threading.Lock()
+
+
+def get_sync_pool() -> SyncBrowserPool:
+    """Pool sync de este thread (se crea la primera vez)."""
+    pool = getattr(_local, "pool", None)
+    if pool is None:
+        pool = _local.pool = SyncBrowserPool()
+        with _SYNC_LOCK:
+            _SYNC_POOLS.append((threading.current_thread(), pool))
+    return pool
+
+
+@atexit.register
+def _close_sync_pools() -> None:
+    # Solo el pool del thread principal se puede cerrar aquí; los demás
+    # threads ya terminaron y sus browsers mueren con el proceso
+    for thread, pool in _SYNC_POOLS:
+        if thread is threading.current_thread():
+            pool.close()
+    _SYNC_POOLS.clear()
+
+
+# ─────────────────────────────────────────────────────────────────────────────
+# SERVICIO LOCAL
+# ─────────────────────────────────────────────────────────────────────────────
+
+def serve(port: int = CDP_PORT) -> None:
+    """Mantiene un chromium headless abierto y publica su endpoint CDP."""
+    from playwright.sync_api import sync_playwright
+
+    endpoint = f"http://127.0.0.1:{port}"
+    with sync_playwright() as p:
+        browser = p.chromium.launch(headless=True, args=[f"--remote-debugging-port={port}"])
+        SERVICE_FILE.parent.mkdir(parents=True, exist_ok=True)
+        SERVICE_FILE.write_text(json.dumps({"endpoint": endpoint, "pid": os.getpid()}), encoding="utf-8")
+        print(f"🌐 Browser pool escuchando en {endpoint} (Ctrl+C para detener)")
+        try:
+            while browser.is_connected():
+                time.sleep(1)
+        except KeyboardInterrupt:
+            pass
+        finally:
+            SERVICE_FILE.unlink(missing_ok=True)
+            browser.close()
+    print("🌐 Browser pool detenido")
+
+
+if __name__ == "__main__":
+    if len(sys.argv) > 1 and sys.argv[1] == "serve":
+        serve(int(sys.argv[2]) if len(sys.argv) > 2 else CDP_PORT)
+    elif len(sys.argv) > 1 and sys.argv[1] == "status":
+        endpoint = service_endpoint()
+        print(f"🌐 Servicio activo en {endpoint}" if endpoint else "🌐 Servicio no activo")
+    else:
+        print("Uso: py -m core.utils.browser_pool [serve [puerto] | status]")
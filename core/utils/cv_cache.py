@@ -0,0 +1,297 @@
+#!/usr/bin/env python3
+"""
+CV Cache - tailored CV PDFs keyed by content, not by sheet row
+
+The old cache was data/cv/generated/{job_id}_{company}_{role}.pdf with _row
+as fallback id: the same posting seen in two tabs got two LLM tailoring
+calls and two PDFs, and editing the base profile never invalidated anything
+unless clear_cv_cache() was run by hand.
+
+Entry key = (job key, inputs hash, profile version):
+  - job key       : canonical job key (core.sheets.job_index.job_key), so the
+                    same posting from any tab / tracking URL is one entry
+  - inputs hash   : hash of what the tailoring prompt sees (company, role,
+                    description, FIT) — a new description → new CV
+  - profile version: hash of profile + salary + CV template — editing the
+                    base profile/template misses every old entry, and the
+                    first put() under a new version drops the old ones
+
+Entries point to a blob = one PDF per distinct rendered HTML (hash of the
+HTML). Two jobs whose tailored output is identical share the same PDF.
+
+Storage: data/state/cv_cache.db (SQLite, WAL) + data/cv/generated/<hash>.pdf
+  - size-bounded: least recently used PDFs (and their entries) are evicted
+    once the blobs exceed CV_CACHE_MAX_MB
+  - what gets uploaded is named(): a hardlink data/cv/generated/<hash>/<name>.pdf
+    with a readable file name (employers see it), removed with its blob
+
+Usage:
+    cache = get_cv_cache()
+    path = cache.get(job_key, inputs_hash, version)
+    if path is None:
+        html = build_html(...)
+        html_hash = cache.content_hash(html)
+        path = cache.blob(html_hash)                    # dedup
+        if path is None:
+            generate_pdf(html, cache.blob_path(html_hash))
+        path = cache.put(job_key, inputs_hash, version, html_hash)
+    upload = cache.named(path, "CV_Marcos_Alvarado_Acme.pdf")
+    cache.print_stats()
+
+Env overrides:
+    CV_CACHE_MAX_MB, CV_CACHE_DISABLED=1
+"""
+import hashlib
+import os
+import shutil
+import sqlite3
+import threading
+import time
+from pathlib import Path
+from typing import Dict, Optional
+
+PROJECT_ROOT = Path(__file__).parent.parent.parent
+DEFAULT_DB_PATH = PROJECT_ROOT / "data" / "state" / "cv_cache.db"
+DEFAULT_BLOB_DIR = PROJECT_ROOT / "data" / "cv" / "generated"
+
+MAX_BYTES = int(float(os.getenv("CV_CACHE_MAX_MB", "200")) * 1024 * 1024)
+DISABLED = os.getenv("CV_CACHE_DISABLED", "") == "1"
+
+
+class CVCache:
+    """Tailored CV PDFs by (job key, inputs hash, profile version), deduplicated by HTML hash."""
+
+    def __init__(self, db_path: Optional[Path] = None, blob_dir: Optional[Path] = None,
+                 max_bytes: int = MAX_BYTES):
+        self.db_path = Path(db_path or DEFAULT_DB_PATH)
+        self.db_path.parent.mkdir(parents=True, exist_ok=True)
+        self.blob_dir = Path(blob_dir or DEFAULT_BLOB_DIR)
+        self.max_bytes = max_bytes
+        self._lock = threading.Lock()
+        self._conn = sqlite3.connect(str(self.db_path), check_same_thread=False)
+        self._conn.execute("PRAGMA journal_mode=WAL")
+        self._conn.executescript(
+            "CREATE TABLE IF NOT EXISTS cv_entries ("
+            "  job_key TEXT, inputs_hash TEXT, profile_version TEXT, html_hash TEXT,"
+            "  created_at REAL, last_used REAL,"
+            "  PRIMARY KEY (job_key, inputs_hash, profile_version));"
+            "CREATE INDEX IF NOT EXISTS cv_entries_blob ON cv_entries (html_hash);"
+            "CREATE TABLE IF NOT EXISTS cv_blobs ("
+            "  html_hash TEXT PRIMARY KEY, bytes INTEGER, created_at REAL, last_used REAL);"
+        )
+        self._conn.commit()
+        self._version_checked = ""
+
+        self.hits = 0
+        self.misses = 0
+        self.dedup = 0            # misses served by an existing identical PDF
+        self.evicted = 0
+
+    @staticmethod
+    def content_hash(*parts: str) -> str:
+        digest = hashlib.sha256()
+        for part in parts:
+            digest.update((part or "").encode("utf-8", errors="replace"))
+            digest.update(b"\0")
+        return digest.hexdigest()
+
+    def blob_path(self, html_hash: str) -> Path:
+        return self.blob_dir / f"{html_hash[:24]}.pdf"
+
+    def named(self, path: Path, filename: str) -> Path:
+        """
+        The blob under a readable file name, for uploading: <blob_dir>/<hash>/<filename>,
+        a hardlink (a copy where the filesystem can't link). `path` itself if it is
+        not a blob of this cache.
+        """
+        path = Path(path)
+        if path.parent != self.blob_dir or not path.exists():
+            return path
+        target = path.with_suffix("") / filename
+        if not target.exists():
+            target.parent.mkdir(parents=True, exist_ok=True)
+            try:
+                os.link(path, target)
+            except OSError:
+                shutil.copy2(path, target)
+        return target
+
+    def get(self, job_key: str, inputs_hash: str, version: str) -> Optional[Path]:
+        """PDF cached for this job/inputs/profile, or None (miss, version bump, file gone)."""
+        if DISABLED:
+            return None
+        now = time.time()
+        with self._lock:
+            row = self._conn.execute(
+                "SELECT html_hash FROM cv_entries"
+                " WHERE job_key = ? AND inputs_hash = ? AND profile_version = ?",
+                (job_key, inputs_hash, version),
+            ).fetchone()
+            if row:
+                path = self.blob_path(row[0])
+                if path.exists():
+                    self._touch(job_key, inputs_hash, version, row[0], now)
+                    self._conn.commit()
+                    self.hits += 1
+                    return path
+                # PDF deleted by hand: the entry is useless
+                self._drop_blob(row[0])
+                self._conn.commit()
+        self.misses += 1
+        return None
+
+    def blob(self, html_hash: str) -> Optional[Path]:
+        """PDF already rendered for this exact HTML (dedup), or None."""
+        if DISABLED:
+            return None
+        with self._lock:
+            row = self._conn.execute(
+                "SELECT 1 FROM cv_blobs WHERE html_hash = ?", (html_hash,)
+            ).fetchone()
+        path = self.blob_path(html_hash)
+        if row and path.exists():
+            self.dedup += 1
+            return path
+        return None
+
+    def put(self, job_key: str, inputs_hash: str, version: str, html_hash: str) -> Path:
+        """
+        Record the PDF (already written to blob_path(html_hash)) for this job.
+        The first put() under a new profile version drops the entries of older
+        versions; then the size bound is enforced.
+        """
+        path = self.blob_path(html_hash)
+        if DISABLED or not path.exists():
+            return path
+        now = time.time()
+        with self._lock:
+            if version != self._version_checked:
+                self._purge_versions(version)
+                self._version_checked = version
+            self._conn.execute(
+                "INSERT OR IGNORE INTO cv_blobs (html_hash, bytes, created_at, last_used)"
+                " VALUES (?, ?, ?, ?)",
+                (html_hash, path.stat().st_size, now, now),
+            )
+            self._conn.execute(
+                "INSERT OR REPLACE INTO cv_entries"
+                " (job_key, inputs_hash, profile_version, html_hash, created_at, last_used)"
+                " VALUES (?, ?, ?, ?, ?, ?)",
+                (job_key, inputs_hash, version, html_hash, now, now),
+            )
+            self._evict(keep=html_hash)
+            self._conn.commit()
+        return path
+
+    def forget(self, job_id: str) -> int:
+        """Drop the entries of one job ("linkedin:123" or just "123"). Returns how many."""
+        with self._lock:
+            rows = self._conn.execute(
+                "SELECT DISTINCT html_hash FROM cv_entries WHERE job_key = ? OR job_key LIKE ?",
+                (job_id, f"%:{job_id}"),
+            ).fetchall()
+            count = self._conn.execute(
+                "DELETE FROM cv_entries WHERE job_key = ? OR job_key LIKE ?",
+                (job_id, f"%:{job_id}"),
+            ).rowcount
+            for (html_hash,) in rows:
+                self._drop_orphan(html_hash)
+            self._conn.commit()
+        return count
+
+    def clear(self) -> int:
+        """Drop the whole cache (entries + PDFs). Returns PDFs deleted."""
+        with self._lock:
+            hashes = [h for (h,) in self._conn.execute("SELECT html_hash FROM cv_blobs")]
+            self._conn.execute("DELETE FROM cv_entries")
+            self._conn.execute("DELETE FROM cv_blobs")
+            self._conn.commit()
+        for html_hash in hashes:
+            self._unlink(html_hash)
+        return len(hashes)
+
+    # ------------------------------------------------------------------
+    # Internals (caller holds self._lock)
+    # ------------------------------------------------------------------
+    def _touch(self, job_key: str, inputs_hash: str, version: str, html_hash: str, now: float) -> None:
+        self._conn.execute(
+            "UPDATE cv_entries SET last_used = ?"
+            " WHERE job_key = ? AND inputs_hash = ? AND profile_version = ?",
+            (now, job_key, inputs_hash, version),
+        )
+        self._conn.execute("UPDATE cv_blobs SET last_used = ? WHERE html_hash = ?", (now, html_hash))
+
+    def _drop_blob(self, html_hash: str) -> None:
+        self._conn.execute("DELETE FROM cv_entries WHERE html_hash = ?", (html_hash,))
+        self._conn.execute("DELETE FROM cv_blobs WHERE html_hash = ?", (html_hash,))
+        self._unlink(html_hash)
+
+    def _unlink(self, html_hash: str) -> None:
+        path = self.blob_path(html_hash)
+        path.unlink(missing_ok=True)
+        shutil.rmtree(path.with_suffix(""), ignore_errors=True)     # named() copies
+
+    def _drop_orphan(self, html_hash: str) -> None:
+        used = self._conn.execute(
+            "SELECT 1 FROM cv_entries WHERE html_hash = ? LIMIT 1", (html_hash,)
+        ).fetchone()
+        if not used:
+            self._drop_blob(html_hash)
+
+    def _purge_versions(self, version: str) -> None:
+        rows = self._conn.execute(
+            "SELECT DISTINCT html_hash FROM cv_entries WHERE profile_version != ?", (version,)
+        ).fetchall()
+        if not rows:
+            return
+        self._conn.execute("DELETE FROM cv_entries WHERE profile_version != ?", (version,))
+        for (html_hash,) in rows:
+            self._drop_orphan(html_hash)
+
+    def _evict(self, keep: str) -> None:
+        total = self._conn.execute("SELECT COALESCE(SUM(bytes), 0) FROM cv_blobs").fetchone()[0]
+        if total <= self.max_bytes:
+            return
+        for html_hash, size in self._conn.execute(
+            "SELECT html_hash, bytes FROM cv_blobs WHERE html_hash != ? ORDER BY last_used",
+            (keep,),
+        ).fetchall():
+            if total <= self.max_bytes:
+                break
+            self._drop_blob(html_hash)
+            total -= size
+            self.evicted += 1
+
+    # ------------------------------------------------------------------
+    # Stats
+    # ------------------------------------------------------------------
+    def stats(self) -> Dict[str, int]:
+        with self._lock:
+            entries = self._conn.execute("SELECT COUNT(*) FROM cv_entries").fetchone()[0]
+            blobs, size = self._conn.execute(
+                "SELECT COUNT(*), COALESCE(SUM(bytes), 0) FROM cv_blobs"
+            ).fetchone()
+        return {
+            "hits": self.hits, "misses": self.misses, "dedup": self.dedup,
+            "evicted": self.evicted, "entries": entries, "pdfs": blobs, "bytes": size,
+        }
+
+    def print_stats(self) -> None:
+        s = self.stats()
+        dedup = f", {s['dedup']} PDFs reusados" if s["dedup"] else ""
+        evicted = f", {s['evicted']} desalojados" if s["evicted"] else ""
+        print(f"   💾 cv_cache: {s['hits']} hits / {s['misses']} misses{dedup} | "
+              f"{s['entries']} entradas → {s['pdfs']} PDFs, {s['bytes'] / 1024 / 1024:.1f} MB{evicted}")
+
+
+_CACHE: Optional[CVCache] = None
+_LOCK = threading.Lock()
+
+
+def get_cv_cache(db_path: Optional[Path] = None) -> CVCache:
+    """Process-wide CV cache."""
+    global _CACHE
+    with _LOCK:
+        if _CACHE is None:
+            _CACHE = CVCache(db_path)
+        return _CACHE
@@ -0,0 +1,262 @@
+#!/usr/bin/env python3
+"""
+Gmail Incremental Sync - historyId based
+Replaces "list the newest N messages and filter against a growing file"
+with Gmail's history.list API.
+
+State lives in data/state/gmail_sync.db (SQLite), one scope per consumer
+(e.g. "bulletins", "ingest_v2"):
+  - sync_state : last historyId seen for the scope
+  - pending    : message ids discovered but not yet processed
+  - processed  : recently processed ids (bounded by age and count)
+
+Flow:
+    sync = GmailSync(gmail, scope="bulletins")
+    for msg_id in sync.new_message_ids(label_id=..., max_results=50):
+        ...
+        sync.mark_processed(msg_id)
+
+new_message_ids() asks history.list for messages added since the stored
+historyId. If there is no stored id, or Gmail answers 404 (history ids
+expire after about a week), it does a full resync with messages.list
+and stores the profile's current historyId. Discovered ids stay in
+`pending` until they are marked processed, so a failed run picks them up
+again even though the historyId has already moved on.
+
+Env overrides:
+    GMAIL_SYNC_RETENTION_DAYS, GMAIL_SYNC_MAX_PROCESSED
+"""
+import json
+import os
+import sqlite3
+import time
+from pathlib import Path
+from typing import Iterable, List, Optional
+
+PROJECT_ROOT = Path(__file__).parent.parent.parent
+DEFAULT_DB_PATH = PROJECT_ROOT / "data" / "state" / "gmail_sync.db"
+
+# Processed ids older than this, or beyond the newest N, are dropped.
+# Once a message is behind the stored historyId it never comes back
+# from history.list, so the store only has to cover a full resync window.
+RETENTION_DAYS = int(os.getenv("GMAIL_SYNC_RETENTION_DAYS", "90"))
+MAX_PROCESSED = int(os.getenv("GMAIL_SYNC_MAX_PROCESSED", "20000"))
+# Pending ids that keep failing (message deleted, etc.) are given up after this
+PENDING_MAX_AGE_DAYS = 7
+
+HISTORY_PAGE_SIZE = 500
+LIST_PAGE_SIZE = 500
+
+
+def _http_status(error: Exception) -> Optional[int]:
+    status = getattr(getattr(error, "resp", None), "status", None)
+    return int(status) if status is not None else None
+
+
+class GmailSync:
+    """Incremental message discovery for one Gmail consumer."""
+
+    def __init__(self, gmail_service, scope: str, db_path: Optional[Path] = None):
+        self.gmail = gmail_service
+        self.scope = scope
+        self.db_path = Path(db_path or DEFAULT_DB_PATH)
+        self.db_path.parent.mkdir(parents=True, exist_ok=True)
+        self._conn = sqlite3.connect(str(self.db_path))
+        self._conn.execute("PRAGMA journal_mode=WAL")
+        self._conn.executescript(
+            "CREATE TABLE IF NOT EXISTS sync_state ("
+            "  scope TEXT PRIMARY KEY, history_id TEXT, synced_at REAL, legacy_imported INTEGER DEFAULT 0);"
+            "CREATE TABLE IF NOT EXISTS pending ("
+            "  scope TEXT, msg_id TEXT, added_at REAL, PRIMARY KEY (scope, msg_id));"
+            "CREATE TABLE IF NOT EXISTS processed ("
+            "  scope TEXT, msg_id TEXT, processed_at REAL, PRIMARY KEY (scope, msg_id));"
+            "CREATE INDEX IF NOT EXISTS processed_by_age ON processed (scope, processed_at);"
+        )
+        self._conn.execute("INSERT OR IGNORE INTO sync_state (scope) VALUES (?)", (scope,))
+        self._conn.commit()
+
+        # Metrics for the last new_message_ids() call
+        self.mode = None          # "history" | "full"
+        self.discovered = 0
+
+    # ------------------------------------------------------------------
+    # State
+    # ------------------------------------------------------------------
+    @property
+    def history_id(self) -> Optional[str]:
+        row = self._conn.execute(
+            "SELECT history_id FROM sync_state WHERE scope = ?", (self.scope,)
+        ).fetchone()
+        return row[0] if row else None
+
+    def _set_history_id(self, history_id: str) -> None:
+        self._conn.execute(
+            "UPDATE sync_state SET history_id = ?, synced_at = ? WHERE scope = ?",
+            (str(history_id), time.time(), self.scope),
+        )
+
+    def import_legacy(self, path: Path) -> int:
+        """
+        One-time import of an old processed-id file (one id per line, or a
+        JSON list). Later calls are no-ops. Returns ids imported.
+        """
+        path = Path(path)
+        row = self._conn.execute(
+            "SELECT legacy_imported FROM sync_state WHERE scope = ?", (self.scope,)
+        ).fetchone()
+        if (row and row[0]) or not path.exists():
+            return 0
+        text = path.read_text(encoding="utf-8").strip()
+        try:
+            ids = json.loads(text) if text.startswith("[") else text.splitlines()
+        except ValueError:
+            ids = []
+        ids = [i.strip() for i in ids if i and i.strip()]
+        # Keep only the newest ids; the file is append-ordered
+        self.mark_many(ids[-MAX_PROCESSED:], commit=False)
+        self._conn.execute(
+            "UPDATE sync_state SET legacy_imported = 1 WHERE scope = ?", (self.scope,)
+        )
+        self._conn.commit()
+        return len(ids)
+
+    def is_processed(self, msg_id: str) -> bool:
+        return self._conn.execute(
+            "SELECT 1 FROM processed WHERE scope = ? AND msg_id = ?", (self.scope, msg_id)
+        ).fetchone() is not None
+
+    def mark_processed(self, msg_id: str) -> None:
+        self.mark_many([msg_id])
+
+    def mark_many(self, msg_ids: Iterable[str], commit: bool = True) -> None:
+        now = time.time()
+        rows = [(self.scope, m, now) for m in msg_ids]
+        self._conn.executemany(
+            "INSERT OR REPLACE INTO processed (scope, msg_id, processed_at) VALUES (?, ?, ?)", rows
+        )
+        self._conn.executemany(
+            "DELETE FROM pending WHERE scope = ? AND msg_id = ?", [(s, m) for s, m, _ in rows]
+        )
+        if commit:
+            self._conn.commit()
+
+    def compact(self) -> None:
+        """Bound the processed store by age and count; drop stale pending ids."""
+        now = time.time()
+        self._conn.execute(
+            "DELETE FROM processed WHERE scope = ? AND processed_at < ?",
+            (self.scope, now - RETENTION_DAYS * 86400),
+        )
+        self._conn.execute(
+            "DELETE FROM processed WHERE scope = ? AND msg_id NOT IN ("
+            "  SELECT msg_id FROM processed WHERE scope = ? ORDER BY processed_at DESC LIMIT ?)",
+            (self.scope, self.scope, MAX_PROCESSED),
+        )
+        self._conn.execute(
+            "DELETE FROM pending WHERE scope = ? AND added_at < ?",
+            (self.scope, now - PENDING_MAX_AGE_DAYS * 86400),
+        )
+        self._conn.commit()
+
+    def close(self) -> None:
+        self.compact()
+        self._conn.close()
+
+    # ------------------------------------------------------------------
+    # Discovery
+    # ------------------------------------------------------------------
+    def _history_ids(self, start_history_id: str, label_id: Optional[str]) -> tuple:
+        """All message ids added (or labelled) since start_history_id. Raises on 404."""
+        ids, page_token, latest = [], None, start_history_id
+        while True:
+            params = dict(
+                userId="me",
+                startHistoryId=start_history_id,
+                historyTypes=["messageAdded", "labelAdded"],
+                maxResults=HISTORY_PAGE_SIZE,
+            )
+            if label_id:
+                params["labelId"] = label_id
+            if page_token:
+                params["pageToken"] = page_token
+            resp = self.gmail.users().history().list(**params).execute()
+            for record in resp.get("history", []):
+                for added in record.get("messagesAdded", []):
+                    msg = added.get("message", {})
+                    if not label_id or label_id in msg.get("labelIds", [label_id]):
+                        ids.append(msg["id"])
+                for added in record.get("labelsAdded", []):
+                    if not label_id or label_id in added.get("labelIds", []):
+                        ids.append(added["message"]["id"])
+            latest = resp.get("historyId", latest)
+            page_token = resp.get("nextPageToken")
+            if not page_token:
+                return ids, latest
+
+    def _full_ids(self, label_id: Optional[str], query: Optional[str]) -> tuple:
+        """
+        Full resync: current historyId first (so nothing slips in between),
+        then every page of messages.list. The whole listing goes to pending:
+        the historyId moves past all of it, so anything left out here would
+        never be discovered again.
+        """
+        profile = self.gmail.users().getProfile(userId="me").execute()
+        ids, page_token = [], None
+        while True:
+            params = dict(userId="me", maxResults=LIST_PAGE_SIZE)
+            if label_id:
+                params["labelIds"] = [label_id]
+            if query:
+                params["q"] = query
+            if page_token:
+                params["pageToken"] = page_token
+            resp = self.gmail.users().messages().list(**params).execute()
+            ids.extend(m["id"] for m in resp.get("messages", []))
+            page_token = resp.get("nextPageToken")
+            if not page_token:
+                break
+        return ids, profile["historyId"]
+
+    def new_message_ids(self, label_id: Optional[str] = None, query: Optional[str] = None,
+                        max_results: int = 50, force_full: bool = False,
+                        include_processed: bool = False) -> List[str]:
+        """
+        Message ids to process: everything still pending for this scope plus
+        whatever Gmail reports since the last historyId, oldest first, capped
+        at max_results (the rest stays pending for the next run).
+
+        `query` only applies to a full resync; incremental sync filters by label_id.
+        include_processed=True (reprocess) does a full resync and queues
+        already processed ids again.
+        """
+        start = None if (force_full or include_processed) else self.history_id
+        discovered, latest = [], None
+        if start:
+            try:
+                discovered, latest = self._history_ids(start, label_id)
+                self.mode = "history"
+            except Exception as e:
+                if _http_status(e) != 404:
+                    raise
+                print(f"   ↻ historyId {start} expired — full resync")
+        if latest is None:
+            discovered, latest = self._full_ids(label_id, query)
+            self.mode = "full"
+            # messages.list is newest first
+            discovered.reverse()
+
+        now = time.time()
+        fresh = [m for m in dict.fromkeys(discovered) if include_processed or not self.is_processed(m)]
+        self._conn.executemany(
+            "INSERT OR IGNORE INTO pending (scope, msg_id, added_at) VALUES (?, ?, ?)",
+            [(self.scope, m, now) for m in fresh],
+        )
+        self._set_history_id(latest)
+        self._conn.commit()
+        self.discovered = len(fresh)
+
+        rows = self._conn.execute(
+            "SELECT msg_id FROM pending WHERE scope = ? ORDER BY added_at, rowid LIMIT ?",
+            (self.scope, max_results),
+        ).fetchall()
+        return [r[0] for r in rows]
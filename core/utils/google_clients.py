@@ -0,0 +1,164 @@
+#!/usr/bin/env python3
+"""
+Google API Clients - Rate limiting & retry
+Single factory for every Sheets / Gmail client in the project.
+
+Every request built by these services goes through:
+  1. A token bucket matched to the API quota
+       - Sheets: reads/min and writes/min per user (default 60 / 60)
+       - Gmail : quota units per second per user (default 250)
+  2. Exponential backoff with jitter on HTTP 429 and 5xx
+
+Buckets are process-wide, so SheetManager, JobBulletinProcessor and any
+script that share a process also share the quota.
+
+Usage:
+    from core.utils.google_clients import build_service, print_metrics
+
+    sheets = build_service('sheets', 'v4', credentials=creds)
+    gmail  = build_service('gmail', 'v1', credentials=creds)
+    ...
+    print_metrics()   # calls, retries, seconds waited per bucket
+
+Env overrides:
+    SHEETS_READS_PER_MIN, SHEETS_WRITES_PER_MIN, GMAIL_UNITS_PER_SEC,
+    GOOGLE_API_MAX_RETRIES
+"""
+import os
+import time
+from typing import Dict, Optional
+
+from googleapiclient.discovery import build
+from googleapiclient.http import HttpRequest
+
+from core.utils.rate_limit import TokenBucket, backoff_delay
+
+# Sheets API: 60 read / 60 write requests per minute per user (project: 300)
+SHEETS_READS_PER_MIN = int(os.getenv("SHEETS_READS_PER_MIN", "60"))
+SHEETS_WRITES_PER_MIN = int(os.getenv("SHEETS_WRITES_PER_MIN", "60"))
+# Gmail API: 250 quota units per user per second
+GMAIL_UNITS_PER_SEC = int(os.getenv("GMAIL_UNITS_PER_SEC", "250"))
+
+MAX_RETRIES = int(os.getenv("GOOGLE_API_MAX_RETRIES", "6"))
+
+# Gmail quota units per method (https://developers.google.com/gmail/api/reference/quota)
+GMAIL_METHOD_COST = {
+    "gmail.users.messages.get": 5,
+    "gmail.users.messages.list": 5,
+    "gmail.users.messages.modify": 5,
+    "gmail.users.messages.trash": 5,
+    "gmail.users.messages.delete": 10,
+    "gmail.users.messages.batchModify": 50,
+    "gmail.users.messages.batchDelete": 50,
+    "gmail.users.messages.send": 100,
+    "gmail.users.history.list": 2,
+    "gmail.users.labels.list": 1,
+    "gmail.users.labels.get": 1,
+    "gmail.users.labels.create": 5,
+    "gmail.users.getProfile": 1,
+    "gmail.users.threads.get": 10,
+    "gmail.users.threads.list": 10,
+}
+GMAIL_DEFAULT_COST = 5
+
+
+_BUCKETS: Dict[str, TokenBucket] = {
+    "sheets.read": TokenBucket("sheets.read", SHEETS_READS_PER_MIN / 60.0, max(1, SHEETS_READS_PER_MIN // 4)),
+    "sheets.write": TokenBucket("sheets.write", SHEETS_WRITES_PER_MIN / 60.0, max(1, SHEETS_WRITES_PER_MIN // 4)),
+    "gmail": TokenBucket("gmail", float(GMAIL_UNITS_PER_SEC), float(GMAIL_UNITS_PER_SEC)),
+}
+
+
+def _bucket_for(method_id: Optional[str], http_method: str):
+    """Returns (bucket, cost) for a discovery method id like 'sheets.spreadsheets.values.get'."""
+    method_id = method_id or ""
+    if method_id.startswith("gmail."):
+        return _BUCKETS["gmail"], GMAIL_METHOD_COST.get(method_id, GMAIL_DEFAULT_COST)
+    if method_id.startswith("sheets."):
+        is_read = http_method == "GET" or method_id.endswith(("values.batchGet", "getByDataFilter"))
+        return _BUCKETS["sheets.read" if is_read else "sheets.write"], 1
+    return None, 0
+
+
+def acquire_quota(bucket: str, cost: float = 1.0) -> float:
+    """
+    Take quota manually for requests that bypass RateLimitedHttpRequest.execute
+    (e.g. Gmail HTTP batches: one HTTP call, N x method cost). Returns seconds waited.
+    """
+    return _BUCKETS[bucket].acquire(cost)
+
+
+def is_retryable(error: Exception) -> bool:
+    """True for HTTP 429 / 5xx and transient network errors."""
+    status = getattr(getattr(error, "resp", None), "status", None)
+    if status is not None:
+        return int(status) == 429 or int(status) >= 500
+    if isinstance(error, (TimeoutError, ConnectionError)):
+        return True
+    msg = str(error)
+    return any(code in msg for code in ("429", "RATE_LIMIT_EXCEEDED", "503", "500 "))
+
+
+class RateLimitedHttpRequest(HttpRequest):
+    """HttpRequest that waits on the quota bucket and retries 429/5xx with backoff."""
+
+    def execute(self, http=None, num_retries=0):
+        bucket, cost = _bucket_for(self.methodId, self.method)
+        for attempt in range(MAX_RETRIES + 1):
+            if bucket is not None:
+                bucket.acquire(cost)
+            try:
+                return super().execute(http=http, num_retries=num_retries)
+            except Exception as e:
+                if attempt >= MAX_RETRIES or not is_retryable(e):
+                    raise
+                if bucket is not None:
+                    bucket.retries += 1
+                    status = getattr(getattr(e, "resp", None), "status", None)
+                    if status is not None and int(status) == 429:
+                        bucket.drain()
+                delay = backoff_delay(attempt)
+                if bucket is not None:
+                    bucket.wait_seconds += delay
+                print(f"   ⏸️  {self.methodId}: {str(e)[:80]} — retry {attempt + 1}/{MAX_RETRIES} in {delay:.1f}s")
+                time.sleep(delay)
+
+
+def execute_with_retry(request, label: str = "request"):
+    """
+    Execute any googleapiclient request with retry.
+    Requests built by build_service already retry internally, so they run as-is;
+    requests from a plain build() get the same backoff policy here.
+    """
+    if isinstance(request, RateLimitedHttpRequest):
+        return request.execute()
+    for attempt in range(MAX_RETRIES + 1):
+        try:
+            return request.execute()
+        except Exception as e:
+            if attempt >= MAX_RETRIES or not is_retryable(e):
+                raise
+            delay = backoff_delay(attempt)
+            print(f"   ⏸️  {label}: {str(e)[:80]} — retry {attempt + 1}/{MAX_RETRIES} in {delay:.1f}s")
+            time.sleep(delay)
+
+
+def build_service(api: str, version: str, credentials):
+    """googleapiclient build() with the shared quota limiter and retry layer."""
+    return build(api, version, credentials=credentials,
+                 requestBuilder=RateLimitedHttpRequest, cache_discovery=False)
+
+
+def get_metrics() -> Dict[str, Dict[str, float]]:
+    """Per-bucket counters: calls, retries, wait_seconds."""
+    return {
+        name: {"calls": b.calls, "retries": b.retries, "wait_seconds": round(b.wait_seconds, 2)}
+        for name, b in _BUCKETS.items()
+    }
+
+
+def print_metrics() -> None:
+    """Prints a one-line summary per bucket that saw traffic."""
+    for name, m in get_metrics().items():
+        if m["calls"]:
+            print(f"   📈 {name}: {m['calls']} calls, {m['retries']} retries, {m['wait_seconds']}s waited")
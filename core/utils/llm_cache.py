@@ -0,0 +1,181 @@
+#!/usr/bin/env python3
+"""
+LLM Response Cache - content addressed, on disk
+Avoids re-sending identical prompts (rows rescored after "AI unavailable",
+the same posting in several tabs, reruns after a crash, repeated HTML
+chunks in bulletins).
+
+Key = sha256(namespace, prompt version, model, normalised input).
+Bumping the prompt version of a call site invalidates its old entries.
+
+Storage: data/state/llm_cache.db (SQLite, shared by every call site)
+  - TTL per entry (default 30 days)
+  - LRU eviction by last use when the table grows past max_entries
+
+Usage:
+    cache = get_cache("fit_score", version="v1")
+    result = cache.get(model, inputs)
+    if result is None:
+        started = time.time()
+        result = call_llm(...)
+        cache.put(model, inputs, result, elapsed=time.time() - started)
+    ...
+    print_cache_stats()   # hits, misses, LLM seconds saved per namespace
+
+Only cache real answers, never fallbacks or error placeholders.
+
+Env overrides:
+    LLM_CACHE_TTL_DAYS, LLM_CACHE_MAX_ENTRIES, LLM_CACHE_DISABLED=1
+"""
+import hashlib
+import json
+import os
+import re
+import sqlite3
+import threading
+import time
+from pathlib import Path
+from typing import Any, Dict, Optional
+
+PROJECT_ROOT = Path(__file__).parent.parent.parent
+DEFAULT_DB_PATH = PROJECT_ROOT / "data" / "state" / "llm_cache.db"
+
+TTL_DAYS = float(os.getenv("LLM_CACHE_TTL_DAYS", "30"))
+MAX_ENTRIES = int(os.getenv("LLM_CACHE_MAX_ENTRIES", "50000"))
+DISABLED = os.getenv("LLM_CACHE_DISABLED", "") == "1"
+
+# Evict at most once every N puts (eviction is a full-table query)
+EVICT_EVERY = 200
+
+_WS = re.compile(r"\s+")
+
+
+def normalize(value: Any) -> Any:
+    """Whitespace-insensitive form of the input (str, dict, list) used for the key."""
+    if isinstance(value, str):
+        return _WS.sub(" ", value).strip()
+    if isinstance(value, dict):
+        return {str(k): normalize(v) for k, v in sorted(value.items())}
+    if isinstance(value, (list, tuple)):
+        return [normalize(v) for v in value]
+    return value
+
+
+class _Store:
+    """One SQLite file shared by every namespace in the process."""
+
+    def __init__(self, db_path: Path):
+        self.db_path = Path(db_path)
+        self.db_path.parent.mkdir(parents=True, exist_ok=True)
+        self.lock = threading.Lock()
+        self.conn = sqlite3.connect(str(self.db_path), check_same_thread=False)
+        self.conn.execute("PRAGMA journal_mode=WAL")
+        self.conn.executescript(
+            "CREATE TABLE IF NOT EXISTS llm_cache ("
+            "  key TEXT PRIMARY KEY, namespace TEXT, value TEXT,"
+            "  created_at REAL, last_used REAL, elapsed REAL);"
+            "CREATE INDEX IF NOT EXISTS llm_cache_lru ON llm_cache (last_used);"
+        )
+        self.puts = 0
+
+
+class LLMCache:
+    """View of the shared store for one call site (namespace + prompt version)."""
+
+    def __init__(self, store: _Store, namespace: str, version: str,
+                 ttl_days: float = TTL_DAYS, max_entries: int = MAX_ENTRIES):
+        self._store = store
+        self.namespace = namespace
+        self.version = version
+        self.ttl = ttl_days * 86400
+        self.max_entries = max_entries
+
+        self.hits = 0
+        self.misses = 0
+        self.saved_seconds = 0.0
+
+    def key(self, model: str, inputs: Any) -> str:
+        blob = json.dumps([self.namespace, self.version, model or "", normalize(inputs)],
+                          ensure_ascii=False, sort_keys=True)
+        return hashlib.sha256(blob.encode("utf-8")).hexdigest()
+
+    def get(self, model: str, inputs: Any) -> Optional[Any]:
+        """Cached value or None (miss, expired or cache disabled)."""
+        if DISABLED:
+            return None
+        key = self.key(model, inputs)
+        now = time.time()
+        with self._store.lock:
+            row = self._store.conn.execute(
+                "SELECT value, created_at, elapsed FROM llm_cache WHERE key = ?", (key,)
+            ).fetchone()
+            if row and now - row[1] <= self.ttl:
+                self._store.conn.execute(
+                    "UPDATE llm_cache SET last_used = ? WHERE key = ?", (now, key)
+                )
+                self._store.conn.commit()
+                self.hits += 1
+                self.saved_seconds += row[2] or 0.0
+                return json.loads(row[0])
+        self.misses += 1
+        return None
+
+    def put(self, model: str, inputs: Any, value: Any, elapsed: float = 0.0) -> None:
+        """Store a real LLM answer. elapsed = seconds the call took (for the report)."""
+        if DISABLED:
+            return
+        key = self.key(model, inputs)
+        now = time.time()
+        with self._store.lock:
+            self._store.conn.execute(
+                "INSERT OR REPLACE INTO llm_cache (key, namespace, value, created_at, last_used, elapsed)"
+                " VALUES (?, ?, ?, ?, ?, ?)",
+                (key, self.namespace, json.dumps(value, ensure_ascii=False), now, now, elapsed),
+            )
+            self._store.puts += 1
+            if self._store.puts % EVICT_EVERY == 0:
+                self._evict(now)
+            self._store.conn.commit()
+
+    def _evict(self, now: float) -> None:
+        """Drop expired entries of this namespace, then least recently used beyond max_entries."""
+        conn = self._store.conn
+        conn.execute(
+            "DELETE FROM llm_cache WHERE namespace = ? AND created_at < ?",
+            (self.namespace, now - self.ttl),
+        )
+        conn.execute(
+            "DELETE FROM llm_cache WHERE key IN ("
+            "  SELECT key FROM llm_cache ORDER BY last_used DESC LIMIT -1 OFFSET ?)",
+            (self.max_entries,),
+        )
+
+    @property
+    def hit_rate(self) -> float:
+        total = self.hits + self.misses
+        return self.hits / total if total else 0.0
+
+
+_STORE: Optional[_Store] = None
+_CACHES: Dict[tuple, LLMCache] = {}
+_LOCK = threading.Lock()
+
+
+def get_cache(namespace: str, version: str, db_path: Optional[Path] = None) -> LLMCache:
+    """Process-wide cache for a call site; every namespace shares one SQLite file."""
+    global _STORE
+    with _LOCK:
+        if _STORE is None:
+            _STORE = _Store(db_path or DEFAULT_DB_PATH)
+        cache = _CACHES.get((namespace, version))
+        if cache is None:
+            cache = _CACHES[(namespace, version)] = LLMCache(_STORE, namespace, version)
+        return cache
+
+
+def print_cache_stats() -> None:
+    """One line per namespace used in this process: hits, misses, hit rate, LLM time saved."""
+    for cache in _CACHES.values():
+        if cache.hits or cache.misses:
+            print(f"   💾 llm_cache[{cache.namespace}:{cache.version}]: {cache.hits} hits / {cache.misses} misses "
+                  f"({cache.hit_rate:.0%}), ~{cache.saved_seconds:.0f}s de LLM ahorrados")
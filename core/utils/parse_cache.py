@@ -0,0 +1,157 @@
+#!/usr/bin/env python3
+"""
+Bulletin Parse Cache - structured jobs per email, on disk
+Every run (and every --reprocess or debug session) used to re-run
+BeautifulSoup/regex over the full bulletin HTML, and the AI fallback sent
+the whole bulletin to the LLM again after a crash.
+
+Entry key = (message id, parser). An entry is a hit only if the stored
+body hash and parser version both match:
+  - a different body under the same id (edited/forwarded) → miss
+  - bumping one parser's version → only that parser's entries miss
+    (and get overwritten on the next put)
+
+Storage: data/state/bulletin_parse.db (SQLite, WAL)
+  - entries not used for TTL days are dropped by compact()
+
+Usage:
+    cache = get_parse_cache()
+    body_hash = cache.body_hash(html, text)
+    jobs = cache.get(msg_id, "linkedin", "v1", body_hash)
+    if jobs is None:
+        jobs = extract_linkedin_jobs(html)
+        cache.put(msg_id, "linkedin", "v1", body_hash, jobs)
+    cache.print_stats()
+
+Only cache real results: an empty list from a parser that failed (LLM down)
+would otherwise stick until the version changes.
+
+Env overrides:
+    PARSE_CACHE_TTL_DAYS, PARSE_CACHE_DISABLED=1
+"""
+import hashlib
+import json
+import os
+import sqlite3
+import threading
+import time
+from pathlib import Path
+from typing import Dict, List, Optional
+
+PROJECT_ROOT = Path(__file__).parent.parent.parent
+DEFAULT_DB_PATH = PROJECT_ROOT / "data" / "state" / "bulletin_parse.db"
+
+TTL_DAYS = float(os.getenv("PARSE_CACHE_TTL_DAYS", "30"))
+DISABLED = os.getenv("PARSE_CACHE_DISABLED", "") == "1"
+
+
+class ParseCache:
+    """Parsed jobs per (message id, parser), validated by body hash and parser version."""
+
+    def __init__(self, db_path: Optional[Path] = None, ttl_days: float = TTL_DAYS):
+        self.db_path = Path(db_path or DEFAULT_DB_PATH)
+        self.db_path.parent.mkdir(parents=True, exist_ok=True)
+        self.ttl = ttl_days * 86400
+        self._lock = threading.Lock()
+        self._conn = sqlite3.connect(str(self.db_path), check_same_thread=False)
+        self._conn.execute("PRAGMA journal_mode=WAL")
+        self._conn.execute(
+            "CREATE TABLE IF NOT EXISTS parse_cache ("
+            "  msg_id TEXT, parser TEXT, version TEXT, body_hash TEXT,"
+            "  jobs TEXT, created_at REAL, last_used REAL, elapsed REAL,"
+            "  PRIMARY KEY (msg_id, parser))"
+        )
+        self._conn.commit()
+
+        self.hits = 0
+        self.misses = 0
+        self.stale = 0            # misses caused by a version or body change
+        self.saved_seconds = 0.0
+
+    @staticmethod
+    def body_hash(*parts: str) -> str:
+        digest = hashlib.sha256()
+        for part in parts:
+            digest.update((part or "").encode("utf-8", errors="replace"))
+            digest.update(b"\0")
+        return digest.hexdigest()
+
+    def get(self, msg_id: str, parser: str, version: str, body_hash: str) -> Optional[List[Dict]]:
+        """Cached jobs, or None on miss / version bump / body change / cache disabled."""
+        if DISABLED:
+            return None
+        now = time.time()
+        with self._lock:
+            row = self._conn.execute(
+                "SELECT version, body_hash, jobs, elapsed FROM parse_cache"
+                " WHERE msg_id = ? AND parser = ?", (msg_id, parser)
+            ).fetchone()
+            if row and row[0] == version and row[1] == body_hash:
+                self._conn.execute(
+                    "UPDATE parse_cache SET last_used = ? WHERE msg_id = ? AND parser = ?",
+                    (now, msg_id, parser),
+                )
+                self._conn.commit()
+                self.hits += 1
+                self.saved_seconds += row[3] or 0.0
+                return json.loads(row[2])
+        self.misses += 1
+        if row:
+            self.stale += 1
+        return None
+
+    def put(self, msg_id: str, parser: str, version: str, body_hash: str,
+            jobs: List[Dict], elapsed: float = 0.0) -> None:
+        """Store a parse result. elapsed = seconds the parse took (for the report)."""
+        if DISABLED:
+            return
+        now = time.time()
+        with self._lock:
+            self._conn.execute(
+                "INSERT OR REPLACE INTO parse_cache"
+                " (msg_id, parser, version, body_hash, jobs, created_at, last_used, elapsed)"
+                " VALUES (?, ?, ?, ?, ?, ?, ?, ?)",
+                (msg_id, parser, version, body_hash,
+                 json.dumps(jobs, ensure_ascii=False), now, now, elapsed),
+            )
+            self._conn.commit()
+
+    def peek(self, msg_id: str) -> List[Dict]:
+        """Every entry stored for a message (debugging): parser, version, jobs, age in days."""
+        with self._lock:
+            rows = self._conn.execute(
+                "SELECT parser, version, jobs, created_at FROM parse_cache WHERE msg_id = ?",
+                (msg_id,),
+            ).fetchall()
+        return [
+            {"parser": p, "version": v, "jobs": json.loads(j),
+             "age_days": (time.time() - c) / 86400}
+            for p, v, j, c in rows
+        ]
+
+    def compact(self) -> None:
+        """Drop entries not used within the TTL."""
+        with self._lock:
+            self._conn.execute(
+                "DELETE FROM parse_cache WHERE last_used < ?", (time.time() - self.ttl,)
+            )
+            self._conn.commit()
+
+    def print_stats(self) -> None:
+        if self.hits or self.misses:
+            stale = f", {self.stale} invalidados por versión/cuerpo" if self.stale else ""
+            print(f"   💾 parse_cache: {self.hits} hits / {self.misses} misses{stale}, "
+                  f"~{self.saved_seconds:.0f}s de parseo ahorrados")
+
+
+_CACHE: Optional[ParseCache] = None
+_LOCK = threading.Lock()
+
+
+def get_parse_cache(db_path: Optional[Path] = None) -> ParseCache:
+    """Process-wide parse cache."""
+    global _CACHE
+    with _LOCK:
+        if _CACHE is None:
+            _CACHE = ParseCache(db_path)
+        return _CACHE
@@ -0,0 +1,137 @@
+#!/usr/bin/env python3
+"""
+PDF Render Service - un Chromium tibio para todos los PDFs del proceso
+
+cv_generator.generate_pdf usaba el pool sync del thread que lo llamaba: el
+apply bot lo llama desde asyncio.to_thread (threads distintos) y cada thread
+nuevo lanzaba su propio Chromium. Además los PDFs salían de uno en uno.
+
+El servicio vive en un thread propio con su event loop y un AsyncBrowserPool:
+  - una cola de trabajos (html, output_path); submit() se puede llamar desde
+    cualquier thread y devuelve un concurrent.futures.Future[bool]
+  - hasta PDF_RENDER_TABS páginas renderizando en paralelo (mismo context,
+    páginas reusadas por el pool)
+  - el Chromium se lanza con el primer PDF y queda abierto hasta el final
+    del proceso (o se conecta al servicio CDP de browser_pool si corre)
+
+Uso:
+    service = get_pdf_service()
+    ok = service.render(html, Path("data/cv/generated/x.pdf"))      # bloqueante
+    futures = [service.submit(html, path) for html, path in items]   # en lote
+    results = service.render_many(items)                             # [bool, ...]
+
+Env overrides:
+    PDF_RENDER_TABS, PDF_RENDER_TIMEOUT (segundos por PDF)
+"""
+import asyncio
+import atexit
+import logging
+import os
+import threading
+from concurrent.futures import Future
+from pathlib import Path
+from typing import Iterable, List, Optional, Tuple
+
+from core.utils.browser_pool import AsyncBrowserPool
+
+RENDER_TABS = int(os.getenv("PDF_RENDER_TABS", "4"))
+RENDER_TIMEOUT = float(os.getenv("PDF_RENDER_TIMEOUT", "60"))
+
+PDF_OPTIONS = {
+    "format": "A4",
+    "print_background": True,
+    "margin": {"top": "14mm", "right": "16mm", "bottom": "14mm", "left": "16mm"},
+}
+
+log = logging.getLogger("pdf_renderer")
+
+
+class PdfRenderService:
+    """Cola de renders HTML → PDF sobre un Chromium headless que no se cierra entre PDFs."""
+
+    def __init__(self, tabs: int = RENDER_TABS):
+        self.tabs = max(1, tabs)
+        self._loop = asyncio.new_event_loop()
+        self._pool = AsyncBrowserPool()
+        self._sem: Optional[asyncio.Semaphore] = None
+        self._thread = threading.Thread(target=self._run_loop, name="pdf-render", daemon=True)
+        self._thread.start()
+
+        self.rendered = 0
+        self.failed = 0
+
+    def _run_loop(self) -> None:
+        asyncio.set_event_loop(self._loop)
+        self._sem = asyncio.Semaphore(self.tabs)
+        self._loop.run_forever()
+
+    async def _render(self, html: str, output_path: Path) -> bool:
+        async with self._sem:
+            try:
+                async with self._pool.page(engine="chromium", headless=True) as page:
+                    await page.set_content(html, wait_until="domcontentloaded")
+                    await page.pdf(path=str(output_path), **PDF_OPTIONS)
+                self.rendered += 1
+                return True
+            except Exception as e:
+                self.failed += 1
+                log.error(f"PDF error ({Path(output_path).name}): {e}")
+                return False
+
+    def submit(self, html: str, output_path: Path) -> Future:
+        """Encola un PDF. Devuelve un Future[bool] (True si se escribió)."""
+        Path(output_path).parent.mkdir(parents=True, exist_ok=True)
+        return asyncio.run_coroutine_threadsafe(self._render(html, Path(output_path)), self._loop)
+
+    def render(self, html: str, output_path: Path, timeout: float = RENDER_TIMEOUT) -> bool:
+        """Encola y espera un PDF."""
+        try:
+            return self.submit(html, output_path).result(timeout)
+        except Exception as e:
+            log.error(f"PDF render timeout/error ({Path(output_path).name}): {e}")
+            return False
+
+    def render_many(self, items: Iterable[Tuple[str, Path]],
+                    timeout: float = RENDER_TIMEOUT) -> List[bool]:
+        """Encola todos y espera todos (se renderizan de a `tabs` en paralelo)."""
+        futures = [self.submit(html, path) for html, path in items]
+        results = []
+        for future in futures:
+            try:
+                results.append(future.result(timeout * len(futures)))
+            except Exception:
+                results.append(False)
+        return results
+
+    def close(self) -> None:
+        if not self._loop.is_running():
+            return
+        try:
+            asyncio.run_coroutine_threadsafe(self._pool.close(), self._loop).result(15)
+        except Exception:
+            pass
+        self._loop.call_soon_threadsafe(self._loop.stop)
+        self._thread.join(5)
+
+    def stats_line(self) -> str:
+        return (f"   📄 pdf_renderer: {self.rendered} PDFs ({self.tabs} pestañas)"
+                f"{f', {self.failed} fallidos' if self.failed else ''}")
+
+
+_SERVICE: Optional[PdfRenderService] = None
+_LOCK = threading.Lock()
+
+
+def get_pdf_service() -> PdfRenderService:
+    """Servicio de render del proceso (se crea con el primer PDF)."""
+    global _SERVICE
+    with _LOCK:
+        if _SERVICE is None:
+            _SERVICE = PdfRenderService()
+        return _SERVICE
+
+
+@atexit.register
+def _close_service() -> None:
+    if _SERVICE is not None:
+        _SERVICE.close()
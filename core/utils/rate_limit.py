@@ -0,0 +1,59 @@
+#!/usr/bin/env python3
+"""
+Rate limiting primitives shared by the Google API clients and the LLM pool.
+
+  - TokenBucket   : thread-safe bucket, acquire() blocks until tokens are available
+  - backoff_delay : full-jitter exponential backoff for 429 / 5xx retries
+"""
+import random
+import threading
+import time
+
+BASE_BACKOFF = 1.0
+MAX_BACKOFF = 64.0
+
+
+class TokenBucket:
+    """Thread-safe token bucket. acquire() blocks until `cost` tokens are available."""
+
+    def __init__(self, name: str, rate_per_sec: float, capacity: float):
+        self.name = name
+        self.rate = rate_per_sec
+        self.capacity = capacity
+        self._tokens = capacity
+        self._updated = time.monotonic()
+        self._lock = threading.Lock()
+
+        # Metrics
+        self.calls = 0
+        self.retries = 0
+        self.wait_seconds = 0.0
+
+    def acquire(self, cost: float = 1.0) -> float:
+        """Take `cost` tokens, sleeping if needed. Returns seconds waited."""
+        cost = min(cost, self.capacity)
+        waited = 0.0
+        while True:
+            with self._lock:
+                now = time.monotonic()
+                self._tokens = min(self.capacity, self._tokens + (now - self._updated) * self.rate)
+                self._updated = now
+                if self._tokens >= cost:
+                    self._tokens -= cost
+                    self.calls += 1
+                    self.wait_seconds += waited
+                    return waited
+                sleep_for = (cost - self._tokens) / self.rate
+            time.sleep(sleep_for)
+            waited += sleep_for
+
+    def drain(self) -> None:
+        """Empty the bucket after a 429 so every thread slows down, not just this one."""
+        with self._lock:
+            self._tokens = 0
+            self._updated = time.monotonic()
+
+
+def backoff_delay(attempt: int) -> float:
+    """Full-jitter exponential backoff: random(0, min(MAX, BASE * 2^attempt))."""
+    return random.uniform(0, min(MAX_BACKOFF, BASE_BACKOFF * (2 ** attempt))) + 0.1
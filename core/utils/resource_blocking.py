@@ -0,0 +1,295 @@
+#!/usr/bin/env python3
+"""
+Resource Blocking - perfiles de intercepción de requests para Playwright
+
+Scrapers y verifiers solo leen el texto del DOM (y el JSON-LD, que viene
+inline en el HTML): imágenes, fuentes, video y scripts de analytics son
+ancho de banda y latencia tirados. Un perfil se aplica a un context vía
+context.route() y aborta esos requests.
+
+Perfiles:
+    "scraping" → image, media, font, stylesheet + trackers
+    "verify"   → image, media, font + trackers (el CSS se queda: algunos
+                 indicadores de "no longer accepting" dependen del layout)
+
+Allowlists por sitio (SITE_RULES): en páginas de login / checkpoint /
+captcha no se bloquea nada, y ciertos hosts o tipos se dejan pasar siempre
+para el sitio (p.ej. el CSS de LinkedIn en su login).
+
+Estadísticas por sitio: requests bloqueados, bytes ahorrados (estimados
+por tipo de recurso, no se descargan), bytes descargados (Content-Length)
+y tiempo de carga de página (navegación → evento load).
+
+Uso (normalmente vía browser_pool):
+    async with pool.page(engine="firefox", block="scraping") as page: ...
+    print_block_stats()
+
+    # manual
+    await attach_async(context, "scraping")
+    attach_sync(context, "verify")
+
+Env overrides:
+    RESOURCE_BLOCKING_DISABLED=1, RESOURCE_BLOCKING_TYPES="image,media,font"
+"""
+import os
+import threading
+import time
+from dataclasses import dataclass, field
+from typing import Dict, FrozenSet, Optional, Tuple
+from urllib.parse import urlsplit
+
+DISABLED = os.getenv("RESOURCE_BLOCKING_DISABLED", "") == "1"
+_TYPES_OVERRIDE = os.getenv("RESOURCE_BLOCKING_TYPES", "")
+
+# Analytics / ads / session replay — nunca hacen falta para leer una vacante
+TRACKER_HOSTS = (
+    "google-analytics.com", "googletagmanager.com", "googleadservices.com",
+    "googlesyndication.com", "doubleclick.net", "adservice.google.com",
+    "facebook.net", "connect.facebook.net", "bat.bing.com", "clarity.ms",
+    "hotjar.com", "hotjar.io", "scorecardresearch.com", "quantserve.com",
+    "criteo.com", "criteo.net", "taboola.com", "outbrain.com",
+    "nr-data.net", "segment.io", "cdn.segment.com", "optimizely.com",
+    "analytics.tiktok.com", "px.ads.linkedin.com", "snap.licdn.com",
+    "adsrvr.org", "amazon-adsystem.com", "yandex.ru/metrika",
+)
+TRACKER_PATHS = ("/li/track", "/collect?", "/pixel", "/beacon")
+
+# Bytes típicos por request bloqueado (mediana aproximada de HTTP Archive)
+EST_BYTES = {
+    "image": 15_000, "media": 250_000, "font": 30_000,
+    "stylesheet": 10_000, "tracker": 25_000,
+}
+
+
+@dataclass(frozen=True)
+class BlockProfile:
+    name: str
+    types: FrozenSet[str]
+    block_trackers: bool = True
+
+
+@dataclass(frozen=True)
+class SiteRule:
+    """Excepciones de un sitio: páginas donde no se bloquea nada, hosts y tipos permitidos."""
+    open_paths: Tuple[str, ...] = ()
+    allow_hosts: Tuple[str, ...] = ()
+    allow_types: FrozenSet[str] = frozenset()
+
+
+def _types(default: str) -> FrozenSet[str]:
+    return frozenset(t.strip() for t in (_TYPES_OVERRIDE or default).split(",") if t.strip())
+
+
+PROFILES = {
+    "scraping": BlockProfile("scraping", _types("image,media,font,stylesheet")),
+    "verify":   BlockProfile("verify", _types("image,media,font")),
+}
+
+# Captchas: se dejan pasar en cualquier sitio
+CAPTCHA_HOSTS = (
+    "challenges.cloudflare.com", "recaptcha.net", "www.google.com/recaptcha",
+    "www.gstatic.com/recaptcha", "hcaptcha.com", "arkoselabs.com", "funcaptcha.com",
+)
+
+SITE_RULES: Dict[str, SiteRule] = {
+    "linkedin.com": SiteRule(
+        open_paths=("/login", "/checkpoint", "/uas/", "/authwall"),
+        allow_hosts=("static.licdn.com",),
+    ),
+    "occ.com.mx": SiteRule(open_paths=("/login", "/cuenta")),
+    "computrabajo.com": SiteRule(open_paths=("/login", "/acceso")),
+}
+
+
+def site_of(url: str) -> str:
+    """'https://mx.computrabajo.com/x' → 'computrabajo.com'; 'www.occ.com.mx' → 'occ.com.mx'."""
+    host = (urlsplit(url).hostname or "").lower()
+    for site in SITE_RULES:
+        if host == site or host.endswith("." + site):
+            return site
+    labels = host.split(".")
+    n = 3 if len(labels) >= 3 and labels[-2] in ("com", "co", "org", "gob") else 2
+    return ".".join(labels[-n:]) if host else ""
+
+
+def _host_path(url: str) -> str:
+    parts = urlsplit(url)
+    return f"{(parts.hostname or '').lower()}{parts.path}"
+
+
+def _matches(host_path: str, patterns) -> bool:
+    host = host_path.split("/", 1)[0]
+    return any(
+        (host_path.startswith(p) if "/" in p else (host == p or host.endswith("." + p)))
+        for p in patterns
+    )
+
+
+def decide(profile: BlockProfile, url: str, resource_type: str, page_url: str) -> Optional[str]:
+    """Motivo de bloqueo ("image", "tracker"...) o None si el request pasa."""
+    if resource_type == "document":
+        return None
+    hp = _host_path(url)
+    if _matches(hp, CAPTCHA_HOSTS):
+        return None
+    rule = SITE_RULES.get(site_of(page_url)) if page_url else None
+    if rule:
+        if any(p in urlsplit(page_url).path for p in rule.open_paths):
+            return None
+        if _matches(hp, rule.allow_hosts) or resource_type in rule.allow_types:
+            return None
+    if profile.block_trackers and (_matches(hp, TRACKER_HOSTS)
+                                   or any(p in url for p in TRACKER_PATHS)):
+        return "tracker"
+    if resource_type in profile.types:
+        return resource_type
+    return None
+
+
+# ─────────────────────────────────────────────────────────────────────────────
+# ESTADÍSTICAS
+# ─────────────────────────────────────────────────────────────────────────────
+
+@dataclass
+class SiteStats:
+    requests: int = 0
+    blocked: Dict[str, int] = field(default_factory=dict)
+    saved_bytes: int = 0
+    downloaded_bytes: int = 0
+    loads: int = 0
+    load_seconds: float = 0.0
+
+
+_STATS: Dict[str, SiteStats] = {}
+_LOCK = threading.Lock()
+
+
+def _site_stats(site: str) -> SiteStats:
+    stats = _STATS.get(site)
+    if stats is None:
+        stats = _STATS[site] = SiteStats()
+    return stats
+
+
+def _record_request(page_url: str, reason: Optional[str]) -> None:
+    with _LOCK:
+        stats = _site_stats(site_of(page_url))
+        stats.requests += 1
+        if reason:
+            stats.blocked[reason] = stats.blocked.get(reason, 0) + 1
+            stats.saved_bytes += EST_BYTES.get(reason, 0)
+
+
+def _record_response(page_url: str, response) -> None:
+    try:
+        size = int(response.headers.get("content-length", 0))
+    except (ValueError, TypeError):
+        return
+    with _LOCK:
+        _site_stats(site_of(page_url)).downloaded_bytes += size
+
+
+def _record_load(url: str, seconds: float) -> None:
+    with _LOCK:
+        stats = _site_stats(site_of(url))
+        stats.loads += 1
+        stats.load_seconds += seconds
+
+
+def _frame_url(request) -> str:
+    """URL de la página que hizo el request ('' para service workers y similares)."""
+    try:
+        return request.frame.page.url if not request.is_navigation_request() else request.url
+    except Exception:
+        return ""
+
+
+def _watch_page(page, nav_started: Dict) -> None:
+    """Tiempo de carga: request de navegación del main frame → evento load."""
+    def on_request(request):
+        try:
+            if request.is_navigation_request() and request.frame.parent_frame is None:
+                nav_started[page] = time.monotonic()
+        except Exception:
+            pass
+
+    def on_load(_page):
+        started = nav_started.pop(page, None)
+        if started is not None and page.url.startswith("http"):
+            _record_load(page.url, time.monotonic() - started)
+
+    page.on("request", on_request)
+    page.on("load", on_load)
+
+
+def _watch_context(context) -> None:
+    nav_started: Dict = {}
+    context.on("page", lambda page: _watch_page(page, nav_started))
+    context.on("response", lambda response: _record_response(_frame_url(response.request), response))
+    for page in context.pages:
+        _watch_page(page, nav_started)
+
+
+# ─────────────────────────────────────────────────────────────────────────────
+# ATTACH
+# ─────────────────────────────────────────────────────────────────────────────
+
+def get_profile(name: str) -> BlockProfile:
+    if name not in PROFILES:
+        raise ValueError(f"Perfil de bloqueo desconocido: {name!r} (usa {', '.join(PROFILES)})")
+    return PROFILES[name]
+
+
+async def attach_async(context, profile_name: str) -> None:
+    """Aplica el perfil a un BrowserContext de playwright.async_api."""
+    if DISABLED:
+        return
+    profile = get_profile(profile_name)
+
+    async def handler(route):
+        request = route.request
+        page_url = _frame_url(request)
+        reason = decide(profile, request.url, request.resource_type, page_url)
+        _record_request(page_url, reason)
+        if reason:
+            await route.abort("blockedbyclient")
+        else:
+            await route.continue_()
+
+    _watch_context(context)
+    await context.route("**/*", handler)
+
+
+def attach_sync(context, profile_name: str) -> None:
+    """Aplica el perfil a un BrowserContext de playwright.sync_api."""
+    if DISABLED:
+        return
+    profile = get_profile(profile_name)
+
+    def handler(route):
+        request = route.request
+        page_url = _frame_url(request)
+        reason = decide(profile, request.url, request.resource_type, page_url)
+        _record_request(page_url, reason)
+        if reason:
+            route.abort("blockedbyclient")
+        else:
+            route.continue_()
+
+    _watch_context(context)
+    context.route("**/*", handler)
+
+
+def print_block_stats() -> None:
+    """Una línea por sitio: bloqueados, MB ahorrados (estimado), MB descargados, carga promedio."""
+    with _LOCK:
+        items = sorted(_STATS.items(), key=lambda kv: -kv[1].requests)
+    for site, s in items:
+        if not site or not s.requests:
+            continue
+        blocked = sum(s.blocked.values())
+        kinds = ", ".join(f"{k} {v}" for k, v in sorted(s.blocked.items(), key=lambda kv: -kv[1]))
+        load = f", carga promedio {s.load_seconds / s.loads:.1f}s ({s.loads} páginas)" if s.loads else ""
+        print(f"   🚫 {site}: {blocked}/{s.requests} requests bloqueados"
+              f"{f' ({kinds})' if kinds else ''}, ~{s.saved_bytes / 1e6:.1f} MB ahorrados, "
+              f"{s.downloaded_bytes / 1e6:.1f} MB descargados{load}")
@@ -19,6 +19,7 @@ import sys
 import os
 import re
 import json
+import hashlib
 import math
 import time
 import argparse
@@ -257,12 +258,57 @@ def _languages_html(languages: list[dict]) -> str:
     )
 
 
-def build_html(profile: dict, job: dict, tailored: dict, salary: dict) -> str:
-    """Rellena el template HTML con los datos del perfil (+ personalización si hay)."""
-    template = TEMPLATE_FILE.read_text(encoding="utf-8")
+# Template compilado: el template se parte en literales + slots una vez, y
+# los slots que solo dependen del perfil (datos personales, experiencia,
+# educación, certs, idiomas, salario) se rellenan una vez por versión del
+# perfil. Por vacante solo se llenan estos:
+JOB_SLOTS = ("SUMMARY", "SKILLS_MANAGEMENT", "SKILLS_TECHNICAL", "TAILORED_BADGE")
+_PLACEHOLDER = re.compile(r"\{\{([A-Z_]+)\}\}")
+_COMPILED: dict = {}      # (mtime del template, versión del perfil) → partes
+_COMPILED_MAX = 4
+
+
+_VERSION_MEMO: tuple = (None, None, "")   # (profile, salary, versión) del último hash
+
+
+def profile_version(profile: dict, salary: dict) -> str:
+    """
+    Hash del perfil + salario: cambia si cambia cualquier dato del CV base.
+    El hash (~80 us) se memoiza por identidad: load_profile() devuelve un
+    dict nuevo cada vez y nadie lo modifica en sitio, así que el mismo
+    objeto es la misma versión.
+    """
+    global _VERSION_MEMO
+    memo_profile, memo_salary, version = _VERSION_MEMO
+    if memo_profile is profile and memo_salary is salary:
+        return version
+    raw = json.dumps([profile, salary], sort_keys=True, ensure_ascii=False, default=str)
+    version = hashlib.sha1(raw.encode("utf-8")).hexdigest()
+    _VERSION_MEMO = (profile, salary, version)
+    return version
 
+
+def _profile_slots(profile: dict, salary: dict) -> dict:
     personal = profile["personal"]
     skills   = profile["skills"]
+    return {
+        "NAME":               personal.get("name", ""),
+        "HEADLINE":           profile.get("headline", ""),
+        "EMAIL":              personal.get("email", ""),
+        "PHONE":              personal.get("phone", ""),
+        "LOCATION":           personal.get("location", ""),
+        "LINKEDIN":           personal.get("linkedin", ""),
+        "EXPERIENCE_HTML":    _experience_html(profile.get("experience", [])),
+        "EDUCATION_HTML":     _education_html(profile.get("education",  [])),
+        "CERTS_HTML":         _certs_html(profile.get("certifications", [])),
+        "LANGUAGES_HTML":     _languages_html(skills.get("languages", [])),
+        "SALARY_DISPLAY_MXN": salary.get("display_mxn", ""),
+        "SALARY_DISPLAY_USD": salary.get("display_usd", ""),
+    }
+
+
+def _job_slots(profile: dict, job: dict, tailored: dict) -> dict:
+    skills = profile["skills"]
 
     # Summary: tailored > base
     summary = tailored.get("summary") or profile.get("summary", "")
@@ -280,30 +326,66 @@ def build_html(profile: dict, job: dict, tailored: dict, salary: dict) -> str:
     if tailored and job.get("company"):
         tailored_badge = f'<span class="tailored-badge">✓ Personalizado para {job.get("company","")}</span>'
 
-    replacements = {
-        "{{NAME}}":               personal.get("name", ""),
-        "{{HEADLINE}}":           profile.get("headline", ""),
-        "{{EMAIL}}":              personal.get("email", ""),
-        "{{PHONE}}":              personal.get("phone", ""),
-        "{{LOCATION}}":           personal.get("location", ""),
-        "{{LINKEDIN}}":           personal.get("linkedin", ""),
-        "{{SUMMARY}}":            summary,
-        "{{SKILLS_MANAGEMENT}}":  mgmt_tags,
-        "{{SKILLS_TECHNICAL}}":   tech_tags,
-        "{{EXPERIENCE_HTML}}":    _experience_html(profile.get("experience", [])),
-        "{{EDUCATION_HTML}}":     _education_html(profile.get("education",  [])),
-        "{{CERTS_HTML}}":         _certs_html(profile.get("certifications", [])),
-        "{{LANGUAGES_HTML}}":     _languages_html(skills.get("languages", [])),
-        "{{SALARY_DISPLAY_MXN}}": salary.get("display_mxn", ""),
-        "{{SALARY_DISPLAY_USD}}": salary.get("display_usd", ""),
-        "{{TAILORED_BADGE}}":     tailored_badge,
+    return {
+        "SUMMARY":           summary,
+        "SKILLS_MANAGEMENT": mgmt_tags,
+        "SKILLS_TECHNICAL":  tech_tags,
+        "TAILORED_BADGE":    tailored_badge,
     }
 
-    html = template
-    for placeholder, value in replacements.items():
-        html = html.replace(placeholder, str(value))
 
-    return html
+_TEMPLATE_MEMO: tuple = (0, "")   # (mtime del template, hash del contenido)
+
+
+def template_version() -> str:
+    """Hash del contenido del template (releído solo si cambia el mtime)."""
+    global _TEMPLATE_MEMO
+    mtime = TEMPLATE_FILE.stat().st_mtime_ns
+    if _TEMPLATE_MEMO[0] != mtime:
+        _TEMPLATE_MEMO = (mtime, hashlib.sha1(TEMPLATE_FILE.read_bytes()).hexdigest())
+    return _TEMPLATE_MEMO[1]
+
+
+def compile_template(template: str, static: dict) -> list:
+    """
+    Template → [literal, slot, literal, slot, ..., literal]: los placeholders
+    de `static` quedan fundidos en los literales; en posiciones impares solo
+    quedan los JOB_SLOTS. Placeholders desconocidos se dejan tal cual.
+    """
+    parts = [""]
+    for i, piece in enumerate(_PLACEHOLDER.split(template)):
+        if i % 2 == 0:
+            parts[-1] += piece
+        elif piece in JOB_SLOTS:
+            parts += [piece, ""]
+        elif piece in static:
+            parts[-1] += str(static[piece])
+        else:
+            parts[-1] += "{{" + piece + "}}"
+    return parts
+
+
+def compiled_template(profile: dict, salary: dict) -> list:
+    """Template compilado para este perfil (cacheado por mtime del template y versión del perfil)."""
+    key = (TEMPLATE_FILE.stat().st_mtime_ns, profile_version(profile, salary))
+    parts = _COMPILED.get(key)
+    if parts is None:
+        template = TEMPLATE_FILE.read_text(encoding="utf-8")
+        parts = compile_template(template, _profile_slots(profile, salary))
+        if len(_COMPILED) >= _COMPILED_MAX:
+            _COMPILED.clear()
+        _COMPILED[key] = parts
+    return parts
+
+
+def build_html(profile: dict, job: dict, tailored: dict, salary: dict) -> str:
+    """Rellena el template HTML con los datos del perfil (+ personalización si hay)."""
+    parts  = compiled_template(profile, salary)
+    values = _job_slots(profile, job, tailored)
+    html   = parts[:]
+    for i in range(1, len(parts), 2):
+        html[i] = str(values[parts[i]])
+    return "".join(html)
 
 
 # ─────────────────────────────────────────────────────────────────────────────
@@ -311,24 +393,19 @@ def build_html(profile: dict, job: dict, tailored: dict, salary: dict) -> str:
 # ─────────────────────────────────────────────────────────────────────────────
 
 def generate_pdf(html: str, output_path: Path) -> bool:
-    """Genera PDF desde HTML usando Playwright Chromium."""
+    """
+    Genera PDF desde HTML usando Playwright Chromium.
+    El render lo hace el servicio de PDFs (core/utils/pdf_renderer.py): un
+    Chromium tibio en su propio thread, compartido por todo el proceso, sin
+    importar desde qué thread se llame.
+    """
     try:
-        from playwright.sync_api import sync_playwright
-
-        with sync_playwright() as p:
-            browser = p.chromium.launch(headless=True)
-            page    = browser.new_page()
-            page.set_content(html, wait_until="domcontentloaded")
-            page.pdf(
-                path=str(output_path),
-                format="A4",
-                print_background=True,
-                margin={"top": "14mm", "right": "16mm", "bottom": "14mm", "left": "16mm"},
-            )
-            browser.close()
-
-        log.info(f"  [PDF] Guardado: {output_path}")
-        return True
+        from core.utils.pdf_renderer import get_pdf_service
+
+        ok = get_pdf_service().render(html, output_path)
+        if ok:
+            log.info(f"  [PDF] Guardado: {output_path}")
+        return ok
 
     except ImportError:
         log.error("Playwright no instalado: py -m playwright install chromium")
@@ -69,6 +69,7 @@ Ejemplos:
   py scripts/apply/run_easy_apply.py --live           # aplicar de verdad
   py scripts/apply/run_easy_apply.py --live --max 3   # hasta 3 aplicaciones
   py scripts/apply/run_easy_apply.py --live --min 8   # solo FIT >= 8
+  py scripts/apply/run_easy_apply.py --live --pregen-cvs  # CVs personalizados primero, en lote
         """
     )
     parser.add_argument('--live',  action='store_true',
@@ -77,6 +78,8 @@ Ejemplos:
                         help='Máximo de aplicaciones por sesión (default: 5)')
     parser.add_argument('--min',   type=int, default=7,
                         help='FIT score mínimo para aplicar (default: 7)')
+    parser.add_argument('--pregen-cvs', action='store_true',
+                        help='Genera todos los CVs personalizados (FIT >= 8) antes de aplicar')
     args = parser.parse_args()
 
     dry_run = not args.live
@@ -96,7 +99,7 @@ Ejemplos:
     bot = EasyApplyBot(dry_run=dry_run)
 
     try:
-        asyncio.run(bot.run(min_fit=args.min, max_jobs=args.max))
+        asyncio.run(bot.run(min_fit=args.min, max_jobs=args.max, pregen_cvs=args.pregen_cvs))
     except KeyboardInterrupt:
         print("\n\n[DETENIDO] Proceso interrumpido por usuario.")
 
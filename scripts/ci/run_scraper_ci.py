@@ -2,7 +2,11 @@
 """
 CI Runner — Multi-Source Scraper para GitHub Actions CI
 ========================================================
-Corre los 3 scrapers en secuencia: LinkedIn → Indeed → Computrabajo.
+Corre las 5 fuentes A LA VEZ en un solo event loop:
+LinkedIn, Indeed, Computrabajo, OCC y Adzuna.
+  - Un solo pool de browsers compartido (core/utils/browser_pool.py)
+  - Un solo escritor de Sheets: los jobs se guardan conforme aparecen, en lotes
+  - Una fuente que falla no detiene a las demás
   - Fuerza headless=True (no hay display en el servidor)
   - Lee SCRAPER_MODE del entorno (live | dry-run)
   - Guarda log en logs/scraper_YYYYMMDD_HHMMSS.log
@@ -16,6 +20,7 @@ import sys
 import os
 import asyncio
 import logging
+import importlib
 from datetime import datetime
 from pathlib import Path
 
@@ -43,6 +48,15 @@ os.environ["PLAYWRIGHT_HEADLESS"] = "true"
 # PROJECT_ROOT debe apuntar al workspace de GitHub Actions
 os.environ.setdefault("PROJECT_ROOT", str(ROOT))
 
+# (nombre, módulo, clase, ImportError es fatal)
+SOURCES = [
+    ("LinkedIn",     "core.ingestion.linkedin_search_scraper_v3", "LinkedInSearchScraper", True),
+    ("Indeed",       "core.ingestion.indeed_scraper",             "IndeedScraper",         False),
+    ("Computrabajo", "core.ingestion.computrabajo_scraper",       "ComputrabajoScraper",   False),
+    ("OCC",          "core.ingestion.occ_scraper",                "OccScraper",            False),
+    ("Adzuna",       "core.ingestion.adzuna_scraper",             "AdzunaScraper",         False),
+]
+
 
 def main():
     mode = os.environ.get("SCRAPER_MODE", "live").lower().strip()
@@ -70,121 +84,45 @@ def main():
 
     log.info("Credentials: OK")
 
-    linkedin_count = 0
-    indeed_count = 0
-    computrabajo_count = 0
-    occ_count = 0
-    adzuna_count = 0
+    from core.ingestion.base_scraper import run_scrapers
+
+    counts = {name: 0 for name, *_ in SOURCES}
     had_error = False
 
-    # ── 1. LinkedIn ────────────────────────────────────────────────────────────
-    log.info("-" * 60)
-    log.info("Running LinkedIn scraper...")
-    try:
-        from core.ingestion.linkedin_search_scraper_v3 import LinkedInSearchScraper
-
-        async def run_linkedin():
-            scraper = LinkedInSearchScraper(headless=True)
-            await scraper.run(dry_run=dry_run)
-            return scraper.jobs_found or []
-
-        jobs = asyncio.run(run_linkedin())
-        linkedin_count = len(jobs)
-        log.info(f"LinkedIn: {linkedin_count} jobs found")
-    except ImportError as e:
-        log.error(f"LinkedIn ImportError: {e}")
-        had_error = True
-    except Exception as e:
-        log.error(f"LinkedIn scraper error: {e}", exc_info=True)
-        had_error = True
-
-    # ── 2. Indeed ─────────────────────────────────────────────────────────────
-    log.info("-" * 60)
-    log.info("Running Indeed scraper...")
-    try:
-        from core.ingestion.indeed_scraper import IndeedScraper
-
-        async def run_indeed():
-            scraper = IndeedScraper(headless=True)
-            await scraper.run(dry_run=dry_run)
-            return scraper.jobs_found or []
-
-        jobs = asyncio.run(run_indeed())
-        indeed_count = len(jobs)
-        log.info(f"Indeed: {indeed_count} jobs found")
-    except ImportError as e:
-        log.warning(f"Indeed ImportError (skipping): {e}")
-    except Exception as e:
-        log.error(f"Indeed scraper error: {e}", exc_info=True)
-        had_error = True
-
-    # ── 3. Computrabajo ────────────────────────────────────────────────────────
-    log.info("-" * 60)
-    log.info("Running Computrabajo scraper...")
-    try:
-        from core.ingestion.computrabajo_scraper import ComputrabajoScraper
-
-        async def run_computrabajo():
-            scraper = ComputrabajoScraper(headless=True)
-            await scraper.run(dry_run=dry_run)
-            return scraper.jobs_found or []
-
-        jobs = asyncio.run(run_computrabajo())
-        computrabajo_count = len(jobs)
-        log.info(f"Computrabajo: {computrabajo_count} jobs found")
-    except ImportError as e:
-        log.warning(f"Computrabajo ImportError (skipping): {e}")
-    except Exception as e:
-        log.error(f"Computrabajo scraper error: {e}", exc_info=True)
-        had_error = True
-
-    # ── 4. OCC Mundial ─────────────────────────────────────────────────────────
-    log.info("-" * 60)
-    log.info("Running OCC Mundial scraper...")
-    try:
-        from core.ingestion.occ_scraper import OccScraper
-
-        async def run_occ():
-            scraper = OccScraper()
-            await scraper.run(dry_run=dry_run)
-            return scraper.jobs_found or []
-
-        jobs = asyncio.run(run_occ())
-        occ_count = len(jobs)
-        log.info(f"OCC: {occ_count} jobs found")
-    except ImportError as e:
-        log.warning(f"OCC ImportError (skipping): {e}")
-    except Exception as e:
-        log.error(f"OCC scraper error: {e}", exc_info=True)
-        had_error = True
-
-    # ── 5. Adzuna ──────────────────────────────────────────────────────────────
+    scrapers, names = [], {}
+    for name, module, cls_name, required in SOURCES:
+        try:
+            cls = getattr(importlib.import_module(module), cls_name)
+        except ImportError as e:
+            if required:
+                log.error(f"{name} ImportError: {e}")
+                had_error = True
+            else:
+                log.warning(f"{name} ImportError (skipping): {e}")
+            continue
+        scrapers.append(cls(headless=True))
+        names[cls_name] = name
+
     log.info("-" * 60)
-    log.info("Running Adzuna scraper...")
-    try:
-        from core.ingestion.adzuna_scraper import AdzunaScraper
-
-        async def run_adzuna():
-            scraper = AdzunaScraper()
-            await scraper.run(dry_run=dry_run)
-            return scraper.jobs_found or []
-
-        jobs = asyncio.run(run_adzuna())
-        adzuna_count = len(jobs)
-        log.info(f"Adzuna: {adzuna_count} jobs found")
-    except ImportError as e:
-        log.warning(f"Adzuna ImportError (skipping): {e}")
-    except Exception as e:
-        log.error(f"Adzuna scraper error: {e}", exc_info=True)
-        had_error = True
+    log.info(f"Running {len(scrapers)} scrapers concurrently: {', '.join(names.values())}")
+    results = asyncio.run(run_scrapers(scrapers, dry_run=dry_run, headless=True))
+
+    for cls_name, outcome in results.items():
+        name = names[cls_name]
+        if isinstance(outcome, BaseException):
+            log.error(f"{name} scraper error: {outcome}", exc_info=outcome)
+            had_error = True
+        else:
+            counts[name] = outcome
+            log.info(f"{name}: {outcome} jobs found")
 
     # ── Summary ────────────────────────────────────────────────────────────────
-    total = linkedin_count + indeed_count + computrabajo_count + occ_count + adzuna_count
+    total = sum(counts.values())
     log.info("=" * 60)
     log.info(
-        f"RESULTADO: LinkedIn={linkedin_count} | Indeed={indeed_count} "
-        f"| Computrabajo={computrabajo_count} | OCC={occ_count} "
-        f"| Adzuna={adzuna_count} | TOTAL={total}"
+        f"RESULTADO: LinkedIn={counts['LinkedIn']} | Indeed={counts['Indeed']} "
+        f"| Computrabajo={counts['Computrabajo']} | OCC={counts['OCC']} "
+        f"| Adzuna={counts['Adzuna']} | TOTAL={total}"
     )
     if not dry_run:
         log.info("Jobs guardados en pestañas LinkedIn / Indeed / Computrabajo / OCC / Adzuna de Google Sheets")
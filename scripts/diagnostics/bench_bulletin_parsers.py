@@ -0,0 +1,316 @@
+# -*- coding: utf-8 -*-
+"""
+bench_bulletin_parsers.py — Benchmark de los extractores de boletines
+=====================================================================
+Compara la implementacion anterior (regex sobre el HTML completo, una
+pasada por patron) contra la actual (un parseo lxml por email compartido
+via core/automation/bulletin_html.py) para cada extractor:
+
+  linkedin, indeed, glassdoor (fallback regex), user_urls,
+  ai_job_ids, ai_context, ai_clean_html   (helpers de AIEmailParser)
+  all                                    (todos sobre el mismo email: un solo parseo)
+
+Corpus: data/samples/*.html + *_SAMPLE.html de la raiz (deduplicados por contenido).
+Reporta emails/s, jobs/s, pico de memoria por email (tracemalloc) y si las
+URLs extraidas coinciden con la referencia (las diferencias esperables son
+entidades ya decodificadas: &amp; → &).
+
+Sin red ni LLM: el parser AI de Glassdoor se reemplaza por uno que devuelve
+[] para medir el fallback.
+
+Uso:
+  py scripts/diagnostics/bench_bulletin_parsers.py
+  py scripts/diagnostics/bench_bulletin_parsers.py --repeat 50 --only linkedin,user_urls
+"""
+
+import io
+import re
+import sys
+import time
+import hashlib
+import argparse
+import tracemalloc
+from contextlib import redirect_stdout
+from pathlib import Path
+
+ROOT = Path(__file__).parent.parent.parent
+sys.path.insert(0, str(ROOT))
+
+from core.automation.bulletin_html import bulletin_doc
+from core.automation.ai_email_parser import AIEmailParser
+from core.automation.job_bulletin_processor import JobBulletinProcessor
+
+
+# ─────────────────────────────────────────────────────────────────────────────
+# Implementacion previa (referencia): regex sobre el HTML completo
+# ─────────────────────────────────────────────────────────────────────────────
+
+def ref_linkedin(html):
+    url_patterns = [
+        r'https?://(?:www\.)?linkedin\.com/jobs/view/(\d+)',
+        r'https?://(?:www\.)?linkedin\.com/comm/jobs/view/(\d+)',
+        r'linkedin\.com[^"<\s]*jobId=(\d+)',
+        r'linkedin\.com[^"<\s]*job[_-]?id=(\d+)',
+        r'linkedin\.com[^"<\s]*currentJobId=(\d+)',
+    ]
+    job_ids, seen = [], set()
+    for pattern in url_patterns:
+        for match in re.finditer(pattern, html, re.IGNORECASE):
+            if match.group(1) not in seen:
+                seen.add(match.group(1))
+                job_ids.append(match.group(1))
+    tracking = re.findall(r'https?://(?:click\.email|emltrk|click)\.linkedin\.com/[^\s"<>]+', html)
+    title_patterns = [
+        r'<span[^>]*class="[^"]*job-title[^"]*"[^>]*>([^<]{5,100})</span>',
+        r'<h3[^>]*>([^<]{5,100})</h3>',
+        r'<a[^>]*linkedin\.com/jobs/view/\d+[^>]*>([^<]{5,100})</a>',
+        r'<a[^>]*linkedin\.com/comm/jobs/view/\d+[^>]*>([^<]{5,100})</a>',
+        r'>([^<]{5,80}(?:Manager|Director|Lead|Analyst|Consultant|Engineer|Owner|Scrum|Agile|ERP|ETL|BI)[^<]{0,30})<',
+    ]
+    titles = []
+    for pattern in title_patterns:
+        for match in re.finditer(pattern, html, re.IGNORECASE):
+            t = re.sub(r'\s+', ' ', re.sub(r'&[a-z]+;', ' ', match.group(1).strip()).strip())
+            if t and t not in titles and len(t) > 4:
+                titles.append(t)
+    for pattern in (r'<span[^>]*class="[^"]*company[^"]*"[^>]*>([^<]{2,80})</span>',
+                    r'<p[^>]*class="[^"]*company[^"]*"[^>]*>([^<]{2,80})</p>',
+                    r'<span[^>]*class="[^"]*location[^"]*"[^>]*>([^<]{2,80})</span>'):
+        re.findall(pattern, html, re.IGNORECASE)
+    urls = [f"https://www.linkedin.com/jobs/view/{j}" for j in job_ids]
+    return urls or tracking[:20]
+
+
+def ref_indeed(html, text=""):
+    return re.findall(r'https://www\.indeed\.com[^\s"<>]+', html)
+
+
+def ref_glassdoor(html):
+    job_ids = []
+    for pattern in (r'https://www\.glassdoor\.com/job-listing/JL_(\d+)\.htm',
+                    r'jobAlertAlert&amp;utm_content=ja-jobpos\d+-(\d+)',
+                    r'job_listing_id=(\d+)', r'jobListingId%3D(\d+)',
+                    r'glassdoor\.com/[^"]*?(\d{10,})'):
+        job_ids.extend(re.findall(pattern, html))
+    titles = re.findall(r'<p style="font-size:14px;line-height:1\.4;margin:0;font-weight:600">([^<]+)</p>', html)
+    re.findall(r'<p style="font-size:12px;line-height:1\.33;margin:0;font-weight:400;white-space:normal">([^<]+)</p>', html)
+    re.findall(r'<p style="font-size:12px;line-height:1\.33;margin:0;margin-top:4px">([^<$]+)</p>', html)
+    # Igual que el extractor viejo: un job por título (id en la misma posición);
+    # sin títulos, un placeholder por id
+    job_ids = list(dict.fromkeys(job_ids))
+    if not titles:
+        return [f"https://www.glassdoor.com/job-listing/JL_{j}.htm" for j in job_ids]
+    return [f"https://www.glassdoor.com/job-listing/JL_{job_ids[i]}.htm" if i < len(job_ids) else "Unknown"
+            for i in range(len(titles))]
+
+
+USER_PATTERNS = [
+    r'https?://(?:www\.)?linkedin\.com/jobs/view/\d+',
+    r'https?://(?:www\.)?linkedin\.com/comm/jobs/view/\d+',
+    r'https?://(?:www\.)?indeed\.com/(?:viewjob|rc/clk)[^\s<>"]+',
+    r'https?://(?:www\.)?indeed\.com/[^\s<>"]*',
+    r'https?://(?:www\.)?glassdoor\.com/job-listing/[^\s<>"]+',
+    r'https?://(?:www\.)?glassdoor\.com/partner/jobListing[^\s<>"]+',
+    r'https?://(?:careers|jobs|hiring)\.[\w\-]+\.com/[^\s<>"]+',
+    r'https?://(?:www\.)?[\w\-]+\.com/careers/[^\s<>"]+',
+    r'https?://(?:www\.)?[\w\-]+\.com/jobs/[^\s<>"]+',
+    r'https?://[\w\-]+\.(?:workday|greenhouse|lever|smartrecruiters|bamboohr|icims)\.com/[^\s<>"]+',
+    r'https?://[^\s<>"]*(?:job|career|apply|vacancy|position)[^\s<>"]*',
+]
+
+
+def ref_user_urls(html, text=""):
+    combined = text + "\n" + html
+    urls = []
+    for pattern in USER_PATTERNS:
+        for url in re.findall(pattern, combined, re.IGNORECASE):
+            url = url.replace('&amp;', '&').rstrip('.,;:\'")>')
+            if url not in urls:
+                urls.append(url)
+    return urls
+
+
+def ref_ai_job_ids(html):
+    return list(dict.fromkeys(re.findall(r'utm_content=ja-jobpos\d+-[^-]+-(\d{13})', html)))
+
+
+def ref_ai_context(html, job_id):
+    for pattern in (rf'utm_content=ja-jobpos\d+-[^-]+-{job_id}', rf'jobListingId={job_id}',
+                    rf'job-listing/JL_{job_id}'):
+        match = re.search(pattern, html)
+        if match:
+            idx = match.start()
+            break
+    else:
+        idx = html.find(job_id)
+    return "" if idx == -1 else html[max(0, idx - 1000):idx + 1000]
+
+
+def ref_ai_clean(html):
+    html = re.sub(r'<script[^>]*>.*?</script>', '', html, flags=re.DOTALL | re.IGNORECASE)
+    html = re.sub(r'<style[^>]*>.*?</style>', '', html, flags=re.DOTALL | re.IGNORECASE)
+    return re.sub(r'<img[^>]*>', '', html)[:15000]
+
+
+def _sample_ids(html):
+    """Ids 'de job' para medir ai_context: los del pixel, o numeros largos en URLs."""
+    return (ref_ai_job_ids(html) or re.findall(r'(\d{10,13})', html))[:10]
+
+
+# ─────────────────────────────────────────────────────────────────────────────
+# Implementacion actual
+# ─────────────────────────────────────────────────────────────────────────────
+
+class _NoAI:
+    def parse_glassdoor_bulletin(self, html):
+        return []
+
+
+def _processor():
+    proc = JobBulletinProcessor.__new__(JobBulletinProcessor)
+    proc.ai_parser = _NoAI()
+    return proc
+
+
+PROC = _processor()
+AI = AIEmailParser.__new__(AIEmailParser)
+
+
+def _urls(jobs):
+    return [j.get('ApplyURL', '') for j in jobs]
+
+
+def new_indeed(html, text=""):
+    # Los jobs de Indeed salen del texto plano; lo comparable son las URLs del HTML
+    PROC.extract_indeed_jobs(html, text)
+    return bulletin_doc(html).find_all(r'https://www\.indeed\.com[^\s"<>]+')
+
+
+def new_ai_context(html, job_id):
+    return AI._extract_job_context(html, job_id)
+
+
+PARSERS = {
+    # nombre: (referencia, actual) — ambos devuelven una lista comparable
+    'linkedin': (ref_linkedin, lambda h, t: _urls(PROC.extract_linkedin_jobs(h))),
+    'indeed': (ref_indeed, lambda h, t: new_indeed(h, t)),
+    'glassdoor': (ref_glassdoor, lambda h, t: _urls(PROC.extract_glassdoor_jobs(h))),
+    'user_urls': (ref_user_urls, lambda h, t: _urls(PROC.extract_user_jobs(t, h))),
+    'ai_job_ids': (ref_ai_job_ids, lambda h, t: AI._extract_job_ids(h)),
+    'ai_context': (lambda h: [ref_ai_context(h, j) for j in _sample_ids(h)],
+                   lambda h, t: [new_ai_context(h, j) for j in _sample_ids(h)]),
+    'ai_clean_html': (lambda h: [ref_ai_clean(h)], lambda h, t: [AI._clean_html_for_ai(h)]),
+}
+
+
+def _call_ref(name, html, text):
+    fn = PARSERS[name][0]
+    return fn(html, text) if name in ('indeed', 'user_urls') else fn(html)
+
+
+def run_all_ref(html, text):
+    return sum(len(_call_ref(name, html, text)) for name in PARSERS if name != 'ai_context')
+
+
+def run_all_new(html, text):
+    # Un solo parseo: todos los extractores comparten el arbol del email
+    return sum(len(PARSERS[name][1](html, text)) for name in PARSERS if name != 'ai_context')
+
+
+# ─────────────────────────────────────────────────────────────────────────────
+# Medicion
+# ─────────────────────────────────────────────────────────────────────────────
+
+def load_corpus():
+    files = sorted((ROOT / "data" / "samples").glob("*.html")) + sorted(ROOT.glob("*_SAMPLE.html"))
+    corpus, seen = [], set()
+    for path in files:
+        html = path.read_text(encoding="utf-8", errors="replace")
+        digest = hashlib.sha256(html.encode("utf-8")).hexdigest()
+        if digest in seen:
+            continue
+        seen.add(digest)
+        corpus.append((path.name, html))
+    return corpus
+
+
+def measure(fn, corpus, repeat, cold=True):
+    """(segundos, items extraidos, pico de memoria promedio por email en KiB)."""
+    items = 0
+    sink = io.StringIO()
+    with redirect_stdout(sink):
+        t0 = time.perf_counter()
+        for _ in range(repeat):
+            for _, html in corpus:
+                if cold:
+                    bulletin_doc.cache_clear()
+                items += fn(html)
+        elapsed = time.perf_counter() - t0
+
+        peaks = []
+        tracemalloc.start()
+        for _, html in corpus:
+            bulletin_doc.cache_clear()
+            tracemalloc.reset_peak()
+            base = tracemalloc.get_traced_memory()[0]
+            fn(html)
+            peaks.append(tracemalloc.get_traced_memory()[1] - base)
+        tracemalloc.stop()
+    return elapsed, items, sum(peaks) / len(peaks) / 1024
+
+
+def main():
+    ap = argparse.ArgumentParser()
+    ap.add_argument("--repeat", type=int, default=20, help="Pasadas sobre el corpus")
+    ap.add_argument("--only", default="", help="Extractores separados por coma (default: todos + all)")
+    args = ap.parse_args()
+
+    corpus = load_corpus()
+    if not corpus:
+        print("[FAIL] No hay samples en data/samples/ ni *_SAMPLE.html")
+        sys.exit(1)
+    chars = sum(len(h) for _, h in corpus)
+    print(f"Corpus: {len(corpus)} emails, {chars / 1e3:.0f} K caracteres, x{args.repeat} pasadas\n")
+
+    names = [n for n in args.only.split(",") if n] or list(PARSERS) + ["all"]
+    print(f"{'parser':<14} {'impl':<6} {'emails/s':>10} {'items/s':>10} {'pico KiB':>9}  speedup")
+    for name in names:
+        if name == "all":
+            ref_fn = lambda h: run_all_ref(h, "")
+            new_fn = lambda h: run_all_new(h, "")
+        else:
+            ref_fn = lambda h, n=name: len(_call_ref(n, h, ""))
+            new_fn = lambda h, n=name: len(PARSERS[n][1](h, ""))
+        t_ref, n_ref, m_ref = measure(ref_fn, corpus, args.repeat)
+        t_new, n_new, m_new = measure(new_fn, corpus, args.repeat)
+        emails = len(corpus) * args.repeat
+        print(f"{name:<14} {'regex':<6} {emails / t_ref:>10.0f} {n_ref / t_ref:>10.0f} {m_ref:>9.0f}")
+        print(f"{'':<14} {'lxml':<6} {emails / t_new:>10.0f} {n_new / t_new:>10.0f} {m_new:>9.0f}  "
+              f"{t_ref / t_new:.1f}x")
+
+    # Equivalencia: mismas URLs (salvo entidades decodificadas)
+    print()
+    diffs = 0
+    with redirect_stdout(io.StringIO()):
+        results = []
+        for fname, html in corpus:
+            for name in ("linkedin", "indeed", "glassdoor", "user_urls", "ai_job_ids"):
+                if names and name not in names and "all" not in names:
+                    continue
+                ref = {u.replace("&amp;", "&") for u in _call_ref(name, html, "")}
+                new = set(PARSERS[name][1](html, ""))
+                if ref != new:
+                    results.append((fname, name, ref - new, new - ref))
+    for fname, name, missing, extra in results:
+        diffs += 1
+        print(f"[DIFF] {fname} / {name}: {len(missing)} solo en regex, {len(extra)} solo en lxml")
+        for url in list(missing)[:2]:
+            print(f"         - {url[:110]}")
+        for url in list(extra)[:2]:
+            print(f"         + {url[:110]}")
+    if not diffs:
+        print("[OK] Mismas URLs que la implementacion anterior en todo el corpus")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,183 @@
+# -*- coding: utf-8 -*-
+"""
+bench_cv_builder.py — Benchmark del armado de HTML de CVs personalizados
+========================================================================
+Compara la implementacion anterior de cv_generator.build_html (leer el
+template, regenerar experiencia/educacion/certs/idiomas y un str.replace por
+placeholder sobre el documento completo, en cada CV) contra el template
+compilado (fragmentos del perfil cacheados por version, por vacante solo se
+llenan summary, skills y badge), y verifica que el HTML sea identico.
+
+Perfil: data/cv_profile.json si existe; si no, uno sintetico del mismo
+tamaño aproximado (8 experiencias con 5 bullets, 3 estudios, 8 certs).
+
+Uso:
+  py scripts/diagnostics/bench_cv_builder.py
+  py scripts/diagnostics/bench_cv_builder.py --n 1000 --seed 7
+"""
+
+import sys
+import time
+import random
+import argparse
+from pathlib import Path
+
+ROOT = Path(__file__).parent.parent.parent
+sys.path.insert(0, str(ROOT))
+
+from scripts.apply import cv_generator as cvg
+from scripts.apply.cv_generator import (
+    PROFILE_FILE, TEMPLATE_FILE, calculate_salary, build_html, _skill_tags,
+    _experience_html, _education_html, _certs_html, _languages_html,
+)
+
+SKILLS = [
+    "Project Management", "Scrum", "Kanban", "Stakeholder Management", "PMO",
+    "Risk Management", "Budgeting", "Change Management", "ERP", "SAP",
+    "Dynamics AX", "SQL", "Power BI", "Python", "Jira", "Confluence",
+    "Azure DevOps", "Salesforce", "Data Migration", "Business Analysis",
+]
+ROLES = ["Senior Project Manager", "Business Analyst", "Scrum Master", "PMO Lead",
+         "ERP Consultant", "Delivery Manager", "Product Owner"]
+COMPANIES = ["Globant", "EPAM", "Wizeline", "Oracle", "Accenture", "Interax",
+             "Murmuration", "Bairesdev", "Encora", "Softtek"]
+
+
+def build_html_reference(profile: dict, job: dict, tailored: dict, salary: dict) -> str:
+    """Implementacion previa de cv_generator.build_html (referencia)."""
+    template = TEMPLATE_FILE.read_text(encoding="utf-8")
+
+    personal = profile["personal"]
+    skills   = profile["skills"]
+
+    summary = tailored.get("summary") or profile.get("summary", "")
+
+    if tailored.get("skills_highlight"):
+        mgmt_tags = _skill_tags(tailored["skills_highlight"][:5])
+        tech_tags = _skill_tags(tailored["skills_highlight"][5:])
+    else:
+        mgmt_tags = _skill_tags(skills.get("management", []))
+        tech_tags = _skill_tags(skills.get("technical",  []))
+
+    tailored_badge = ""
+    if tailored and job.get("company"):
+        tailored_badge = f'<span class="tailored-badge">✓ Personalizado para {job.get("company","")}</span>'
+
+    replacements = {
+        "{{NAME}}":               personal.get("name", ""),
+        "{{HEADLINE}}":           profile.get("headline", ""),
+        "{{EMAIL}}":              personal.get("email", ""),
+        "{{PHONE}}":              personal.get("phone", ""),
+        "{{LOCATION}}":           personal.get("location", ""),
+        "{{LINKEDIN}}":           personal.get("linkedin", ""),
+        "{{SUMMARY}}":            summary,
+        "{{SKILLS_MANAGEMENT}}":  mgmt_tags,
+        "{{SKILLS_TECHNICAL}}":   tech_tags,
+        "{{EXPERIENCE_HTML}}":    _experience_html(profile.get("experience", [])),
+        "{{EDUCATION_HTML}}":     _education_html(profile.get("education",  [])),
+        "{{CERTS_HTML}}":         _certs_html(profile.get("certifications", [])),
+        "{{LANGUAGES_HTML}}":     _languages_html(skills.get("languages", [])),
+        "{{SALARY_DISPLAY_MXN}}": salary.get("display_mxn", ""),
+        "{{SALARY_DISPLAY_USD}}": salary.get("display_usd", ""),
+        "{{TAILORED_BADGE}}":     tailored_badge,
+    }
+
+    html = template
+    for placeholder, value in replacements.items():
+        html = html.replace(placeholder, str(value))
+
+    return html
+
+
+def synthetic_profile(rnd: random.Random) -> dict:
+    bullet = ("Led the migration of {n} business units to {s}, coordinating {k} "
+              "cross-functional teams and cutting month-end close by {p}%.")
+    return {
+        "personal": {"name": "Marcos Alvarado", "email": "markalvati@gmail.com",
+                     "phone": "+52 33 2332 0358", "location": "Guadalajara, Jalisco",
+                     "linkedin": "linkedin.com/in/marcosalvarado"},
+        "headline": "Senior Project Manager · ERP · Business Analysis",
+        "summary": "Project manager with 10+ years delivering ERP and data projects. " * 3,
+        "skills": {
+            "management": SKILLS[:10], "technical": SKILLS[10:],
+            "languages": [{"lang": "Español", "level": "Nativo"},
+                          {"lang": "English", "level": "Professional"}],
+        },
+        "experience": [
+            {"company": rnd.choice(COMPANIES), "role": rnd.choice(ROLES),
+             "location": "Guadalajara, MX", "start": f"{2024 - 2 * i}-0{1 + i % 9}",
+             "end": None if i == 0 else f"{2025 - 2 * i}-1{i % 3}", "current": i == 0,
+             "bullets": [bullet.format(n=rnd.randint(2, 9), s=rnd.choice(SKILLS),
+                                       k=rnd.randint(2, 6), p=rnd.randint(10, 40))
+                         for _ in range(5)]}
+            for i in range(8)
+        ],
+        "education": [{"degree": f"Degree {i}", "institution": "Universidad de Guadalajara",
+                       "end": str(2010 + i)} for i in range(3)],
+        "certifications": [{"name": f"Certification {i}",
+                            "status": "active" if i % 3 else "in_progress"} for i in range(8)],
+        "salary": {"min_mxn_monthly": 50000, "exchange_rate_mxn_usd": 20.0},
+    }
+
+
+def make_jobs(n: int, rnd: random.Random) -> list:
+    jobs = []
+    for _ in range(n):
+        company = rnd.choice(COMPANIES)
+        job = {"company": company, "role": rnd.choice(ROLES)}
+        tailored = {}
+        if rnd.random() < 0.9:
+            tailored = {
+                "summary": f"Project manager tailored for {company}: " + " ".join(rnd.sample(SKILLS, 6)),
+                "skills_highlight": rnd.sample(SKILLS, rnd.randint(8, 10)),
+            }
+        jobs.append((job, tailored))
+    return jobs
+
+
+def main():
+    ap = argparse.ArgumentParser()
+    ap.add_argument("--n", type=int, default=500, help="CVs personalizados a armar")
+    ap.add_argument("--seed", type=int, default=42)
+    args = ap.parse_args()
+
+    rnd = random.Random(args.seed)
+    if PROFILE_FILE.exists():
+        profile = cvg.load_profile()
+        print(f"Perfil: {PROFILE_FILE}")
+    else:
+        profile = synthetic_profile(rnd)
+        print("Perfil: sintetico (data/cv_profile.json no existe)")
+    salary = calculate_salary(profile)
+    jobs = make_jobs(args.n, rnd)
+
+    t0 = time.perf_counter()
+    ref = [build_html_reference(profile, job, tailored, salary) for job, tailored in jobs]
+    t_ref = time.perf_counter() - t0
+
+    cvg._COMPILED.clear()
+    cvg._VERSION_MEMO = (None, None, "")
+    t0 = time.perf_counter()
+    build_html(profile, *jobs[0], salary)            # primer CV: compila el template
+    t_first = time.perf_counter() - t0
+    t0 = time.perf_counter()
+    new = [build_html(profile, job, tailored, salary) for job, tailored in jobs]
+    t_new = time.perf_counter() - t0
+
+    mismatches = [i for i, (a, b) in enumerate(zip(ref, new)) if a != b]
+
+    size = sum(len(h) for h in new) / len(new)
+    print(f"CVs: {len(jobs)} ({size / 1024:.1f} KiB de HTML c/u)")
+    print(f"Referencia (str.replace x placeholder): {t_ref:.3f}s  ({t_ref / len(jobs) * 1e6:.0f} us/CV)")
+    print(f"Template compilado (1a vez):           {t_first * 1e6:.0f} us")
+    print(f"Template compilado:                    {t_new:.3f}s  ({t_new / len(jobs) * 1e6:.0f} us/CV)")
+    print(f"Speedup: {t_ref / t_new:.1f}x")
+    if mismatches:
+        i = mismatches[0]
+        print(f"[FAIL] {len(mismatches)} HTML distintos, p.ej. #{i}")
+        sys.exit(1)
+    print("[OK] HTML identico en todos los CVs")
+
+
+if __name__ == "__main__":
+    main()
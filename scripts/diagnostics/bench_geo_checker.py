@@ -0,0 +1,109 @@
+# -*- coding: utf-8 -*-
+"""
+bench_geo_checker.py — Benchmark del clasificador geografico
+============================================================
+Compara la implementacion anterior de geo_checker._score_text (un re.search
+por patron, sin precompilar) contra GeoClassifier, y verifica que ambos den
+exactamente los mismos conteos.
+
+Corpus: descripciones sinteticas armadas con frases reales de ofertas
+(US only, LATAM, remoto global, sin señal), de 300 a 5000 caracteres.
+
+Uso:
+  py scripts/diagnostics/bench_geo_checker.py
+  py scripts/diagnostics/bench_geo_checker.py --n 5000 --seed 7
+"""
+
+import re
+import sys
+import time
+import random
+import argparse
+from pathlib import Path
+
+ROOT = Path(__file__).parent.parent.parent
+sys.path.insert(0, str(ROOT))
+
+from core.enrichment.geo_checker import (
+    US_ONLY_PATTERNS, GLOBAL_PATTERNS, MX_PATTERNS, PATTERN_TRIGGERS,
+    _clean_text, score_texts,
+)
+
+PHRASES = [
+    "Remote - USA Only", "Must be authorized to work in the US.", "No visa sponsorship.",
+    "We are hiring across Latin America including Mexico.", "work from anywhere in the world",
+    "Candidates must be located in the United States", "100% remote, global team",
+    "Guadalajara, Jalisco", "CDMX o remoto en México", "We cannot sponsor visa for this role",
+    "open to all international candidates", "LATAM remote position", "domestic candidates only",
+    "We only hire people in the U.S. at this time", "Must have US citizenship",
+    "Ciudad de México", "Mexican candidates welcome", "remote worldwide",
+]
+FILLER = (
+    "We are looking for a Senior Project Manager to lead ERP migrations and "
+    "coordinate cross-functional teams. You will own the roadmap, manage "
+    "stakeholders, run Scrum ceremonies and report to the PMO. Experience with "
+    "SAP, Dynamics AX, SQL and Power BI is a plus. Competitive salary and benefits. "
+)
+
+
+def _score_text_reference(text: str) -> dict:
+    """Implementacion previa de geo_checker._score_text (referencia)."""
+    t = _clean_text(text)
+    us_hits   = sum(1 for p in US_ONLY_PATTERNS if re.search(p, t, re.IGNORECASE))
+    global_hits = sum(1 for p in GLOBAL_PATTERNS if re.search(p, t, re.IGNORECASE))
+    mx_hits   = sum(1 for p in MX_PATTERNS if re.search(p, t, re.IGNORECASE))
+    return {"us_only": us_hits, "global": global_hits, "mx": mx_hits}
+
+
+def make_corpus(n: int, seed: int) -> list:
+    rnd = random.Random(seed)
+    corpus = []
+    for _ in range(n):
+        parts = [FILLER] * rnd.randint(1, 12)
+        # ~1/3 sin ninguna señal geografica (caso mas comun en el sheet)
+        for _ in range(rnd.choice([0, 0, 1, 2, 3])):
+            parts.insert(rnd.randrange(len(parts) + 1), rnd.choice(PHRASES))
+        text = " ".join(parts)
+        if rnd.random() < 0.3:
+            text = text.upper()
+        corpus.append(text)
+    return corpus
+
+
+def main():
+    ap = argparse.ArgumentParser()
+    ap.add_argument("--n", type=int, default=2000, help="Descripciones en el corpus")
+    ap.add_argument("--seed", type=int, default=42)
+    args = ap.parse_args()
+
+    missing = [p for p in US_ONLY_PATTERNS + GLOBAL_PATTERNS + MX_PATTERNS
+               if p not in PATTERN_TRIGGERS]
+    if missing:
+        print(f"[WARN] {len(missing)} patrones sin disparador (se evaluan siempre)")
+
+    corpus = make_corpus(args.n, args.seed)
+    chars = sum(len(t) for t in corpus)
+    print(f"Corpus: {len(corpus)} textos, {chars / 1e6:.1f} M caracteres")
+
+    t0 = time.perf_counter()
+    ref = [_score_text_reference(t) for t in corpus]
+    t_ref = time.perf_counter() - t0
+
+    t0 = time.perf_counter()
+    new = score_texts(corpus)
+    t_new = time.perf_counter() - t0
+
+    mismatches = [i for i, (a, b) in enumerate(zip(ref, new)) if a != b]
+
+    print(f"Referencia (re.search x patron): {t_ref:.3f}s  ({t_ref / len(corpus) * 1e6:.0f} us/texto)")
+    print(f"GeoClassifier.score_many:       {t_new:.3f}s  ({t_new / len(corpus) * 1e6:.0f} us/texto)")
+    print(f"Speedup: {t_ref / t_new:.1f}x")
+    if mismatches:
+        i = mismatches[0]
+        print(f"[FAIL] {len(mismatches)} conteos distintos, p.ej. #{i}: {ref[i]} vs {new[i]}")
+        sys.exit(1)
+    print("[OK] Conteos identicos en todo el corpus")
+
+
+if __name__ == "__main__":
+    main()
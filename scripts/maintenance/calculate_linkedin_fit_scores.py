@@ -7,15 +7,22 @@ import sys
 from pathlib import Path
 sys.path.insert(0, str(Path(__file__).parent.parent.parent))
 
+import itertools
 import requests
 import time
 from core.sheets.sheet_manager import SheetManager
+from core.utils.google_clients import print_metrics
+from core.enrichment.scoring_engine import (
+    ScoringEngine, RateLimited, BackendUnavailable, estimate_tokens,
+)
+from core.utils.llm_cache import get_cache, print_cache_stats
 from dotenv import load_dotenv
 import os
 
 # ── Límites de ejecución para evitar timeout en GitHub Actions ───────────────
-# GHA timeout del step: 40 min → damos 37 min de margen
-MAX_JOBS_PER_RUN  = 160    # máx jobs por ejecución (el resto se scorea mañana)
+# GHA timeout del step: 40 min → damos 37 min de margen.
+# El número de jobs lo decide la capacidad de los backends (rpm) dentro del
+# tiempo; FIT_MAX_JOBS_PER_RUN (ver abajo) solo aplica si se define (>0).
 MAX_RUN_SECONDS   = 37 * 60  # 37 minutos → sale antes del timeout de 40 min
 
 # Windows UTF-8
@@ -27,21 +34,23 @@ load_dotenv()
 
 import json as _json
 
+MAX_JOBS_PER_RUN = int(os.getenv("FIT_MAX_JOBS_PER_RUN", "0"))
+
 SHEET_ID    = os.getenv("GOOGLE_SHEETS_ID")
 NVIDIA_KEY  = os.getenv("NVIDIA_API_KEY",  "").strip().strip('"').strip("'")
 GEMINI_KEY  = os.getenv("GEMINI_API_KEY",  "").strip().strip('"').strip("'")
 
 # ─────────────────────────────────────────────────────────────────────
-# MULTI-BACKEND con fallback automático
+# MULTI-BACKEND en paralelo
 #
-# Prioridad de uso (de más rápido/barato a más lento):
+# Backends disponibles:
 #   1. LLM_URL explícita en .env   → solo ese backend (override manual)
 #   2. Gemini Flash (gratis ~15 rpm, OpenAI-compatible)
 #   3. NVIDIA NIM (~5 rpm, gratis con key)
 #   4. Ollama local (sin límite, privado)
 #
-# Cuando un backend devuelve 429 se salta al siguiente
-# automáticamente sin interrumpir el batch.
+# main() usa TODOS a la vez vía ScoringEngine (rate limit por backend);
+# analyze_with_ai() (un job suelto) sigue el orden y rota en 429.
 # ─────────────────────────────────────────────────────────────────────
 
 def _build_backends() -> list:
@@ -142,68 +151,64 @@ PRIORITIES:
 - Leadership roles
 """
 
-def _call_backend(backend: dict, prompt: str) -> dict | None:
+def _call_backend(backend: dict, prompt: str) -> dict:
     """
-    Llama a un backend LLM. Devuelve el resultado o None si hay 429
-    (para que el llamador rote al siguiente backend).
+    Llama a un backend LLM y devuelve el resultado parseado.
+
+    Raises:
+        RateLimited:        HTTP 429
+        BackendUnavailable: key expirada / inválida
+        RuntimeError:       otro HTTP != 200 o respuesta no parseable
     """
     headers = {"Content-Type": "application/json"}
     if backend["key"]:
         headers["Authorization"] = f"Bearer {backend['key']}"
 
-    try:
-        response = requests.post(
-            backend["url"],
-            headers=headers,
-            json={
-                "model": backend["model"],
-                "messages": [{"role": "user", "content": prompt}],
-                "temperature": 0.3,
-                "max_tokens": 300,
-            },
-            timeout=30,
-        )
-
-        if response.status_code == 429:
-            return None  # señal para rotar backend
-
-        # Key expirada / inválida → rotar (None = rotar al siguiente)
-        if response.status_code in (400, 401, 403):
-            try:
-                err_body = response.json()
-                err_msg  = str(err_body).lower()
-            except Exception:
-                err_msg = response.text.lower()
-            if any(w in err_msg for w in ("expired", "invalid", "unauthorized", "forbidden", "api key")):
-                return None  # señal para rotar backend
-
-        if response.status_code != 200:
-            return {"fit_score": 5,
-                    "why": f"AI unavailable (HTTP {response.status_code})",
-                    "seniority": "Unknown"}
-
-        content = response.json()["choices"][0]["message"]["content"]
-        content = content.replace("```json", "").replace("```", "").strip()
-        result  = _json.loads(content)
-        # Incluir nombre del backend en Why para detectar scores de Ollama
-        why_raw = result.get("why", "Analysis completed")[:180]
-        return {
-            "fit_score": min(10, max(0, int(result.get("fit_score", 5)))),
-            "why":       f"[{backend['name']}] {why_raw}",
-            "seniority": result.get("seniority", "Unknown"),
-        }
-
-    except Exception as e:
-        return {"fit_score": 5, "why": f"Error: {str(e)[:100]}", "seniority": "Unknown"}
-
-
-def analyze_with_ai(job_data: dict) -> dict:
-    """Analiza job con IA usando multi-backend con fallback automático en 429."""
+    response = requests.post(
+        backend["url"],
+        headers=headers,
+        json={
+            "model": backend["model"],
+            "messages": [{"role": "user", "content": prompt}],
+            "temperature": 0.3,
+            "max_tokens": 300,
+        },
+        timeout=30,
+    )
+
+    if response.status_code == 429:
+        raise RateLimited(backend["name"])
+
+    # Key expirada / inválida → desactivar backend
+    if response.status_code in (400, 401, 403):
+        try:
+            err_msg = str(response.json()).lower()
+        except Exception:
+            err_msg = response.text.lower()
+        if any(w in err_msg for w in ("expired", "invalid", "unauthorized", "forbidden", "api key")):
+            raise BackendUnavailable(f"HTTP {response.status_code}: {err_msg[:60]}")
+
+    if response.status_code != 200:
+        raise RuntimeError(f"HTTP {response.status_code}")
+
+    content = response.json()["choices"][0]["message"]["content"]
+    content = content.replace("```json", "").replace("```", "").strip()
+    result  = _json.loads(content)
+    # Incluir nombre del backend en Why para detectar scores de Ollama
+    why_raw = result.get("why", "Analysis completed")[:180]
+    return {
+        "fit_score": min(10, max(0, int(result.get("fit_score", 5)))),
+        "why":       f"[{backend['name']}] {why_raw}",
+        "seniority": result.get("seniority", "Unknown"),
+    }
+
+
+def build_prompt(job_data: dict) -> str:
     role     = job_data.get("Role",     "Unknown")
     company  = job_data.get("Company",  "Unknown")
     location = job_data.get("Location", "Unknown")
 
-    prompt = f"""Eres un experto en análisis de ofertas laborales.
+    return f"""Eres un experto en análisis de ofertas laborales.
 
 CANDIDATO:
 {CV_TEXT}
@@ -227,20 +232,50 @@ Responde SOLO en JSON:
   "seniority": "Mid-Level | Senior | Lead"
 }}"""
 
-    # Intentar con cada backend; rotar en 429
+
+# Subir la version si cambia build_prompt (invalida el cache)
+FIT_PROMPT_VERSION = "fit-v1"
+_fit_cache = get_cache("fit_score", FIT_PROMPT_VERSION)
+
+
+def cached_score(job_data: dict) -> dict | None:
+    """Resultado previo del mismo prompt con cualquiera de los modelos disponibles."""
+    prompt = build_prompt(job_data)
+    for backend in BACKENDS:
+        hit = _fit_cache.get(backend["model"], prompt)
+        if hit is not None:
+            return hit
+    return None
+
+
+def score_job(backend: dict, job_data: dict) -> dict:
+    """Unidad de trabajo del ScoringEngine: un job en un backend."""
+    prompt  = build_prompt(job_data)
+    started = time.time()
+    result  = _call_backend(backend, prompt)
+    _fit_cache.put(backend["model"], prompt, result, elapsed=time.time() - started)
+    return result
+
+
+def analyze_with_ai(job_data: dict) -> dict:
+    """Analiza un job suelto usando multi-backend con fallback automático en 429."""
+    cached = cached_score(job_data)
+    if cached is not None:
+        return cached
+
+    # Intentar con cada backend; rotar en 429 / key inválida
     attempts_per_backend = 2
     tried = 0
     while tried < len(BACKENDS) * attempts_per_backend:
         backend = _active_backend()
-        result  = _call_backend(backend, prompt)
-
-        if result is None:
-            # 429 → rotar al siguiente backend sin esperar
-            _rotate_backend("429")
+        try:
+            return score_job(backend, job_data)
+        except (RateLimited, BackendUnavailable) as e:
+            # → rotar al siguiente backend sin esperar
+            _rotate_backend(type(e).__name__)
             tried += 1
-            continue
-
-        return result
+        except Exception as e:
+            return {"fit_score": 5, "why": f"Error: {str(e)[:100]}", "seniority": "Unknown"}
 
     return {"fit_score": 5, "why": "AI unavailable (all backends exhausted)", "seniority": "Unknown"}
 
@@ -288,10 +323,9 @@ def main():
     print("="*70)
     print(f"Sheet:   {SHEET_ID}")
     print(f"Tabs:    {', '.join(TABS_TO_SCORE)}")
-    print(f"Backends disponibles ({len(BACKENDS)}):")
+    print(f"Backends en paralelo ({len(BACKENDS)}):")
     for i, b in enumerate(BACKENDS):
-        marker = "▶" if i == 0 else " "
-        print(f"  {marker} [{i+1}] {b['name']} — {b['model']}")
+        print(f"  [{i+1}] {b['name']} — {b['model']}")
     print("="*70 + "\n")
 
     sheet_manager = SheetManager()
@@ -305,72 +339,76 @@ def main():
 
     total_pending = len(pending)
 
-    # Cap por run — el resto se procesa en la siguiente ejecución
-    if total_pending > MAX_JOBS_PER_RUN:
+    # Cap opcional por run — el resto se procesa en la siguiente ejecución
+    if MAX_JOBS_PER_RUN and total_pending > MAX_JOBS_PER_RUN:
         print(f"\n⚠️  {total_pending} jobs pendientes — limitando a {MAX_JOBS_PER_RUN} por run")
-        print(f"   Los {total_pending - MAX_JOBS_PER_RUN} restantes se procesarán mañana.")
         pending = pending[:MAX_JOBS_PER_RUN]
 
-    print(f"\n📋 Procesando {len(pending)} de {total_pending} jobs\n")
+    # Prompts ya contestados (rerun tras crash, "AI unavailable"...) no van al LLM,
+    # y el mismo prompt en varios tabs se manda una sola vez
+    cached   = []
+    by_prompt: dict = {}
+    for job in pending:
+        hit = cached_score(job)
+        if hit is not None:
+            cached.append((job, hit, "cache"))
+        else:
+            by_prompt.setdefault(build_prompt(job), []).append(job)
+    to_score = [jobs[0] for jobs in by_prompt.values()]
+    if cached or len(to_score) < len(pending) - len(cached):
+        print(f"\n💾 {len(cached)} jobs desde llm_cache, "
+              f"{len(pending) - len(cached) - len(to_score)} duplicados en esta corrida")
+
+    def _fan_out(results):
+        """Un resultado del engine → todas las filas con el mismo prompt."""
+        for job, result, backend_name in results:
+            for same in by_prompt[build_prompt(job)]:
+                yield same, result, backend_name
+
+    engine   = ScoringEngine(BACKENDS)
+    run_start = time.time()
+    # No empezar jobs nuevos si quedan < 3 min
+    deadline = run_start + MAX_RUN_SECONDS - 180
+    est = engine.capacity_per_min * (MAX_RUN_SECONDS - 180) / 60
+    print(f"\n📋 Procesando {len(pending)} de {total_pending} jobs "
+          f"(capacidad ≈ {engine.capacity_per_min:.0f}/min, ~{est:.0f} en el tiempo límite)\n")
     print("="*70)
 
-    run_start  = time.time()
     processed  = 0
-    errors     = 0
-    time_exits = 0
-
-    for i, job in enumerate(pending, 1):
-        # ── Time budget: salir limpio si quedan < 3 min ──────────────────
-        elapsed   = time.time() - run_start
-        remaining = MAX_RUN_SECONDS - elapsed
-        if remaining < 180:
-            print(f"\n⏱️  Tiempo límite alcanzado ({elapsed/60:.1f} min) — "
-                  f"procesados {processed}/{len(pending)} jobs.")
-            print(f"   Los {len(pending) - i + 1} restantes se scorearán mañana.")
-            time_exits = len(pending) - i + 1
-            break
 
-        try:
+    # Modo buffer: updates + colores se mandan en lotes (flush cada 30s y al final).
+    # Los LLMs corren en threads; la escritura al Sheet solo en este thread.
+    with sheet_manager.buffered():
+        results = itertools.chain(cached, _fan_out(engine.run(
+            to_score, score_job, deadline=deadline,
+            token_cost=lambda job: estimate_tokens(build_prompt(job)),
+        )))
+        for job, result, backend_name in results:
+            processed += 1
             role       = job.get('Role',    'Unknown')
             company    = job.get('Company', 'Unknown')
             row        = job.get('_row', 0)
             source_tab = job.get('_source_tab', 'linkedin')
+            elapsed    = time.time() - run_start
 
-            print(f"\n[{i}/{len(pending)}] [{source_tab}] {role} @ {company}  "
-                  f"(⏱ {elapsed/60:.1f}m/{MAX_RUN_SECONDS/60:.0f}m)")
-            print(f"   Row: {row}")
-
-            # Analyze
-            print(f"   🤖 Analyzing...")
-            result = analyze_with_ai(job)
-
-            print(f"   ✅ FIT: {result['fit_score']}/10")
-
-            # Save to correct tab
-            print(f"   💾 Saving → {source_tab}...")
-            updates = {
-                'FitScore':  result['fit_score'],
-                'Why':       result['why'],
-                'Seniority': result['seniority'],
-            }
-            sheet_manager.update_job(row, updates, source_tab)
-            print(f"   ✅ Saved!")
-            processed += 1
-
-            # Sleep dinámico según el backend activo
-            active_url = _active_backend()["url"]
-            if "127.0.0.1" in active_url or "localhost" in active_url:
-                sleep_secs = 2    # Ollama local — sin límite de API
-            elif "google" in active_url:
-                sleep_secs = 4    # Gemini Flash — 15 rpm → ~4s
-            else:
-                sleep_secs = 8    # NVIDIA NIM
-            time.sleep(sleep_secs)
-
-        except Exception as e:
-            print(f"   ❌ Error: {e}")
-            errors += 1
-            continue
+            print(f"[{processed}/{len(pending)}] [{source_tab}] row {row} · {role} @ {company} "
+                  f"→ FIT {result['fit_score']}/10 ({backend_name}, ⏱ {elapsed/60:.1f}m)")
+            try:
+                updates = {
+                    'FitScore':  result['fit_score'],
+                    'Why':       result['why'],
+                    'Seniority': result['seniority'],
+                }
+                sheet_manager.update_job(row, updates, source_tab)
+                # Semaforo de colores — va en el mismo flush que los valores
+                sheet_manager.color_row_by_fit(row, result['fit_score'], source_tab)
+            except Exception as e:
+                print(f"   ❌ Error guardando row {row}: {e}")
+                processed -= 1
+
+    errors     = sum(len(by_prompt[build_prompt(job)])
+                     for job, reason in engine.skipped if reason.startswith("error"))
+    time_exits = len(pending) - processed - errors
 
     total_elapsed = time.time() - run_start
     print("\n" + "="*70)
@@ -378,8 +416,13 @@ def main():
     print("="*70)
     print(f"Procesados:  {processed}")
     print(f"Errores:     {errors}")
-    print(f"Pendientes:  {time_exits + max(0, total_pending - MAX_JOBS_PER_RUN)}")
+    print(f"Pendientes:  {time_exits + (total_pending - len(pending))}")
     print(f"Tiempo total: {total_elapsed/60:.1f} min")
+    if total_elapsed > 0:
+        print(f"Throughput:  {processed / (total_elapsed / 60):.1f} jobs/min")
+    engine.print_stats()
+    print_cache_stats()
+    print_metrics()
     print("="*70)
 
     if processed > 0:
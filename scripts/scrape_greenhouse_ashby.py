@@ -8,6 +8,13 @@ Uso:
     py scripts/scrape_greenhouse_ashby.py
     py scripts/scrape_greenhouse_ashby.py --dry-run      # no escribe en Sheets
     py scripts/scrape_greenhouse_ashby.py --sector ai    # solo empresas de AI
+    py scripts/scrape_greenhouse_ashby.py --companies-file data/ats/greenhouse.txt
+    py scripts/scrape_greenhouse_ashby.py --all          # también vacantes ya vistas
+
+Por defecto solo se emiten vacantes nuevas o modificadas desde la corrida
+anterior (snapshot en data/state/ats_boards.db); boards sin cambios se saltan.
+El snapshot se guarda después de escribir en Sheets: con --dry-run no se
+guarda, y las vacantes cuyo insert falla se vuelven a emitir la próxima vez.
 """
 
 import sys
@@ -21,6 +28,7 @@ sys.path.insert(0, str(Path(__file__).parent.parent))
 
 from core.ingestion.greenhouse_scraper import scrape_greenhouse, get_greenhouse_companies_for_sector
 from core.ingestion.ashby_scraper import scrape_ashby
+from core.ingestion.ats_harvester import PendingSnapshots
 
 logging.basicConfig(level=logging.INFO, format="%(asctime)s | %(levelname)s | %(message)s")
 log = logging.getLogger(__name__)
@@ -43,11 +51,20 @@ def normalize_job(job: dict, idx: int) -> dict:
     }
 
 
+def load_companies_file(path: str) -> list[str]:
+    """Un slug por línea; líneas vacías y comentarios (#) se ignoran."""
+    lines = Path(path).read_text(encoding="utf-8").splitlines()
+    return [l.strip() for l in lines if l.strip() and not l.strip().startswith("#")]
+
+
 def main():
     parser = argparse.ArgumentParser(description="Scrape Greenhouse + Ashby y cargar a Sheets")
     parser.add_argument("--dry-run",  action="store_true", help="No escribe en Sheets")
     parser.add_argument("--sector",   default=None,        help="Sector: ai, saas, latam_tech")
     parser.add_argument("--company",  default=None,        help="Empresa específica (slug)")
+    parser.add_argument("--companies-file", default=None,
+                        help="Archivo con un slug por línea (se consulta en Greenhouse y Ashby)")
+    parser.add_argument("--all",      action="store_true", help="Emitir todas las vacantes relevantes, no solo nuevas")
     args = parser.parse_args()
 
     # ── Definir qué empresas buscar ────────────────────────────────────────────
@@ -60,19 +77,27 @@ def main():
     elif args.company:
         gh_companies  = [args.company]
         ash_companies = [args.company]
+    elif args.companies_file:
+        gh_companies  = load_companies_file(args.companies_file)
+        ash_companies = gh_companies
+        log.info(f"{args.companies_file}: {len(gh_companies)} empresas")
 
     # ── Scraping ───────────────────────────────────────────────────────────────
     log.info("=== Scraping Greenhouse ===")
-    gh_jobs = scrape_greenhouse(gh_companies)
+    only_new = not args.all
+    pending = PendingSnapshots()
+    gh_jobs = scrape_greenhouse(gh_companies, only_new=only_new, pending=pending)
 
     log.info("=== Scraping Ashby ===")
-    ash_jobs = scrape_ashby(ash_companies)
+    ash_jobs = scrape_ashby(ash_companies, only_new=only_new, pending=pending)
 
     all_jobs = gh_jobs + ash_jobs
     log.info(f"Total: {len(all_jobs)} vacantes ({len(gh_jobs)} GH + {len(ash_jobs)} Ashby)")
 
     if not all_jobs:
         log.info("Sin vacantes nuevas.")
+        if not args.dry_run:
+            pending.commit()
         return
 
     # ── Normalizar ─────────────────────────────────────────────────────────────
@@ -90,7 +115,7 @@ def main():
     print()
 
     if args.dry_run:
-        log.info("--dry-run: no se escribió en Sheets.")
+        log.info("--dry-run: no se escribió en Sheets (snapshot sin guardar).")
         return
 
     # ── Insertar en Sheets usando pipeline existente ───────────────────────────
@@ -100,7 +125,8 @@ def main():
 
         inserted = 0
         skipped  = 0
-        for job in normalized:
+        failed   = []
+        for record, job in zip(all_jobs, normalized):
             try:
                 result = sm.insert_job(job)
                 if result:
@@ -109,9 +135,11 @@ def main():
                     skipped += 1
             except Exception as e:
                 log.warning(f"Error insertando {job['Company']}/{job['Role']}: {e}")
-                skipped += 1
+                failed.append(record)
 
-        log.info(f"Sheets: {inserted} insertadas, {skipped} omitidas (duplicadas o error)")
+        # Snapshot al final: las que fallaron se vuelven a emitir la próxima corrida
+        pending.commit(failed=failed)
+        log.info(f"Sheets: {inserted} insertadas, {skipped} omitidas (duplicadas), {len(failed)} con error")
 
     except ImportError as e:
         log.error(f"No se pudo importar SheetManager: {e}")
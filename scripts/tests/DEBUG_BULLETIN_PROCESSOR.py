@@ -4,6 +4,10 @@ DEBUG BULLETIN PROCESSOR
 Ver por qué no procesa los emails
 """
 import os
+import sys
+from pathlib import Path
+sys.path.insert(0, str(Path(__file__).parent.parent.parent))
+
 from google.auth.transport.requests import Request
 from google.oauth2.credentials import Credentials
 from googleapiclient.discovery import build
@@ -13,6 +17,8 @@ from email.parser import BytesParser
 from datetime import datetime
 from email.utils import parsedate_to_datetime
 
+from core.utils.parse_cache import get_parse_cache
+
 def get_gmail_service():
     creds = None
     if os.path.exists('data/credentials/token.json'):
@@ -84,6 +90,7 @@ def main():
     
     messages = results.get('messages', [])
     processed_ids = get_processed_ids()
+    parse_cache = get_parse_cache()
     
     print(f"📊 Encontrados: {len(messages)} emails")
     print(f"📋 Ya procesados: {len(processed_ids)} IDs en archivo\n")
@@ -122,6 +129,16 @@ def main():
         print(f"   Type: {bulletin_type if bulletin_type else '❌ NO DETECTADO'}")
         print(f"   Processed: {'✅ YA PROCESADO' if is_processed else '❌ NO'}")
         print(f"   Age filter: {'✅ PASS (<7)' if age <= 7 else '❌ FAIL (>7)'}")
+        
+        # Jobs que el processor ya extrajo de este email (sin re-parsear)
+        cached = parse_cache.peek(msg_id)
+        if not cached:
+            print("   Parse cache: — (nunca parseado)")
+        for entry in cached:
+            print(f"   Parse cache: 💾 {entry['parser']} {entry['version']} → "
+                  f"{len(entry['jobs'])} jobs (hace {entry['age_days']:.1f} días)")
+            for job in entry['jobs'][:3]:
+                print(f"      - {job.get('Role', '')[:40]} | {job.get('Company', '')[:25]}")
         print()
         
         if not is_processed and age <= 7 and bulletin_type:
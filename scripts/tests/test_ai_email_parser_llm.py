@@ -0,0 +1,114 @@
+"""
+TEST AI EMAIL PARSER - LLM call paths (sin LM Studio)
+Location: scripts/tests/test_ai_email_parser_llm.py
+
+Reemplaza requests.post por un LLM falso y ejercita los dos caminos que
+llaman a _call_llm: el prompt por lotes (_ai_extract_batch, con max_tokens
+calculado por lote) y los prompts sueltos (_ai_extract_single_job,
+parse_generic_bulletin). Cache en un SQLite temporal.
+
+Uso:
+  py -m pytest scripts/tests/test_ai_email_parser_llm.py -q
+"""
+
+import json
+import re
+import sys
+from pathlib import Path
+
+project_root = Path(__file__).parent.parent.parent
+sys.path.insert(0, str(project_root))
+
+import pytest
+
+from core.automation import ai_email_parser as aep
+from core.utils.llm_cache import LLMCache, _Store
+
+IDS = ["1009965617382", "1009965617383"]
+
+
+class FakeResponse:
+    def __init__(self, content: str):
+        self._content = content
+
+    def raise_for_status(self):
+        pass
+
+    def json(self):
+        return {"choices": [{"message": {"content": self._content}}]}
+
+
+@pytest.fixture
+def parser(tmp_path, monkeypatch):
+    calls = []
+
+    def fake_post(url, timeout=None, **kwargs):
+        payload = kwargs["json"]
+        prompt = payload["messages"][0]["content"]
+        calls.append({"prompt": prompt, "max_tokens": payload["max_tokens"], "timeout": timeout})
+        if "### JOB" in prompt:
+            ids = re.findall(r"### JOB (\d+)", prompt)
+            answer = [{"job_id": i, "title": f"PM {i}", "company": "Acme", "location": "CDMX"} for i in ids]
+        elif "This is job ID" in prompt:
+            answer = {"title": "Business Analyst", "company": "Acme", "location": "GDL"}
+        else:
+            answer = [{"title": "Scrum Master", "company": "Foo", "location": "Remote",
+                       "url": "https://example.com/jobs/1"}]
+        return FakeResponse(json.dumps(answer))
+
+    monkeypatch.setattr(aep.requests, "post", fake_post, raising=False)
+    p = aep.AIEmailParser(llm_url="http://llm.test/v1/chat/completions", model="fake")
+    p._cache = LLMCache(_Store(tmp_path / "llm_cache.db"), "email_parser", "test")
+    p.calls = calls
+    return p
+
+
+def test_batch_path_sends_max_tokens(parser):
+    contexts = {job_id: f"<p>job {job_id}</p>" for job_id in IDS}
+    found = parser._ai_extract_batch(IDS, contexts)
+
+    assert sorted(found) == IDS
+    assert all(job["Role"] == f"PM {job_id}" for job_id, job in found.items())
+    assert parser.calls[0]["max_tokens"] == aep.OUTPUT_TOKENS_PER_JOB * len(IDS) + 200
+    assert parser.calls[0]["timeout"] == aep.BATCH_TIMEOUT
+
+
+def test_single_prompt_path_uses_default_max_tokens(parser):
+    job = parser._ai_extract_single_job("<p>Business Analyst</p>", IDS[0], 1, 1)
+
+    assert job["Role"] == "Business Analyst"
+    assert parser.calls[0]["max_tokens"] == 1000
+
+
+def test_generic_bulletin_path(parser):
+    jobs = parser.parse_generic_bulletin("<html><body><a href='https://example.com/jobs/1'>"
+                                         "Scrum Master</a></body></html>", source="Adzuna")
+
+    assert len(jobs) == 1
+    assert parser.calls[0]["max_tokens"] == 1000
+
+
+def test_second_call_is_served_from_cache(parser):
+    contexts = {job_id: f"<p>job {job_id}</p>" for job_id in IDS}
+    parser._ai_extract_batch(IDS, contexts)
+    parser._ai_extract_batch(IDS, contexts)
+
+    assert len(parser.calls) == 1
+
+
+def test_malformed_answers_are_not_cached(parser, monkeypatch):
+    answers = iter(['[{"title": "Scrum Ma', '{"title": "Broken'] + ['[]'] * 4)
+    monkeypatch.setattr(aep.requests, "post",
+                        lambda url, timeout=None, **kw: FakeResponse(next(answers)), raising=False)
+
+    html = "<a href='https://example.com/jobs/1'>Scrum Master</a>"
+    assert parser.parse_generic_bulletin(html, source="Adzuna") == []
+    parser._ai_extract_single_job("<p>x</p>", IDS[0], 1, 1)
+
+    assert parser._cache._store.conn.execute("SELECT COUNT(*) FROM llm_cache").fetchone()[0] == 0
+
+
+def test_placeholder_jobs_are_flagged(parser):
+    job = parser._create_minimal_job(IDS[0])
+
+    assert job["_ai_failed"] is True
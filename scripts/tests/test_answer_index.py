@@ -0,0 +1,54 @@
+"""
+TEST ANSWER INDEX - exact / similar lookups (SQLite temporal)
+Location: scripts/tests/test_answer_index.py
+
+Una respuesta aprendida solo se reutiliza para la misma pregunta o una que
+cambie palabras genéricas; otro país, una negación u otra skill no cuentan.
+
+Uso:
+  py -m pytest scripts/tests/test_answer_index.py -q
+"""
+
+import sys
+from pathlib import Path
+
+project_root = Path(__file__).parent.parent.parent
+sys.path.insert(0, str(project_root))
+
+import pytest
+
+from core.utils.answer_index import AnswerIndex
+
+
+@pytest.fixture
+def index(tmp_path):
+    return AnswerIndex(tmp_path / "answer_index.db")
+
+
+def test_exact_and_rephrased_questions_hit(index):
+    index.learn("How many years of work experience do you have with Python programming language?", "8")
+
+    assert index.lookup("How many years of work experience do you have with Python programming language?").score == 1.0
+    hit = index.lookup("How many years of work experience do you have with the Python programming language?")
+    assert (hit.answer, hit.score) == ("8", 1.0)
+    assert index.similar == 1
+
+
+def test_other_country_does_not_hit(index):
+    index.learn("Are you legally authorized to work in Mexico?", "Yes")
+
+    assert index.lookup("Are you legally authorized to work in the US?") is None
+
+
+def test_negation_does_not_hit(index):
+    index.learn("Will you require visa sponsorship?", "No")
+
+    assert index.lookup("Will you not require visa sponsorship?") is None
+    assert index.lookup("Won't you require visa sponsorship?") is None
+
+
+def test_other_skill_does_not_hit(index):
+    index.learn("How many years of work experience do you have with Python programming language?", "8")
+
+    assert index.lookup("How many years of work experience do you have with Java programming language?") is None
+    assert index.lookup("How many years of work experience do you have with Python and Django?") is None
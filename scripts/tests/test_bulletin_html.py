@@ -0,0 +1,42 @@
+"""
+TEST BULLETIN HTML - índices de BulletinDoc
+Location: scripts/tests/test_bulletin_html.py
+
+lxml descarta los comentarios; los bloques condicionales de Outlook
+(<!--[if mso]>...<![endif]-->) traen links de jobs que no deben perderse.
+
+Uso:
+  py -m pytest scripts/tests/test_bulletin_html.py -q
+"""
+
+import sys
+from pathlib import Path
+
+project_root = Path(__file__).parent.parent.parent
+sys.path.insert(0, str(project_root))
+
+from core.automation.bulletin_html import BulletinDoc
+
+HTML = """<html><body>
+<a href="https://www.glassdoor.com/job-listing/JL_1009946882356.htm?src=email&amp;pos=1">PM</a>
+<!--[if mso]>
+<v:roundrect href="https://www.glassdoor.com/job-listing/JL_1009512345678.htm?src=email&amp;pos=2">
+  <center>Apply</center></v:roundrect>
+<![endif]-->
+<!-- tracking: https://example.com/ignored -->
+</body></html>"""
+
+
+def test_urls_include_conditional_comments():
+    doc = BulletinDoc(HTML)
+
+    assert doc.find_all(r"JL_(\d+)") == ["1009946882356", "1009512345678"]
+    assert "https://www.glassdoor.com/job-listing/JL_1009512345678.htm?src=email&pos=2" in doc.urls
+    assert not any("example.com" in url for url in doc.urls)
+
+
+def test_conditional_comments_stay_out_of_text_and_clean_html():
+    doc = BulletinDoc(HTML)
+
+    assert "Apply" not in doc.text_nodes
+    assert "1009512345678" not in doc.clean_html()
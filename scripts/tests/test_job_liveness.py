@@ -0,0 +1,95 @@
+"""
+TEST JOB LIVENESS - ids y redirects con URLs de tracking reales (sin red)
+Location: scripts/tests/test_job_liveness.py
+
+Las URLs son las que llegan en los boletines (Glassdoor partner con cb=,
+LinkedIn /comm/ con trackingId, Indeed rc/clk con fccid). El HTTP se sirve
+con httpx.MockTransport.
+
+Uso:
+  py -m pytest scripts/tests/test_job_liveness.py -q
+"""
+
+import sys
+from pathlib import Path
+
+project_root = Path(__file__).parent.parent.parent
+sys.path.insert(0, str(project_root))
+
+import httpx
+import pytest
+
+from core.enrichment import job_liveness as jl
+
+GLASSDOOR = ("https://www.glassdoor.com.mx/partner/jobListing.htm?pos=101&ao=1136043&s=58"
+             "&guid=00000192a1b2c3d4e5f6a7b8c9d0e1f2&src=GD_JOB_AD&t=ESR&vt=w&cs=1_94d1a0c2"
+             "&cb=1729166400123&jobListingId=1009512345678&jrtk=5-yul1-0-1ia2b3c4d5e6f7g8")
+LINKEDIN = ("https://www.linkedin.com/comm/jobs/view/4012345678/?trackingId=Zx9%2BqW1aQ%3D%3D"
+            "&refId=8f3b2c1d&lipi=urn%3Ali%3Apage%3Aemail_email_job_alert_digest_01"
+            "&midToken=AQHq1w2e3r4t5y&trk=eml-email_job_alert_digest_01-job_card-0-view_job")
+INDEED = ("https://mx.indeed.com/rc/clk?jk=3f2a1b4c5d6e7f80&bb=Kp0aZ9x8&xkcb=SoD167M3"
+          "&fccid=1234abcd5678ef90&vjs=3")
+
+SCANNER = jl.IndicatorScanner(expired=["no longer accepting applications"], active=["apply now"])
+
+
+def test_job_id_of_ignores_tracking_numbers():
+    assert jl.job_id_of(GLASSDOOR) == ""
+    assert jl.job_id_of(LINKEDIN) == "4012345678"
+    assert jl.job_id_of(INDEED) == "3f2a1b4c5d6e7f80"
+    assert jl.job_id_of("https://boards.greenhouse.io/acme/jobs/4567890?gh_src=a1b2c3&utm_source=LinkedIn") \
+        == "4567890"
+
+
+@pytest.fixture
+def check(monkeypatch):
+    routes = {}
+
+    def handler(request):
+        url = str(request.url)
+        for prefix, (status, headers, body) in routes.items():
+            if url.startswith(prefix):
+                return httpx.Response(status, headers=headers, text=body)
+        return httpx.Response(404)
+
+    real_client = httpx.AsyncClient
+    monkeypatch.setattr(jl.httpx, "AsyncClient",
+                        lambda **kw: real_client(transport=httpx.MockTransport(handler), **kw))
+
+    def run(url):
+        return jl.LivenessChecker(SCANNER).check_many([url])[0]
+
+    run.routes = routes
+    return run
+
+
+def test_glassdoor_redirect_that_drops_cb_is_not_expired(check):
+    check.routes["https://www.glassdoor.com.mx/partner/"] = (
+        302, {"location": "https://www.glassdoor.com.mx/job-listing/pm-acme-JV_IC2.htm?jl=1009512345678"}, "")
+    check.routes["https://www.glassdoor.com.mx/job-listing/"] = (
+        200, {"content-type": "text/html"}, "<html><title>PM - Acme</title><body>Acme</body></html>")
+
+    verdict = check(GLASSDOOR)
+
+    assert verdict.status == jl.UNKNOWN
+    assert verdict.needs_browser
+
+
+def test_linkedin_redirect_to_search_is_expired(check):
+    check.routes["https://www.linkedin.com/jobs-guest/jobs/api/jobPosting/4012345678"] = (
+        302, {"location": "https://www.linkedin.com/jobs/search?keywords=Product"}, "")
+    check.routes["https://www.linkedin.com/jobs/search"] = (
+        200, {"content-type": "text/html"}, "<html><title>Jobs</title></html>")
+
+    verdict = check(LINKEDIN)
+
+    assert (verdict.status, verdict.method) == (jl.EXPIRED, "redirect")
+
+
+def test_indeed_redirect_keeping_jk_is_classified_by_content(check):
+    check.routes["https://mx.indeed.com/rc/clk"] = (
+        302, {"location": "https://mx.indeed.com/viewjob?jk=3f2a1b4c5d6e7f80&from=serp"}, "")
+    check.routes["https://mx.indeed.com/viewjob"] = (
+        200, {"content-type": "text/html"}, "<html><title>PM</title><body>Apply now</body></html>")
+
+    assert check(INDEED).status == jl.ACTIVE
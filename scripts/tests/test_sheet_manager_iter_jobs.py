@@ -0,0 +1,107 @@
+"""
+TEST SHEET MANAGER - iter_jobs paging (sin Google API)
+Location: scripts/tests/test_sheet_manager_iter_jobs.py
+
+Sustituye el service de Sheets por un grid en memoria que imita values.get
+(recorta filas vacías al final de cada rango) y verifica que iter_jobs
+recorre todo el grid aunque una página termine en un bloque de filas vacías.
+
+Uso:
+  py -m pytest scripts/tests/test_sheet_manager_iter_jobs.py -q
+"""
+
+import sys
+from pathlib import Path
+
+project_root = Path(__file__).parent.parent.parent
+sys.path.insert(0, str(project_root))
+
+from core.sheets.sheet_manager import SheetManager
+
+HEADERS = ["Role", "ApplyURL"]
+
+
+class FakeRequest:
+    def __init__(self, result):
+        self._result = result
+
+    def execute(self):
+        return self._result
+
+
+class FakeSheets:
+    """Grid de una pestaña: grid[i] es la fila i + 2 ([] = fila vacía)."""
+
+    def __init__(self, grid):
+        self.grid = grid
+        self.ranges = []
+
+    def spreadsheets(self):
+        return self
+
+    def values(self):
+        return self
+
+    def get(self, spreadsheetId=None, range=None, fields=None):
+        if range is None:   # metadata: rowCount = headers + grid
+            return FakeRequest({"sheets": [{"properties": {
+                "title": "Registry", "sheetId": 1,
+                "gridProperties": {"rowCount": len(self.grid) + 1}}}]})
+        self.ranges.append(range)
+        first, last = range.split("!")[1].split(":")
+        lo, hi = int(first[1:]) - 2, int(last.lstrip("ABCDEFGHIJKLMNOPQRSTUVWXYZ")) - 1
+        rows = self.grid[lo:hi]
+        while rows and not rows[-1]:
+            rows = rows[:-1]
+        return FakeRequest({"values": rows} if rows else {})
+
+    def append(self, spreadsheetId=None, range=None, valueInputOption=None, body=None):
+        self.grid.extend(body["values"])
+        return FakeRequest({})
+
+
+def make_manager(grid):
+    sm = SheetManager.__new__(SheetManager)
+    sm.service = FakeSheets(grid)
+    sm.spreadsheet_id = "test"
+    sm.tabs = {"registry": "Registry"}
+    sm._headers_cache = {"Registry": HEADERS}
+    sm._sheet_id_cache = {}
+    sm._row_count_cache = {}
+    sm._write_buffer = None
+    sm._job_index = None
+    sm.mirror = None
+    return sm
+
+
+def job(i):
+    return [f"Role {i}", f"https://example.com/jobs/{i}"]
+
+
+def test_blank_block_at_end_of_page_does_not_stop_iteration():
+    # filas 2-7 con datos, 8-11 vacías (cierran la página de 10), 12-16 con datos
+    grid = [job(i) for i in range(6)] + [[]] * 4 + [job(i) for i in range(6, 11)]
+    sm = make_manager(grid)
+
+    rows = [r for r in sm.iter_jobs(chunk_rows=10) if r.get("ApplyURL")]
+
+    assert [r["Role"] for r in rows] == [f"Role {i}" for i in range(11)]
+    assert rows[-1].row == 16
+    assert len(sm.service.ranges) == 2
+
+
+def test_rows_appended_after_first_read_are_visible():
+    sm = make_manager([job(i) for i in range(5)])
+    assert len(list(sm.iter_jobs(chunk_rows=10))) == 5
+
+    sm.append_rows("registry", [job(i) for i in range(5, 25)])
+
+    assert len(list(sm.iter_jobs(chunk_rows=10))) == 25
+
+
+def test_without_metadata_a_short_page_ends_iteration():
+    sm = make_manager([job(i) for i in range(12)])
+    sm._get_row_count = lambda tab_name: None
+
+    assert len(list(sm.iter_jobs(chunk_rows=10))) == 12
+    assert len(sm.service.ranges) == 2
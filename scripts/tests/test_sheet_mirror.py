@@ -0,0 +1,90 @@
+"""
+TEST SHEET MIRROR - pull por hash y write-through (sin Google API)
+Location: scripts/tests/test_sheet_mirror.py
+
+Nadie escribe un marcador de "última edición" en el Sheet, así que el pull
+lee la pestaña completa: filas borradas (deleteDimension) y ediciones hechas
+a mano en la UI tienen que verse en la copia local.
+
+Uso:
+  py -m pytest scripts/tests/test_sheet_mirror.py -q
+"""
+
+import sys
+from pathlib import Path
+
+project_root = Path(__file__).parent.parent.parent
+sys.path.insert(0, str(project_root))
+
+from core.sheets.sheet_manager import SheetManager
+from core.sheets.sheet_mirror import SheetMirror
+
+HEADERS = ["Role", "ApplyURL", "Status"]
+
+
+class FakeRequest:
+    def __init__(self, result):
+        self._result = result
+
+    def execute(self):
+        return self._result
+
+
+class FakeSheets:
+    """Pestaña Registry en memoria: grid[0] son los headers."""
+
+    def __init__(self, grid):
+        self.grid = grid
+
+    def spreadsheets(self):
+        return self
+
+    def values(self):
+        return self
+
+    def get(self, spreadsheetId=None, range=None):
+        if range.endswith("!1:1"):
+            return FakeRequest({"values": [self.grid[0]]})
+        return FakeRequest({"values": [list(row) for row in self.grid[1:]]})
+
+    def batchUpdate(self, spreadsheetId=None, body=None):
+        for data in body["data"]:
+            cell = data["range"].split("!")[1]
+            self.grid[int(cell[1:]) - 1][ord(cell[0]) - ord("A")] = data["values"][0][0]
+        return FakeRequest({})
+
+
+def make(tmp_path):
+    service = FakeSheets([HEADERS] + [[role, f"https://example.com/{role}", "New"] for role in "ABC"])
+    mirror = SheetMirror(service, "test", db_path=tmp_path / "mirror.db")
+    sm = SheetManager.__new__(SheetManager)
+    sm.service = service
+    sm.spreadsheet_id = "test"
+    sm.tabs = {"registry": "Registry"}
+    sm._headers_cache = {"Registry": HEADERS}
+    sm._row_count_cache = {}
+    sm._write_buffer = None
+    sm._job_index = None
+    sm.mirror = mirror
+    return sm, service, mirror
+
+
+def test_pull_sees_deleted_rows_and_ui_edits(tmp_path):
+    sm, service, mirror = make(tmp_path)
+    assert mirror.pull("Registry") == 3
+
+    del service.grid[2]               # fila 3 (B) borrada
+    service.grid[1][0] = "A (editado)"
+    mirror.pull("Registry")
+
+    assert [(job["Role"], job["_row"]) for job in mirror.get_all("Registry")] == [("A (editado)", 2), ("C", 3)]
+
+
+def test_update_job_writes_through_to_the_sheet(tmp_path):
+    sm, service, mirror = make(tmp_path)
+    mirror.pull("Registry")
+
+    assert sm.update_job(3, {"Status": "Applied"})
+
+    assert service.grid[2] == ["B", "https://example.com/B", "Applied"]
+    assert mirror.get_all("Registry")[1]["Status"] == "Applied"
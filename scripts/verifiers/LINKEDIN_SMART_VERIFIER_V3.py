@@ -6,6 +6,8 @@ Mejoras vs V2:
 - Más patrones de detección (ES/EN)
 - Mejor manejo de checkpoints
 - Logging detallado para debugging
+- Verificación HTTP en paralelo (jobs-guest, sin login); el browser solo
+  abre los jobs ambiguos (core/enrichment/job_liveness.py)
 """
 import os
 import sys
@@ -17,7 +19,9 @@ sys.path.insert(0, str(project_root))
 
 from core.sheets.sheet_manager import SheetManager
 from dotenv import load_dotenv
-from playwright.sync_api import sync_playwright
+from core.utils.browser_pool import get_sync_pool
+from core.utils.resource_blocking import print_block_stats
+from core.enrichment.job_liveness import IndicatorScanner, LivenessChecker, classify_html
 import time
 from datetime import datetime
 
@@ -93,6 +97,10 @@ class LinkedInSmartVerifierV3:
             "republicado",  # ✅ NEW
             "buscando activamente"  # ✅ NEW
         ]
+        
+        # Indicadores compilados en un solo regex + verificación HTTP por niveles
+        self.scanner = IndicatorScanner(self.expired_indicators, self.active_indicators)
+        self.liveness = LivenessChecker(self.scanner)
     
     def save_cookies(self, context):
         """Guarda las cookies de sesión para reutilizar"""
@@ -281,7 +289,6 @@ class LinkedInSmartVerifierV3:
                 
                 # Get full HTML
                 full_html = page.content()
-                full_text = full_html.lower()
                 
                 # DEBUG: Save HTML if unknown
                 if debug:
@@ -290,35 +297,11 @@ class LinkedInSmartVerifierV3:
                     debug_file.write_text(full_html, encoding='utf-8')
                     print(f"  🐛 DEBUG: HTML saved to {debug_file.name}")
                 
-                # Check EXPIRED indicators
-                for indicator in self.expired_indicators:
-                    if indicator.lower() in full_text:
-                        return {
-                            'status': 'EXPIRED',
-                            'reason': f'Found: "{indicator}"'
-                        }
-                
-                # Check ACTIVE indicators
-                for indicator in self.active_indicators:
-                    if indicator.lower() in full_text:
-                        return {
-                            'status': 'ACTIVE',
-                            'reason': f'Found: "{indicator}"'
-                        }
-                
-                # Check title
-                title = page.title().lower()
-                if any(word in title for word in ['error', '404', 'not found', 'no encontrado']):
-                    return {
-                        'status': 'EXPIRED',
-                        'reason': f'Title error: {title[:50]}'
-                    }
-                
-                # UNKNOWN
-                return {
-                    'status': 'UNKNOWN',
-                    'reason': 'No clear indicators (may need login or new patterns)'
-                }
+                # Un solo scan precompilado (JSON-LD, indicadores, título)
+                verdict = classify_html(full_html, self.scanner)
+                if verdict.status == 'UNKNOWN':
+                    verdict.reason = 'No clear indicators (may need login or new patterns)'
+                return verdict.to_dict()
                 
             except Exception as nav_error:
                 error_msg = str(nav_error)
@@ -402,9 +385,6 @@ class LinkedInSmartVerifierV3:
             return None
         
         print(f"✅ Found {len(jobs)} jobs to verify\n")
-        print("="*70)
-        print("🌐 Starting browser with cookies...")
-        print("="*70 + "\n")
         
         results = {
             'expired': [],
@@ -413,75 +393,88 @@ class LinkedInSmartVerifierV3:
             'error': []
         }
         
-        with sync_playwright() as p:
-            # Launch browser
-            browser = p.firefox.launch(headless=False)
-            context = browser.new_context(
+        # Niveles 1-2: HTTP en paralelo (jobs-guest, status, redirects, JSON-LD, indicadores)
+        print("⚡ HTTP liveness check (sin browser)...")
+        checks = [v.to_dict() for v in self.liveness.check_many([job['url'] for job in jobs])]
+        self.liveness.print_stats()
+        ambiguous = [i for i, c in enumerate(checks) if c['status'] in ('UNKNOWN', 'ERROR')]
+        print()
+        
+        # Nivel 3: browser solo para lo que HTTP no pudo decidir
+        if ambiguous:
+            print("="*70)
+            print(f"🌐 Starting browser with cookies ({len(ambiguous)} ambiguous jobs)...")
+            print("="*70 + "\n")
+            
+            # Página prestada por el pool de browsers (firefox visible, context tibio);
+            # perfil "verify": sin imágenes, fuentes ni trackers — solo se lee el HTML
+            with get_sync_pool().page(
+                engine="firefox", headless=False, block="verify",
                 viewport={'width': 1920, 'height': 1080},
                 user_agent='Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36'
-            )
-            page = context.new_page()
-            
-            # Try loading cookies first
-            cookies_loaded = self.load_cookies(context)
-            
-            if cookies_loaded:
-                print("  ℹ️  Testing saved session...")
-                page.goto("https://www.linkedin.com/feed", wait_until='domcontentloaded')
-                time.sleep(3)
-                
-                # Check if still logged in
-                if 'feed' in page.url:
-                    print("  ✅ Session is still VALID! No need to login again.")
-                else:
-                    print("  ⚠️  Session EXPIRED, need to login again")
-                    cookies_loaded = False
-            
-            # Login if needed
-            if not cookies_loaded:
-                login_success = self.do_linkedin_login(page, context)
-                if not login_success:
-                    print("\n⚠️  WARNING: Login did not complete successfully")
-                    print("⚠️  Results may be UNKNOWN due to lack of authentication\n")
-            
-            print()  # Newline
-            
-            # Process jobs
-            for i, job in enumerate(jobs, 1):
-                print(f"[{i}/{len(jobs)}] Checking: {job['company']} - {job['role'][:50]}...")
-                print(f"  URL: {job['url'][:70]}...")
-                
-                # Verify
-                debug_mode = False  # Set to True for first few UNKNOWNs
-                result = self.verify_single_job(job['url'], page, debug=debug_mode)
-                status = result['status']
-                reason = result['reason']
+            ) as page:
+                context = page.context
                 
-                # Print
-                if status == 'EXPIRED':
-                    print(f"  ❌ EXPIRED: {reason}")
-                    results['expired'].append(job)
-                elif status == 'ACTIVE':
-                    print(f"  ✅ ACTIVE: {reason}")
-                    results['active'].append(job)
-                elif status == 'UNKNOWN':
-                    print(f"  ❓ UNKNOWN: {reason}")
-                    results['unknown'].append(job)
-                else:  # ERROR
-                    print(f"  ⚠️  ERROR: {reason}")
-                    results['error'].append(job)
+                # Try loading cookies first
+                cookies_loaded = self.load_cookies(context)
                 
-                # Mark in sheet
-                if mark_expired and status == 'EXPIRED':
-                    if self.mark_job_status(job['row'], 'EXPIRED', reason):
-                        print(f"  📝 Marked as EXPIRED in sheet")
+                if cookies_loaded:
+                    print("  ℹ️  Testing saved session...")
+                    page.goto("https://www.linkedin.com/feed", wait_until='domcontentloaded')
+                    time.sleep(3)
+                    
+                    # Check if still logged in
+                    if 'feed' in page.url:
+                        print("  ✅ Session is still VALID! No need to login again.")
+                    else:
+                        print("  ⚠️  Session EXPIRED, need to login again")
+                        cookies_loaded = False
                 
-                print()
+                # Login if needed
+                if not cookies_loaded:
+                    login_success = self.do_linkedin_login(page, context)
+                    if not login_success:
+                        print("\n⚠️  WARNING: Login did not complete successfully")
+                        print("⚠️  Results may be UNKNOWN due to lack of authentication\n")
                 
-                # Rate limiting
-                time.sleep(3)
+                for n, i in enumerate(ambiguous, 1):
+                    job = jobs[i]
+                    print(f"  🌐 [{n}/{len(ambiguous)}] {job['company']} - {job['role'][:50]}...")
+                    debug_mode = False  # Set to True for first few UNKNOWNs
+                    checks[i] = self.verify_single_job(job['url'], page, debug=debug_mode)
+                    
+                    # Rate limiting
+                    time.sleep(3)
+            print()
+        
+        # Process jobs
+        for i, (job, result) in enumerate(zip(jobs, checks), 1):
+            print(f"[{i}/{len(jobs)}] Checking: {job['company']} - {job['role'][:50]}...")
+            print(f"  URL: {job['url'][:70]}...")
+            
+            status = result['status']
+            reason = result['reason']
+            
+            # Print
+            if status == 'EXPIRED':
+                print(f"  ❌ EXPIRED: {reason}")
+                results['expired'].append(job)
+            elif status == 'ACTIVE':
+                print(f"  ✅ ACTIVE: {reason}")
+                results['active'].append(job)
+            elif status == 'UNKNOWN':
+                print(f"  ❓ UNKNOWN: {reason}")
+                results['unknown'].append(job)
+            else:  # ERROR
+                print(f"  ⚠️  ERROR: {reason}")
+                results['error'].append(job)
+            
+            # Mark in sheet
+            if mark_expired and status == 'EXPIRED':
+                if self.mark_job_status(job['row'], 'EXPIRED', reason):
+                    print(f"  📝 Marked as EXPIRED in sheet")
             
-            browser.close()
+            print()
         
         # Summary
         print("\n" + "="*70)
@@ -493,6 +486,7 @@ class LinkedInSmartVerifierV3:
         print(f"  ✅ ACTIVE:    {len(results['active'])} ({len(results['active'])/total*100:.1f}%)")
         print(f"  ❓ UNKNOWN:   {len(results['unknown'])} ({len(results['unknown'])/total*100:.1f}%)")
         print(f"  ⚠️  ERROR:     {len(results['error'])} ({len(results['error'])/total*100:.1f}%)")
+        print_block_stats()
         
         if results['unknown']:
             print(f"\nℹ️  {len(results['unknown'])} UNKNOWN results detected")